@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+from django.contrib import admin
+
+from .models import ArchivedDelivery, ArchivedOrder
+
+
+class ReadOnlyAdmin(admin.ModelAdmin):
+    """Arhiva se modifică doar prin `archive_closed_orders`."""
+
+    def has_add_permission(self, request):  # type: ignore[no-untyped-def]
+        return False
+
+    def has_change_permission(self, request, obj=None):  # type: ignore[no-untyped-def]
+        return False
+
+
+@admin.register(ArchivedOrder)
+class ArchivedOrderAdmin(ReadOnlyAdmin):
+    list_display = ["order_number", "partner", "order_date", "total_value", "status", "archived_at"]
+    list_filter = ["status", "order_date"]
+    search_fields = ["order_number", "partner__name"]
+
+
+@admin.register(ArchivedDelivery)
+class ArchivedDeliveryAdmin(ReadOnlyAdmin):
+    list_display = ["delivery_number", "order", "partner", "delivery_date", "validation_status"]
+    list_filter = ["validation_status", "delivery_date"]
+    search_fields = ["delivery_number", "order__order_number"]
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import time
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from archive.services import archive_closed_orders
+
+
+class Command(BaseCommand):
+    help = "Mută comenzile livrate/anulate mai vechi de N zile (cu pozițiile și avizele lor) în arhivă."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--older-than",
+            type=int,
+            default=None,
+            help="Vechimea minimă în zile de la ultima modificare (implicit ARCHIVE_AFTER_DAYS)",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=None,
+            help="Comenzi per tranzacție (implicit ARCHIVE_BATCH_SIZE)",
+        )
+        parser.add_argument(
+            "--max-batches",
+            type=int,
+            default=None,
+            help="Oprește după N loturi (rularea următoare continuă)",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            default=False,
+            help="Doar numără comenzile eligibile",
+        )
+
+    def handle(self, *args, **options):  # type: ignore[no-untyped-def]
+        started = time.perf_counter()
+        totals = archive_closed_orders(
+            older_than_days=options["older_than"],
+            batch_size=options["batch_size"],
+            max_batches=options["max_batches"],
+            dry_run=options["dry_run"],
+        )
+        elapsed = time.perf_counter() - started
+        if options["dry_run"]:
+            self.stdout.write(f"[DRY-RUN] Comenzi eligibile: {totals['orders']}")
+            return
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Arhivate: {totals['orders']} comenzi, {totals['order_items']} poziții, "
+                f"{totals['deliveries']} avize, {totals['delivery_items']} poziții aviz | "
+                f"{totals['batches']} loturi | {elapsed:.2f}s"
+            )
+        )
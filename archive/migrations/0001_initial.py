@@ -0,0 +1,229 @@
+# Generated by Django 5.1.1 on 2026-10-19 16:18
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ("orders", "0003_backfill_material"),
+        ("partners", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArchivedOrder",
+            fields=[
+                ("id", models.BigIntegerField(primary_key=True, serialize=False)),
+                ("created_at", models.DateTimeField()),
+                ("updated_at", models.DateTimeField()),
+                ("is_active", models.BooleanField(default=True)),
+                ("order_number", models.CharField(db_index=True, max_length=50)),
+                ("order_date", models.DateField(db_index=True)),
+                ("total_value", models.DecimalField(decimal_places=2, max_digits=15)),
+                ("currency", models.CharField(default="RON", max_length=3)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "În așteptare"),
+                            ("sent_to_partner", "Trimisă către partener"),
+                            ("in_delivery", "În livrare"),
+                            ("delivered", "Livrată"),
+                            ("cancelled", "Anulată"),
+                        ],
+                        max_length=32,
+                    ),
+                ),
+                ("delivery_date", models.DateField()),
+                ("sap_sync_date", models.DateTimeField(blank=True, null=True)),
+                ("notes", models.TextField(blank=True)),
+                ("archived_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "partner",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="archived_orders",
+                        to="partners.partner",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Comandă arhivată",
+                "verbose_name_plural": "Comenzi arhivate",
+                "ordering": ["-order_date"],
+            },
+        ),
+        migrations.CreateModel(
+            name="ArchivedDelivery",
+            fields=[
+                ("id", models.BigIntegerField(primary_key=True, serialize=False)),
+                ("created_at", models.DateTimeField()),
+                ("updated_at", models.DateTimeField()),
+                ("is_active", models.BooleanField(default=True)),
+                ("delivery_number", models.CharField(db_index=True, max_length=50)),
+                ("delivery_date", models.DateField(db_index=True)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("draft", "Draft"),
+                            ("submitted", "Trimis"),
+                            ("validating", "În validare"),
+                            ("validated", "Validat"),
+                            ("rejected", "Respins"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "validation_status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pending"),
+                            ("approved", "Aprobat"),
+                            ("rejected", "Respins"),
+                            ("partial", "Parțial"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("submitted_at", models.DateTimeField(blank=True, null=True)),
+                ("validated_at", models.DateTimeField(blank=True, null=True)),
+                ("notes", models.TextField(blank=True)),
+                ("validation_notes", models.TextField(blank=True)),
+                ("desadv_exported_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "partner",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="archived_deliveries",
+                        to="partners.partner",
+                    ),
+                ),
+                (
+                    "validated_by",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "order",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="deliveries",
+                        to="archive.archivedorder",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Aviz arhivat",
+                "verbose_name_plural": "Avize arhivate",
+                "ordering": ["-delivery_date"],
+            },
+        ),
+        migrations.CreateModel(
+            name="ArchivedOrderItem",
+            fields=[
+                ("id", models.BigIntegerField(primary_key=True, serialize=False)),
+                ("created_at", models.DateTimeField()),
+                ("updated_at", models.DateTimeField()),
+                ("is_active", models.BooleanField(default=True)),
+                ("position", models.IntegerField()),
+                ("material_code", models.CharField(max_length=100)),
+                ("material_description", models.CharField(max_length=255)),
+                (
+                    "quantity_ordered",
+                    models.DecimalField(decimal_places=3, max_digits=10),
+                ),
+                ("unit_of_measure", models.CharField(max_length=10)),
+                ("delivery_date", models.DateField()),
+                ("net_price", models.DecimalField(decimal_places=2, max_digits=15)),
+                ("price_unit", models.CharField(max_length=10)),
+                ("price_unit_order", models.CharField(blank=True, max_length=10)),
+                ("line_total", models.DecimalField(decimal_places=2, max_digits=15)),
+                (
+                    "quantity_delivered",
+                    models.DecimalField(
+                        decimal_places=3, default=Decimal("0"), max_digits=10
+                    ),
+                ),
+                (
+                    "material",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.PROTECT,
+                        related_name="archived_order_items",
+                        to="orders.material",
+                    ),
+                ),
+                (
+                    "order",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="items",
+                        to="archive.archivedorder",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Poziție comandă arhivată",
+                "verbose_name_plural": "Poziții comenzi arhivate",
+                "ordering": ["position"],
+            },
+        ),
+        migrations.CreateModel(
+            name="ArchivedDeliveryItem",
+            fields=[
+                ("id", models.BigIntegerField(primary_key=True, serialize=False)),
+                ("created_at", models.DateTimeField()),
+                ("updated_at", models.DateTimeField()),
+                ("is_active", models.BooleanField(default=True)),
+                (
+                    "quantity_delivered",
+                    models.DecimalField(decimal_places=3, max_digits=10),
+                ),
+                (
+                    "quantity_accepted",
+                    models.DecimalField(
+                        blank=True, decimal_places=3, max_digits=10, null=True
+                    ),
+                ),
+                ("has_discrepancy", models.BooleanField(default=False)),
+                ("discrepancy_reason", models.TextField(blank=True)),
+                ("notes", models.TextField(blank=True)),
+                (
+                    "delivery",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="items",
+                        to="archive.archiveddelivery",
+                    ),
+                ),
+                (
+                    "order_item",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="delivery_items",
+                        to="archive.archivedorderitem",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Poziție aviz arhivat",
+                "verbose_name_plural": "Poziții avize arhivate",
+                "ordering": ["order_item__position"],
+            },
+        ),
+    ]
@@ -0,0 +1,174 @@
+"""Tabele de arhivă pentru comenzile închise și avizele lor.
+
+Au aceleași coloane ca tabelele operaționale (inclusiv `id`, păstrat la mutare),
+deci URL-urile de detaliu rămân valabile, iar template-urile existente pot
+afișa direct obiectele arhivate (aceleași `related_name`: `items`,
+`deliveries`). `created_at` / `updated_at` sunt câmpuri simple, nu `auto_now`,
+pentru a păstra valorile originale.
+"""
+
+from __future__ import annotations
+
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import models
+from django.urls import reverse
+
+from core.constants import DELIVERY_STATUS_CHOICES, ORDER_STATUS_CHOICES, VALIDATION_STATUS_CHOICES
+
+
+class ArchivedOrder(models.Model):
+    """Comandă închisă mutată din `orders.Order`."""
+
+    is_archived = True
+
+    id = models.BigIntegerField(primary_key=True)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    is_active = models.BooleanField(default=True)
+    order_number = models.CharField(max_length=50, db_index=True)
+    partner = models.ForeignKey(
+        "partners.Partner", on_delete=models.CASCADE, related_name="archived_orders"
+    )
+    order_date = models.DateField(db_index=True)
+    total_value = models.DecimalField(max_digits=15, decimal_places=2)
+    currency = models.CharField(max_length=3, default="RON")
+    status = models.CharField(max_length=32, choices=ORDER_STATUS_CHOICES)
+    delivery_date = models.DateField()
+    sap_sync_date = models.DateTimeField(null=True, blank=True)
+    notes = models.TextField(blank=True)
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["-order_date"]
+        verbose_name = "Comandă arhivată"
+        verbose_name_plural = "Comenzi arhivate"
+
+    def __str__(self) -> str:  # pragma: no cover
+        return self.order_number
+
+    def get_absolute_url(self) -> str:
+        return reverse("orders:order_detail", args=[self.pk])
+
+    def get_total_items(self) -> int:
+        return self.items.count()
+
+    def is_fully_delivered(self) -> bool:
+        return not self.items.exclude(quantity_delivered__gte=models.F("quantity_ordered")).exists()
+
+
+class ArchivedOrderItem(models.Model):
+    """Poziție a unei comenzi arhivate."""
+
+    is_archived = True
+
+    id = models.BigIntegerField(primary_key=True)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    is_active = models.BooleanField(default=True)
+    order = models.ForeignKey(ArchivedOrder, on_delete=models.CASCADE, related_name="items")
+    position = models.IntegerField()
+    material = models.ForeignKey(
+        "orders.Material",
+        on_delete=models.PROTECT,
+        related_name="archived_order_items",
+        null=True,
+        blank=True,
+    )
+    material_code = models.CharField(max_length=100)
+    material_description = models.CharField(max_length=255)
+    quantity_ordered = models.DecimalField(max_digits=10, decimal_places=3)
+    unit_of_measure = models.CharField(max_length=10)
+    delivery_date = models.DateField()
+    net_price = models.DecimalField(max_digits=15, decimal_places=2)
+    price_unit = models.CharField(max_length=10)
+    price_unit_order = models.CharField(max_length=10, blank=True)
+    line_total = models.DecimalField(max_digits=15, decimal_places=2)
+    quantity_delivered = models.DecimalField(default=Decimal("0"), max_digits=10, decimal_places=3)
+
+    class Meta:
+        ordering = ["position"]
+        verbose_name = "Poziție comandă arhivată"
+        verbose_name_plural = "Poziții comenzi arhivate"
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"{self.order.order_number} - Poz {self.position}"
+
+    def get_remaining_quantity(self) -> Decimal:
+        return (self.quantity_ordered - (self.quantity_delivered or Decimal("0"))).quantize(Decimal("0.001"))
+
+    def is_fully_delivered(self) -> bool:
+        return (self.quantity_delivered or Decimal("0")) >= (self.quantity_ordered or Decimal("0"))
+
+
+class ArchivedDelivery(models.Model):
+    """Aviz al unei comenzi arhivate."""
+
+    is_archived = True
+
+    id = models.BigIntegerField(primary_key=True)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    is_active = models.BooleanField(default=True)
+    delivery_number = models.CharField(max_length=50, db_index=True)
+    order = models.ForeignKey(ArchivedOrder, on_delete=models.CASCADE, related_name="deliveries")
+    partner = models.ForeignKey(
+        "partners.Partner", on_delete=models.CASCADE, related_name="archived_deliveries"
+    )
+    delivery_date = models.DateField(db_index=True)
+    status = models.CharField(max_length=20, choices=DELIVERY_STATUS_CHOICES)
+    validation_status = models.CharField(max_length=20, choices=VALIDATION_STATUS_CHOICES)
+    submitted_at = models.DateTimeField(null=True, blank=True)
+    validated_at = models.DateTimeField(null=True, blank=True)
+    validated_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, null=True, blank=True, on_delete=models.SET_NULL, related_name="+"
+    )
+    notes = models.TextField(blank=True)
+    validation_notes = models.TextField(blank=True)
+    desadv_exported_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ["-delivery_date"]
+        verbose_name = "Aviz arhivat"
+        verbose_name_plural = "Avize arhivate"
+
+    def __str__(self) -> str:  # pragma: no cover
+        return self.delivery_number
+
+    def get_absolute_url(self) -> str:
+        return reverse("deliveries:delivery_detail", args=[self.pk])
+
+    def get_total_items(self) -> int:
+        return self.items.count()
+
+    def has_discrepancies(self) -> bool:
+        return self.items.filter(has_discrepancy=True).exists()
+
+
+class ArchivedDeliveryItem(models.Model):
+    """Poziție a unui aviz arhivat."""
+
+    is_archived = True
+
+    id = models.BigIntegerField(primary_key=True)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    is_active = models.BooleanField(default=True)
+    delivery = models.ForeignKey(ArchivedDelivery, on_delete=models.CASCADE, related_name="items")
+    order_item = models.ForeignKey(
+        ArchivedOrderItem, on_delete=models.CASCADE, related_name="delivery_items"
+    )
+    quantity_delivered = models.DecimalField(max_digits=10, decimal_places=3)
+    quantity_accepted = models.DecimalField(max_digits=10, decimal_places=3, null=True, blank=True)
+    has_discrepancy = models.BooleanField(default=False)
+    discrepancy_reason = models.TextField(blank=True)
+    notes = models.TextField(blank=True)
+
+    class Meta:
+        ordering = ["order_item__position"]
+        verbose_name = "Poziție aviz arhivat"
+        verbose_name_plural = "Poziții avize arhivate"
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"Aviz {self.delivery.delivery_number} - {self.order_item}"
@@ -0,0 +1,110 @@
+"""Mutarea comenzilor închise (și a avizelor lor) în tabelele de arhivă.
+
+Fiecare lot de comenzi este copiat și șters într-o singură tranzacție, deci o
+rulare întreruptă lasă doar loturi complete; rularea următoare continuă cu
+comenzile rămase. Criteriile sunt reverificate în tranzacția lotului.
+
+Nu sunt arhivate comenzile care au încă avize nefinalizate (alt status decât
+`validated` / `rejected`), confirmări SAP netransmise din outbox sau avize
+validate pentru care nu s-a scris încă DESADV (`export_desadv` citește doar
+tabelele operaționale).
+"""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import Dict, List, Type
+
+from django.conf import settings
+from django.db import connection, models, transaction
+from django.db.models import Exists, OuterRef, QuerySet
+from django.utils import timezone
+
+from deliveries.models import Delivery, DeliveryItem, SapOutboxMessage
+from orders.models import Order, OrderItem
+
+from .models import ArchivedDelivery, ArchivedDeliveryItem, ArchivedOrder, ArchivedOrderItem
+
+
+CLOSED_ORDER_STATUSES = ("delivered", "cancelled")
+FINAL_DELIVERY_STATUSES = ("validated", "rejected")
+
+
+def archive_candidates(older_than_days: int | None = None) -> QuerySet:
+    """Comenzile închise fără activitate în ultimele `older_than_days` zile."""
+    if older_than_days is None:
+        older_than_days = getattr(settings, "ARCHIVE_AFTER_DAYS", 365)
+    cutoff = timezone.now() - timedelta(days=older_than_days)
+    open_deliveries = Delivery.objects.filter(order=OuterRef("pk")).exclude(status__in=FINAL_DELIVERY_STATUSES)
+    unsent = SapOutboxMessage.objects.filter(delivery__order=OuterRef("pk")).exclude(status="sent")
+    desadv_pending = Delivery.objects.filter(
+        order=OuterRef("pk"), status="validated", desadv_exported_at__isnull=True
+    )
+    return (
+        Order.objects.filter(status__in=CLOSED_ORDER_STATUSES, updated_at__lt=cutoff)
+        .exclude(Exists(open_deliveries))
+        .exclude(Exists(unsent))
+        .exclude(Exists(desadv_pending))
+    )
+
+
+def _copy(source: QuerySet, target: Type[models.Model]) -> int:
+    """Copiază rândurile `source` în `target` (aceleași nume de coloane, inclusiv `id`)."""
+    names = [f.attname for f in source.model._meta.concrete_fields]
+    rows = [target(**values) for values in source.values(*names).iterator(chunk_size=2000)]
+    target.objects.bulk_create(rows, batch_size=500)
+    return len(rows)
+
+
+def archive_batch(order_ids: List[int], older_than_days: int | None = None) -> Dict[str, int]:
+    """Mută comenzile date (dacă încă îndeplinesc criteriile) cu pozițiile și avizele lor."""
+    with transaction.atomic():
+        qs = archive_candidates(older_than_days).filter(pk__in=order_ids)
+        if connection.features.has_select_for_update_skip_locked:
+            # Comenzile blocate de o altă tranzacție (ex. validare în curs) rămân pentru rularea următoare
+            qs = qs.select_for_update(skip_locked=True)
+        elif connection.features.has_select_for_update:
+            qs = qs.select_for_update()
+        ids = list(qs.values_list("pk", flat=True))
+        if not ids:
+            return {"orders": 0, "order_items": 0, "deliveries": 0, "delivery_items": 0}
+
+        counts = {
+            "orders": _copy(Order.objects.filter(pk__in=ids), ArchivedOrder),
+            "order_items": _copy(OrderItem.objects.filter(order_id__in=ids), ArchivedOrderItem),
+            "deliveries": _copy(Delivery.objects.filter(order_id__in=ids), ArchivedDelivery),
+            "delivery_items": _copy(DeliveryItem.objects.filter(delivery__order_id__in=ids), ArchivedDeliveryItem),
+        }
+        # Ștergerea comenzii elimină în cascadă pozițiile, avizele și mesajele outbox deja trimise
+        Order.objects.filter(pk__in=ids).delete()
+    return counts
+
+
+def archive_closed_orders(
+    older_than_days: int | None = None,
+    batch_size: int | None = None,
+    max_batches: int | None = None,
+    dry_run: bool = False,
+) -> Dict[str, int]:
+    """Arhivează comenzile închise în loturi de câte `batch_size` (câte o tranzacție per lot)."""
+    batch_size = batch_size or getattr(settings, "ARCHIVE_BATCH_SIZE", 200)
+    totals = {"orders": 0, "order_items": 0, "deliveries": 0, "delivery_items": 0, "batches": 0}
+    if dry_run:
+        totals["orders"] = archive_candidates(older_than_days).count()
+        return totals
+
+    last_pk = 0
+    while max_batches is None or totals["batches"] < max_batches:
+        ids = list(
+            archive_candidates(older_than_days)
+            .filter(pk__gt=last_pk)
+            .order_by("pk")
+            .values_list("pk", flat=True)[:batch_size]
+        )
+        if not ids:
+            break
+        last_pk = ids[-1]
+        for key, value in archive_batch(ids, older_than_days).items():
+            totals[key] += value
+        totals["batches"] += 1
+    return totals
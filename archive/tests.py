@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.test import TestCase
+from django.utils import timezone
+
+from deliveries.models import Delivery, DeliveryItem, SapOutboxMessage
+from orders.models import Order, OrderItem
+from partners.models import Partner
+
+from .models import ArchivedDelivery, ArchivedDeliveryItem, ArchivedOrder, ArchivedOrderItem
+from .services import archive_candidates, archive_closed_orders
+
+
+class ArchiveCandidatesTests(TestCase):
+    def setUp(self) -> None:
+        self.partner = Partner.objects.create(partner_code="P001", name="Partener test")
+
+    def _order(self, number: str, status: str = "delivered", age_days: int = 400) -> Order:
+        order = Order.objects.create(
+            order_number=number,
+            partner=self.partner,
+            total_value=Decimal("100"),
+            status=status,
+            delivery_date=date(2024, 3, 10),
+        )
+        Order.objects.filter(pk=order.pk).update(updated_at=timezone.now() - timedelta(days=age_days))
+        return order
+
+    def _delivery(  # type: ignore[no-untyped-def]
+        self, order: Order, number: str, status: str = "validated", **fields
+    ) -> Delivery:
+        return Delivery.objects.create(
+            delivery_number=number,
+            order=order,
+            partner=self.partner,
+            delivery_date=date(2024, 3, 12),
+            status=status,
+            **fields,
+        )
+
+    def test_only_old_closed_orders_without_pending_work_are_candidates(self) -> None:
+        delivered = self._order("4500000001")
+        cancelled = self._order("4500000002", status="cancelled")
+        self._order("4500000003", status="in_delivery")
+        self._order("4500000004", age_days=10)
+        with_open_delivery = self._order("4500000005")
+        self._delivery(with_open_delivery, "AV-5", status="submitted")
+        with_unsent_message = self._order("4500000006")
+        delivery = self._delivery(with_unsent_message, "AV-6", desadv_exported_at=timezone.now())
+        SapOutboxMessage.objects.create(delivery=delivery, payload={}, status="failed")
+
+        self.assertEqual(set(archive_candidates(365)), {delivered, cancelled})
+        recent = Order.objects.get(order_number="4500000004")
+        self.assertEqual(set(archive_candidates(5)), {delivered, cancelled, recent})
+
+    def test_validated_delivery_waits_for_desadv_export(self) -> None:
+        order = self._order("4500000001")
+        delivery = self._delivery(order, "AV-1", validated_at=timezone.now())
+        self.assertFalse(archive_candidates(365).exists())
+
+        Delivery.objects.filter(pk=delivery.pk).update(desadv_exported_at=timezone.now())
+        self.assertEqual(list(archive_candidates(365)), [order])
+
+
+class ArchiveClosedOrdersTests(TestCase):
+    def setUp(self) -> None:
+        self.partner = Partner.objects.create(partner_code="P001", name="Partener test")
+        self.orders = [self._closed_order(f"450000000{i}") for i in range(1, 4)]
+        Order.objects.update(updated_at=timezone.now() - timedelta(days=400))
+
+    def _closed_order(self, number: str) -> Order:
+        order = Order.objects.create(
+            order_number=number,
+            partner=self.partner,
+            total_value=Decimal("100"),
+            status="delivered",
+            delivery_date=date(2024, 3, 10),
+        )
+        item = OrderItem.objects.create(
+            order=order,
+            position=10,
+            material_code="MAT-001",
+            material_description="Țeavă",
+            quantity_ordered=Decimal("10"),
+            unit_of_measure="BUC",
+            delivery_date=date(2024, 3, 10),
+            net_price=Decimal("10"),
+            price_unit="1",
+            line_total=Decimal("100"),
+        )
+        delivery = Delivery.objects.create(
+            delivery_number=f"AV-{number}",
+            order=order,
+            partner=self.partner,
+            delivery_date=date(2024, 3, 12),
+            status="validated",
+            validated_at=timezone.now(),
+            desadv_exported_at=timezone.now(),
+        )
+        DeliveryItem.objects.create(delivery=delivery, order_item=item, quantity_delivered=Decimal("10"))
+        SapOutboxMessage.objects.create(delivery=delivery, payload={}, status="sent")
+        return order
+
+    def test_rows_move_with_their_ids(self) -> None:
+        live = {
+            ArchivedOrder: set(Order.objects.values_list("pk", "order_number")),
+            ArchivedOrderItem: set(OrderItem.objects.values_list("pk", "order_id")),
+            ArchivedDelivery: set(Delivery.objects.values_list("pk", "order_id")),
+            ArchivedDeliveryItem: set(DeliveryItem.objects.values_list("pk", "delivery_id")),
+        }
+        totals = archive_closed_orders(older_than_days=365, batch_size=2)
+
+        self.assertEqual(
+            totals, {"orders": 3, "order_items": 3, "deliveries": 3, "delivery_items": 3, "batches": 2}
+        )
+        self.assertEqual(set(ArchivedOrder.objects.values_list("pk", "order_number")), live[ArchivedOrder])
+        self.assertEqual(set(ArchivedOrderItem.objects.values_list("pk", "order_id")), live[ArchivedOrderItem])
+        self.assertEqual(set(ArchivedDelivery.objects.values_list("pk", "order_id")), live[ArchivedDelivery])
+        self.assertEqual(
+            set(ArchivedDeliveryItem.objects.values_list("pk", "delivery_id")), live[ArchivedDeliveryItem]
+        )
+        # Rândurile curente (inclusiv mesajele outbox trimise) sunt șterse
+        for model in (Order, OrderItem, Delivery, DeliveryItem, SapOutboxMessage):
+            self.assertFalse(model.objects.exists(), model.__name__)
+
+    def test_dry_run_and_max_batches(self) -> None:
+        self.assertEqual(archive_closed_orders(older_than_days=365, dry_run=True)["orders"], 3)
+        self.assertFalse(ArchivedOrder.objects.exists())
+
+        partial = archive_closed_orders(older_than_days=365, batch_size=2, max_batches=1)
+        self.assertEqual((partial["orders"], partial["batches"]), (2, 1))
+        self.assertEqual(Order.objects.get().pk, self.orders[2].pk)
+        # Rularea următoare continuă cu comenzile rămase
+        self.assertEqual(archive_closed_orders(older_than_days=365, batch_size=2)["orders"], 1)
+        self.assertEqual(ArchivedOrder.objects.count(), 3)
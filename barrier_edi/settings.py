@@ -4,7 +4,7 @@ Acest fișier conține setările de bază pentru mediul de dezvoltare:
 - încărcarea cheilor din variabile de mediu (folosind `python-decouple`)
 - aplicații instalate (inclusiv DRF și Crispy Forms cu Bootstrap 5)
 - motorul de template-uri cu directorul global `templates`
-- baza de date SQLite
+- baza de date SQLite (cu profil de performanță configurabil)
 - localizare pentru România și fus orar Europe/Bucharest
 - directoarele pentru fișiere statice și media
 
@@ -48,16 +48,20 @@ INSTALLED_APPS = [
     "orders",
     "partners",
     "deliveries",
+    "reports",
+    "archive",
 ]
 
 
 # Middleware standard
 MIDDLEWARE = [
+    "core.middleware.PerformanceMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "core.middleware.ReplicaPinMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -84,16 +88,102 @@ TEMPLATES = [
 
 
 WSGI_APPLICATION = "barrier_edi.wsgi.application"
+ASGI_APPLICATION = "barrier_edi.asgi.application"
+# Sub ASGI (uvicorn): webhook-ul SAP și API-ul de poziții rulează ca view-uri
+# async; sub WSGI rămân variantele sync (un view async ar costa un event loop per cerere)
+ASYNC_API_VIEWS = config("ASYNC_API_VIEWS", cast=bool, default=False)
 
 
 # Baza de date: SQLite pentru development
-DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+# Profilul SQLite aplicat la fiecare conexiune nouă:
+# - "tuned": WAL (cititorii nu blochează scriitorul), synchronous=NORMAL (fsync
+#   doar la checkpoint), busy_timeout, mmap și cache mărite, tranzacții
+#   `BEGIN IMMEDIATE` (lock-ul de scriere se ia la începutul tranzacției, deci
+#   nu apare "database is locked" la trecerea de la citire la scriere)
+# - "default": setările implicite SQLite/Django
+SQLITE_PROFILE = config("SQLITE_PROFILE", default="tuned")
+SQLITE_BUSY_TIMEOUT = config("SQLITE_BUSY_TIMEOUT", cast=int, default=20)  # secunde
+SQLITE_MMAP_SIZE = config("SQLITE_MMAP_SIZE", cast=int, default=256 * 1024 * 1024)
+SQLITE_CACHE_SIZE_KB = config("SQLITE_CACHE_SIZE_KB", cast=int, default=64 * 1024)
+
+# PostgreSQL (DB_ENGINE=postgresql): conexiuni persistente (`DB_CONN_MAX_AGE`)
+# sau pool psycopg (`DB_POOL=True`, exclusiv cu conexiunile persistente),
+# verificarea conexiunii reutilizate înainte de folosire și limite de timp pe
+# statement / lock aplicate la nivel de sesiune
+DB_ENGINE = config("DB_ENGINE", default="sqlite")
+DB_POOL = config("DB_POOL", cast=bool, default=False)
+DB_STATEMENT_TIMEOUT_MS = config("DB_STATEMENT_TIMEOUT_MS", cast=int, default=30_000)
+DB_LOCK_TIMEOUT_MS = config("DB_LOCK_TIMEOUT_MS", cast=int, default=10_000)
+
+if DB_ENGINE == "postgresql":
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.postgresql",
+            "NAME": config("DB_NAME", default="barrier_edi"),
+            "USER": config("DB_USER", default="barrier_edi"),
+            "PASSWORD": config("DB_PASSWORD", default=""),
+            "HOST": config("DB_HOST", default="localhost"),
+            "PORT": config("DB_PORT", default="5432"),
+            "CONN_MAX_AGE": 0 if DB_POOL else config("DB_CONN_MAX_AGE", cast=int, default=60),
+            "CONN_HEALTH_CHECKS": config("DB_CONN_HEALTH_CHECKS", cast=bool, default=True),
+            "OPTIONS": {
+                "application_name": config("DB_APPLICATION_NAME", default="barrier_edi"),
+                "connect_timeout": config("DB_CONNECT_TIMEOUT", cast=int, default=5),
+                "options": (
+                    f"-c statement_timeout={DB_STATEMENT_TIMEOUT_MS} "
+                    f"-c lock_timeout={DB_LOCK_TIMEOUT_MS}"
+                ),
+            },
+        }
     }
-}
-
+    if DB_POOL:
+        # Cu CONN_HEALTH_CHECKS, Django verifică fiecare conexiune la ieșirea din pool
+        DATABASES["default"]["OPTIONS"]["pool"] = {
+            "min_size": config("DB_POOL_MIN_SIZE", cast=int, default=2),
+            "max_size": config("DB_POOL_MAX_SIZE", cast=int, default=10),
+            "timeout": config("DB_POOL_TIMEOUT", cast=int, default=10),
+        }
+else:
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": config("SQLITE_PATH", default=str(BASE_DIR / "db.sqlite3")),
+            "OPTIONS": {},
+        }
+    }
+    if SQLITE_PROFILE == "tuned":
+        DATABASES["default"]["OPTIONS"] = {
+            "transaction_mode": "IMMEDIATE",
+            "timeout": SQLITE_BUSY_TIMEOUT,
+            "init_command": (
+                "PRAGMA journal_mode=WAL;"
+                "PRAGMA synchronous=NORMAL;"
+                f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT * 1000};"
+                f"PRAGMA mmap_size={SQLITE_MMAP_SIZE};"
+                f"PRAGMA cache_size=-{SQLITE_CACHE_SIZE_KB};"
+                "PRAGMA temp_store=MEMORY"
+            ),
+        }
+
+
+# Replică de citire (opțional): `DB_REPLICA_NAME` = numele bazei (PostgreSQL)
+# sau calea fișierului (SQLite), restul setărilor sunt cele de la `default`.
+# Doar view-urile marcate cu `core.db_router.use_replica` / querysetele
+# `on_replica(...)` citesc de pe ea; după o scriere clientul rămâne pe
+# `default` `REPLICA_PIN_SECONDS` secunde (read-your-writes)
+DB_REPLICA_NAME = config("DB_REPLICA_NAME", default="")
+if DB_REPLICA_NAME:
+    DATABASES["replica"] = {
+        **DATABASES["default"],
+        "NAME": DB_REPLICA_NAME,
+        "OPTIONS": dict(DATABASES["default"]["OPTIONS"]),
+        "TEST": {"MIRROR": "default"},
+    }
+    if DB_ENGINE == "postgresql":
+        DATABASES["replica"]["HOST"] = config("DB_REPLICA_HOST", default=DATABASES["default"]["HOST"])
+        DATABASES["replica"]["PORT"] = config("DB_REPLICA_PORT", default=DATABASES["default"]["PORT"])
+DATABASE_ROUTERS = ["core.db_router.ReplicaRouter"]
+REPLICA_PIN_SECONDS = config("REPLICA_PIN_SECONDS", cast=int, default=10)
 
 # Validatori parole (standard Django)
 AUTH_PASSWORD_VALIDATORS = [
@@ -152,6 +242,114 @@ REST_FRAMEWORK = {
 SAP_API_URL = config("SAP_API_URL", default="http://placeholder-sap-api.local/api/v1")
 SAP_API_KEY = config("SAP_API_KEY", default="placeholder-api-key")
 SAP_API_TIMEOUT = config("SAP_API_TIMEOUT", cast=int, default=30)
+# Comenzi importate per tranzacție (import în loturi din JSON/XLSX/CSV)
+SAP_IMPORT_BATCH_SIZE = config("SAP_IMPORT_BATCH_SIZE", cast=int, default=200)
+# Coduri material păstrate în cache-ul de import (cod -> id) per proces
+MATERIAL_CACHE_SIZE = config("MATERIAL_CACHE_SIZE", cast=int, default=100_000)
+
+# Outbox confirmări SAP: endpoint, loturi, concurență și backoff (secunde)
+SAP_CONFIRMATION_PATH = config("SAP_CONFIRMATION_PATH", default="/deliveries/confirmations")
+SAP_OUTBOX_BATCH_SIZE = config("SAP_OUTBOX_BATCH_SIZE", cast=int, default=100)
+SAP_OUTBOX_CONCURRENCY = config("SAP_OUTBOX_CONCURRENCY", cast=int, default=4)
+SAP_OUTBOX_MAX_ATTEMPTS = config("SAP_OUTBOX_MAX_ATTEMPTS", cast=int, default=8)
+SAP_OUTBOX_BACKOFF_BASE = config("SAP_OUTBOX_BACKOFF_BASE", cast=float, default=2.0)
+SAP_OUTBOX_BACKOFF_MAX = config("SAP_OUTBOX_BACKOFF_MAX", cast=float, default=600.0)
+# Un mesaj "sending" mai vechi decât lease-ul (worker oprit) este revendicat din nou
+SAP_OUTBOX_LEASE_SECONDS = config("SAP_OUTBOX_LEASE_SECONDS", cast=int, default=300)
+
+# EDI de ieșire (DESADV): identificatori UNB/NAD, director și loturi
+EDI_SENDER_ID = config("EDI_SENDER_ID", default="BARRIER")
+EDI_RECIPIENT_ID = config("EDI_RECIPIENT_ID", default="SAP")
+EDI_BUYER_ID = config("EDI_BUYER_ID", default="BARRIER")
+OUTBOUND_DIR = config("OUTBOUND_DIR", default=str(BASE_DIR / "outbound"))
+OUTBOUND_BATCH_SIZE = config("OUTBOUND_BATCH_SIZE", cast=int, default=500)
+OUTBOUND_WRITE_BUFFER = 1024 * 1024
+
+# Rapoarte: zile recalculate per tranzacție la actualizarea agregatelor și suprapunerea
+# ferestrei incrementale (secunde) pentru tranzacțiile care fac commit după `updated_at`
+ROLLUP_DAYS_PER_CHUNK = 31
+ROLLUP_LAG = config("ROLLUP_LAG", cast=int, default=300)
+# KPI furnizori: poziții citite per query și durata cache-ului dashboard-ului (secunde)
+ANALYTICS_CHUNK_SIZE = config("ANALYTICS_CHUNK_SIZE", cast=int, default=100_000)
+ANALYTICS_CACHE_TIMEOUT = config("ANALYTICS_CACHE_TIMEOUT", cast=int, default=900)
+
+# Arhivare: comenzi livrate/anulate nemodificate de N zile, mutate în loturi
+ARCHIVE_AFTER_DAYS = config("ARCHIVE_AFTER_DAYS", cast=int, default=365)
+ARCHIVE_BATCH_SIZE = config("ARCHIVE_BATCH_SIZE", cast=int, default=200)
+
+# Export CSV/XLSX: rânduri citite per round-trip din cursor și blocul de streaming
+EXPORT_CHUNK_SIZE = config("EXPORT_CHUNK_SIZE", cast=int, default=2000)
+EXPORT_STREAM_BLOCK_SIZE = 64 * 1024
+
+# Detaliul comenzii: pozițiile și avizele se încarcă în pagini de N rânduri
+ORDER_DETAIL_PAGE_SIZE = config("ORDER_DETAIL_PAGE_SIZE", cast=int, default=100)
+
+# Instrumentare request-uri (`core.middleware.PerformanceMiddleware`): fracțiunea
+# eșantionată în log, header `Server-Timing` și bugete peste care request-ul e
+# logat ca WARNING
+PERF_SAMPLE_RATE = config("PERF_SAMPLE_RATE", cast=float, default=0.0)
+PERF_SERVER_TIMING = config("PERF_SERVER_TIMING", cast=bool, default=DEBUG)
+PERF_BUDGET_MS = config("PERF_BUDGET_MS", cast=int, default=500)
+PERF_BUDGET_QUERIES = config("PERF_BUDGET_QUERIES", cast=int, default=50)
+PERF_BUDGET_DB_MS = config("PERF_BUDGET_DB_MS", cast=int, default=200)
+
+# Metrici Prometheus (`/metrics/`): token pentru scraper (staff are acces și fără)
+# și directorul în care workerii își agregă valorile (gol = doar procesul curent)
+METRICS_TOKEN = config("METRICS_TOKEN", default="")
+METRICS_DIR = config("METRICS_DIR", default="")
+METRICS_FLUSH_INTERVAL = config("METRICS_FLUSH_INTERVAL", cast=float, default=1.0)
+
+# JSON pentru API (`core.jsonapi`): "auto" = orjson dacă este instalat, altfel
+# stdlib; răspunsurile sub prag nu se comprimă (brotli dacă este instalat, altfel gzip)
+JSON_BACKEND = config("JSON_BACKEND", default="auto")
+JSON_COMPRESS_MIN_BYTES = config("JSON_COMPRESS_MIN_BYTES", cast=int, default=1024)
+JSON_GZIP_LEVEL = config("JSON_GZIP_LEVEL", cast=int, default=6)
+JSON_BROTLI_QUALITY = config("JSON_BROTLI_QUALITY", cast=int, default=4)
+
+# Chei de idempotență (webhook SAP, trimitere aviz): cât se păstrează răspunsul,
+# după cât expiră o rezervare rămasă în lucru și cât așteaptă un dublu-click al
+# formularului răspunsul primei trimiteri
+IDEMPOTENCY_TTL_SECONDS = config("IDEMPOTENCY_TTL_SECONDS", cast=int, default=24 * 3600)
+IDEMPOTENCY_LOCK_SECONDS = config("IDEMPOTENCY_LOCK_SECONDS", cast=int, default=300)
+IDEMPOTENCY_FORM_WAIT_SECONDS = config("IDEMPOTENCY_FORM_WAIT_SECONDS", cast=float, default=10.0)
+
+# Cache partajat între workeri (limitare rată, chei de idempotență); fără URL
+# rămâne cache-ul implicit, în memoria fiecărui proces
+REDIS_URL = config("REDIS_URL", default="")
+if REDIS_URL:
+    CACHES = {"default": {"BACKEND": "django.core.cache.backends.redis.RedisCache", "LOCATION": REDIS_URL}}
+
+# Sesiuni: "db" (tabela django_session), "cached_db" (citire din cache, scriere
+# și în DB), "cache" sau "signed_cookies" (datele în cookie semnat, fără stocare
+# pe server; nu pot fi revocate). Implicit cached_db doar cu cache partajat: cu
+# cache-ul local per proces ceilalți workeri ar vedea sesiunea veche după logout
+SESSION_STRATEGY = config("SESSION_STRATEGY", default="cached_db" if REDIS_URL else "db")
+SESSION_ENGINE = f"django.contrib.sessions.backends.{SESSION_STRATEGY}"
+SESSION_COOKIE_AGE = config("SESSION_COOKIE_AGE", cast=int, default=14 * 24 * 3600)
+# Sesiunea se salvează doar când a fost modificată: paginile de citire nu scriu
+SESSION_SAVE_EVERY_REQUEST = False
+
+# Limitarea ratei (`core.ratelimit`): "N/s|m|h|d" per identitate (cheie API,
+# partener, IP); gol = fără limită. Importurile webhook simultane sunt plafonate
+# (503 + Retry-After peste plafon); slotul unui worker oprit expiră după timeout
+RATELIMIT_ENABLED = config("RATELIMIT_ENABLED", cast=bool, default=True)
+RATELIMIT_FORWARDED_FOR = config("RATELIMIT_FORWARDED_FOR", cast=bool, default=False)
+RATELIMIT_WEBHOOK = config("RATELIMIT_WEBHOOK", default="120/m")
+RATELIMIT_ITEMS_API = config("RATELIMIT_ITEMS_API", default="300/m")
+RATELIMIT_ORDER_DETAIL_API = config("RATELIMIT_ORDER_DETAIL_API", default="600/m")
+RATELIMIT_LOGIN_IP = config("RATELIMIT_LOGIN_IP", default="20/m")
+RATELIMIT_LOGIN_CODE = config("RATELIMIT_LOGIN_CODE", default="5/m")
+IMPORT_MAX_CONCURRENT = config("IMPORT_MAX_CONCURRENT", cast=int, default=4)
+IMPORT_SLOT_TIMEOUT = config("IMPORT_SLOT_TIMEOUT", cast=int, default=600)
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {"console": {"class": "logging.StreamHandler"}},
+    "loggers": {
+        "barrier_edi.perf": {"handlers": ["console"], "level": "INFO", "propagate": False},
+    },
+}
 
 # Login redirects
 LOGIN_URL = "/"
@@ -19,6 +19,7 @@ urlpatterns = [
     path("orders/", include("orders.urls")),
     path("partners/", include("partners.urls")),
     path("deliveries/", include("deliveries.urls")),
+    path("reports/", include("reports.urls")),
 ]
 
 
@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+from django.contrib import admin
+
+from .models import IdempotencyKey, Watermark
+
+
+@admin.register(Watermark)
+class WatermarkAdmin(admin.ModelAdmin):
+    list_display = ["name", "last_timestamp", "last_pk", "updated_at"]
+    search_fields = ["name"]
+
+
+@admin.register(IdempotencyKey)
+class IdempotencyKeyAdmin(admin.ModelAdmin):
+    list_display = ["scope", "key", "status", "response_status", "created_at", "expires_at"]
+    list_filter = ["scope", "status"]
+    search_fields = ["key"]
+    exclude = ["response_body"]
+    readonly_fields = ["scope", "key", "fingerprint", "status", "response_status", "response_headers", "expires_at"]
@@ -0,0 +1,164 @@
+"""Date sintetice deterministe pentru benchmark-uri și teste de încărcare.
+
+Aceeași sămânță (`seed`) produce aceleași parteneri, materiale, comenzi,
+cantități și prețuri, atât în baza de date (`seed_benchmark_data`), cât și în
+fișierele JSON SAP (`generate_sap_payload`). Codurile sunt derivate dintr-un
+prefix, deci payload-urile generate se potrivesc cu partenerii din baza seed.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import random
+from dataclasses import dataclass
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterable, Iterator, List, TextIO
+
+
+LINE_DISTRIBUTIONS = ("fixed", "uniform", "lognormal")
+
+UNITS = ("BUC", "KG", "M", "L", "SET")
+
+
+def partner_code(prefix: str, n: int) -> str:
+    return f"{prefix}-P{n:04d}"
+
+
+def material_code(prefix: str, n: int) -> str:
+    return f"{prefix}-MAT-{n:06d}"
+
+
+def order_number(prefix: str, n: int) -> str:
+    return f"{prefix}-{n:09d}"
+
+
+def line_count_sampler(rng: random.Random, distribution: str, mean: int, maximum: int) -> Callable[[], int]:
+    """Numărul de poziții per comandă.
+
+    - `fixed`: mereu `mean`
+    - `uniform`: între 1 și `2 * mean - 1`
+    - `lognormal`: coadă lungă (majoritatea comenzilor mici, câteva foarte
+      mari), cu media aproximativ `mean`
+    Rezultatul este limitat la [1, `maximum`].
+    """
+    if distribution == "fixed":
+        return lambda: max(1, min(mean, maximum))
+    if distribution == "uniform":
+        return lambda: min(maximum, rng.randint(1, max(1, 2 * mean - 1)))
+    if distribution == "lognormal":
+        sigma = 1.0
+        mu = math.log(max(mean, 1)) - sigma**2 / 2
+        return lambda: max(1, min(maximum, int(round(rng.lognormvariate(mu, sigma)))))
+    raise ValueError(f"Distribuție necunoscută: {distribution} (acceptate: {', '.join(LINE_DISTRIBUTIONS)})")
+
+
+@dataclass
+class SyntheticLine:
+    position: int
+    material: int
+    quantity: Decimal
+    unit: str
+    net_price: Decimal
+    delivery_date: date
+
+    @property
+    def line_total(self) -> Decimal:
+        return (self.quantity * self.net_price).quantize(Decimal("0.01"))
+
+
+@dataclass
+class SyntheticOrder:
+    number: int
+    partner: int
+    order_date: date
+    delivery_date: date
+    lines: List[SyntheticLine]
+
+
+class OrderGenerator:
+    """Comenzi sintetice, reproductibile pentru aceeași sămânță și aceiași parametri."""
+
+    def __init__(
+        self,
+        seed: int,
+        partners: int,
+        materials: int,
+        distribution: str = "lognormal",
+        lines_mean: int = 10,
+        lines_max: int = 200,
+        start_date: date = date(2024, 1, 1),
+        days: int = 365,
+    ) -> None:
+        self.rng = random.Random(seed)
+        self.partners = partners
+        self.materials = materials
+        self.start_date = start_date
+        self.days = days
+        self.line_count = line_count_sampler(self.rng, distribution, lines_mean, lines_max)
+
+    def order(self, number: int) -> SyntheticOrder:
+        rng = self.rng
+        order_date = self.start_date + timedelta(days=rng.randrange(self.days))
+        delivery_date = order_date + timedelta(days=rng.randint(3, 30))
+        lines = [
+            SyntheticLine(
+                position=(i + 1) * 10,
+                material=rng.randrange(self.materials),
+                quantity=Decimal(rng.randint(1, 500)),
+                unit=UNITS[rng.randrange(len(UNITS))],
+                net_price=Decimal(rng.randint(50, 250_000)).scaleb(-2),
+                delivery_date=delivery_date,
+            )
+            for i in range(self.line_count())
+        ]
+        return SyntheticOrder(number, rng.randrange(self.partners), order_date, delivery_date, lines)
+
+    def orders(self, count: int, start: int = 0) -> Iterator[SyntheticOrder]:
+        for number in range(start, start + count):
+            yield self.order(number)
+
+
+def to_sap_payload(order: SyntheticOrder, prefix: str) -> Dict[str, Any]:
+    """Comanda în formatul acceptat de `import_sap_order` / webhook."""
+    return {
+        "order_number": order_number(prefix, order.number),
+        "partner_code": partner_code(prefix, order.partner),
+        "order_date": order.order_date.isoformat(),
+        "delivery_date": order.delivery_date.isoformat(),
+        "currency": "RON",
+        "items": [
+            {
+                "position": line.position,
+                "material_code": material_code(prefix, line.material),
+                "material_description": f"Material {line.material}",
+                "quantity_ordered": str(line.quantity),
+                "unit_of_measure": line.unit,
+                "delivery_date": line.delivery_date.isoformat(),
+                "net_price": str(line.net_price),
+                "price_unit": line.unit,
+            }
+            for line in order.lines
+        ],
+    }
+
+
+def write_json_array(fh: TextIO, entries: Iterable[Dict[str, Any]], max_bytes: int | None = None) -> tuple[int, int]:
+    """Scrie un array JSON element cu element (memorie constantă).
+
+    Cu `max_bytes` se oprește după primul element care depășește dimensiunea.
+    Întoarce (elemente scrise, octeți scriși).
+    """
+    written = size = 0
+    fh.write("[\n")
+    size += 2
+    for entry in entries:
+        chunk = ("" if written == 0 else ",\n") + json.dumps(entry, ensure_ascii=False)
+        fh.write(chunk)
+        size += len(chunk.encode("utf-8"))
+        written += 1
+        if max_bytes is not None and size >= max_bytes:
+            break
+    fh.write("\n]\n")
+    return written, size + 3
@@ -0,0 +1,306 @@
+"""Scenarii de benchmark pentru serviciile critice și comparația cu un baseline.
+
+Un scenariu primește dimensiunea datelor (poziții per comandă, comenzi per
+fișier), își creează datele o singură dată și întoarce o funcție `prepare()`;
+fiecare apel `prepare()` pregătește starea pentru o iterație (nemăsurat) și
+întoarce operația măsurată. Rulările sunt făcute de `run_benchmarks`, pe o bază
+de test creată separat.
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import os
+import statistics
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass
+from decimal import Decimal
+from itertools import count
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client
+from django.urls import reverse
+
+from .benchdata import OrderGenerator, partner_code, to_sap_payload, write_json_array
+
+
+PREFIX = "BENCH"
+
+Operation = Callable[[], Any]
+Prepare = Callable[[], Operation]
+
+
+@dataclass
+class Scenario:
+    name: str
+    sizes: Tuple[int, ...]
+    unit: str
+    setup: Callable[[int], Prepare]
+
+
+SCENARIOS: Dict[str, Scenario] = {}
+
+
+def benchmark(name: str, sizes: Sequence[int], unit: str) -> Callable[[Callable[[int], Prepare]], Callable[[int], Prepare]]:
+    """Înregistrează un scenariu: `setup(size)` creează datele și întoarce `prepare`."""
+
+    def decorator(setup: Callable[[int], Prepare]) -> Callable[[int], Prepare]:
+        SCENARIOS[name] = Scenario(name, tuple(sizes), unit, setup)
+        return setup
+
+    return decorator
+
+
+# --- date comune ---
+
+
+def _partner():  # type: ignore[no-untyped-def]
+    from partners.models import Partner
+
+    partner, _created = Partner.objects.get_or_create(
+        partner_code=partner_code(PREFIX, 0), defaults={"name": "Partener benchmark"}
+    )
+    return partner
+
+
+def _staff_user():  # type: ignore[no-untyped-def]
+    user, _created = get_user_model().objects.get_or_create(
+        username=f"{PREFIX.lower()}-validator", defaults={"is_staff": True}
+    )
+    return user
+
+
+_order_numbers = count(1)
+
+
+def _generator(lines: int, seed: int = 42) -> OrderGenerator:
+    # Un singur partener (cel creat de `_partner`), număr fix de poziții
+    return OrderGenerator(
+        seed=seed, partners=1, materials=max(lines, 1000), distribution="fixed", lines_mean=lines, lines_max=lines
+    )
+
+
+def _payload(generator: OrderGenerator) -> Dict[str, Any]:
+    """Payload SAP pentru o comandă nouă (număr unic în toată rularea)."""
+    return to_sap_payload(generator.order(next(_order_numbers)), PREFIX)
+
+
+def _order(lines: int):  # type: ignore[no-untyped-def]
+    from orders.services import import_sap_order
+
+    _partner()
+    return import_sap_order(_payload(_generator(lines)))
+
+
+# --- scenarii ---
+
+
+@benchmark("import_sap_order", sizes=(10, 100, 1000), unit="poziții")
+def bench_import_sap_order(size: int) -> Prepare:
+    from orders.services import import_sap_order
+
+    _partner()
+    generator = _generator(size)
+
+    def prepare() -> Operation:
+        payload = _payload(generator)
+        return lambda: import_sap_order(payload)
+
+    return prepare
+
+
+@benchmark("sync_sap_orders", sizes=(10, 100, 500), unit="comenzi x 10 poziții")
+def bench_sync_sap_orders(size: int) -> Prepare:
+    from orders.services import sync_sap_orders
+
+    _partner()
+    generator = _generator(10)
+    fd, path = tempfile.mkstemp(prefix="bench-sap-", suffix=".json")
+    atexit.register(os.remove, path)
+    with os.fdopen(fd, "w", encoding="utf-8") as fh:
+        write_json_array(fh, (_payload(generator) for _ in range(size)))
+
+    def run() -> None:
+        result = sync_sap_orders(file_path=path)
+        if result["errors"]:
+            raise RuntimeError(f"sync_sap_orders: {result['errors'][:3]}")
+
+    # Rularea de încălzire creează comenzile, cele măsurate le actualizează
+    return lambda: run
+
+
+@benchmark("validate_delivery", sizes=(10, 100, 500), unit="poziții aviz")
+def bench_validate_delivery(size: int) -> Prepare:
+    from deliveries.models import Delivery, DeliveryItem
+    from deliveries.services import validate_delivery
+
+    order = _order(size)
+    user = _staff_user()
+    order_items = list(order.items.all())
+    deliveries = count(1)
+
+    def prepare() -> Operation:
+        delivery = Delivery.objects.create(
+            delivery_number=f"{PREFIX}-AVZ-{order.pk}-{next(deliveries)}",
+            order=order,
+            partner_id=order.partner_id,
+            delivery_date=order.delivery_date,
+            status="submitted",
+        )
+        items = DeliveryItem.objects.bulk_create(
+            [DeliveryItem(delivery=delivery, order_item=oi, quantity_delivered=Decimal("1")) for oi in order_items]
+        )
+        data = {item.pk: Decimal("1") for item in items}
+        return lambda: validate_delivery(delivery.pk, user, data)
+
+    return prepare
+
+
+@benchmark("calculate_order_completion", sizes=(10, 1000, 10000), unit="poziții")
+def bench_calculate_order_completion(size: int) -> Prepare:
+    from deliveries.services import calculate_order_completion
+
+    order = _order(size)
+    return lambda: lambda: calculate_order_completion(order.pk)
+
+
+@benchmark("order_items_api", sizes=(10, 1000, 10000), unit="poziții")
+def bench_order_items_api(size: int) -> Prepare:
+    order = _order(size)
+    client = Client()
+    client.force_login(_staff_user())
+    url = reverse("orders:order_items_api", args=[order.pk])
+
+    def run() -> None:
+        response = client.get(url)
+        if response.status_code != 200:
+            raise RuntimeError(f"order_items_api: HTTP {response.status_code}")
+
+    return lambda: run
+
+
+@benchmark("order_detail", sizes=(10, 1000, 10000), unit="poziții")
+def bench_order_detail(size: int) -> Prepare:
+    # Pagina de detaliu plus prima pagină de poziții: nu ar trebui să crească cu mărimea comenzii
+    order = _order(size)
+    client = Client()
+    client.force_login(_staff_user())
+    urls = [reverse("orders:order_detail", args=[order.pk]), reverse("orders:order_lines_api", args=[order.pk])]
+
+    def run() -> None:
+        for url in urls:
+            response = client.get(url)
+            if response.status_code != 200:
+                raise RuntimeError(f"order_detail: {url} HTTP {response.status_code}")
+
+    return lambda: run
+
+
+# --- măsurare ---
+
+
+def reset_state() -> None:
+    """Bază goală și cache-uri golite: rezultatul unui scenariu nu depinde de cele rulate înainte."""
+    from orders.services import clear_material_cache
+
+    call_command("flush", interactive=False, verbosity=0)
+    clear_material_cache()
+
+
+def measure(prepare: Prepare, repeat: int) -> Dict[str, Any]:
+    """O rulare de încălzire, una cu numărarea query-urilor, una sub tracemalloc
+    (vârful de memorie), apoi `repeat` rulări cronometrate."""
+    prepare()()
+    queries = 0
+
+    def count_query(execute, sql, params, many, context):  # type: ignore[no-untyped-def]
+        nonlocal queries
+        queries += 1
+        return execute(sql, params, many, context)
+
+    # `execute_wrapper`, nu `CaptureQueriesContext`: jurnalul de query-uri este
+    # golit la începutul fiecărei cereri (`request_started`), deci pierde query-urile view-urilor
+    operation = prepare()
+    with connection.execute_wrapper(count_query):
+        operation()
+
+    operation = prepare()
+    tracemalloc.start()
+    try:
+        operation()
+        _current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    timings: List[float] = []
+    for _ in range(repeat):
+        operation = prepare()
+        started = time.perf_counter()
+        operation()
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return {
+        "runs": repeat,
+        "min_ms": round(timings[0], 3),
+        "median_ms": round(statistics.median(timings), 3),
+        "max_ms": round(timings[-1], 3),
+        "queries": queries,
+        "peak_kib": round(peak / 1024, 1),
+    }
+
+
+# --- istoric și baseline ---
+
+
+def load_json(path: str, default: Any) -> Any:
+    try:
+        with open(path, encoding="utf-8") as fh:
+            return json.load(fh)
+    except FileNotFoundError:
+        return default
+
+
+def save_json(path: str, data: Any) -> None:
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump(data, fh, indent=2, ensure_ascii=False)
+        fh.write("\n")
+    os.replace(tmp, path)
+
+
+def compare(
+    results: Dict[str, Dict[str, Any]],
+    baseline: Dict[str, Dict[str, Any]],
+    threshold: float,
+    min_delta_ms: float,
+) -> List[str]:
+    """Regresiile față de baseline, ca mesaje.
+
+    - timp: mediana crește cu peste `threshold` (fracțiune) și cu cel puțin
+      `min_delta_ms` (zgomotul măsurătorilor foarte scurte)
+    - query-uri: orice creștere (numărul este determinist)
+    - memorie: vârful crește cu peste `threshold` și cu cel puțin 64 KiB
+    """
+    regressions: List[str] = []
+    for key, current in results.items():
+        base = baseline.get(key)
+        if not base:
+            continue
+        median, base_median = current["median_ms"], base["median_ms"]
+        if median > base_median * (1 + threshold) and median - base_median >= min_delta_ms:
+            regressions.append(f"{key}: mediana {base_median:.2f} -> {median:.2f} ms (+{(median / base_median - 1) * 100:.0f}%)")
+        if current["queries"] > base["queries"]:
+            regressions.append(f"{key}: query-uri {base['queries']} -> {current['queries']}")
+        peak, base_peak = current["peak_kib"], base["peak_kib"]
+        if peak > base_peak * (1 + threshold) and peak - base_peak >= 64:
+            regressions.append(f"{key}: memorie {base_peak:.0f} -> {peak:.0f} KiB")
+    return regressions
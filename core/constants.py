@@ -30,3 +30,10 @@ VALIDATION_STATUS_CHOICES: list[tuple[str, str]] = [
 ]
 
 
+
+OUTBOX_STATUS_CHOICES: list[tuple[str, str]] = [
+    ("pending", "În așteptare"),
+    ("sending", "În transmitere"),
+    ("sent", "Trimis"),
+    ("failed", "Eșuat"),
+]
@@ -0,0 +1,124 @@
+"""Citiri pe replica bazei de date (`DATABASES["replica"]`), la cerere.
+
+Nimic nu ajunge implicit pe replică: view-urile se înscriu explicit cu
+`@use_replica` (citirile ORM din view și randarea template-ului), iar
+querysetele consumate după întoarcerea view-ului (exporturile streaming) cu
+`on_replica(qs)`. Scrierile merg mereu pe `default`.
+
+Read-your-writes: după un request care a scris în baza de date,
+`ReplicaPinMiddleware` setează un cookie pentru `REPLICA_PIN_SECONDS`, timp în
+care citirile aceluiași client rămân pe `default` (replica poate fi în urmă).
+La fel în restul request-ului care a scris și în interiorul unei tranzacții.
+
+Sesiunile, utilizatorii și content types se citesc mereu de pe `default`:
+o sesiune creată la login trebuie găsită imediat, indiferent de întârzierea
+replicii.
+"""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models import QuerySet
+
+from .perf import timed
+
+
+REPLICA_DB_ALIAS = "replica"
+
+# Aplicații citite întotdeauna de pe baza principală
+PRIMARY_ONLY_APPS = frozenset({"sessions", "auth", "contenttypes", "admin"})
+
+_replica_reads: ContextVar[bool] = ContextVar("replica_reads", default=False)
+# Starea request-ului curent (setată de `ReplicaPinMiddleware`): pinned / wrote
+_request_state: ContextVar[Optional[Dict[str, bool]]] = ContextVar("replica_request_state", default=None)
+
+
+def replica_configured() -> bool:
+    return REPLICA_DB_ALIAS in settings.DATABASES
+
+
+def read_alias() -> str:
+    """Alias-ul pe care se pot citi acum datele: replica sau, dacă nu e sigur, `default`."""
+    if not replica_configured() or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+        return DEFAULT_DB_ALIAS
+    state = _request_state.get()
+    if state is not None and state["pinned"]:
+        return DEFAULT_DB_ALIAS
+    return REPLICA_DB_ALIAS
+
+
+def on_replica(qs: QuerySet) -> QuerySet:
+    """Fixează queryset-ul pe replică (dacă este permis acum), indiferent când e evaluat."""
+    return qs.using(read_alias())
+
+
+@contextmanager
+def replica_reads() -> Iterator[None]:
+    """Citirile ORM din bloc (fără `using()` explicit) merg pe replică."""
+    token = _replica_reads.set(True)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+def use_replica(view_func: Callable[..., Any]) -> Callable[..., Any]:
+    """Decorator pentru view-uri read-only (funcții sau `method_decorator(..., name="dispatch")`).
+
+    `TemplateResponse` este randat în interiorul blocului, altfel querysetele
+    leneșe evaluate în template (paginare, relații) ar ajunge pe `default`.
+    """
+
+    @wraps(view_func)
+    def _wrapped_view(request, *args, **kwargs):  # type: ignore[no-untyped-def]
+        with replica_reads():
+            response = view_func(request, *args, **kwargs)
+            if hasattr(response, "render") and not getattr(response, "is_rendered", True):
+                with timed("render"):
+                    response.render()
+        return response
+
+    return _wrapped_view
+
+
+@contextmanager
+def track_request(pinned: bool) -> Iterator[Dict[str, bool]]:
+    """Urmărește scrierile din request-ul curent (folosit de `ReplicaPinMiddleware`)."""
+    state = {"pinned": pinned, "wrote": False}
+    token = _request_state.set(state)
+    try:
+        yield state
+    finally:
+        _request_state.reset(token)
+
+
+class ReplicaRouter:
+    """Router Django: replica doar în `replica_reads()`, scrierile întotdeauna pe `default`."""
+
+    def db_for_read(self, model, **hints: Any) -> str:  # type: ignore[no-untyped-def]
+        if _replica_reads.get() and model._meta.app_label not in PRIMARY_ONLY_APPS:
+            return read_alias()
+        # Explicit `default`: un obiect citit de pe replică nu trage după el
+        # și relațiile accesate în afara blocului
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints: Any) -> str:  # type: ignore[no-untyped-def]
+        state = _request_state.get()
+        if state is not None:
+            state["wrote"] = state["pinned"] = True
+        # Explicit `default`, altfel Django ar scrie pe baza din care a fost citit obiectul
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints: Any) -> bool:  # type: ignore[no-untyped-def]
+        # Aceleași date pe ambele alias-uri
+        return {obj1._state.db, obj2._state.db} <= {DEFAULT_DB_ALIAS, REPLICA_DB_ALIAS, None}
+
+    def allow_migrate(self, db: str, app_label: str, **hints: Any) -> Optional[bool]:
+        # Schema replicii vine prin replicare, nu prin `migrate`
+        return False if db == REPLICA_DB_ALIAS else None
@@ -0,0 +1,287 @@
+"""Chei de idempotență: o cerere repetată cu aceeași cheie primește răspunsul deja calculat.
+
+Prima cerere cu o cheie rezervă rândul `IdempotencyKey` (status
+"processing"), execută view-ul și salvează răspunsul (status, Content-Type,
+Location, corp) pentru `IDEMPOTENCY_TTL_SECONDS`; răspunsurile salvate sunt
+ținute și în cache, deci o reîncercare nu mai atinge baza de date. O cerere
+care găsește cheia încă în lucru așteaptă cel mult `wait` secunde, apoi
+primește 409. Aceeași cheie cu alt conținut (amprentă diferită) dă 422.
+
+Răspunsurile pe care `store(response)` le respinge (implicit erorile) și
+excepțiile eliberează cheia, ca reîncercarea să execute din nou view-ul. O
+rezervare rămasă de la un proces oprit expiră după `IDEMPOTENCY_LOCK_SECONDS`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import time
+from contextlib import nullcontext
+from datetime import timedelta
+from functools import wraps
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.http import HttpRequest, HttpResponse
+from django.utils import timezone
+
+from . import metrics
+from .models import IdempotencyKey
+
+
+IDEMPOTENCY_REQUESTS = metrics.counter(
+    "edi_idempotency_requests_total",
+    "Cereri cu cheie de idempotență (new/replayed/in_progress/mismatch)",
+    ["scope", "outcome"],
+)
+
+# Header-ele păstrate din răspunsul original
+_STORED_HEADERS = ("Content-Type", "Location")
+_POLL_SECONDS = 0.05
+
+# (amprentă, status HTTP, header-e, corp)
+Stored = Tuple[str, int, Dict[str, str], bytes]
+ConflictHandler = Callable[[HttpRequest, int], HttpResponse]
+# Ce urmează după rezervare: ("run", id rând) sau ("respond", răspuns)
+Decision = Tuple[str, Any]
+
+
+def fingerprint(*parts: Any) -> str:
+    """Amprenta SHA-256 a conținutului cererii (octeți sau text)."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part if isinstance(part, bytes) else str(part).encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def _normalize(key: str) -> str:
+    # Cheile mai lungi decât coloana sunt înlocuite cu amprenta lor
+    return key if len(key) <= 255 else fingerprint(key)
+
+
+def _cache_key(scope: str, key: str) -> str:
+    return f"idempotency:{scope}:{fingerprint(key)}"
+
+
+def _default_conflict(request: HttpRequest, status: int) -> HttpResponse:
+    response = HttpResponse(status=status)
+    if status == 409:
+        response["Retry-After"] = "1"
+    return response
+
+
+def _replay(scope: str, stored: Stored, request_fingerprint: str, conflict: ConflictHandler, request: HttpRequest) -> HttpResponse:
+    saved_fingerprint, status, headers, body = stored
+    if saved_fingerprint != request_fingerprint:
+        IDEMPOTENCY_REQUESTS.inc(scope=scope, outcome="mismatch")
+        return conflict(request, 422)
+    IDEMPOTENCY_REQUESTS.inc(scope=scope, outcome="replayed")
+    response = HttpResponse(body, status=status)
+    for name, value in headers.items():
+        response[name] = value
+    response["Idempotent-Replayed"] = "true"
+    return response
+
+
+def _reserve(scope: str, key: str, request_fingerprint: str) -> Tuple[Optional[int], Optional[IdempotencyKey]]:
+    """(id-ul rândului rezervat, None) sau (None, rândul existent, neexpirat)."""
+    while True:
+        now = timezone.now()
+        try:
+            with transaction.atomic():
+                row = IdempotencyKey.objects.create(
+                    scope=scope,
+                    key=key,
+                    fingerprint=request_fingerprint,
+                    expires_at=now + timedelta(seconds=settings.IDEMPOTENCY_LOCK_SECONDS),
+                )
+            return row.pk, None
+        except IntegrityError:
+            pass
+        existing = IdempotencyKey.objects.filter(scope=scope, key=key).first()
+        if existing is None:
+            continue  # eliberată între timp
+        if existing.expires_at <= now:
+            IdempotencyKey.objects.filter(pk=existing.pk, expires_at__lte=now).delete()
+            continue
+        return None, existing
+
+
+def _decide(
+    scope: str, key: str, request_fingerprint: str, request: HttpRequest, conflict: ConflictHandler
+) -> Tuple[Decision, bool]:
+    """Decizia și dacă merită reîncercată (cheia e încă în lucru la altă cerere)."""
+    stored = cache.get(_cache_key(scope, key))
+    if stored is not None:
+        return ("respond", _replay(scope, stored, request_fingerprint, conflict, request)), False
+    row_id, existing = _reserve(scope, key, request_fingerprint)
+    if row_id is not None:
+        IDEMPOTENCY_REQUESTS.inc(scope=scope, outcome="new")
+        return ("run", row_id), False
+    assert existing is not None
+    if existing.status == IdempotencyKey.STATUS_COMPLETED:
+        stored = existing.stored()
+        _cache(scope, key, stored, existing.expires_at)
+        return ("respond", _replay(scope, stored, request_fingerprint, conflict, request)), False
+    if existing.fingerprint != request_fingerprint:
+        IDEMPOTENCY_REQUESTS.inc(scope=scope, outcome="mismatch")
+        return ("respond", conflict(request, 422)), False
+    return ("respond", None), True
+
+
+def _cache(scope: str, key: str, stored: Stored, expires_at: Any) -> None:
+    timeout = int((expires_at - timezone.now()).total_seconds())
+    if timeout > 0:
+        cache.set(_cache_key(scope, key), stored, timeout)
+
+
+def _in_progress(scope: str, request: HttpRequest, conflict: ConflictHandler) -> HttpResponse:
+    IDEMPOTENCY_REQUESTS.inc(scope=scope, outcome="in_progress")
+    return conflict(request, 409)
+
+
+def _complete(scope: str, key: str, row_id: int, request_fingerprint: str, response: HttpResponse) -> None:
+    if hasattr(response, "render") and not response.is_rendered:
+        response.render()
+    headers = {name: response[name] for name in _STORED_HEADERS if response.has_header(name)}
+    expires_at = timezone.now() + timedelta(seconds=settings.IDEMPOTENCY_TTL_SECONDS)
+    IdempotencyKey.objects.filter(pk=row_id).update(
+        status=IdempotencyKey.STATUS_COMPLETED,
+        response_status=response.status_code,
+        response_headers=headers,
+        response_body=response.content,
+        expires_at=expires_at,
+        updated_at=timezone.now(),
+    )
+    transaction.on_commit(
+        lambda: _cache(scope, key, (request_fingerprint, response.status_code, headers, response.content), expires_at)
+    )
+
+
+def _release(row_id: int) -> None:
+    IdempotencyKey.objects.filter(pk=row_id).delete()
+
+
+def _run(
+    view_func: Callable[..., HttpResponse],
+    scope: str,
+    key: str,
+    row_id: int,
+    request_fingerprint: str,
+    store: Callable[[HttpResponse], bool],
+    atomic: bool,
+    request: HttpRequest,
+    args: Any,
+    kwargs: Any,
+) -> HttpResponse:
+    try:
+        with transaction.atomic() if atomic else nullcontext():
+            response = view_func(request, *args, **kwargs)
+            stored = store(response) and not response.streaming
+            if stored:
+                # Cu `atomic`, răspunsul se salvează în aceeași tranzacție cu efectele view-ului
+                _complete(scope, key, row_id, request_fingerprint, response)
+    except BaseException:
+        _release(row_id)
+        raise
+    if not stored:
+        _release(row_id)
+    return response
+
+
+def idempotent(
+    scope: str,
+    key: Callable[[HttpRequest], Optional[str]],
+    request_fingerprint: Callable[[HttpRequest], str],
+    store: Callable[[HttpResponse], bool] = lambda response: response.status_code < 400,
+    wait: float = 0.0,
+    atomic: bool = False,
+    conflict: ConflictHandler = _default_conflict,
+) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Decorator de view (sync sau async): cererile cu aceeași cheie execută view-ul o singură dată.
+
+    `key(request)` dă cheia (None = cerere fără idempotență),
+    `request_fingerprint(request)` amprenta conținutului. Cu `atomic=True`
+    (doar view-uri sync) view-ul și salvarea răspunsului sunt în aceeași
+    tranzacție, deci o cerere întreruptă nu lasă efecte fără răspuns salvat. `conflict(request,
+    status)` construiește răspunsurile 409 (cheie în lucru după `wait`
+    secunde) și 422 (cheie refolosită cu alt conținut).
+    """
+
+    def decorator(view_func: Callable[..., Any]) -> Callable[..., Any]:
+        if iscoroutinefunction(view_func):
+            if atomic:
+                raise TypeError("idempotent(atomic=True) nu este suportat pentru view-uri async")
+
+            @wraps(view_func)
+            async def async_view(request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponse:
+                idempotency_key = key(request)
+                if not idempotency_key:
+                    return await view_func(request, *args, **kwargs)
+                idempotency_key = _normalize(idempotency_key)
+                current = await sync_to_async(request_fingerprint)(request)
+                deadline = time.monotonic() + wait
+                while True:
+                    (action, value), busy = await sync_to_async(_decide)(
+                        scope, idempotency_key, current, request, conflict
+                    )
+                    if not busy:
+                        break
+                    if time.monotonic() >= deadline:
+                        return _in_progress(scope, request, conflict)
+                    await asyncio.sleep(_POLL_SECONDS)
+                if action == "respond":
+                    return value
+                try:
+                    response = await view_func(request, *args, **kwargs)
+                    stored = store(response) and not response.streaming
+                    if stored:
+                        await sync_to_async(_complete)(scope, idempotency_key, value, current, response)
+                except BaseException:
+                    await sync_to_async(_release)(value)
+                    raise
+                if not stored:
+                    await sync_to_async(_release)(value)
+                return response
+
+            return async_view
+
+        @wraps(view_func)
+        def view(request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponse:
+            idempotency_key = key(request)
+            if not idempotency_key:
+                return view_func(request, *args, **kwargs)
+            idempotency_key = _normalize(idempotency_key)
+            current = request_fingerprint(request)
+            deadline = time.monotonic() + wait
+            while True:
+                (action, value), busy = _decide(scope, idempotency_key, current, request, conflict)
+                if not busy:
+                    break
+                if time.monotonic() >= deadline:
+                    return _in_progress(scope, request, conflict)
+                time.sleep(_POLL_SECONDS)
+            if action == "respond":
+                return value
+            return _run(view_func, scope, idempotency_key, value, current, store, atomic, request, args, kwargs)
+
+        return view
+
+    return decorator
+
+
+def purge_expired(batch_size: int = 1000) -> int:
+    """Șterge cheile expirate, în loturi; întoarce numărul de rânduri șterse."""
+    deleted = 0
+    while True:
+        ids = list(
+            IdempotencyKey.objects.filter(expires_at__lte=timezone.now()).values_list("pk", flat=True)[:batch_size]
+        )
+        if not ids:
+            return deleted
+        deleted += IdempotencyKey.objects.filter(pk__in=ids).delete()[0]
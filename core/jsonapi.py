@@ -0,0 +1,210 @@
+"""Stratul JSON al endpoint-urilor API: serializare rapidă, corpuri gzip, răspunsuri comprimate.
+
+- `dumps`/`loads` folosesc orjson dacă este instalat (`JSON_BACKEND="auto"`),
+  altfel modulul `json` din stdlib; ambele dau același JSON compact
+- `Decimal` este serializat exact, ca șir (`"12.500"`), la fel ca
+  `DjangoJSONEncoder`: cantitățile nu trec prin float
+- `read_body`/`body_stream` acceptă corpuri `Content-Encoding: gzip` (SAP),
+  cu limita `DATA_UPLOAD_MAX_MEMORY_SIZE` aplicată conținutului decomprimat;
+  `spool_body` copiază corpul brut pe disc (peste prag) calculând amprenta
+- `compress_response` comprimă răspunsul view-ului cu brotli (dacă pachetul
+  `Brotli` este instalat) sau gzip, după `Accept-Encoding`
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import tempfile
+import zlib
+from decimal import Decimal
+from functools import lru_cache, wraps
+from typing import IO, Any, Callable, Optional, Tuple
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.core.exceptions import RequestDataTooBig
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpRequest, HttpResponse
+from django.utils.cache import patch_vary_headers
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - dependența este opțională
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - dependența este opțională
+    brotli = None
+
+
+class UnsupportedContentEncoding(Exception):
+    """`Content-Encoding` al cererii nu este suportat (răspuns 415)."""
+
+
+class BodyDecodingError(ValueError):
+    """Corpul cererii nu poate fi decomprimat (gzip corupt sau trunchiat)."""
+
+
+# --- serializare ---
+
+_django_encoder = DjangoJSONEncoder()
+
+
+def _default(obj: Any) -> Any:
+    # orjson nu cunoaște Decimal; restul tipurilor (lazy strings, timedelta) ca în Django
+    if isinstance(obj, Decimal):
+        return str(obj)
+    return _django_encoder.default(obj)
+
+
+@lru_cache(maxsize=None)
+def active_backend() -> str:
+    """Implementarea folosită: "orjson" sau "stdlib" (după `JSON_BACKEND`)."""
+    choice = getattr(settings, "JSON_BACKEND", "auto")
+    if choice == "orjson" and orjson is None:
+        raise ImportError("JSON_BACKEND=orjson, dar pachetul orjson nu este instalat")
+    if choice == "stdlib" or orjson is None:
+        return "stdlib"
+    return "orjson"
+
+
+def dumps(obj: Any, backend: Optional[str] = None) -> bytes:
+    """JSON compact, UTF-8 (fără escape pentru diacritice); `backend` forțează implementarea."""
+    if (backend or active_backend()) == "orjson":
+        return orjson.dumps(obj, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, cls=DjangoJSONEncoder, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def loads(data: bytes, backend: Optional[str] = None) -> Any:
+    """Parsează un document JSON UTF-8; erorile sunt `ValueError` (inclusiv octeți non-UTF-8)."""
+    if (backend or active_backend()) == "orjson":
+        return orjson.loads(data)
+    return json.loads(data.decode("utf-8"))
+
+
+class FastJsonResponse(HttpResponse):
+    """Ca `JsonResponse`, dar serializat cu `dumps` și fără restricția la dict."""
+
+    def __init__(self, data: Any, **kwargs: Any) -> None:
+        kwargs.setdefault("content_type", "application/json")
+        super().__init__(content=dumps(data), **kwargs)
+
+
+# --- corpul cererii ---
+
+
+class _GzipBody:
+    """Citire incrementală din corpul gzip; erorile de format devin `BodyDecodingError`."""
+
+    def __init__(self, source: IO[bytes]) -> None:
+        self._file = gzip.GzipFile(fileobj=source, mode="rb")
+
+    def read(self, size: int = -1) -> bytes:
+        try:
+            return self._file.read(size)
+        except (OSError, EOFError, zlib.error) as exc:
+            raise BodyDecodingError(f"Corp gzip invalid: {exc}") from None
+
+
+def body_stream(request: HttpRequest, source: IO[bytes] | None = None) -> IO[bytes]:
+    """Corpul cererii ca flux de octeți, decomprimat dacă are `Content-Encoding: gzip`.
+
+    `source` înlocuiește corpul citit din cerere (ex. copia făcută de `spool_body`).
+    """
+    raw = request if source is None else source
+    encoding = request.headers.get("Content-Encoding", "").strip().lower()
+    if encoding in ("", "identity"):
+        return raw  # type: ignore[return-value]
+    if encoding in ("gzip", "x-gzip"):
+        return _GzipBody(raw)  # type: ignore[return-value]
+    raise UnsupportedContentEncoding(encoding)
+
+
+def spool_body(request: HttpRequest, chunk_size: int = 64 * 1024) -> Tuple[IO[bytes], str]:
+    """Copia corpului brut (în memorie până la `FILE_UPLOAD_MAX_MEMORY_SIZE`, apoi pe disc) și SHA-256-ul lui.
+
+    Corpul este citit o singură dată, pe bucăți: amprenta acoperă tot conținutul
+    fără a-l ține în memorie, iar copia este apoi parsată incremental.
+    """
+    spooled = tempfile.SpooledTemporaryFile(max_size=settings.FILE_UPLOAD_MAX_MEMORY_SIZE)
+    digest = hashlib.sha256()
+    while chunk := request.read(chunk_size):
+        digest.update(chunk)
+        spooled.write(chunk)
+    spooled.seek(0)
+    return spooled, digest.hexdigest()  # type: ignore[return-value]
+
+
+def read_body(request: HttpRequest) -> bytes:
+    """Corpul complet al cererii (decomprimat), limitat la `DATA_UPLOAD_MAX_MEMORY_SIZE`."""
+    stream = body_stream(request)
+    if stream is request:
+        return request.body
+    limit = settings.DATA_UPLOAD_MAX_MEMORY_SIZE
+    if limit is None:
+        return stream.read()
+    data = stream.read(limit + 1)
+    if len(data) > limit:
+        raise RequestDataTooBig("Corpul decomprimat depășește DATA_UPLOAD_MAX_MEMORY_SIZE.")
+    return data
+
+
+# --- compresia răspunsului ---
+
+
+def _accepted_encodings(header: str) -> set:
+    accepted = set()
+    for part in header.split(","):
+        token, _sep, params = part.partition(";")
+        q = params.strip()
+        if q.startswith("q="):
+            try:
+                if float(q[2:]) <= 0:
+                    continue
+            except ValueError:
+                continue
+        accepted.add(token.strip().lower())
+    return accepted
+
+
+def compress(content: bytes, accept_encoding: str) -> Tuple[bytes, str]:
+    """(conținut comprimat, codare) după `Accept-Encoding`; codarea "" = necomprimat."""
+    accepted = _accepted_encodings(accept_encoding)
+    if brotli is not None and "br" in accepted:
+        return brotli.compress(content, quality=settings.JSON_BROTLI_QUALITY), "br"
+    if "gzip" in accepted:
+        return gzip.compress(content, compresslevel=settings.JSON_GZIP_LEVEL, mtime=0), "gzip"
+    return content, ""
+
+
+def _compress_response(request: HttpRequest, response: HttpResponse) -> HttpResponse:
+    if response.streaming or response.has_header("Content-Encoding"):
+        return response
+    patch_vary_headers(response, ("Accept-Encoding",))
+    if len(response.content) < settings.JSON_COMPRESS_MIN_BYTES:
+        return response
+    content, encoding = compress(response.content, request.headers.get("Accept-Encoding", ""))
+    if not encoding or len(content) >= len(response.content):
+        return response
+    response.content = content
+    response["Content-Length"] = str(len(content))
+    response["Content-Encoding"] = encoding
+    return response
+
+
+def compress_response(view_func: Callable) -> Callable:  # type: ignore[type-arg]
+    """Decorator: răspunsurile peste `JSON_COMPRESS_MIN_BYTES` sunt comprimate (view sync sau async)."""
+    if iscoroutinefunction(view_func):
+
+        async def _async_view(request, *args, **kwargs):  # type: ignore[no-untyped-def]
+            return _compress_response(request, await view_func(request, *args, **kwargs))
+
+        return wraps(view_func)(_async_view)
+
+    def _view(request, *args, **kwargs):  # type: ignore[no-untyped-def]
+        return _compress_response(request, view_func(request, *args, **kwargs))
+
+    return wraps(view_func)(_view)
@@ -0,0 +1,351 @@
+"""Generator de trafic pentru un server local: parteneri, validări staff și webhook SAP.
+
+Fiecare utilizator virtual este un thread cu propria sesiune HTTP (cookie-uri,
+keep-alive) care alege acțiuni după ponderile din `mix`, cu o pauză aleatoare
+între ele. Acțiunile trec prin rutele reale, cu CSRF și formulare, deci includ
+tot lanțul de middleware; latența fiecărei cereri este înregistrată pe
+endpoint. Datele (parteneri, comenzi, avize de validat) sunt cele create de
+`seed_benchmark_data` și sunt descoperite de comanda `load_test`.
+"""
+
+from __future__ import annotations
+
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import date
+from itertools import count
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Tuple
+
+import requests
+
+from .benchdata import OrderGenerator, to_sap_payload
+
+
+ACTIONS = ("partner_login", "dashboard", "order_items_api", "delivery_create", "delivery_validate", "webhook")
+
+DEFAULT_MIX = "partner_login=5,dashboard=30,order_items_api=30,delivery_create=10,delivery_validate=10,webhook=15"
+
+_CSRF_RE = re.compile(r'name="csrfmiddlewaretoken" value="([^"]+)"')
+_IDEMPOTENCY_RE = re.compile(r'name="idempotency_key" value="([^"]+)"')
+_ACCEPTED_INPUT_RE = re.compile(r'<input[^>]*name="item_(\d+)_quantity_accepted"[^>]*>')
+_VALUE_RE = re.compile(r'value="([^"]*)"')
+_DELIVERY_URL_RE = re.compile(r"/deliveries/(\d+)/")
+
+
+def parse_mix(text: str) -> Dict[str, float]:
+    """`"dashboard=30,webhook=10"` -> ponderi; acțiunile nemenționate au ponderea 0."""
+    mix: Dict[str, float] = {}
+    for part in filter(None, (p.strip() for p in text.split(","))):
+        name, _sep, weight = part.partition("=")
+        name = name.strip()
+        if name not in ACTIONS:
+            raise ValueError(f"Acțiune necunoscută: {name} (acceptate: {', '.join(ACTIONS)})")
+        try:
+            mix[name] = float(weight) if weight else 1.0
+        except ValueError:
+            raise ValueError(f"Pondere invalidă pentru {name}: {weight}") from None
+    if not any(w > 0 for w in mix.values()):
+        raise ValueError("Mix-ul nu conține nicio acțiune cu pondere pozitivă")
+    return mix
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+@dataclass
+class LoadTestData:
+    """Ce trebuie să știe utilizatorii virtuali despre datele din bază."""
+
+    partners: List[str]
+    # Comenzile deschise ale fiecărui partener (cod -> id-uri)
+    orders: Dict[str, List[int]]
+    # Avize trimise, de validat; avizele create în test sunt adăugate la coadă
+    deliveries: Deque[int]
+    staff_username: str
+    staff_password: str
+    api_key: str
+    prefix: str
+    first_order_number: int
+    partners_total: int
+    materials_total: int
+
+
+@dataclass
+class EndpointStats:
+    latencies: List[float] = field(default_factory=list)
+    errors: Dict[str, int] = field(default_factory=dict)
+
+
+class Recorder:
+    """Latențe și erori per endpoint, partajate între thread-uri."""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.endpoints: Dict[str, EndpointStats] = {}
+        self.skipped: Dict[str, int] = {}
+
+    def record(self, endpoint: str, seconds: float, error: Optional[str] = None) -> None:
+        with self.lock:
+            stats = self.endpoints.setdefault(endpoint, EndpointStats())
+            stats.latencies.append(seconds)
+            if error:
+                stats.errors[error] = stats.errors.get(error, 0) + 1
+
+    def skip(self, action: str) -> None:
+        with self.lock:
+            self.skipped[action] = self.skipped.get(action, 0) + 1
+
+    def summary(self, duration: float) -> Dict[str, Dict[str, Any]]:
+        rows: Dict[str, Dict[str, Any]] = {}
+        for endpoint, stats in sorted(self.endpoints.items()):
+            latencies = stats.latencies
+            rows[endpoint] = {
+                "requests": len(latencies),
+                "errors": sum(stats.errors.values()),
+                "error_kinds": dict(stats.errors),
+                "rps": round(len(latencies) / duration, 2) if duration else 0.0,
+                "p50_ms": round(percentile(latencies, 50) * 1000, 1),
+                "p95_ms": round(percentile(latencies, 95) * 1000, 1),
+                "p99_ms": round(percentile(latencies, 99) * 1000, 1),
+                "max_ms": round(max(latencies, default=0.0) * 1000, 1),
+            }
+        return rows
+
+
+class VirtualUser(threading.Thread):
+    def __init__(
+        self,
+        index: int,
+        base_url: str,
+        data: LoadTestData,
+        mix: Dict[str, float],
+        recorder: Recorder,
+        order_numbers: Iterator[int],
+        start_at: float,
+        deadline: float,
+        think: float,
+        burst: int,
+        timeout: float,
+    ) -> None:
+        super().__init__(name=f"vu-{index}", daemon=True)
+        self.base_url = base_url.rstrip("/")
+        self.data = data
+        self.recorder = recorder
+        self.order_numbers = order_numbers
+        self.start_at = start_at
+        self.deadline = deadline
+        self.think = think
+        self.burst = burst
+        self.timeout = timeout
+        self.rng = random.Random(index)
+        self.actions = [a for a in mix if mix[a] > 0]
+        self.weights = [mix[a] for a in self.actions]
+        self.partner_code = data.partners[index % len(data.partners)]
+        self.partner: Optional[requests.Session] = None
+        self.staff: Optional[requests.Session] = None
+        self.generator = OrderGenerator(
+            seed=index, partners=data.partners_total, materials=data.materials_total, lines_mean=10, lines_max=200
+        )
+        self.api = self._session()
+
+    # --- HTTP ---
+
+    @staticmethod
+    def _session() -> requests.Session:
+        session = requests.Session()
+        session.trust_env = False  # fără proxy-uri din mediu pentru serverul local
+        return session
+
+    def _request(
+        self, session: requests.Session, endpoint: str, method: str, path: str, ok: Tuple[int, ...] = (200,), **kwargs: Any
+    ) -> Optional[requests.Response]:
+        started = time.perf_counter()
+        try:
+            response = session.request(
+                method, self.base_url + path, timeout=self.timeout, allow_redirects=False, **kwargs
+            )
+        except requests.RequestException as exc:
+            self.recorder.record(endpoint, time.perf_counter() - started, type(exc).__name__)
+            return None
+        elapsed = time.perf_counter() - started
+        self.recorder.record(endpoint, elapsed, None if response.status_code in ok else f"HTTP {response.status_code}")
+        return response if response.status_code in ok else None
+
+    def _form(self, session: requests.Session, endpoint: str, path: str) -> Optional[Tuple[str, str]]:
+        """GET pe formular: (HTML, token CSRF)."""
+        response = self._request(session, endpoint, "GET", path)
+        if response is None:
+            return None
+        match = _CSRF_RE.search(response.text)
+        if not match:
+            self.recorder.skip(f"{endpoint} (fără token CSRF)")
+            return None
+        return response.text, match.group(1)
+
+    def _post_form(
+        self, session: requests.Session, endpoint: str, path: str, token: str, fields: Dict[str, Any]
+    ) -> Optional[requests.Response]:
+        return self._request(
+            session,
+            endpoint,
+            "POST",
+            path,
+            ok=(302,),
+            data={"csrfmiddlewaretoken": token, **fields},
+            headers={"Referer": self.base_url + path},
+        )
+
+    # --- sesiuni ---
+
+    def _partner_session(self) -> Optional[requests.Session]:
+        if self.partner is None:
+            self.action_partner_login()
+        return self.partner
+
+    def _staff_session(self) -> Optional[requests.Session]:
+        if self.staff is None:
+            session = self._session()
+            form = self._form(session, "staff_login_form", "/admin/login/")
+            if form is None:
+                return None
+            fields = {"username": self.data.staff_username, "password": self.data.staff_password, "next": "/admin/"}
+            if self._post_form(session, "staff_login", "/admin/login/", form[1], fields) is not None:
+                self.staff = session
+        return self.staff
+
+    # --- acțiuni ---
+
+    def action_partner_login(self) -> None:
+        """Autentificare nouă (sesiune nouă), ca un partener care tocmai a deschis portalul."""
+        session = self._session()
+        form = self._form(session, "partner_login_form", "/partners/login/")
+        if form is None:
+            return
+        if self._post_form(session, "partner_login", "/partners/login/", form[1], {"partner_code": self.partner_code}):
+            self.partner = session
+
+    def action_dashboard(self) -> None:
+        session = self._partner_session()
+        if session is not None:
+            self._request(session, "dashboard", "GET", "/partners/dashboard/")
+
+    def _order_id(self) -> Optional[int]:
+        orders = self.data.orders.get(self.partner_code)
+        return self.rng.choice(orders) if orders else None
+
+    def action_order_items_api(self) -> None:
+        session = self._partner_session()
+        order_id = self._order_id()
+        if session is None or order_id is None:
+            self.recorder.skip("order_items_api")
+            return
+        self._request(session, "order_items_api", "GET", f"/orders/{order_id}/items-api/")
+
+    def action_delivery_create(self) -> None:
+        session = self._partner_session()
+        order_id = self._order_id()
+        if session is None or order_id is None:
+            self.recorder.skip("delivery_create")
+            return
+        form = self._form(session, "delivery_create_form", f"/deliveries/create/?order={order_id}")
+        if form is None:
+            return
+        # Fără rânduri în formset: view-ul preia cantitățile rămase din comandă
+        fields = {"order": order_id, "delivery_date": date.today().isoformat(), "notes": "load test"}
+        token = _IDEMPOTENCY_RE.search(form[0])
+        if token:
+            fields["idempotency_key"] = token.group(1)
+        response = self._post_form(session, "delivery_create", "/deliveries/create/", form[1], fields)
+        match = _DELIVERY_URL_RE.search(response.headers.get("Location", "")) if response is not None else None
+        if match:
+            self.data.deliveries.append(int(match.group(1)))
+
+    def action_delivery_validate(self) -> None:
+        session = self._staff_session()
+        try:
+            delivery_id = self.data.deliveries.popleft()
+        except IndexError:
+            self.recorder.skip("delivery_validate")
+            return
+        if session is None:
+            return
+        path = f"/deliveries/{delivery_id}/validate/"
+        form = self._form(session, "delivery_validate_form", path)
+        if form is None:
+            return
+        html, token = form
+        fields: Dict[str, Any] = {"validation_notes": "load test"}
+        for tag in _ACCEPTED_INPUT_RE.finditer(html):
+            value = _VALUE_RE.search(tag.group(0))
+            fields[f"item_{tag.group(1)}_quantity_accepted"] = value.group(1) if value else "0"
+        self._post_form(session, "delivery_validate", path, token, fields)
+
+    def action_webhook(self) -> None:
+        orders = [
+            to_sap_payload(self.generator.order(next(self.order_numbers)), self.data.prefix) for _ in range(self.burst)
+        ]
+        self._request(
+            self.api,
+            "webhook",
+            "POST",
+            "/orders/api/sap/webhook/",
+            json=orders,
+            headers={"X-API-KEY": self.data.api_key},
+        )
+
+    def run(self) -> None:
+        time.sleep(max(0.0, self.start_at - time.time()))
+        actions: Dict[str, Callable[[], None]] = {name: getattr(self, f"action_{name}") for name in self.actions}
+        while time.time() < self.deadline:
+            actions[self.rng.choices(self.actions, self.weights)[0]]()
+            if self.think:
+                time.sleep(self.rng.uniform(0, 2 * self.think))
+
+
+def run_load_test(
+    base_url: str,
+    data: LoadTestData,
+    mix: Dict[str, float],
+    users: int,
+    duration: float,
+    ramp_up: float = 0.0,
+    think: float = 0.1,
+    burst: int = 20,
+    timeout: float = 30.0,
+) -> Tuple[Recorder, float]:
+    """Pornește `users` utilizatori virtuali (eșalonat pe `ramp_up` secunde) și așteaptă terminarea.
+
+    Întoarce înregistrările și durata efectivă.
+    """
+    recorder = Recorder()
+    order_numbers = count(data.first_order_number)
+    started = time.time()
+    deadline = started + ramp_up + duration
+    threads = [
+        VirtualUser(
+            i,
+            base_url,
+            data,
+            mix,
+            recorder,
+            order_numbers,
+            start_at=started + (ramp_up * i / users if users else 0.0),
+            deadline=deadline,
+            think=think,
+            burst=burst,
+            timeout=timeout,
+        )
+        for i in range(users)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return recorder, time.time() - started
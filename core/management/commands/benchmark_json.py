@@ -0,0 +1,132 @@
+"""Micro-benchmark pentru stratul JSON al API-ului (`core.jsonapi`), pe comenzi mari.
+
+Pentru fiecare dimensiune de comandă (număr de poziții) măsoară:
+
+- răspunsul `order_items_api`: vechea cale (float per poziție + `JsonResponse`)
+  față de `dumps` cu stdlib și cu orjson (Decimal exact)
+- corpul webhook-ului SAP (aceeași comandă): parsare stdlib față de orjson,
+  inclusiv decomprimarea unui corp trimis cu `Content-Encoding: gzip`
+- dimensiunea și timpul de compresie gzip / brotli ale răspunsului
+
+Timpii sunt minimul din `--repeat` rulări; nu este nevoie de bază de date.
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import time
+from datetime import date
+from decimal import Decimal
+from typing import Any, Callable, Dict, List
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.core.serializers.json import DjangoJSONEncoder
+
+from core import jsonapi
+from core.benchdata import SyntheticLine, SyntheticOrder, material_code, to_sap_payload
+
+
+def _best(func: Callable[[], Any], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best * 1000
+
+
+def _items_payload(lines: int) -> Dict[str, List[Dict[str, Any]]]:
+    """Răspunsul `order_items_api` pentru o comandă cu `lines` poziții."""
+    return {
+        "items": [
+            {
+                "id": 1_000_000 + i,
+                "material_code": material_code("BENCH", i),
+                "material_description": f"Material {i} – țeavă oțel zincat",
+                "remaining": (Decimal(i % 997) + Decimal("0.125")).quantize(Decimal("0.001")),
+            }
+            for i in range(lines)
+        ]
+    }
+
+
+class Command(BaseCommand):
+    help = "Serializare JSON (stdlib vs orjson) și compresie gzip/brotli pe comenzi mari."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--lines", default="100,1000,5000,10000", help="Dimensiunile comenzilor (poziții), separate prin virgulă"
+        )
+        parser.add_argument("--repeat", type=int, default=20, help="Rulări per măsurătoare (se raportează minimul)")
+
+    def handle(self, *args, **options):  # type: ignore[no-untyped-def]
+        try:
+            sizes = [int(part) for part in options["lines"].split(",") if part.strip()]
+        except ValueError:
+            raise CommandError(f"--lines invalid: {options['lines']}")
+        repeat = options["repeat"]
+        backends = ["stdlib"] + (["orjson"] if jsonapi.orjson is not None else [])
+        self.stdout.write(
+            f"Backend activ: {jsonapi.active_backend()}; brotli "
+            f"{'instalat' if jsonapi.brotli is not None else 'lipsă'}; timpi în ms (minim din {repeat})"
+        )
+
+        self.stdout.write("\nRăspuns order_items_api (codare):")
+        self.stdout.write(f"{'poziții':>8} {'KiB':>8} {'float+JsonResponse':>19} " + " ".join(f"{b:>9}" for b in backends))
+        for lines in sizes:
+            payload = _items_payload(lines)
+
+            def legacy() -> bytes:
+                rows = [{**row, "remaining": float(row["remaining"])} for row in payload["items"]]
+                return json.dumps({"items": rows}, cls=DjangoJSONEncoder).encode("utf-8")
+
+            size = len(jsonapi.dumps(payload, backend="stdlib")) / 1024
+            timings = [_best(lambda b=b: jsonapi.dumps(payload, backend=b), repeat) for b in backends]
+            self.stdout.write(
+                f"{lines:>8} {size:>8.1f} {_best(legacy, repeat):>19.2f} " + " ".join(f"{t:>9.2f}" for t in timings)
+            )
+
+        self.stdout.write("\nCorp webhook SAP (parsare; gzip = decomprimare + parsare):")
+        self.stdout.write(
+            f"{'poziții':>8} {'KiB':>8} {'KiB gzip':>9} "
+            + " ".join(f"{b:>9} {b + '+gz':>10}" for b in backends)
+        )
+        for lines in sizes:
+            today = date.today()
+            order = SyntheticOrder(
+                number=0,
+                partner=0,
+                order_date=today,
+                delivery_date=today,
+                lines=[
+                    SyntheticLine((i + 1) * 10, i, Decimal("12.500"), "BUC", Decimal("99.90"), today)
+                    for i in range(lines)
+                ],
+            )
+            body = jsonapi.dumps([to_sap_payload(order, "BENCH")], backend="stdlib")
+            compressed = gzip.compress(body, mtime=0)
+            cells = []
+            for b in backends:
+                cells.append(f"{_best(lambda b=b: jsonapi.loads(body, backend=b), repeat):>9.2f}")
+                cells.append(
+                    f"{_best(lambda b=b: jsonapi.loads(gzip.decompress(compressed), backend=b), repeat):>10.2f}"
+                )
+            self.stdout.write(f"{lines:>8} {len(body) / 1024:>8.1f} {len(compressed) / 1024:>9.1f} " + " ".join(cells))
+
+        self.stdout.write(
+            f"\nCompresia răspunsului order_items_api (gzip nivel {settings.JSON_GZIP_LEVEL}"
+            + (f", brotli calitate {settings.JSON_BROTLI_QUALITY}" if jsonapi.brotli is not None else "")
+            + "):"
+        )
+        encodings = ["gzip"] + (["br"] if jsonapi.brotli is not None else [])
+        self.stdout.write(f"{'poziții':>8} {'KiB':>8} " + " ".join(f"{e + ' KiB':>9} {e + ' ms':>8}" for e in encodings))
+        for lines in sizes:
+            content = jsonapi.dumps(_items_payload(lines))
+            cells = []
+            for encoding in encodings:
+                compressed, _used = jsonapi.compress(content, encoding)
+                ms = _best(lambda e=encoding: jsonapi.compress(content, e), repeat)
+                cells.append(f"{len(compressed) / 1024:>9.1f} {ms:>8.2f}")
+            self.stdout.write(f"{lines:>8} {len(content) / 1024:>8.1f} " + " ".join(cells))
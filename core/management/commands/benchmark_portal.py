@@ -0,0 +1,139 @@
+"""Benchmark pentru paginile portalului de parteneri, pe fiecare strategie de sesiune.
+
+Pentru fiecare motor de sesiune (`--strategies`) un partener se autentifică,
+apoi parcurge în buclă dashboard-ul, lista de comenzi, detaliul unei comenzi și
+API-ul de poziții, cu test client-ul Django (fără rețea). Raportează
+cererile/secundă și, per cerere, query-urile totale și cele pe `django_session`
+(citiri și scrieri). Datele sunt create într-o bază de test separată, ca la
+`run_benchmarks`; limitarea ratei este oprită pe durata măsurătorii.
+"""
+
+from __future__ import annotations
+
+import os
+import tempfile
+import time
+from typing import Any, Callable, Dict, List
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import connection
+from django.test import Client
+from django.test.utils import override_settings, setup_databases, teardown_databases
+from django.urls import reverse
+
+from core.benchdata import OrderGenerator, partner_code, to_sap_payload
+
+
+PREFIX = "PORTAL"
+STRATEGIES = ("db", "cached_db", "cache", "signed_cookies")
+
+
+class _QueryCounter:
+    """`execute_wrapper` care numără query-urile, separat cele pe tabela de sesiuni."""
+
+    def __init__(self) -> None:
+        self.total = self.session_reads = self.session_writes = 0
+
+    def __call__(self, execute: Callable[..., Any], sql: str, params: Any, many: bool, context: Any) -> Any:
+        self.total += 1
+        if "django_session" in sql:
+            if sql.lstrip().upper().startswith("SELECT"):
+                self.session_reads += 1
+            else:
+                self.session_writes += 1
+        return execute(sql, params, many, context)
+
+
+class Command(BaseCommand):
+    help = "Cereri/secundă și query-uri de sesiune pe paginile portalului, per strategie de sesiune."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--strategies", default="db,cached_db,signed_cookies", help=f"Separate prin virgulă ({', '.join(STRATEGIES)})"
+        )
+        parser.add_argument("--requests", type=int, default=2000, help="Cereri măsurate per strategie")
+        parser.add_argument("--orders", type=int, default=50, help="Comenzi create pentru partener")
+        parser.add_argument("--lines", type=int, default=20, help="Poziții per comandă")
+
+    def handle(self, *args, **options):  # type: ignore[no-untyped-def]
+        strategies = [s.strip() for s in options["strategies"].split(",") if s.strip()]
+        unknown = [s for s in strategies if s not in STRATEGIES]
+        if unknown:
+            raise CommandError(f"Strategii necunoscute: {', '.join(unknown)}")
+
+        with tempfile.TemporaryDirectory() as tmp:
+            if connection.vendor == "sqlite":
+                connection.settings_dict["TEST"]["NAME"] = os.path.join(tmp, "portal.sqlite3")
+            with override_settings(
+                DEBUG=False,
+                PERF_SERVER_TIMING=False,
+                RATELIMIT_ENABLED=False,
+                ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"],
+            ):
+                old_config = setup_databases(verbosity=0, interactive=False, aliases={"default"})
+                try:
+                    code, order_id = self._seed(options["orders"], options["lines"])
+                    urls = [
+                        reverse("partners:dashboard"),
+                        reverse("partners:order_list"),
+                        reverse("partners:order_detail", args=[order_id]),
+                        reverse("orders:order_items_api", args=[order_id]),
+                    ]
+                    results = [self._measure(s, code, urls, options["requests"]) for s in strategies]
+                finally:
+                    teardown_databases(old_config, verbosity=0)
+
+        self.stdout.write(
+            f"{'strategie':<16}{'cereri/s':>10}{'ms/cerere':>11}{'query/cerere':>14}"
+            f"{'citiri sesiune':>16}{'scrieri sesiune':>17}"
+        )
+        for row in results:
+            self.stdout.write(
+                f"{row['strategy']:<16}{row['rps']:>10.0f}{row['ms']:>11.2f}{row['queries']:>14.2f}"
+                f"{row['session_reads']:>16.2f}{row['session_writes']:>17.2f}"
+            )
+
+    def _seed(self, orders: int, lines: int) -> tuple[str, int]:
+        from orders.services import import_sap_order
+        from partners.models import Partner
+
+        partner = Partner.objects.create(partner_code=partner_code(PREFIX, 0), name="Partener benchmark portal")
+        generator = OrderGenerator(
+            seed=7, partners=1, materials=max(lines, 100), distribution="fixed", lines_mean=lines, lines_max=lines
+        )
+        order = None
+        for n in range(1, orders + 1):
+            order = import_sap_order(to_sap_payload(generator.order(n), PREFIX))
+        assert order is not None
+        return partner.partner_code, order.pk
+
+    def _measure(self, strategy: str, code: str, urls: List[str], requests: int) -> Dict[str, Any]:
+        with override_settings(SESSION_ENGINE=f"django.contrib.sessions.backends.{strategy}"):
+            cache.clear()
+            client = Client()
+            response = client.post(reverse("partners:login"), {"partner_code": code})
+            if response.status_code != 302:
+                raise CommandError(f"{strategy}: autentificarea a eșuat (HTTP {response.status_code})")
+            # Încălzire: template-uri, cache-ul sesiunii, mesajul de după login
+            for url in urls:
+                client.get(url)
+
+            counter = _QueryCounter()
+            with connection.execute_wrapper(counter):
+                started = time.perf_counter()
+                for i in range(requests):
+                    response = client.get(urls[i % len(urls)])
+                    if response.status_code != 200:
+                        raise CommandError(f"{strategy}: {urls[i % len(urls)]} a răspuns HTTP {response.status_code}")
+                elapsed = time.perf_counter() - started
+
+        return {
+            "strategy": strategy,
+            "rps": requests / elapsed,
+            "ms": elapsed * 1000 / requests,
+            "queries": counter.total / requests,
+            "session_reads": counter.session_reads / requests,
+            "session_writes": counter.session_writes / requests,
+        }
@@ -0,0 +1,221 @@
+"""Benchmark scrieri concurente pe SQLite, per profil (`SQLITE_PROFILE`).
+
+Pentru fiecare profil se creează o bază temporară (migrare + date inițiale),
+apoi pornesc simultan procese care trimit avize (același flux de scriere ca
+`DeliveryCreateView`) și procese care importă comenzi SAP (`import_sap_order`).
+Fiecare proces își configurează Django din variabilele de mediu, deci profilul
+se aplică exact ca în producție, la deschiderea conexiunii.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+import random
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+from django.core.management.base import BaseCommand, CommandParser
+
+
+def _setup(env: Dict[str, str]) -> None:
+    os.environ.update(env)
+    import django
+
+    django.setup()
+
+
+def _prepare(env: Dict[str, str], orders: int, lines: int) -> None:
+    """Creează schema și comenzile pe care se trimit avize."""
+    _setup(env)
+    from datetime import date
+    from decimal import Decimal
+
+    from django.core.management import call_command
+
+    from orders.models import Order, OrderItem
+    from partners.models import Partner
+
+    call_command("migrate", verbosity=0)
+    partner = Partner.objects.create(partner_code="BENCH", name="Benchmark")
+    today = date.today()
+    created = Order.objects.bulk_create(
+        [
+            Order(order_number=f"BENCH-{n}", partner=partner, total_value=Decimal("0"), delivery_date=today)
+            for n in range(orders)
+        ]
+    )
+    OrderItem.objects.bulk_create(
+        [
+            OrderItem(
+                order=order,
+                position=(i + 1) * 10,
+                material_code=f"MAT-{i}",
+                material_description="Material benchmark",
+                quantity_ordered=Decimal("1000000"),
+                unit_of_measure="BUC",
+                delivery_date=today,
+                net_price=Decimal("1"),
+                price_unit="BUC",
+                line_total=Decimal("1000000"),
+            )
+            for order in created
+            for i in range(lines)
+        ],
+        batch_size=1000,
+    )
+
+
+def _submit_delivery(order_ids: List[int]) -> None:
+    from datetime import date
+    from decimal import Decimal
+
+    from django.db import transaction
+    from django.utils import timezone
+
+    from deliveries.models import Delivery, DeliveryItem
+    from orders.models import Order
+
+    with transaction.atomic():
+        order = Order.objects.get(pk=random.choice(order_ids))
+        delivery = Delivery.objects.create(
+            order=order, partner_id=order.partner_id, delivery_date=date.today(), status="draft"
+        )
+        DeliveryItem.objects.bulk_create(
+            [DeliveryItem(delivery=delivery, order_item=oi, quantity_delivered=Decimal("1")) for oi in order.items.all()]
+        )
+        delivery.status = "submitted"
+        delivery.submitted_at = timezone.now()
+        delivery.save(update_fields=["status", "submitted_at", "updated_at"])
+
+
+def _import_order(number: str, lines: int) -> None:
+    from datetime import date
+
+    from orders.services import import_sap_order
+
+    today = date.today().isoformat()
+    import_sap_order(
+        {
+            "order_number": number,
+            "partner_code": "BENCH",
+            "order_date": today,
+            "delivery_date": today,
+            "currency": "RON",
+            "items": [
+                {
+                    "position": (i + 1) * 10,
+                    "material_code": f"MAT-{i}",
+                    "material_description": "Material benchmark",
+                    "quantity_ordered": "10",
+                    "unit_of_measure": "BUC",
+                    "delivery_date": today,
+                    "net_price": "2.50",
+                    "price_unit": "BUC",
+                }
+                for i in range(lines)
+            ],
+        }
+    )
+
+
+def _worker(
+    env: Dict[str, str], role: str, index: int, start_at: float, duration: float, lines: int, think: float
+) -> Dict[str, Any]:
+    _setup(env)
+    from django.db import IntegrityError, OperationalError, connection
+
+    from orders.models import Order
+
+    order_ids = list(Order.objects.filter(order_number__startswith="BENCH-").values_list("pk", flat=True))
+    connection.close()
+    result: Dict[str, Any] = {"role": role, "ok": 0, "locked": 0, "integrity": 0, "other": 0, "latencies": []}
+    time.sleep(max(0.0, start_at - time.time()))
+    deadline = start_at + duration
+    sequence = 0
+    while time.time() < deadline:
+        if think:
+            # Pauză între operații (utilizator / lot următor); fără ea, un scriitor
+            # în buclă strânsă reia lock-ul imediat după commit și îi înfometează pe ceilalți
+            time.sleep(random.uniform(0, 2 * think))
+        started = time.perf_counter()
+        try:
+            if role == "submit":
+                _submit_delivery(order_ids)
+            else:
+                sequence += 1
+                _import_order(f"IMP-{index}-{sequence}", lines)
+        except OperationalError as exc:
+            result["locked" if "locked" in str(exc) else "other"] += 1
+            continue
+        except IntegrityError:
+            result["integrity"] += 1
+            continue
+        except Exception:
+            result["other"] += 1
+            continue
+        result["ok"] += 1
+        result["latencies"].append(time.perf_counter() - started)
+    connection.close()
+    return result
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+class Command(BaseCommand):
+    help = "Benchmark avize + importuri SAP concurente pe SQLite, per profil de conexiune."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--profiles", default="default,tuned", help="Profiluri SQLITE_PROFILE, separate prin virgulă")
+        parser.add_argument("--submitters", type=int, default=4, help="Procese care trimit avize")
+        parser.add_argument("--importers", type=int, default=2, help="Procese care importă comenzi")
+        parser.add_argument("--duration", type=float, default=10.0, help="Durata fiecărei rulări (secunde)")
+        parser.add_argument("--orders", type=int, default=200, help="Comenzi inițiale")
+        parser.add_argument("--lines", type=int, default=10, help="Poziții per comandă/aviz")
+        parser.add_argument(
+            "--think-ms", type=float, default=20.0, help="Pauza medie între operațiile unui proces (ms)"
+        )
+
+    def handle(self, *args, **options):  # type: ignore[no-untyped-def]
+        context = multiprocessing.get_context("spawn")
+        workers = [("submit", i) for i in range(options["submitters"])] + [
+            ("import", i) for i in range(options["importers"])
+        ]
+        for profile in [p.strip() for p in options["profiles"].split(",") if p.strip()]:
+            with tempfile.TemporaryDirectory() as tmp:
+                env = {"SQLITE_PROFILE": profile, "SQLITE_PATH": str(Path(tmp) / "bench.sqlite3")}
+                with context.Pool(1) as pool:
+                    pool.apply(_prepare, (env, options["orders"], options["lines"]))
+
+                with context.Pool(len(workers)) as pool:
+                    # Start comun după ce toate procesele au pornit Django
+                    start_at = time.time() + 3.0
+                    results = pool.starmap(
+                        _worker,
+                        [
+                            (env, role, i, start_at, options["duration"], options["lines"], options["think_ms"] / 1000)
+                            for role, i in workers
+                        ],
+                    )
+            self._report(profile, results, options["duration"])
+
+    def _report(self, profile: str, results: List[Dict[str, Any]], duration: float) -> None:
+        self.stdout.write(self.style.MIGRATE_HEADING(f"Profil: {profile}"))
+        for role, label in (("submit", "Avize"), ("import", "Importuri")):
+            rows = [r for r in results if r["role"] == role]
+            if not rows:
+                continue
+            ok = sum(r["ok"] for r in rows)
+            latencies = [lat for r in rows for lat in r["latencies"]]
+            self.stdout.write(
+                f"  {label:<10} {ok / duration:8.1f} op/s | ok {ok} | locked {sum(r['locked'] for r in rows)} | "
+                f"integrity {sum(r['integrity'] for r in rows)} | alte erori {sum(r['other'] for r in rows)} | "
+                f"p50 {_percentile(latencies, 50) * 1000:.1f} ms | p95 {_percentile(latencies, 95) * 1000:.1f} ms"
+            )
@@ -0,0 +1,162 @@
+"""Test de încărcare pe un server pornit local, cu datele create de `seed_benchmark_data`.
+
+Comanda citește din bază partenerii, comenzile deschise și avizele de validat
+(aceeași configurație ca serverul), apoi pornește utilizatorii virtuali din
+`core.loadtest` și raportează, per endpoint, numărul de cereri, erorile,
+throughput-ul și latențele p50/p95/p99.
+"""
+
+from __future__ import annotations
+
+import json
+import secrets
+from collections import deque
+from typing import Dict, List
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from core.benchdata import order_number
+from core.loadtest import DEFAULT_MIX, LoadTestData, parse_mix, run_load_test
+from deliveries.models import Delivery
+from orders.models import Material, Order
+from partners.models import Partner
+
+
+class Command(BaseCommand):
+    help = "Trafic simulat (parteneri, validări staff, webhook SAP) spre un server local; latențe p50/p95/p99."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--url", default="http://127.0.0.1:8000", help="Adresa serverului testat")
+        parser.add_argument("--users", type=int, default=20, help="Utilizatori virtuali (thread-uri) simultani")
+        parser.add_argument("--duration", type=float, default=60.0, help="Durata testului (secunde)")
+        parser.add_argument("--ramp-up", type=float, default=5.0, help="Pornirea eșalonată a utilizatorilor (secunde)")
+        parser.add_argument("--think-ms", type=float, default=100.0, help="Pauza medie între acțiuni (ms)")
+        parser.add_argument("--mix", default=DEFAULT_MIX, help="Ponderile acțiunilor: nume=pondere,...")
+        parser.add_argument("--burst", type=int, default=20, help="Comenzi per cerere webhook")
+        parser.add_argument("--timeout", type=float, default=30.0, help="Timeout per cerere (secunde)")
+        parser.add_argument("--prefix", default="BENCH", help="Prefixul datelor seed_benchmark_data")
+        parser.add_argument("--orders-per-partner", type=int, default=200, help="Comenzi deschise folosite per partener")
+        parser.add_argument("--staff-username", default=None, help="Implicit utilizatorul creat de seed")
+        parser.add_argument(
+            "--staff-password",
+            default=None,
+            help="Obligatorie pentru alt utilizator decât cel creat de seed (căruia i se setează una aleatoare)",
+        )
+        parser.add_argument("--json", dest="json_path", default=None, help="Scrie și rezultatele în acest fișier")
+
+    def handle(self, *args, **options):  # type: ignore[no-untyped-def]
+        try:
+            mix = parse_mix(options["mix"])
+        except ValueError as exc:
+            raise CommandError(str(exc))
+        data = self._data(options)
+        self.stdout.write(
+            f"{options['users']} utilizatori, {options['duration']:.0f}s, {len(data.partners)} parteneri, "
+            f"{len(data.deliveries)} avize de validat, mix: {options['mix']}"
+        )
+
+        recorder, elapsed = run_load_test(
+            options["url"],
+            data,
+            mix,
+            users=options["users"],
+            duration=options["duration"],
+            ramp_up=options["ramp_up"],
+            think=options["think_ms"] / 1000,
+            burst=options["burst"],
+            timeout=options["timeout"],
+        )
+        summary = recorder.summary(elapsed)
+        self._report(summary, recorder.skipped, elapsed)
+        if options["json_path"]:
+            with open(options["json_path"], "w", encoding="utf-8") as fh:
+                json.dump(
+                    {"options": {k: options[k] for k in ("url", "users", "duration", "mix", "burst", "think_ms")},
+                     "elapsed": round(elapsed, 2), "endpoints": summary, "skipped": recorder.skipped},
+                    fh,
+                    indent=2,
+                    ensure_ascii=False,
+                )
+
+    def _data(self, options: Dict) -> LoadTestData:  # type: ignore[type-arg]
+        prefix = options["prefix"]
+        like = f"{prefix}-"
+        partners = list(
+            Partner.objects.filter(partner_code__startswith=like, is_active=True)
+            .order_by("partner_code")
+            .values_list("partner_code", flat=True)
+        )
+        if not partners:
+            raise CommandError(f"Nu există parteneri {prefix}; rulează întâi seed_benchmark_data --prefix {prefix}.")
+
+        orders: Dict[str, List[int]] = {}
+        open_orders = (
+            Order.objects.filter(order_number__startswith=like, status__in=("pending", "sent_to_partner", "in_delivery"))
+            .order_by("pk")
+            .values_list("partner__partner_code", "pk")
+        )
+        for code, pk in open_orders.iterator(chunk_size=5000):
+            ids = orders.setdefault(code, [])
+            if len(ids) < options["orders_per_partner"]:
+                ids.append(pk)
+
+        deliveries = deque(
+            Delivery.objects.filter(delivery_number__startswith=like, status="submitted")
+            .order_by("pk")
+            .values_list("pk", flat=True)
+        )
+
+        seed_username = f"{prefix.lower()}-validator"
+        username = options["staff_username"] or seed_username
+        password = options["staff_password"]
+        if password is None:
+            # Parola se resetează doar pentru contul creat de seed_benchmark_data, niciodată pentru conturi reale
+            if username != seed_username:
+                raise CommandError(f"--staff-password este obligatoriu pentru utilizatorul {username}")
+            user = get_user_model().objects.filter(username=username, is_staff=True).first()
+            if user is None:
+                raise CommandError(f"Utilizator staff inexistent: {username}")
+            password = secrets.token_urlsafe(16)
+            user.set_password(password)
+            user.save(update_fields=["password"])
+
+        # Comenzile trimise prin webhook continuă numerotarea seed-ului, fără suprascrieri
+        last = Order.objects.filter(order_number__startswith=like).order_by("-order_number").first()
+        first_order = int(last.order_number.rsplit("-", 1)[-1]) + 1 if last else 0
+        if last and last.order_number != order_number(prefix, first_order - 1):
+            raise CommandError(f"Numerotare necunoscută pentru comenzile {prefix}: {last.order_number}")
+
+        return LoadTestData(
+            partners=partners,
+            orders=orders,
+            deliveries=deliveries,
+            staff_username=username,
+            staff_password=password,
+            api_key=getattr(settings, "SAP_API_KEY", ""),
+            prefix=prefix,
+            first_order_number=first_order,
+            partners_total=len(partners),
+            materials_total=Material.objects.filter(code__startswith=like).count() or 1,
+        )
+
+    def _report(self, summary: Dict[str, Dict], skipped: Dict[str, int], elapsed: float) -> None:  # type: ignore[type-arg]
+        self.stdout.write(
+            f"{'endpoint':<24} {'cereri':>7} {'erori':>6} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} "
+            f"{'p99 ms':>8} {'max ms':>8}"
+        )
+        for endpoint, row in summary.items():
+            line = (
+                f"{endpoint:<24} {row['requests']:>7} {row['errors']:>6} {row['rps']:>8.1f} {row['p50_ms']:>8.1f} "
+                f"{row['p95_ms']:>8.1f} {row['p99_ms']:>8.1f} {row['max_ms']:>8.1f}"
+            )
+            self.stdout.write(self.style.ERROR(line) if row["errors"] else line)
+        total = sum(row["requests"] for row in summary.values())
+        errors = sum(row["errors"] for row in summary.values())
+        self.stdout.write(f"Total: {total} cereri, {errors} erori, {total / elapsed:.1f} req/s în {elapsed:.1f}s")
+        for endpoint, row in summary.items():
+            if row["error_kinds"]:
+                self.stdout.write(f"  {endpoint}: {row['error_kinds']}")
+        if skipped:
+            self.stdout.write(f"Acțiuni sărite (fără date): {skipped}")
@@ -0,0 +1,47 @@
+"""Șterge sesiunile expirate din `django_session`, în loturi scurte.
+
+Spre deosebire de `clearsessions` (un singur DELETE pe tot tabelul), fiecare
+lot este o tranzacție separată, deci pe SQLite lock-ul de scriere nu blochează
+trimiterile de avize pe durata curățeniei. Cu `SESSION_STRATEGY=signed_cookies`
+sau `cache` nu există nimic de șters pe server.
+"""
+
+from __future__ import annotations
+
+from importlib import import_module
+
+from django.conf import settings
+from django.contrib.sessions.models import Session
+from django.core.management.base import BaseCommand, CommandParser
+from django.utils import timezone
+
+
+# Motoarele care păstrează sesiunile în `django_session`
+DB_ENGINES = ("django.contrib.sessions.backends.db", "django.contrib.sessions.backends.cached_db")
+
+
+class Command(BaseCommand):
+    help = "Șterge sesiunile expirate (în loturi); echivalentul incremental al `clearsessions`."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--batch-size", type=int, default=1000, help="Sesiuni șterse per lot")
+
+    def handle(self, *args, **options):  # type: ignore[no-untyped-def]
+        if settings.SESSION_ENGINE not in DB_ENGINES:
+            # Motoarele fără tabel își curăță singure datele (sau nu au ce curăța)
+            import_module(settings.SESSION_ENGINE).SessionStore.clear_expired()
+            self.stdout.write(f"{settings.SESSION_ENGINE}: fără sesiuni stocate în baza de date.")
+            return
+
+        deleted = 0
+        now = timezone.now()
+        while True:
+            keys = list(
+                Session.objects.filter(expire_date__lt=now).values_list("session_key", flat=True)[
+                    : options["batch_size"]
+                ]
+            )
+            if not keys:
+                break
+            deleted += Session.objects.filter(session_key__in=keys).delete()[0]
+        self.stdout.write(self.style.SUCCESS(f"Sesiuni expirate șterse: {deleted}"))
@@ -0,0 +1,16 @@
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from core.idempotency import purge_expired
+
+
+class Command(BaseCommand):
+    help = "Șterge cheile de idempotență expirate (răspunsuri salvate și rezervări abandonate)."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--batch-size", type=int, default=1000, help="Rânduri șterse per lot")
+
+    def handle(self, *args, **options):  # type: ignore[no-untyped-def]
+        deleted = purge_expired(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Chei expirate șterse: {deleted}"))
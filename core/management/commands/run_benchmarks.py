@@ -0,0 +1,137 @@
+"""Rulează scenariile din `core.benchmarks`, salvează istoricul și compară cu baseline-ul.
+
+Datele sunt create într-o bază de test separată (ca la `manage.py test`),
+ștearsă la final; pe SQLite baza de test este un fișier temporar cu aceleași
+opțiuni de conexiune, nu o bază în memorie. Fiecare rulare este adăugată în
+fișierul de istoric (`--history`); cu `--baseline` existent, o regresie peste
+`--threshold` termină comanda cu eroare (cod de ieșire nenul, pentru CI).
+"""
+
+from __future__ import annotations
+
+import os
+import platform
+import subprocess
+import tempfile
+from datetime import datetime, timezone
+from typing import Any, Dict, List
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import connection, connections
+from django.test.utils import override_settings, setup_databases, teardown_databases
+
+from core.benchmarks import SCENARIOS, compare, load_json, measure, reset_state, save_json
+
+
+def _git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=settings.BASE_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Command(BaseCommand):
+    help = "Benchmark pentru importul SAP, validarea avizelor și API-ul de poziții, cu istoric și comparație cu baseline."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--scenarios", default="", help=f"Scenarii separate prin virgulă (implicit toate: {', '.join(SCENARIOS)})"
+        )
+        parser.add_argument("--quick", action="store_true", default=False, help="Doar cea mai mică dimensiune")
+        parser.add_argument("--repeat", type=int, default=5, help="Rulări cronometrate per dimensiune")
+        parser.add_argument("--history", default=str(settings.BASE_DIR / "benchmarks" / "history.json"))
+        parser.add_argument("--baseline", default=str(settings.BASE_DIR / "benchmarks" / "baseline.json"))
+        parser.add_argument(
+            "--update-baseline", action="store_true", default=False, help="Salvează rezultatele ca baseline nou"
+        )
+        parser.add_argument("--threshold", type=float, default=0.25, help="Creșterea tolerată (0.25 = 25%%)")
+        parser.add_argument(
+            "--min-delta-ms", type=float, default=1.0, help="Sub această diferență (ms) timpul nu este regresie"
+        )
+        parser.add_argument("--label", default="", help="Etichetă salvată în istoric (ex. numele branch-ului)")
+
+    def handle(self, *args, **options):  # type: ignore[no-untyped-def]
+        names = [n.strip() for n in options["scenarios"].split(",") if n.strip()] or list(SCENARIOS)
+        unknown = [n for n in names if n not in SCENARIOS]
+        if unknown:
+            raise CommandError(f"Scenarii necunoscute: {', '.join(unknown)}")
+
+        with tempfile.TemporaryDirectory() as tmp:
+            if connection.vendor == "sqlite":
+                connection.settings_dict["TEST"]["NAME"] = os.path.join(tmp, "bench.sqlite3")
+            # Ca în producție: fără jurnalul de query-uri al DEBUG și fără Server-Timing
+            with override_settings(
+                DEBUG=False, PERF_SERVER_TIMING=False, ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]
+            ):
+                old_config = setup_databases(verbosity=0, interactive=False, aliases={"default"})
+                try:
+                    results = self._run(names, options)
+                finally:
+                    teardown_databases(old_config, verbosity=0)
+
+        run = {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "revision": _git_revision(),
+            "label": options["label"],
+            "database": connections["default"].vendor,
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "host": platform.node(),
+            "results": results,
+        }
+        history: List[Dict[str, Any]] = load_json(options["history"], [])
+        history.append(run)
+        save_json(options["history"], history)
+        self.stdout.write(f"Istoric: {options['history']} ({len(history)} rulări)")
+
+        if options["update_baseline"]:
+            save_json(options["baseline"], run)
+            self.stdout.write(self.style.SUCCESS(f"Baseline actualizat: {options['baseline']}"))
+            return
+
+        baseline = load_json(options["baseline"], None)
+        if baseline is None:
+            self.stdout.write(f"Fără baseline ({options['baseline']}); creează-l cu --update-baseline.")
+            return
+        if baseline.get("database") != run["database"]:
+            self.stdout.write(
+                self.style.WARNING(f"Baseline-ul este pe {baseline.get('database')}, rularea pe {run['database']}.")
+            )
+        regressions = compare(results, baseline["results"], options["threshold"], options["min_delta_ms"])
+        if regressions:
+            for line in regressions:
+                self.stderr.write(f"  {line}")
+            raise CommandError(
+                f"{len(regressions)} regresii față de baseline ({baseline.get('revision') or '?'}, "
+                f"{baseline.get('timestamp')})"
+            )
+        self.stdout.write(self.style.SUCCESS("Fără regresii față de baseline."))
+
+    def _run(self, names: List[str], options: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        results: Dict[str, Dict[str, Any]] = {}
+        self.stdout.write(
+            f"{'scenariu':<40} {'min ms':>9} {'median ms':>10} {'max ms':>9} {'query':>6} {'vârf KiB':>10}"
+        )
+        for name in names:
+            scenario = SCENARIOS[name]
+            sizes = scenario.sizes[:1] if options["quick"] else scenario.sizes
+            for size in sizes:
+                key = f"{name}[{size}]"
+                reset_state()
+                result = measure(scenario.setup(size), options["repeat"])
+                result["size"] = size
+                result["unit"] = scenario.unit
+                results[key] = result
+                self.stdout.write(
+                    f"{key:<40} {result['min_ms']:>9.2f} {result['median_ms']:>10.2f} {result['max_ms']:>9.2f} "
+                    f"{result['queries']:>6} {result['peak_kib']:>10.1f}"
+                )
+        return results
@@ -0,0 +1,303 @@
+"""Populează baza cu date sintetice la volum de producție, pentru benchmark-uri.
+
+Comenzile sunt generate în bucăți de `--chunk-orders`; fiecare bucată
+(comenzi, poziții, avize, poziții de aviz) este scrisă cu `bulk_create` într-o
+singură tranzacție. Cantitățile livrate pe poziții și statusul comenzilor sunt
+calculate în Python, la generare, exact cum le-ar lăsa validările, deci nu mai
+este nevoie de un UPDATE ulterior.
+
+Toate codurile încep cu `--prefix`, deci datele pot fi șterse (`--clear`) fără
+a atinge restul bazei. Aceeași `--seed` produce aceleași date (mai puțin
+`created_at` / `updated_at`, setate la inserare).
+"""
+
+from __future__ import annotations
+
+import random
+import time
+from datetime import datetime, time as dt_time, timedelta
+from decimal import Decimal
+from typing import Any, Dict, List, Tuple
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import connection, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from core.benchdata import (
+    LINE_DISTRIBUTIONS,
+    OrderGenerator,
+    SyntheticOrder,
+    material_code,
+    order_number,
+    partner_code,
+)
+from deliveries.models import Delivery, DeliveryItem
+from orders.models import Material, Order, OrderItem
+from partners.models import Partner
+
+
+# Statusul avizelor generate (toate statusurile apar), ponderi relative
+DELIVERY_STATUS_WEIGHTS = {"validated": 60, "submitted": 14, "rejected": 10, "validating": 8, "draft": 8}
+
+
+class Command(BaseCommand):
+    help = "Generează parteneri, materiale, comenzi, avize și validări sintetice (bulk_create, determinist)."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--prefix", default="BENCH", help="Prefixul tuturor codurilor generate")
+        parser.add_argument("--partners", type=int, default=50)
+        parser.add_argument("--materials", type=int, default=5000)
+        parser.add_argument("--orders", type=int, default=10_000)
+        parser.add_argument("--lines-distribution", choices=LINE_DISTRIBUTIONS, default="lognormal")
+        parser.add_argument("--lines-mean", type=int, default=10, help="Media pozițiilor per comandă")
+        parser.add_argument("--lines-max", type=int, default=200, help="Maximul pozițiilor per comandă")
+        parser.add_argument("--delivery-ratio", type=float, default=0.6, help="Fracțiunea comenzilor cu avize")
+        parser.add_argument("--cancelled-ratio", type=float, default=0.03, help="Fracțiunea comenzilor anulate")
+        parser.add_argument("--start-date", default="2024-01-01", help="Prima dată de comandă (YYYY-MM-DD)")
+        parser.add_argument("--days", type=int, default=365, help="Intervalul datelor de comandă (zile)")
+        parser.add_argument("--chunk-orders", type=int, default=2000, help="Comenzi per tranzacție")
+        parser.add_argument("--batch-size", type=int, default=5000, help="Rânduri per INSERT")
+        parser.add_argument("--clear", action="store_true", default=False, help="Șterge întâi datele cu același prefix")
+
+    def handle(self, *args, **options):  # type: ignore[no-untyped-def]
+        if not connection.features.can_return_rows_from_bulk_insert:
+            raise CommandError("Baza de date nu întoarce id-urile la bulk_create (necesar SQLite >= 3.35 sau PostgreSQL).")
+        prefix = options["prefix"]
+        start_date = parse_date(options["start_date"])
+        if start_date is None:
+            raise CommandError("--start-date invalid")
+        if options["clear"]:
+            self._clear(prefix)
+        elif Order.objects.filter(order_number__startswith=f"{prefix}-").exists():
+            raise CommandError(f"Există deja date cu prefixul {prefix}; folosește --clear sau alt --prefix.")
+
+        started = time.perf_counter()
+        self.batch_size = options["batch_size"]
+        self.prefix = prefix
+        self.rng = random.Random(options["seed"] + 1)
+        self.delivery_ratio = options["delivery_ratio"]
+        self.cancelled_ratio = options["cancelled_ratio"]
+        self.validator = self._validator(prefix)
+        self.delivery_seq = 0
+
+        partner_ids = self._partners(options["partners"])
+        self.material_ids = self._materials(options["materials"])
+        generator = OrderGenerator(
+            seed=options["seed"],
+            partners=options["partners"],
+            materials=options["materials"],
+            distribution=options["lines_distribution"],
+            lines_mean=options["lines_mean"],
+            lines_max=options["lines_max"],
+            start_date=start_date,
+            days=options["days"],
+        )
+
+        totals = {"orders": 0, "order_items": 0, "deliveries": 0, "delivery_items": 0}
+        chunk = options["chunk_orders"]
+        for start in range(0, options["orders"], chunk):
+            count = min(chunk, options["orders"] - start)
+            counts = self._write_chunk(list(generator.orders(count, start)), partner_ids)
+            for key, value in counts.items():
+                totals[key] += value
+            elapsed = time.perf_counter() - started
+            self.stdout.write(
+                f"  {totals['orders']:>10} comenzi | {totals['order_items']:>11} poziții | "
+                f"{totals['deliveries']:>9} avize | {elapsed:7.1f}s"
+            )
+
+        elapsed = time.perf_counter() - started
+        rows = sum(totals.values())
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Generat: {options['partners']} parteneri, {options['materials']} materiale, "
+                f"{totals['orders']} comenzi, {totals['order_items']} poziții, {totals['deliveries']} avize, "
+                f"{totals['delivery_items']} poziții aviz în {elapsed:.1f}s ({rows / max(elapsed, 1e-9):,.0f} rânduri/s)"
+            )
+        )
+
+    # --- date de bază ---
+
+    def _clear(self, prefix: str) -> None:
+        like = f"{prefix}-"
+        DeliveryItem.objects.filter(delivery__delivery_number__startswith=like).delete()
+        Delivery.objects.filter(delivery_number__startswith=like).delete()
+        OrderItem.objects.filter(order__order_number__startswith=like).delete()
+        Order.objects.filter(order_number__startswith=like).delete()
+        Material.objects.filter(code__startswith=like).delete()
+        Partner.objects.filter(partner_code__startswith=like).delete()
+
+    def _validator(self, prefix: str):  # type: ignore[no-untyped-def]
+        user, _created = get_user_model().objects.get_or_create(
+            username=f"{prefix.lower()}-validator", defaults={"is_staff": True}
+        )
+        return user
+
+    def _partners(self, count: int) -> List[int]:
+        Partner.objects.bulk_create(
+            [
+                Partner(
+                    partner_code=partner_code(self.prefix, n),
+                    name=f"Partener benchmark {n:04d}",
+                    email=f"partner{n:04d}@example.com",
+                )
+                for n in range(count)
+            ],
+            ignore_conflicts=True,
+        )
+        ids = dict(Partner.objects.filter(partner_code__startswith=f"{self.prefix}-").values_list("partner_code", "id"))
+        return [ids[partner_code(self.prefix, n)] for n in range(count)]
+
+    def _materials(self, count: int) -> List[int]:
+        Material.objects.bulk_create(
+            [Material(code=material_code(self.prefix, n), description=f"Material {n}") for n in range(count)],
+            batch_size=self.batch_size,
+            ignore_conflicts=True,
+        )
+        ids = dict(Material.objects.filter(code__startswith=f"{self.prefix}-").values_list("code", "id"))
+        return [ids[material_code(self.prefix, n)] for n in range(count)]
+
+    # --- comenzi și avize ---
+
+    def _write_chunk(self, synthetic: List[SyntheticOrder], partner_ids: List[int]) -> Dict[str, int]:
+        # Întâi planul (statusuri, cantități), apoi obiectele copil create cu `*_id`
+        # după inserarea părinților: fără descriptorii de relație, mai ieftin per rând
+        plans = [self._deliver(synth) for synth in synthetic]
+        orders = [
+            Order(
+                order_number=order_number(self.prefix, synth.number),
+                partner_id=partner_ids[synth.partner],
+                order_date=synth.order_date,
+                delivery_date=synth.delivery_date,
+                currency="RON",
+                status=status,
+                total_value=sum((line.line_total for line in synth.lines), Decimal("0")),
+            )
+            for synth, (status, _delivered, _deliveries) in zip(synthetic, plans)
+        ]
+        with transaction.atomic():
+            Order.objects.bulk_create(orders, batch_size=self.batch_size)
+            # `order_date` este auto_now_add: `bulk_create` a pus data curentă, se rescrie cea generată
+            for order, synth in zip(orders, synthetic):
+                order.order_date = synth.order_date
+            Order.objects.bulk_update(orders, ["order_date"], batch_size=self.batch_size)
+            items: List[List[OrderItem]] = [
+                [
+                    OrderItem(
+                        order_id=order.pk,
+                        position=line.position,
+                        material_id=self.material_ids[line.material],
+                        material_code=material_code(self.prefix, line.material),
+                        material_description=f"Material {line.material}",
+                        quantity_ordered=line.quantity,
+                        unit_of_measure=line.unit,
+                        delivery_date=line.delivery_date,
+                        net_price=line.net_price,
+                        price_unit=line.unit,
+                        line_total=line.line_total,
+                        quantity_delivered=delivered[i],
+                    )
+                    for i, line in enumerate(synth.lines)
+                ]
+                for order, synth, (_status, delivered, _deliveries) in zip(orders, synthetic, plans)
+            ]
+            OrderItem.objects.bulk_create([oi for order_items in items for oi in order_items], batch_size=self.batch_size)
+
+            deliveries: List[Delivery] = []
+            for order, (_status, _delivered, planned) in zip(orders, plans):
+                for delivery, _lines in planned:
+                    delivery.order_id = order.pk
+                    delivery.partner_id = order.partner_id
+                    deliveries.append(delivery)
+            Delivery.objects.bulk_create(deliveries, batch_size=self.batch_size)
+
+            delivery_items = [
+                DeliveryItem(
+                    delivery_id=delivery.pk,
+                    order_item_id=order_items[i].pk,
+                    quantity_delivered=delivered,
+                    quantity_accepted=accepted,
+                    has_discrepancy=discrepancy,
+                )
+                for order_items, (_status, _delivered, planned) in zip(items, plans)
+                for delivery, lines in planned
+                for i, delivered, accepted, discrepancy in lines
+            ]
+            DeliveryItem.objects.bulk_create(delivery_items, batch_size=self.batch_size)
+        return {
+            "orders": len(orders),
+            "order_items": sum(len(order_items) for order_items in items),
+            "deliveries": len(deliveries),
+            "delivery_items": len(delivery_items),
+        }
+
+    def _deliver(self, synth: SyntheticOrder) -> Tuple[str, List[Decimal], List[Tuple[Delivery, List[Tuple[Any, ...]]]]]:
+        """Planul avizelor unei comenzi.
+
+        Întoarce statusul comenzii, cantitatea livrată (acceptată) per poziție și
+        avizele nesalvate, fiecare cu pozițiile lui
+        `(index poziție, livrat, acceptat, discrepanță)`.
+        """
+        rng = self.rng
+        delivered_qty = [Decimal("0")] * len(synth.lines)
+        planned: List[Tuple[Delivery, List[Tuple[Any, ...]]]] = []
+        roll = rng.random()
+        if roll < self.cancelled_ratio:
+            return "cancelled", delivered_qty, planned
+        if roll >= self.cancelled_ratio + self.delivery_ratio:
+            return ("sent_to_partner" if rng.random() < 0.3 else "pending"), delivered_qty, planned
+
+        # Cantitatea încă nelivrată (avizele respinse nu o consumă)
+        open_qty = [line.quantity for line in synth.lines]
+        statuses = list(DELIVERY_STATUS_WEIGHTS)
+        weights = list(DELIVERY_STATUS_WEIGHTS.values())
+        for k in range(rng.randint(1, 3)):
+            candidates = [i for i, qty in enumerate(open_qty) if qty > 0]
+            if not candidates:
+                break
+            status = rng.choices(statuses, weights)[0]
+            delivery_date = synth.delivery_date + timedelta(days=rng.randint(-5, 10) + k)
+            submitted_at = timezone.make_aware(
+                datetime.combine(delivery_date, dt_time(8)) + timedelta(minutes=rng.randrange(600))
+            )
+            self.delivery_seq += 1
+            delivery = Delivery(
+                delivery_number=f"{self.prefix}-AVZ-{self.delivery_seq:09d}",
+                delivery_date=delivery_date,
+                status=status,
+                validation_status="pending",
+                submitted_at=submitted_at if status != "draft" else None,
+            )
+            lines: List[Tuple[Any, ...]] = []
+            partial = False
+            chosen = candidates if rng.random() < 0.6 else rng.sample(candidates, max(1, len(candidates) // 2))
+            for i in chosen:
+                remaining = open_qty[i]
+                delivered = remaining if rng.random() < 0.7 else Decimal(rng.randint(1, int(remaining) or 1)).min(remaining)
+                accepted = None
+                discrepancy = delivered != remaining
+                if status == "validated":
+                    accepted = delivered if rng.random() < 0.9 else (delivered * Decimal("0.9")).quantize(Decimal("0.001"))
+                    if accepted != delivered:
+                        discrepancy = partial = True
+                    delivered_qty[i] += accepted
+                if status != "rejected":
+                    open_qty[i] = remaining - delivered
+                lines.append((i, delivered, accepted, discrepancy))
+            if status in ("validated", "rejected"):
+                delivery.validation_status = "rejected" if status == "rejected" else ("partial" if partial else "approved")
+                delivery.validated_at = submitted_at + timedelta(hours=rng.randint(1, 72))
+                delivery.validated_by_id = self.validator.pk
+            planned.append((delivery, lines))
+
+        # Aceeași regulă ca `order_status_expression`
+        if all(qty >= line.quantity for qty, line in zip(delivered_qty, synth.lines)):
+            status = "delivered"
+        elif any(qty > 0 for qty in delivered_qty):
+            status = "in_delivery"
+        else:
+            status = "pending"
+        return status, delivered_qty, planned
@@ -0,0 +1,363 @@
+"""Registru de metrici în proces (counter, histogramă, gauge), în format text Prometheus.
+
+Fără `METRICS_DIR` valorile sunt doar în memoria procesului curent. Cu
+`METRICS_DIR` setat (gunicorn cu mai mulți workeri), fiecare proces își scrie
+starea în `<METRICS_DIR>/<pid>-<start>.json` cel târziu la
+`METRICS_FLUSH_INTERVAL` secunde după o modificare (și la ieșire), iar
+endpoint-ul `/metrics/` adună fișierele tuturor proceselor:
+- counterele și histogramele se însumează, inclusiv ale proceselor oprite
+  (altfel totalurile ar scădea la repornirea unui worker)
+- gauge-urile `livesum` se însumează doar pentru procesele în viață, cele
+  `max` iau maximul (ex. momentul ultimei sincronizări reușite)
+
+Directorul se golește la pornirea serviciului (înainte de a porni workerii).
+"""
+
+from __future__ import annotations
+
+import atexit
+import glob
+import json
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+LabelValues = Tuple[str, ...]
+
+
+class _Metric:
+    type = ""
+
+    def __init__(self, registry: "MetricsRegistry", name: str, documentation: str, labelnames: Sequence[str]) -> None:
+        self.registry = registry
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[LabelValues, Any] = {}
+
+    def _key(self, labels: Dict[str, Any]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name}: etichete așteptate {self.labelnames}, primite {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _reset(self) -> None:
+        self._values = {}
+
+
+class Counter(_Metric):
+    type = "counter"
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        key = self._key(labels)
+        with self.registry.lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+        self.registry.changed()
+
+
+class Gauge(_Metric):
+    type = "gauge"
+
+    def __init__(self, *args: Any, multiprocess_mode: str = "livesum") -> None:
+        super().__init__(*args)
+        if multiprocess_mode not in ("livesum", "max"):
+            raise ValueError(f"{self.name}: mod necunoscut {multiprocess_mode}")
+        self.multiprocess_mode = multiprocess_mode
+
+    def set(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        with self.registry.lock:
+            self._values[key] = float(value)
+        self.registry.changed()
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        key = self._key(labels)
+        with self.registry.lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+        self.registry.changed()
+
+    def dec(self, amount: float = 1.0, **labels: Any) -> None:
+        self.inc(-amount, **labels)
+
+    @contextmanager
+    def track_inprogress(self, **labels: Any) -> Iterator[None]:
+        self.inc(**labels)
+        try:
+            yield
+        finally:
+            self.dec(**labels)
+
+
+class Histogram(_Metric):
+    """Histogramă cu bucket-uri fixe; per set de etichete: [număr per bucket..., +Inf, sumă]."""
+
+    type = "histogram"
+
+    def __init__(self, *args: Any, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        super().__init__(*args)
+        self.buckets = tuple(sorted(float(b) for b in buckets))
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        index = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                index = i
+                break
+        with self.registry.lock:
+            row = self._values.get(key)
+            if row is None:
+                row = self._values[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            row[index] += 1
+            row[-1] += value
+        self.registry.changed()
+
+    @contextmanager
+    def time(self, **labels: Any) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self._metrics: Dict[str, _Metric] = {}
+        self._started = int(time.time())
+        self._timer: Optional[threading.Timer] = None
+        self._atexit_registered = False
+        if hasattr(os, "register_at_fork"):
+            # Un worker nu moștenește valorile procesului părinte (gunicorn --preload)
+            os.register_at_fork(after_in_child=self._reset_after_fork)
+
+    def _register(self, cls: type, name: str, documentation: str, labelnames: Sequence[str], **kwargs: Any) -> Any:
+        with self.lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(self, name, documentation, labelnames, **kwargs)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Metrica {name} este deja înregistrată ca {metric.type}")
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter, name, documentation, labelnames)
+
+    def gauge(
+        self, name: str, documentation: str, labelnames: Sequence[str] = (), multiprocess_mode: str = "livesum"
+    ) -> Gauge:
+        return self._register(Gauge, name, documentation, labelnames, multiprocess_mode=multiprocess_mode)
+
+    def histogram(
+        self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self._register(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    # --- agregare multi-proces ---
+
+    @staticmethod
+    def _directory() -> str:
+        return getattr(settings, "METRICS_DIR", "") or ""
+
+    def _path(self) -> str:
+        return os.path.join(self._directory(), f"{os.getpid()}-{self._started}.json")
+
+    def _reset_after_fork(self) -> None:
+        self.lock = threading.Lock()
+        self._started = int(time.time())
+        self._timer = None
+        self._atexit_registered = False
+        for metric in self._metrics.values():
+            metric._reset()
+
+    def changed(self) -> None:
+        """Programează scrierea stării pe disc (cel mult o scriere per interval)."""
+        if not self._directory() or self._timer is not None:
+            return
+        with self.lock:
+            if self._timer is not None:
+                return
+            if not self._atexit_registered:
+                atexit.register(self.flush)
+                self._atexit_registered = True
+            self._timer = threading.Timer(getattr(settings, "METRICS_FLUSH_INTERVAL", 1.0), self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self.lock:
+            return {
+                name: [[list(key), value if isinstance(value, float) else list(value)] for key, value in m._values.items()]
+                for name, m in self._metrics.items()
+            }
+
+    def flush(self) -> None:
+        with self.lock:
+            self._timer = None
+        directory = self._directory()
+        if not directory:
+            return
+        os.makedirs(directory, exist_ok=True)
+        path = self._path()
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump({"pid": os.getpid(), "metrics": self.snapshot()}, fh)
+        os.replace(tmp, path)
+
+    def _snapshots(self) -> List[Tuple[bool, Dict[str, Any]]]:
+        """(proces în viață, valori) pentru procesul curent și fișierele celorlalte procese."""
+        snapshots = [(True, self.snapshot())]
+        directory = self._directory()
+        if not directory:
+            return snapshots
+        own = self._path()
+        for path in glob.glob(os.path.join(directory, "*.json")):
+            if path == own:
+                continue
+            try:
+                with open(path, encoding="utf-8") as fh:
+                    data = json.load(fh)
+            except (OSError, ValueError):
+                continue
+            snapshots.append((_pid_alive(data.get("pid", 0)), data.get("metrics", {})))
+        return snapshots
+
+    def collect(self) -> Dict[str, Dict[LabelValues, Any]]:
+        """Valorile agregate peste toate procesele, per metrică și set de etichete."""
+        totals: Dict[str, Dict[LabelValues, Any]] = {name: {} for name in self._metrics}
+        for alive, snapshot in self._snapshots():
+            for name, rows in snapshot.items():
+                metric = self._metrics.get(name)
+                if metric is None:
+                    continue
+                if isinstance(metric, Gauge) and metric.multiprocess_mode == "livesum" and not alive:
+                    continue
+                target = totals[name]
+                for key, value in rows:
+                    key = tuple(key)
+                    if isinstance(metric, Histogram):
+                        if len(value) != len(metric.buckets) + 2:
+                            continue  # bucket-uri schimbate între versiuni
+                        current = target.get(key) or [0] * len(value)
+                        target[key] = [a + b for a, b in zip(current, value)]
+                    elif isinstance(metric, Gauge) and metric.multiprocess_mode == "max":
+                        target[key] = max(target.get(key, -math.inf), value)
+                    else:
+                        target[key] = target.get(key, 0.0) + value
+        return totals
+
+    def render(self) -> str:
+        """Expunerea în formatul text Prometheus (0.0.4)."""
+        lines: List[str] = []
+        for name, values in self.collect().items():
+            metric = self._metrics[name]
+            lines.append(f"# HELP {name} {_escape_help(metric.documentation)}")
+            lines.append(f"# TYPE {name} {metric.type}")
+            for key, value in sorted(values.items()):
+                labels = list(zip(metric.labelnames, key))
+                if isinstance(metric, Histogram):
+                    cumulative = 0
+                    for bound, count in zip([*metric.buckets, math.inf], value[:-1]):
+                        cumulative += count
+                        lines.append(f"{name}_bucket{_labels(labels + [('le', _number(bound))])} {cumulative}")
+                    lines.append(f"{name}_sum{_labels(labels)} {_number(value[-1])}")
+                    lines.append(f"{name}_count{_labels(labels)} {cumulative}")
+                else:
+                    lines.append(f"{name}{_labels(labels)} {_number(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def _pid_alive(pid: int) -> bool:
+    if pid <= 0:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _number(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value))
+
+
+def _escape_help(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(pairs: List[Tuple[str, str]]) -> str:
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape_label(value)}"' for name, value in pairs) + "}"
+
+
+REGISTRY = MetricsRegistry()
+counter = REGISTRY.counter
+gauge = REGISTRY.gauge
+histogram = REGISTRY.histogram
+
+
+def instrument(
+    seconds: Histogram,
+    calls: Optional[Counter] = None,
+    result: Optional[Callable[[Any], str]] = None,
+) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Decorator: durata apelului în `seconds` și, opțional, apelul în `calls{result=...}`.
+
+    `result(valoare_întoarsă)` dă eticheta `result` (implicit `ok`); o excepție
+    este numărată ca `error` și propagată. Funcționează și pe funcții `async`.
+    """
+
+    def observe(started: float, value: Any = None, failed: bool = False) -> None:
+        seconds.observe(time.perf_counter() - started)
+        if calls is not None:
+            calls.inc(result="error" if failed else (result(value) if result else "ok"))
+
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        if iscoroutinefunction(func):
+
+            @wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                started = time.perf_counter()
+                try:
+                    value = await func(*args, **kwargs)
+                except BaseException:
+                    observe(started, failed=True)
+                    raise
+                observe(started, value)
+                return value
+
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            started = time.perf_counter()
+            try:
+                value = func(*args, **kwargs)
+            except BaseException:
+                observe(started, failed=True)
+                raise
+            observe(started, value)
+            return value
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import json
+import logging
+import random
+import time
+from typing import Callable, Dict, List
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse
+
+from .db_router import replica_configured, track_request
+from .perf import RequestTimings, ainstrument_request, current_timings, instrument_request, server_timing_header
+
+
+perf_logger = logging.getLogger("barrier_edi.perf")
+
+
+class PerformanceMiddleware:
+    """Timpi per request: interogări, timp DB, cea mai lentă interogare, render, view.
+
+    Un request este instrumentat dacă este eșantionat (`PERF_SAMPLE_RATE`) sau
+    dacă `PERF_SERVER_TIMING` este activ; atunci primește header-ul
+    `Server-Timing` (doar cu `PERF_SERVER_TIMING`) și, dacă e eșantionat, o
+    linie JSON în logger-ul `barrier_edi.perf`. Request-urile peste buget
+    (`PERF_BUDGET_MS`, `PERF_BUDGET_QUERIES`, `PERF_BUDGET_DB_MS`) sunt logate
+    ca WARNING; pe cele neinstrumentate se verifică doar durata totală.
+
+    Se pune primul în `MIDDLEWARE`, pentru ca durata totală să includă și
+    celelalte middleware-uri. Pentru răspunsurile streaming se măsoară doar
+    până la primul octet. Funcționează și sub ASGI, fără a forța lanțul de
+    middleware pe un thread.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+        self.sample_rate = getattr(settings, "PERF_SAMPLE_RATE", 0.0)
+        self.server_timing = getattr(settings, "PERF_SERVER_TIMING", False)
+        self.budget_ms = getattr(settings, "PERF_BUDGET_MS", 500)
+        self.budget_queries = getattr(settings, "PERF_BUDGET_QUERIES", 50)
+        self.budget_db_ms = getattr(settings, "PERF_BUDGET_DB_MS", 200)
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        if self.is_async:
+            return self.__acall__(request)  # type: ignore[return-value]
+        started = time.perf_counter()
+        sampled = self._sample()
+        if not (sampled or self.server_timing):
+            return self._check_total(request, self.get_response(request), started)
+        with instrument_request() as timings:
+            response = self.get_response(request)
+        return self._finish(request, response, started, timings, sampled)
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        started = time.perf_counter()
+        sampled = self._sample()
+        if not (sampled or self.server_timing):
+            return self._check_total(request, await self.get_response(request), started)
+        async with ainstrument_request() as timings:
+            response = await self.get_response(request)
+        return self._finish(request, response, started, timings, sampled)
+
+    def _sample(self) -> bool:
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def _check_total(self, request: HttpRequest, response: HttpResponse, started: float) -> HttpResponse:
+        total = time.perf_counter() - started
+        if total * 1000 > self.budget_ms:
+            self._log(logging.WARNING, request, response, {"total_ms": round(total * 1000, 1)}, ["total"])
+        return response
+
+    def _finish(
+        self, request: HttpRequest, response: HttpResponse, started: float, timings: RequestTimings, sampled: bool
+    ) -> HttpResponse:
+        ended = time.perf_counter()
+        total = ended - started
+        view_started = getattr(request, "_perf_view_started", None)
+        render = timings.spans.get("render", 0.0)
+        view = max(0.0, ended - view_started - render) if view_started else 0.0
+
+        over_budget = self._over_budget(timings, total)
+        if self.server_timing:
+            response["Server-Timing"] = server_timing_header(timings, total, view, {"over_budget": over_budget})
+        if sampled or over_budget:
+            record = {
+                "total_ms": round(total * 1000, 1),
+                "view_ms": round(view * 1000, 1),
+                "render_ms": round(render * 1000, 1),
+                "db_ms": round(timings.db_time * 1000, 1),
+                "queries": timings.queries,
+                "slowest_query_ms": round(timings.slowest_query_time * 1000, 1),
+            }
+            if over_budget:
+                record["slowest_query"] = timings.slowest_query
+            self._log(logging.WARNING if over_budget else logging.INFO, request, response, record, over_budget)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):  # type: ignore[no-untyped-def]
+        if current_timings() is not None:
+            request._perf_view_started = time.perf_counter()  # type: ignore[attr-defined]
+        return None
+
+    def process_template_response(self, request, response):  # type: ignore[no-untyped-def]
+        timings = current_timings()
+        if timings is not None and not response.is_rendered:
+            # Handler-ul randează imediat după middleware-uri: măsurăm până la callback-ul post-render
+            render_started = time.perf_counter()
+            response.add_post_render_callback(
+                lambda _response: timings.add_span("render", time.perf_counter() - render_started)
+            )
+        return response
+
+    def _over_budget(self, timings: RequestTimings, total: float) -> List[str]:
+        over = []
+        if total * 1000 > self.budget_ms:
+            over.append("total")
+        if timings.queries > self.budget_queries:
+            over.append("queries")
+        if timings.db_time * 1000 > self.budget_db_ms:
+            over.append("db")
+        return over
+
+    def _log(self, level: int, request: HttpRequest, response: HttpResponse, record: dict, over_budget: List[str]) -> None:
+        match = getattr(request, "resolver_match", None)
+        line = {
+            "method": request.method,
+            "path": request.path,
+            "view": match.view_name if match else None,
+            "status": response.status_code,
+            **record,
+        }
+        if over_budget:
+            line["over_budget"] = over_budget
+        perf_logger.log(level, json.dumps(line, ensure_ascii=False))
+
+
+class ReplicaPinMiddleware:
+    """Read-your-writes: după o scriere, clientul citește de pe `default` încă `REPLICA_PIN_SECONDS`.
+
+    Se pune după `AuthenticationMiddleware`, deci salvarea sesiunii de la
+    sfârșitul request-ului nu contează drept scriere.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+        self.cookie_name = getattr(settings, "REPLICA_PIN_COOKIE", "db_pinned")
+        self.pin_seconds = getattr(settings, "REPLICA_PIN_SECONDS", 10)
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        if self.is_async:
+            return self.__acall__(request)  # type: ignore[return-value]
+        if not replica_configured():
+            return self.get_response(request)
+        with track_request(pinned=self.cookie_name in request.COOKIES) as state:
+            response = self.get_response(request)
+        return self._pin(response, state)
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        if not replica_configured():
+            return await self.get_response(request)
+        # Starea este în ContextVar: thread-urile `sync_to_async` primesc o copie
+        # a contextului, cu același dict, deci scrierile din ORM ajung aici
+        with track_request(pinned=self.cookie_name in request.COOKIES) as state:
+            response = await self.get_response(request)
+        return self._pin(response, state)
+
+    def _pin(self, response: HttpResponse, state: Dict[str, bool]) -> HttpResponse:
+        if state["wrote"]:
+            response.set_cookie(self.cookie_name, "1", max_age=self.pin_seconds, httponly=True, samesite="Lax")
+        return response
@@ -0,0 +1,37 @@
+# Generated by Django 5.1.1 on 2026-10-19 15:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="Watermark",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("is_active", models.BooleanField(default=True)),
+                ("name", models.CharField(max_length=100, unique=True)),
+                ("last_timestamp", models.DateTimeField(blank=True, null=True)),
+                ("last_pk", models.BigIntegerField(default=0)),
+            ],
+            options={
+                "verbose_name": "Watermark",
+                "verbose_name_plural": "Watermark-uri",
+            },
+        ),
+    ]
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+from typing import Any
+
 from django.db import models
 
 
@@ -22,3 +24,71 @@ class BaseModel(models.Model):
         abstract = True
 
 
+
+
+class Watermark(BaseModel):
+    """Poziția ultimei procesări incrementale pentru un job (export, agregare).
+
+    Perechea (`last_timestamp`, `last_pk`) permite paginare keyset stabilă chiar
+    dacă mai multe înregistrări au același timestamp.
+    """
+
+    name = models.CharField(max_length=100, unique=True)
+    last_timestamp = models.DateTimeField(null=True, blank=True)
+    last_pk = models.BigIntegerField(default=0)
+
+    class Meta:
+        verbose_name = "Watermark"
+        verbose_name_plural = "Watermark-uri"
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"{self.name} @ {self.last_timestamp} / {self.last_pk}"
+
+    @classmethod
+    def get(cls, name: str) -> "Watermark":
+        """Returnează (creând dacă lipsește) watermark-ul cu numele dat."""
+        obj, _created = cls.objects.get_or_create(name=name)
+        return obj
+
+    def advance(self, timestamp: Any, pk: int) -> None:
+        """Mută watermark-ul la (`timestamp`, `pk`) și îl salvează."""
+        self.last_timestamp = timestamp
+        self.last_pk = pk
+        self.save(update_fields=["last_timestamp", "last_pk", "updated_at"])
+
+
+class IdempotencyKey(BaseModel):
+    """Cheie de idempotență a unei cereri (webhook SAP, trimitere aviz) și răspunsul ei.
+
+    Rândul este rezervat ("processing") la prima cerere și completat cu
+    răspunsul după execuție; `expires_at` este termenul rezervării, apoi al
+    răspunsului salvat (vezi `core.idempotency`).
+    """
+
+    STATUS_PROCESSING = "processing"
+    STATUS_COMPLETED = "completed"
+    STATUS_CHOICES = [
+        (STATUS_PROCESSING, "În lucru"),
+        (STATUS_COMPLETED, "Finalizată"),
+    ]
+
+    scope = models.CharField(max_length=50)
+    key = models.CharField(max_length=255)
+    fingerprint = models.CharField(max_length=64)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PROCESSING)
+    response_status = models.PositiveSmallIntegerField(null=True, blank=True)
+    response_headers = models.JSONField(default=dict, blank=True)
+    response_body = models.BinaryField(default=b"", blank=True)
+    expires_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        unique_together = [["scope", "key"]]
+        verbose_name = "Cheie de idempotență"
+        verbose_name_plural = "Chei de idempotență"
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"{self.scope}:{self.key} ({self.status})"
+
+    def stored(self) -> tuple:
+        """Răspunsul salvat: (amprentă, status HTTP, header-e, corp)."""
+        return (self.fingerprint, self.response_status, self.response_headers, bytes(self.response_body))
@@ -0,0 +1,126 @@
+"""Măsurători per request: interogări, timp DB, render template, view.
+
+Starea este ținută într-un `ContextVar`, deci nu se amestecă între thread-uri
+/ task-uri. Interogările sunt cronometrate prin `connection.execute_wrapper`,
+activ doar pe request-urile instrumentate (eșantionate sau cu `Server-Timing`),
+deci în rest costul este un singur `perf_counter()` la început și la sfârșit.
+"""
+
+from __future__ import annotations
+
+import time
+from contextlib import ExitStack, asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, Iterator, Optional
+
+from asgiref.sync import sync_to_async
+from django.db import connections
+
+
+SLOW_SQL_MAX_LENGTH = 300
+
+
+@dataclass
+class RequestTimings:
+    queries: int = 0
+    db_time: float = 0.0
+    slowest_query: str = ""
+    slowest_query_time: float = 0.0
+    # Intervale numite (ex. `render`), în secunde, cumulate
+    spans: Dict[str, float] = field(default_factory=dict)
+
+    def add_span(self, name: str, seconds: float) -> None:
+        self.spans[name] = self.spans.get(name, 0.0) + seconds
+
+
+_current: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+
+
+def current_timings() -> Optional[RequestTimings]:
+    return _current.get()
+
+
+@contextmanager
+def timed(name: str) -> Iterator[None]:
+    """Adaugă durata blocului la intervalul `name` al request-ului instrumentat (dacă există)."""
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add_span(name, time.perf_counter() - started)
+
+
+def _record_query(execute, sql, params, many, context):  # type: ignore[no-untyped-def]
+    timings = _current.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        elapsed = time.perf_counter() - started
+        timings.queries += 1
+        timings.db_time += elapsed
+        if elapsed > timings.slowest_query_time:
+            timings.slowest_query_time = elapsed
+            timings.slowest_query = sql[:SLOW_SQL_MAX_LENGTH]
+
+
+def query_wrappers() -> ExitStack:
+    """Cronometrarea interogărilor pe conexiunile thread-ului curent (închisă cu `.close()`).
+
+    Conexiunile Django sunt per thread: sub ASGI, ORM-ul rulează în thread-ul
+    request-ului (`sync_to_async`), deci wrapper-ele se instalează acolo.
+    """
+    stack = ExitStack()
+    for conn in connections.all():
+        stack.enter_context(conn.execute_wrapper(_record_query))
+    return stack
+
+
+@contextmanager
+def instrument_request() -> Iterator[RequestTimings]:
+    """Activează măsurătorile pentru blocul curent, pe toate conexiunile configurate."""
+    timings = RequestTimings()
+    token = _current.set(timings)
+    try:
+        with query_wrappers():
+            yield timings
+    finally:
+        _current.reset(token)
+
+
+@asynccontextmanager
+async def ainstrument_request() -> AsyncIterator[RequestTimings]:
+    """Varianta async: `_current` în contextul async (copiat în thread-urile
+    `sync_to_async`), wrapper-ele pe conexiunile thread-ului request-ului."""
+    timings = RequestTimings()
+    token = _current.set(timings)
+    try:
+        stack = await sync_to_async(query_wrappers)()
+        try:
+            yield timings
+        finally:
+            await sync_to_async(stack.close)()
+    finally:
+        _current.reset(token)
+
+
+def server_timing_header(timings: RequestTimings, total: float, view: float, extra: Dict[str, Any]) -> str:
+    """Valoarea header-ului `Server-Timing` (durate în ms)."""
+    parts = [
+        f'db;dur={timings.db_time * 1000:.1f};desc="{timings.queries} queries"',
+        f"render;dur={timings.spans.get('render', 0.0) * 1000:.1f}",
+        f"view;dur={view * 1000:.1f}",
+        f"total;dur={total * 1000:.1f}",
+    ]
+    if timings.slowest_query_time:
+        parts.insert(1, f"db-slowest;dur={timings.slowest_query_time * 1000:.1f}")
+    if extra.get("over_budget"):
+        parts.append(f'budget;desc="{",".join(extra["over_budget"])}"')
+    return ", ".join(parts)
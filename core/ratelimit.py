@@ -0,0 +1,236 @@
+"""Limitarea ratei (per partener / cheie API / IP) și plafonul de importuri simultane.
+
+Limita `"N/perioadă"` (ex. `"120/m"`) se comportă ca o găleată de N jetoane
+reumplută pe parcursul perioadei: contoarele sunt în cache-ul Django (câte
+unul per fereastră, incrementat atomic cu `cache.incr`), iar estimarea
+glisantă `anterior * (1 - fracțiune) + curent` netezește trecerea între
+ferestre, fără citire-modificare-scriere. O cerere respinsă primește 429 cu
+`Retry-After` și nu consumă din limită.
+
+Plafonul de concurență ocupă unul din `limit` sloturi (`cache.add`, atomic);
+slotul unui proces oprit se eliberează singur după `timeout` secunde.
+
+Cu cache-ul implicit (memorie locală) limitele sunt per proces; cu mai mulți
+workeri se configurează un cache partajat (`REDIS_URL`).
+"""
+
+from __future__ import annotations
+
+import math
+import re
+import time
+from dataclasses import dataclass
+from functools import wraps
+from typing import Any, Callable, Optional, Tuple
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpRequest, HttpResponse
+
+from . import metrics
+from .idempotency import fingerprint
+from .jsonapi import FastJsonResponse
+
+
+RATELIMIT_REJECTIONS = metrics.counter(
+    "edi_ratelimit_rejections_total", "Cereri respinse de limitarea ratei (429)", ["name"]
+)
+ADMISSION_REJECTIONS = metrics.counter(
+    "edi_admission_rejections_total", "Cereri respinse de plafonul de concurență (503)", ["name"]
+)
+
+_PERIODS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+_RATE_RE = re.compile(r"^\s*(\d+)\s*/\s*(\d*)\s*([smhd])\s*$")
+
+RejectHandler = Callable[[HttpRequest, int], HttpResponse]
+
+
+@dataclass(frozen=True)
+class Rate:
+    limit: int
+    period: int  # secunde
+
+    @classmethod
+    def parse(cls, text: str) -> "Rate":
+        """`"120/m"`, `"10/s"`, `"1000/h"`, `"30/10s"` -> Rate."""
+        match = _RATE_RE.match(text)
+        if not match or int(match.group(1)) <= 0:
+            raise ValueError(f"Limită invalidă: {text!r} (format: N/s, N/m, N/h, N/d, N/10s)")
+        return cls(int(match.group(1)), int(match.group(2) or 1) * _PERIODS[match.group(3)])
+
+
+def client_ip(request: HttpRequest) -> str:
+    """Adresa clientului; în spatele unui proxy (`RATELIMIT_FORWARDED_FOR`) ultima din `X-Forwarded-For`."""
+    if getattr(settings, "RATELIMIT_FORWARDED_FOR", False):
+        forwarded = request.headers.get("X-Forwarded-For", "")
+        if forwarded:
+            return forwarded.split(",")[-1].strip()
+    return request.META.get("REMOTE_ADDR", "")
+
+
+def _incr(key: str, timeout: int) -> int:
+    cache.add(key, 0, timeout)
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # Cheia a expirat/a fost evacuată între `add` și `incr`
+        cache.set(key, 1, timeout)
+        return 1
+
+
+def hit(name: str, ident: str, rate: Rate, now: Optional[float] = None) -> Tuple[bool, int]:
+    """Consumă un jeton: (permis, secunde până la următorul jeton disponibil)."""
+    now = time.time() if now is None else now
+    window, fraction = divmod(now / rate.period, 1)
+    prefix = f"rl:{name}:{fingerprint(ident)[:32]}"
+    current_key = f"{prefix}:{int(window)}"
+    count = _incr(current_key, 2 * rate.period + 1)
+    previous = cache.get(f"{prefix}:{int(window) - 1}", 0)
+    if previous * (1 - fraction) + count <= rate.limit:
+        return True, 0
+
+    try:
+        cache.decr(current_key)  # cererea respinsă nu consumă din limită
+    except ValueError:
+        pass
+    # Când ar încăpea din nou aceeași cerere (a `count`-a din fereastră)
+    if count > rate.limit:
+        # Abia în fereastra următoare: anterior' = count - 1, curent' = 1
+        needed = 1 - (rate.limit - 1) / (count - 1) if count > 1 else 0.0
+        wait = (1 - fraction) + max(0.0, needed)
+    else:
+        needed = 1 - (rate.limit - count) / previous
+        wait = max(0.0, needed - fraction)
+    return False, max(1, math.ceil(wait * rate.period))
+
+
+def _too_many_requests(request: HttpRequest, retry_after: int) -> HttpResponse:
+    return FastJsonResponse({"error": "rate_limited", "retry_after": retry_after}, status=429)
+
+
+def ratelimit(
+    name: str,
+    rate: Optional[str],
+    key: Callable[[HttpRequest], Optional[str]],
+    methods: Optional[Tuple[str, ...]] = None,
+    reject: RejectHandler = _too_many_requests,
+) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Decorator de view (sync sau async): cel mult `rate` cereri per identitate `key(request)`.
+
+    `key` întoarce identitatea (cod partener, cheie API, IP); None = cerere
+    nelimitată. Fără `rate` view-ul nu este decorat; cu
+    `RATELIMIT_ENABLED=False` nu se verifică nimic. `reject(request,
+    retry_after)` construiește răspunsul 429.
+    """
+    parsed = Rate.parse(rate) if rate else None
+
+    def decorator(view_func: Callable[..., Any]) -> Callable[..., Any]:
+        if parsed is None:
+            return view_func
+
+        def check(request: HttpRequest) -> Optional[HttpResponse]:
+            # Citit la fiecare cerere: benchmark-urile îl pot opri cu override_settings
+            if not getattr(settings, "RATELIMIT_ENABLED", True):
+                return None
+            if methods and request.method not in methods:
+                return None
+            ident = key(request)
+            if ident is None:
+                return None
+            allowed, retry_after = hit(name, ident, parsed)
+            if allowed:
+                return None
+            RATELIMIT_REJECTIONS.inc(name=name)
+            response = reject(request, retry_after)
+            response["Retry-After"] = str(retry_after)
+            return response
+
+        if iscoroutinefunction(view_func):
+
+            @wraps(view_func)
+            async def async_view(request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponse:
+                rejected = await sync_to_async(check)(request)
+                return rejected or await view_func(request, *args, **kwargs)
+
+            return async_view
+
+        @wraps(view_func)
+        def view(request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponse:
+            return check(request) or view_func(request, *args, **kwargs)
+
+        return view
+
+    return decorator
+
+
+# --- plafon de concurență ---
+
+
+def acquire_slot(name: str, limit: int, timeout: int) -> Optional[str]:
+    """Ocupă un slot liber: cheia lui (de dat la `release_slot`) sau None dacă toate sunt ocupate."""
+    for slot in range(limit):
+        key = f"slot:{name}:{slot}"
+        if cache.add(key, 1, timeout):
+            return key
+    return None
+
+
+def release_slot(key: str) -> None:
+    cache.delete(key)
+
+
+def _service_unavailable(request: HttpRequest, retry_after: int) -> HttpResponse:
+    return FastJsonResponse({"error": "too_many_in_flight", "retry_after": retry_after}, status=503)
+
+
+def limit_concurrency(
+    name: str,
+    limit: int,
+    timeout: int,
+    retry_after: int = 5,
+    reject: RejectHandler = _service_unavailable,
+) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Decorator de view (sync sau async): cel mult `limit` execuții simultane, în toți workerii.
+
+    Peste plafon cererea primește imediat 503 cu `Retry-After`, în loc să
+    aștepte o conexiune la bază sau lock-ul de scriere. `limit <= 0` = fără plafon.
+    """
+
+    def decorator(view_func: Callable[..., Any]) -> Callable[..., Any]:
+        if limit <= 0:
+            return view_func
+
+        def rejected(request: HttpRequest) -> HttpResponse:
+            ADMISSION_REJECTIONS.inc(name=name)
+            response = reject(request, retry_after)
+            response["Retry-After"] = str(retry_after)
+            return response
+
+        if iscoroutinefunction(view_func):
+
+            @wraps(view_func)
+            async def async_view(request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponse:
+                slot = await sync_to_async(acquire_slot)(name, limit, timeout)
+                if slot is None:
+                    return rejected(request)
+                try:
+                    return await view_func(request, *args, **kwargs)
+                finally:
+                    await sync_to_async(release_slot)(slot)
+
+            return async_view
+
+        @wraps(view_func)
+        def view(request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponse:
+            slot = acquire_slot(name, limit, timeout)
+            if slot is None:
+                return rejected(request)
+            try:
+                return view_func(request, *args, **kwargs)
+            finally:
+                release_slot(slot)
+
+        return view
+
+    return decorator
@@ -0,0 +1,509 @@
+from __future__ import annotations
+
+import atexit
+import gzip
+import json
+import multiprocessing
+import os
+import runpy
+import tempfile
+import unittest
+from datetime import date, timedelta
+from decimal import Decimal
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.sessions.backends.db import SessionStore
+from django.contrib.sessions.models import Session
+from django.core.cache import cache
+from django.core.exceptions import RequestDataTooBig
+from django.core.management import CommandError, call_command
+from django.db import OperationalError, connection
+from django.db.backends.sqlite3.base import DatabaseWrapper as SqliteDatabaseWrapper
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from orders.models import Order
+from partners.models import Partner
+
+from .db_router import ReplicaRouter, on_replica, replica_reads, track_request, use_replica
+from .idempotency import idempotent
+from .jsonapi import (
+    BodyDecodingError,
+    FastJsonResponse,
+    UnsupportedContentEncoding,
+    brotli,
+    compress_response,
+    dumps,
+    loads,
+    orjson,
+    read_body,
+)
+from .management.commands.load_test import Command as LoadTestCommand
+from .metrics import MetricsRegistry
+from .middleware import ReplicaPinMiddleware
+from .models import IdempotencyKey
+from .ratelimit import Rate, hit, limit_concurrency, ratelimit
+
+
+class SeedBenchmarkDataTests(TestCase):
+    def test_orders_keep_generated_order_dates(self) -> None:
+        call_command(
+            "seed_benchmark_data",
+            "--orders=50",
+            "--partners=2",
+            "--materials=20",
+            "--lines-mean=2",
+            "--lines-max=3",
+            "--start-date=2024-01-01",
+            "--days=30",
+            stdout=StringIO(),
+        )
+        dates = set(Order.objects.values_list("order_date", flat=True))
+        self.assertGreater(len(dates), 1)
+        self.assertTrue(all(date(2024, 1, 1) <= d < date(2024, 1, 1) + timedelta(days=30) for d in dates))
+
+
+@unittest.skipUnless(
+    connection.vendor == "sqlite" and settings.SQLITE_PROFILE == "tuned", "profilul SQLite `tuned` nu este activ"
+)
+class SqliteTunedProfileTests(unittest.TestCase):
+    def test_pragmas_and_immediate_transactions_on_file_database(self) -> None:
+        # Baza de test este în memorie (fără WAL): conexiune separată pe un fișier, cu aceleași OPTIONS
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        wrapper = SqliteDatabaseWrapper(
+            {**connection.settings_dict, "NAME": str(Path(tmp.name) / "profil.sqlite3")}, alias="sqlite_profile"
+        )
+        self.addCleanup(wrapper.close)
+        with wrapper.cursor() as cursor:
+            pragmas = {}
+            for name in ("journal_mode", "synchronous", "busy_timeout", "temp_store"):
+                cursor.execute(f"PRAGMA {name}")
+                pragmas[name] = cursor.fetchone()[0]
+        # synchronous 1 = NORMAL, temp_store 2 = MEMORY
+        self.assertEqual(
+            pragmas,
+            {
+                "journal_mode": "wal",
+                "synchronous": 1,
+                "busy_timeout": settings.SQLITE_BUSY_TIMEOUT * 1000,
+                "temp_store": 2,
+            },
+        )
+        self.assertEqual(wrapper.transaction_mode, "IMMEDIATE")
+
+
+class LoadTestStaffPasswordTests(TestCase):
+    def setUp(self) -> None:
+        Partner.objects.create(partner_code="BENCH-0001", name="Partener benchmark")
+        self.options = {"prefix": "BENCH", "orders_per_partner": 10, "staff_username": None, "staff_password": None}
+
+    def test_other_user_requires_password(self) -> None:
+        admin = get_user_model().objects.create_user("admin", password="secret", is_staff=True)
+        with self.assertRaises(CommandError):
+            call_command("load_test", "--staff-username=admin", "--duration=0", stdout=StringIO())
+        admin.refresh_from_db()
+        self.assertTrue(admin.check_password("secret"))
+
+    def test_seed_validator_gets_random_password(self) -> None:
+        validator = get_user_model().objects.create_user("bench-validator", password="old", is_staff=True)
+        data = LoadTestCommand()._data(self.options)
+        validator.refresh_from_db()
+        self.assertEqual(data.staff_username, "bench-validator")
+        self.assertTrue(validator.check_password(data.staff_password))
+
+
+class HealthTests(TestCase):
+    def test_database_error_is_logged_not_returned(self) -> None:
+        error = OperationalError('could not connect to server at "db.internal" as user "edi"')
+        with mock.patch("django.db.backends.utils.CursorWrapper.execute", side_effect=error):
+            with self.assertLogs("barrier_edi.health", level="ERROR") as logs:
+                response = self.client.get("/health/")
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json()["error"], "database_unavailable")
+        self.assertNotIn("db.internal", response.content.decode())
+        self.assertIn("db.internal", "\n".join(logs.output))
+
+
+class IdempotencyTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.factory = RequestFactory()
+        self.calls = 0
+        self.status = 201
+
+        def view(request):  # type: ignore[no-untyped-def]
+            self.calls += 1
+            if request.POST.get("fail"):
+                raise RuntimeError("import eșuat")
+            return HttpResponse(f"rezultat {self.calls}", status=self.status)
+
+        self.view = idempotent(
+            "test",
+            key=lambda request: request.headers.get("Idempotency-Key"),
+            request_fingerprint=lambda request: request.POST.get("payload", ""),
+        )(view)
+
+    def _post(self, payload: str = "a", key: str = "k1", **extra: str) -> HttpResponse:
+        return self.view(self.factory.post("/", {"payload": payload, **extra}, headers={"Idempotency-Key": key}))
+
+    def test_retry_replays_stored_response(self) -> None:
+        first = self._post()
+        cache.clear()  # reluarea din tabelă, nu doar din cache
+        replay = self._post()
+        self.assertEqual(self.calls, 1)
+        self.assertEqual((replay.status_code, replay.content), (201, b"rezultat 1"))
+        self.assertEqual(replay["Idempotent-Replayed"], "true")
+        self.assertFalse(first.has_header("Idempotent-Replayed"))
+        self.assertEqual(self._post().content, b"rezultat 1")
+
+    def test_same_key_with_other_payload_is_422(self) -> None:
+        self._post("a")
+        self.assertEqual(self._post("b").status_code, 422)
+        self.assertEqual(self._post("b", key="k2").status_code, 201)
+        self.assertEqual(self.calls, 2)
+
+    def test_in_progress_key_is_409_with_retry_after(self) -> None:
+        IdempotencyKey.objects.create(
+            scope="test", key="k1", fingerprint="a", expires_at=timezone.now() + timedelta(minutes=5)
+        )
+        response = self._post()
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response["Retry-After"], "1")
+        self.assertEqual(self.calls, 0)
+
+    def test_expired_reservation_is_taken_over(self) -> None:
+        IdempotencyKey.objects.create(
+            scope="test", key="k1", fingerprint="a", expires_at=timezone.now() - timedelta(seconds=1)
+        )
+        self.assertEqual(self._post().status_code, 201)
+        self.assertEqual(IdempotencyKey.objects.get().status, IdempotencyKey.STATUS_COMPLETED)
+
+    def test_exception_and_error_response_release_the_key(self) -> None:
+        with self.assertRaises(RuntimeError):
+            self._post(fail="1")
+        self.assertFalse(IdempotencyKey.objects.exists())
+
+        self.status = 500
+        self.assertEqual(self._post().status_code, 500)
+        self.assertFalse(IdempotencyKey.objects.exists())
+
+        self.status = 201
+        self.assertEqual(self._post().content, b"rezultat 3")
+        self.assertEqual(self.calls, 3)
+
+
+@override_settings(RATELIMIT_ENABLED=True)
+class RateLimitTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.factory = RequestFactory()
+
+    def test_over_limit_is_429_with_retry_after(self) -> None:
+        view = ratelimit("test", "2/m", key=lambda request: request.GET.get("client"))(
+            lambda request: HttpResponse("ok")
+        )
+        statuses = [view(self.factory.get("/", {"client": "a"})).status_code for _ in range(2)]
+        self.assertEqual(statuses, [200, 200])
+        rejected = view(self.factory.get("/", {"client": "a"}))
+        self.assertEqual(rejected.status_code, 429)
+        # Până la sfârșitul ferestrei plus jumătate din următoarea (estimarea glisantă)
+        self.assertTrue(1 <= int(rejected["Retry-After"]) <= 90)
+        # Altă identitate are propria limită
+        self.assertEqual(view(self.factory.get("/", {"client": "b"})).status_code, 200)
+
+    def test_rejected_request_does_not_consume_tokens(self) -> None:
+        rate = Rate.parse("2/m")
+        start = 600 * 60.0  # începutul unei ferestre
+        self.assertTrue(hit("test", "a", rate, now=start)[0])
+        self.assertTrue(hit("test", "a", rate, now=start + 1)[0])
+        for _ in range(5):
+            self.assertFalse(hit("test", "a", rate, now=start + 2)[0])
+        # În fereastra următoare estimarea glisantă scade sub limită: anterior 2 * (1 - 0.75) + 1 <= 2
+        self.assertTrue(hit("test", "a", rate, now=start + 105)[0])
+
+    def test_concurrency_slot_is_rejected_then_released(self) -> None:
+        inner: list[HttpResponse] = []
+
+        @limit_concurrency("test_import", 1, timeout=60)
+        def view(request):  # type: ignore[no-untyped-def]
+            if request.GET.get("nested"):
+                inner.append(view(self.factory.get("/")))
+            if request.GET.get("fail"):
+                raise RuntimeError("import eșuat")
+            return HttpResponse("ok")
+
+        self.assertEqual(view(self.factory.get("/", {"nested": "1"})).status_code, 200)
+        self.assertEqual(inner[0].status_code, 503)
+        self.assertEqual(inner[0]["Retry-After"], "5")
+        with self.assertRaises(RuntimeError):
+            view(self.factory.get("/", {"fail": "1"}))
+        # Slotul a fost eliberat și după succes, și după excepție
+        self.assertEqual(view(self.factory.get("/")).status_code, 200)
+
+
+@override_settings(METRICS_TOKEN="secret-token")
+class MetricsEndpointAuthTests(TestCase):
+    def test_token_auth(self) -> None:
+        self.assertEqual(self.client.get("/metrics/").status_code, 401)
+        self.assertEqual(self.client.get("/metrics/", HTTP_AUTHORIZATION="Bearer wrong").status_code, 401)
+        response = self.client.get("/metrics/", HTTP_AUTHORIZATION="Bearer secret-token")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("# TYPE", response.content.decode())
+
+    def test_non_ascii_authorization_header_is_401(self) -> None:
+        # WSGI decodează header-ele ca latin-1
+        response = self.client.get("/metrics/", HTTP_AUTHORIZATION="Bearer sécret")
+        self.assertEqual(response.status_code, 401)
+
+
+@override_settings(REPLICA_PIN_COOKIE="db_pinned", REPLICA_PIN_SECONDS=10)
+class ReplicaRoutingTests(SimpleTestCase):
+    """Router-ul și pin-ul read-your-writes, cu o replică declarată (fără interogări reale)."""
+
+    def setUp(self) -> None:
+        for target in ("core.db_router.replica_configured", "core.middleware.replica_configured"):
+            patcher = mock.patch(target, return_value=True)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.router = ReplicaRouter()
+        self.factory = RequestFactory()
+
+    def test_reads_use_replica_only_inside_replica_reads(self) -> None:
+        self.assertEqual(self.router.db_for_read(Order), "default")
+        with replica_reads():
+            self.assertEqual(self.router.db_for_read(Order), "replica")
+            # Sesiunile și utilizatorii rămân pe baza principală
+            self.assertEqual(self.router.db_for_read(get_user_model()), "default")
+            self.assertEqual(self.router.db_for_write(Order), "default")
+        self.assertEqual(on_replica(Order.objects.all()).db, "replica")
+        self.assertFalse(self.router.allow_migrate("replica", "orders"))
+
+    def test_write_pins_the_rest_of_the_request(self) -> None:
+        with track_request(pinned=False) as state, replica_reads():
+            self.assertEqual(self.router.db_for_read(Order), "replica")
+            self.router.db_for_write(Order)
+            self.assertTrue(state["wrote"])
+            self.assertEqual(self.router.db_for_read(Order), "default")
+            self.assertEqual(on_replica(Order.objects.all()).db, "default")
+
+    def _middleware(self, write: bool):  # type: ignore[no-untyped-def]
+        reads: list[str] = []
+
+        @use_replica
+        def view(request):  # type: ignore[no-untyped-def]
+            if write:
+                self.router.db_for_write(Order)
+            reads.append(self.router.db_for_read(Order))
+            return HttpResponse("ok")
+
+        return ReplicaPinMiddleware(view), reads
+
+    def test_pin_cookie_after_write_keeps_next_reads_on_primary(self) -> None:
+        middleware, reads = self._middleware(write=True)
+        response = middleware(self.factory.post("/"))
+        self.assertEqual(response.cookies["db_pinned"]["max-age"], 10)
+        self.assertEqual(reads, ["default"])
+
+        middleware, reads = self._middleware(write=False)
+        request = self.factory.get("/")
+        request.COOKIES["db_pinned"] = "1"
+        self.assertNotIn("db_pinned", middleware(request).cookies)
+        self.assertEqual(reads, ["default"])
+        # Fără cookie (pin expirat) citirile revin pe replică
+        middleware(self.factory.get("/"))
+        self.assertEqual(reads, ["default", "replica"])
+
+
+@override_settings(PERF_BUDGET_MS=60_000, PERF_BUDGET_QUERIES=1000, PERF_BUDGET_DB_MS=60_000)
+class PerformanceMiddlewareTests(TestCase):
+    def setUp(self) -> None:
+        self.client.force_login(get_user_model().objects.create_user("intern", password="x", is_staff=True))
+
+    @override_settings(PERF_SERVER_TIMING=True, PERF_SAMPLE_RATE=0.0)
+    def test_server_timing_header_without_log(self) -> None:
+        with self.assertNoLogs("barrier_edi.perf"):
+            response = self.client.get("/orders/")
+        timing = response["Server-Timing"]
+        for metric in ("db;dur=", "render;dur=", "view;dur=", "total;dur="):
+            self.assertIn(metric, timing)
+        queries = int(timing.split('desc="')[1].split(" ")[0])
+        self.assertGreater(queries, 0)
+
+    @override_settings(PERF_SERVER_TIMING=False, PERF_SAMPLE_RATE=1.0, PERF_BUDGET_QUERIES=0)
+    def test_sampled_request_over_budget_is_logged(self) -> None:
+        with self.assertLogs("barrier_edi.perf", level="INFO") as logs:
+            response = self.client.get("/orders/")
+        self.assertNotIn("Server-Timing", response)
+        [record] = logs.records
+        self.assertEqual(record.levelname, "WARNING")
+        line = json.loads(record.getMessage())
+        self.assertEqual((line["view"], line["status"], line["over_budget"]), ("orders:order_list", 200, ["queries"]))
+        self.assertGreater(line["queries"], 0)
+        self.assertTrue(line["slowest_query"].startswith("SELECT"))
+
+    @override_settings(PERF_SERVER_TIMING=False, PERF_SAMPLE_RATE=0.0)
+    def test_uninstrumented_request_has_no_header_or_log(self) -> None:
+        with self.assertNoLogs("barrier_edi.perf"):
+            response = self.client.get("/orders/")
+        self.assertNotIn("Server-Timing", response)
+
+
+def _worker_metrics(registry: MetricsRegistry) -> None:
+    # Proces copil (fork): pornește cu valori goale, își scrie starea și iese
+    registry.counter("test_imports_total", "", ["result"]).inc(2, result="ok")
+    registry.gauge("test_inprogress", "").inc(5)
+    registry.gauge("test_last_sync", "", multiprocess_mode="max").set(200)
+    registry.histogram("test_seconds", "", buckets=(1.0,)).observe(3.0)
+    registry.flush()
+
+
+@unittest.skipUnless(hasattr(os, "fork"), "necesită fork")
+class MultiprocessMetricsTests(SimpleTestCase):
+    def setUp(self) -> None:
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.enterContext(override_settings(METRICS_DIR=tmp.name, METRICS_FLUSH_INTERVAL=60))
+        self.directory = tmp.name
+        self.registry = MetricsRegistry()
+        # Fără scrierea programată / de la ieșire într-un director de test deja șters
+        self.addCleanup(atexit.unregister, self.registry.flush)
+        self.addCleanup(lambda: self.registry._timer and self.registry._timer.cancel())
+        self.imports = self.registry.counter("test_imports_total", "Importuri", ["result"])
+        self.inprogress = self.registry.gauge("test_inprogress", "În curs")
+        self.last_sync = self.registry.gauge("test_last_sync", "Ultima sincronizare", multiprocess_mode="max")
+        self.seconds = self.registry.histogram("test_seconds", "Durată", buckets=(1.0,))
+
+    def test_workers_are_aggregated(self) -> None:
+        self.imports.inc(result="ok")
+        self.inprogress.inc()
+        self.last_sync.set(100)
+        self.seconds.observe(0.5)
+
+        child = multiprocessing.get_context("fork").Process(target=_worker_metrics, args=(self.registry,))
+        child.start()
+        child.join()
+        self.assertEqual(child.exitcode, 0)
+        # Un worker în viață (procesul părinte al testului), scris direct ca fișier
+        with open(os.path.join(self.directory, f"{os.getppid()}-1.json"), "w", encoding="utf-8") as fh:
+            json.dump({"pid": os.getppid(), "metrics": {"test_inprogress": [[[], 3.0]]}}, fh)
+
+        lines = self.registry.render().splitlines()
+        # Counter/histogramă: însumate și pentru workerul oprit; `livesum` doar pentru cei în viață
+        self.assertIn('test_imports_total{result="ok"} 3.0', lines)
+        self.assertIn("test_inprogress 4.0", lines)
+        self.assertIn("test_last_sync 200.0", lines)
+        self.assertIn('test_seconds_bucket{le="1.0"} 1', lines)
+        self.assertIn('test_seconds_bucket{le="+Inf"} 2', lines)
+        self.assertIn("test_seconds_sum 3.5", lines)
+        self.assertIn("test_seconds_count 2", lines)
+
+
+@override_settings(JSON_COMPRESS_MIN_BYTES=100, JSON_GZIP_LEVEL=6, JSON_BROTLI_QUALITY=4)
+class JsonApiTests(SimpleTestCase):
+    DATA = {"order": "4500000001", "quantity": Decimal("12.500"), "date": date(2024, 3, 5), "text": "Țeavă"}
+
+    def setUp(self) -> None:
+        self.factory = RequestFactory()
+
+    @unittest.skipIf(orjson is None, "orjson nu este instalat")
+    def test_backends_produce_the_same_json(self) -> None:
+        encoded = dumps(self.DATA, backend="stdlib")
+        self.assertEqual(dumps(self.DATA, backend="orjson"), encoded)
+        expected = '{"order":"4500000001","quantity":"12.500","date":"2024-03-05","text":"Țeavă"}'
+        self.assertEqual(encoded, expected.encode("utf-8"))
+        for backend in ("stdlib", "orjson"):
+            self.assertEqual(loads(encoded, backend=backend)["quantity"], "12.500")
+            with self.assertRaises(ValueError):
+                loads(b'{"text": "\xff"}', backend=backend)
+
+    def _view(self, size: int):  # type: ignore[no-untyped-def]
+        return compress_response(lambda request: FastJsonResponse({"items": ["MAT-001"] * size}))
+
+    def _get(self, size: int, accept: str) -> HttpResponse:
+        return self._view(size)(self.factory.get("/", HTTP_ACCEPT_ENCODING=accept))
+
+    def test_response_encoding_follows_accept_encoding(self) -> None:
+        plain = self._get(100, "")
+        self.assertFalse(plain.has_header("Content-Encoding"))
+        self.assertEqual(plain["Vary"], "Accept-Encoding")
+
+        gzipped = self._get(100, "gzip, br;q=0")
+        self.assertEqual(gzipped["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(gzipped.content), plain.content)
+        self.assertEqual(gzipped["Content-Length"], str(len(gzipped.content)))
+
+        self.assertFalse(self._get(100, "gzip;q=0").has_header("Content-Encoding"))
+        # Sub `JSON_COMPRESS_MIN_BYTES` răspunsul rămâne necomprimat
+        self.assertFalse(self._get(1, "gzip").has_header("Content-Encoding"))
+
+    @unittest.skipIf(brotli is None, "Brotli nu este instalat")
+    def test_brotli_is_preferred_when_accepted(self) -> None:
+        response = self._get(100, "gzip, deflate, br")
+        self.assertEqual(response["Content-Encoding"], "br")
+        self.assertEqual(brotli.decompress(response.content), self._get(100, "").content)
+
+    def _post(self, body: bytes, encoding: str):  # type: ignore[no-untyped-def]
+        return self.factory.post(
+            "/", data=body, content_type="application/json", headers={"Content-Encoding": encoding}
+        )
+
+    def test_gzip_request_bodies(self) -> None:
+        body = dumps(self.DATA)
+        self.assertEqual(read_body(self._post(gzip.compress(body), "gzip")), body)
+        with self.assertRaises(BodyDecodingError):
+            read_body(self._post(gzip.compress(body)[:-10], "gzip"))
+        with self.assertRaises(UnsupportedContentEncoding):
+            read_body(self._post(body, "zstd"))
+        # Limita se aplică conținutului decomprimat, nu celui transmis
+        with override_settings(DATA_UPLOAD_MAX_MEMORY_SIZE=len(body) - 1):
+            with self.assertRaises(RequestDataTooBig):
+                read_body(self._post(gzip.compress(body), "gzip"))
+
+
+class SessionStrategyTests(TestCase):
+    @override_settings(SESSION_ENGINE="django.contrib.sessions.backends.db")
+    def test_purge_deletes_only_expired_sessions_in_batches(self) -> None:
+        for i in range(7):
+            store = SessionStore()
+            store["partner_code"] = f"P{i}"
+            store.create()
+        live = set(Session.objects.values_list("session_key", flat=True)[:2])
+        Session.objects.exclude(session_key__in=live).update(expire_date=timezone.now() - timedelta(days=1))
+
+        out = StringIO()
+        with CaptureQueriesContext(connection) as queries:
+            call_command("purge_expired_sessions", "--batch-size=2", stdout=out)
+        self.assertIn("Sesiuni expirate șterse: 5", out.getvalue())
+        self.assertEqual(set(Session.objects.values_list("session_key", flat=True)), live)
+        deletes = [q["sql"] for q in queries.captured_queries if q["sql"].startswith("DELETE")]
+        self.assertEqual(len(deletes), 3)
+
+    @override_settings(SESSION_ENGINE="django.contrib.sessions.backends.signed_cookies")
+    def test_purge_without_session_table_is_a_no_op(self) -> None:
+        out = StringIO()
+        call_command("purge_expired_sessions", stdout=out)
+        self.assertIn("fără sesiuni stocate", out.getvalue())
+
+    def _settings(self, **env: str) -> dict:
+        environ = {k: v for k, v in os.environ.items() if k not in ("REDIS_URL", "SESSION_STRATEGY")}
+        with mock.patch.dict(os.environ, {**environ, **env}, clear=True):
+            return runpy.run_path(str(Path(settings.BASE_DIR) / "barrier_edi" / "settings.py"))
+
+    def test_session_strategy_maps_to_engine(self) -> None:
+        self.assertEqual(self._settings()["SESSION_ENGINE"], "django.contrib.sessions.backends.db")
+        # Cu cache partajat implicit `cached_db`
+        shared = self._settings(REDIS_URL="redis://127.0.0.1:6379/1")
+        self.assertEqual(shared["SESSION_ENGINE"], "django.contrib.sessions.backends.cached_db")
+        self.assertEqual(shared["CACHES"]["default"]["BACKEND"], "django.core.cache.backends.redis.RedisCache")
+        self.assertEqual(
+            self._settings(SESSION_STRATEGY="signed_cookies")["SESSION_ENGINE"],
+            "django.contrib.sessions.backends.signed_cookies",
+        )
+        self.assertFalse(self._settings()["SESSION_SAVE_EVERY_REQUEST"])
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from django.urls import path
-from .views import HomeView, StaffLoginView, StaffPasswordResetView, StaffProfileView, staff_logout
+from .views import HomeView, StaffLoginView, StaffPasswordResetView, StaffProfileView, health, metrics_endpoint, staff_logout
 
 
 app_name = "core"
@@ -12,6 +12,8 @@ urlpatterns = [
     path("reset/", StaffPasswordResetView.as_view(), name="staff_reset"),
     path("profile/", StaffProfileView.as_view(), name="staff_profile"),
     path("logout/", staff_logout, name="staff_logout"),
+    path("health/", health, name="health"),
+    path("metrics/", metrics_endpoint, name="metrics"),
 ]
 
 
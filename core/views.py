@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import logging
+
 from django.views.generic import TemplateView
 from django.views import View
 from django.shortcuts import render, redirect
@@ -7,6 +9,8 @@ from django.contrib.auth import authenticate, login, logout, get_user_model
 from django.conf import settings
 from django.contrib import messages
 
+health_logger = logging.getLogger("barrier_edi.health")
+
 
 class HomeView(TemplateView):
     """Pagina principală a aplicației Barrier EDI.
@@ -110,3 +114,49 @@ def staff_logout(request):  # type: ignore[no-untyped-def]
     return redirect("core:home")
 
 
+
+
+def health(request):  # type: ignore[no-untyped-def]
+    """Verificare pentru load balancer / monitorizare: conexiune DB + `SELECT 1`."""
+    import time
+
+    from django.db import DatabaseError, connection
+    from django.http import JsonResponse
+
+    started = time.perf_counter()
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+            cursor.fetchone()
+    except DatabaseError:
+        # Detaliile erorii (host, utilizator, mesajul driverului) rămân în log, nu în răspunsul public
+        health_logger.exception("Health check: baza de date nu răspunde")
+        return JsonResponse(
+            {"status": "error", "database": connection.vendor, "error": "database_unavailable"}, status=503
+        )
+    return JsonResponse(
+        {
+            "status": "ok",
+            "database": connection.vendor,
+            "latency_ms": round((time.perf_counter() - started) * 1000, 2),
+        }
+    )
+
+
+def metrics_endpoint(request):  # type: ignore[no-untyped-def]
+    """Metricile aplicației în format text Prometheus (staff sau `Authorization: Bearer <METRICS_TOKEN>`)."""
+    import hmac
+
+    from django.http import HttpResponse
+
+    from .metrics import REGISTRY
+
+    token = getattr(settings, "METRICS_TOKEN", "")
+    provided = request.headers.get("Authorization", "")
+    # Comparat ca octeți: un header non-ASCII (decodat latin-1 de WSGI) dă TypeError la `str`
+    authorized = token and hmac.compare_digest(
+        provided.encode("utf-8", "surrogateescape"), f"Bearer {token}".encode("utf-8")
+    )
+    if not (request.user.is_staff or authorized):
+        return HttpResponse("unauthorized", status=401, content_type="text/plain")
+    return HttpResponse(REGISTRY.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from django.contrib import admin
 
-from .models import Delivery, DeliveryItem
+from .models import Delivery, DeliveryItem, SapOutboxMessage
 
 
 class DeliveryItemInline(admin.TabularInline):
@@ -43,3 +43,25 @@ class DeliveryItemAdmin(admin.ModelAdmin):
     ]
 
 
+
+
+@admin.register(SapOutboxMessage)
+class SapOutboxMessageAdmin(admin.ModelAdmin):
+    list_display = [
+        "delivery",
+        "status",
+        "attempts",
+        "next_attempt_at",
+        "sent_at",
+        "idempotency_key",
+    ]
+    list_filter = ["status"]
+    search_fields = ["idempotency_key", "delivery__delivery_number"]
+    readonly_fields = ["idempotency_key", "payload"]
+    actions = ["requeue"]
+
+    @admin.action(description="Reprogramează mesajele selectate")
+    def requeue(self, request, queryset):  # type: ignore[no-untyped-def]
+        from django.utils import timezone
+
+        queryset.update(status="pending", next_attempt_at=timezone.now(), claimed_at=None)
@@ -0,0 +1,21 @@
+"""Filtre comune pentru lista de avize (UI și export)."""
+
+from __future__ import annotations
+
+from typing import Mapping
+
+from django.db.models import QuerySet
+
+
+def filter_deliveries(qs: QuerySet, params: Mapping[str, str]) -> QuerySet:
+    """Aplică filtrele `status`, `validation_status` și `partner` pe un queryset de `Delivery`."""
+    status = params.get("status")
+    vstatus = params.get("validation_status")
+    partner = params.get("partner")
+    if status:
+        qs = qs.filter(status=status)
+    if vstatus:
+        qs = qs.filter(validation_status=vstatus)
+    if partner:
+        qs = qs.filter(partner__name__icontains=partner)
+    return qs
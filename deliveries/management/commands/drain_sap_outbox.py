@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import time
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from deliveries.sap_outbox import drain_outbox
+
+
+class Command(BaseCommand):
+    help = "Transmite către SAP confirmările de livrare din outbox."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--batch-size", type=int, default=None, help="Mesaje per lot (implicit SAP_OUTBOX_BATCH_SIZE)")
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=None,
+            help="Cereri HTTP simultane (implicit SAP_OUTBOX_CONCURRENCY)",
+        )
+        parser.add_argument("--max-batches", type=int, default=None, help="Oprește după N loturi")
+        parser.add_argument(
+            "--loop",
+            action="store_true",
+            default=False,
+            help="Rulează continuu, verificând outbox-ul la fiecare --interval secunde",
+        )
+        parser.add_argument("--interval", type=float, default=5.0, help="Pauza între verificări în modul --loop")
+
+    def handle(self, *args, **options):  # type: ignore[no-untyped-def]
+        while True:
+            stats = drain_outbox(
+                batch_size=options["batch_size"],
+                concurrency=options["concurrency"],
+                max_batches=options["max_batches"],
+            )
+            if stats["batches"] or not options["loop"]:
+                self.stdout.write(
+                    self.style.SUCCESS(
+                        f"Trimise: {stats['sent']} | Reprogramate: {stats['pending']} | "
+                        f"Eșuate: {stats['failed']} | Preluate de alt worker: {stats['stale']} | "
+                        f"Loturi: {stats['batches']}"
+                    )
+                )
+            if not options["loop"]:
+                break
+            time.sleep(options["interval"])
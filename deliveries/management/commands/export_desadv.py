@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandParser
+
+from deliveries.outbound import OUTBOUND_FORMATS, export_validated_deliveries, reset_exported
+
+
+class Command(BaseCommand):
+    help = "Generează notificări DESADV (EDIFACT și/sau JSON) pentru avizele validate noi."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--output-dir",
+            default=None,
+            help="Directorul de ieșire (implicit OUTBOUND_DIR)",
+        )
+        parser.add_argument(
+            "--format",
+            dest="formats",
+            choices=[*OUTBOUND_FORMATS, "both"],
+            default="both",
+            help="Formatul fișierelor generate",
+        )
+        parser.add_argument("--batch-size", type=int, default=None, help="Avize per lot (implicit OUTBOUND_BATCH_SIZE)")
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            default=False,
+            help="Numără avizele noi fără a scrie fișiere sau a le marca drept emise",
+        )
+        parser.add_argument(
+            "--reset",
+            action="store_true",
+            default=False,
+            help="Șterge marcajele de export (re-emite toate avizele validate)",
+        )
+
+    def handle(self, *args, **options):  # type: ignore[no-untyped-def]
+        if options["reset"]:
+            reset = reset_exported()
+            self.stdout.write(self.style.WARNING(f"Marcaje DESADV resetate: {reset} avize."))
+
+        formats = OUTBOUND_FORMATS if options["formats"] == "both" else (options["formats"],)
+        result = export_validated_deliveries(
+            options["output_dir"] or settings.OUTBOUND_DIR,
+            formats=formats,
+            batch_size=options["batch_size"],
+            dry_run=options["dry_run"],
+        )
+        self.stdout.write(
+            self.style.SUCCESS(f"Avize emise: {result.deliveries} în {result.batches} loturi")
+        )
+        for path in result.files:
+            self.stdout.write(f" - {path}")
@@ -0,0 +1,95 @@
+# Generated by Django 5.1.1 on 2026-10-19 16:01
+
+import deliveries.models
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("deliveries", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SapOutboxMessage",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("is_active", models.BooleanField(default=True)),
+                (
+                    "idempotency_key",
+                    models.CharField(
+                        default=deliveries.models._new_idempotency_key,
+                        max_length=64,
+                        unique=True,
+                    ),
+                ),
+                ("payload", models.JSONField()),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "În așteptare"),
+                            ("sending", "În transmitere"),
+                            ("sent", "Trimis"),
+                            ("failed", "Eșuat"),
+                        ],
+                        default="pending",
+                        max_length=20,
+                    ),
+                ),
+                ("attempts", models.PositiveIntegerField(default=0)),
+                (
+                    "next_attempt_at",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+                ("claimed_at", models.DateTimeField(blank=True, null=True)),
+                ("sent_at", models.DateTimeField(blank=True, null=True)),
+                ("last_error", models.TextField(blank=True)),
+                (
+                    "delivery",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="sap_outbox_messages",
+                        to="deliveries.delivery",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Mesaj SAP (outbox)",
+                "verbose_name_plural": "Mesaje SAP (outbox)",
+                "ordering": ["pk"],
+                "indexes": [
+                    models.Index(
+                        fields=["status", "next_attempt_at"],
+                        name="deliveries__status_dda9f1_idx",
+                    )
+                ],
+            },
+        ),
+        migrations.AddField(
+            model_name="delivery",
+            name="desadv_exported_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="delivery",
+            index=models.Index(
+                condition=models.Q(("desadv_exported_at__isnull", True), ("status", "validated")),
+                fields=["validated_at", "id"],
+                name="delivery_desadv_pending",
+            ),
+        ),
+    ]
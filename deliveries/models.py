@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import uuid
 from datetime import datetime
 from decimal import Decimal
 from typing import Any
@@ -9,9 +10,10 @@ from typing import Any
 from django.contrib.auth import get_user_model
 from django.db import models, transaction
 from django.urls import reverse
+from django.utils import timezone
 
 from core.models import BaseModel
-from core.constants import DELIVERY_STATUS_CHOICES, VALIDATION_STATUS_CHOICES
+from core.constants import DELIVERY_STATUS_CHOICES, OUTBOX_STATUS_CHOICES, VALIDATION_STATUS_CHOICES
 
 
 User = get_user_model()
@@ -50,11 +52,21 @@ class Delivery(BaseModel):
     validated_by = models.ForeignKey(User, null=True, blank=True, on_delete=models.SET_NULL)
     notes = models.TextField(blank=True)
     validation_notes = models.TextField(blank=True)
+    # Momentul includerii într-un fișier DESADV (`deliveries.outbound`); NULL = încă neemis
+    desadv_exported_at = models.DateTimeField(null=True, blank=True)
 
     class Meta:
         ordering = ["-delivery_date"]
         verbose_name = "Aviz livrare"
         verbose_name_plural = "Avize livrare"
+        indexes = [
+            # Doar avizele validate neemise: indexul rămâne mic oricât crește istoricul
+            models.Index(
+                fields=["validated_at", "id"],
+                name="delivery_desadv_pending",
+                condition=models.Q(status="validated", desadv_exported_at__isnull=True),
+            ),
+        ]
 
     def __str__(self) -> str:  # pragma: no cover
         return self.delivery_number
@@ -130,3 +142,36 @@ class DeliveryItem(BaseModel):
         return (self.quantity_delivered - self.get_remaining_quantity()).quantize(Decimal("0.001"))
 
 
+
+
+def _new_idempotency_key() -> str:
+    return uuid.uuid4().hex
+
+
+class SapOutboxMessage(BaseModel):
+    """Mesaj de confirmare către SAP, scris în aceeași tranzacție cu validarea.
+
+    Worker-ul `drain_sap_outbox` îl transmite ulterior; `idempotency_key` este
+    trimis la fiecare reîncercare, astfel încât SAP să poată ignora duplicatele.
+    """
+
+    idempotency_key = models.CharField(max_length=64, unique=True, default=_new_idempotency_key)
+    delivery = models.ForeignKey(
+        Delivery, on_delete=models.CASCADE, related_name="sap_outbox_messages"
+    )
+    payload = models.JSONField()
+    status = models.CharField(max_length=20, choices=OUTBOX_STATUS_CHOICES, default="pending")
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+
+    class Meta:
+        ordering = ["pk"]
+        indexes = [models.Index(fields=["status", "next_attempt_at"])]
+        verbose_name = "Mesaj SAP (outbox)"
+        verbose_name_plural = "Mesaje SAP (outbox)"
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"{self.delivery_id} - {self.status} ({self.idempotency_key})"
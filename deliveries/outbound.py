@@ -0,0 +1,204 @@
+"""Notificări de livrare către SAP: EDIFACT DESADV (D.96A) și echivalent JSON.
+
+Sunt emise avizele validate încă nemarcate cu `desadv_exported_at`, în loturi
+keyset după (`validated_at`, `pk`) pe indexul parțial al avizelor neemise.
+Fiecare lot este încărcat cu un singur query (aviz + comandă + partener) plus
+prefetch-ul pozițiilor cu pozițiile de comandă, apoi serializat în fișiere cu
+buffer mare. Fișierele sunt scrise ca `.part` și redenumite doar la final;
+avizele sunt marcate după redenumire, deci o rulare întreruptă este reluată
+integral la următoarea rulare.
+
+Marcajul per aviz (nu un watermark pe `validated_at`) contează pentru că
+`validated_at` este setat înainte de commit-ul validării: un aviz care devine
+vizibil după ce o rulare a trecut de timestamp-ul lui este emis la rularea
+următoare, nu pierdut.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Prefetch, Q
+from django.utils import timezone
+
+from orders.edifact import format_segment
+
+from .models import Delivery, DeliveryItem
+
+
+OUTBOUND_FORMATS = ("edifact", "json")
+
+
+@dataclass
+class OutboundResult:
+    deliveries: int = 0
+    batches: int = 0
+    files: List[str] = field(default_factory=list)
+
+
+def iter_validated_batches(batch_size: int) -> Iterator[List[Delivery]]:
+    """Loturi keyset de avize validate neemise, în ordinea (`validated_at`, `pk`)."""
+    items_qs = DeliveryItem.objects.select_related("order_item")
+    base = (
+        Delivery.objects.filter(status="validated", validated_at__isnull=False, desadv_exported_at__isnull=True)
+        .select_related("order", "partner")
+        .prefetch_related(Prefetch("items", queryset=items_qs))
+        .order_by("validated_at", "pk")
+    )
+    after_timestamp: datetime | None = None
+    after_pk = 0
+    while True:
+        qs = base
+        if after_timestamp is not None:
+            qs = qs.filter(
+                Q(validated_at__gt=after_timestamp) | Q(validated_at=after_timestamp, pk__gt=after_pk)
+            )
+        batch = list(qs[:batch_size])
+        if not batch:
+            return
+        yield batch
+        after_timestamp, after_pk = batch[-1].validated_at, batch[-1].pk
+
+
+def _date(value: Any) -> str:
+    return value.strftime("%Y%m%d")
+
+
+def desadv_segments(delivery: Delivery, message_ref: str) -> List[str]:
+    """Segmentele unui mesaj DESADV pentru un aviz validat."""
+    seg = format_segment
+    order = delivery.order
+    buyer = getattr(settings, "EDI_BUYER_ID", "BARRIER")
+    lines = [
+        seg("UNH", message_ref, ("DESADV", "D", "96A", "UN")),
+        seg("BGM", "351", delivery.delivery_number, "9"),
+        seg("DTM", ("137", _date(timezone.localtime(delivery.validated_at)), "102")),
+        seg("DTM", ("11", _date(delivery.delivery_date), "102")),
+        seg("RFF", ("ON", order.order_number)),
+        seg("NAD", "SU", (delivery.partner.partner_code, "", "92")),
+        seg("NAD", "BY", (buyer, "", "92")),
+        seg("CPS", "1"),
+    ]
+    for item in delivery.items.all():
+        order_item = item.order_item
+        unit = order_item.unit_of_measure
+        lines += [
+            seg("LIN", order_item.position, "", (order_item.material_code, "SA")),
+            seg("QTY", ("12", item.quantity_delivered, unit)),
+            seg("QTY", ("194", item.quantity_accepted if item.quantity_accepted is not None else "", unit)),
+            seg("RFF", ("ON", order.order_number, order_item.position)),
+        ]
+        if item.has_discrepancy and item.discrepancy_reason:
+            lines.append(seg("FTX", "AAI", "", "", [item.discrepancy_reason[:512]]))
+    lines.append(seg("UNT", str(len(lines) + 1), message_ref))
+    return lines
+
+
+def desadv_json(delivery: Delivery) -> Dict[str, Any]:
+    """Echivalentul JSON al mesajului DESADV."""
+    return {
+        "delivery_number": delivery.delivery_number,
+        "order_number": delivery.order.order_number,
+        "partner_code": delivery.partner.partner_code,
+        "delivery_date": delivery.delivery_date,
+        "validated_at": delivery.validated_at,
+        "validation_status": delivery.validation_status,
+        "items": [
+            {
+                "position": item.order_item.position,
+                "material_code": item.order_item.material_code,
+                "unit_of_measure": item.order_item.unit_of_measure,
+                "quantity_delivered": item.quantity_delivered,
+                "quantity_accepted": item.quantity_accepted,
+                "has_discrepancy": item.has_discrepancy,
+            }
+            for item in delivery.items.all()
+        ],
+    }
+
+
+def export_validated_deliveries(
+    output_dir: str | os.PathLike[str],
+    formats: tuple[str, ...] = OUTBOUND_FORMATS,
+    batch_size: int | None = None,
+    dry_run: bool = False,
+) -> OutboundResult:
+    """Scrie DESADV (EDIFACT și/sau JSON Lines) pentru avizele validate noi.
+
+    Un fișier per format per rulare; rularea fără avize noi nu creează fișiere.
+    """
+    if batch_size is None:
+        batch_size = getattr(settings, "OUTBOUND_BATCH_SIZE", 500)
+    buffer_size = getattr(settings, "OUTBOUND_WRITE_BUFFER", 1024 * 1024)
+    result = OutboundResult()
+
+    started = timezone.now()
+    stamp = started.strftime("%Y%m%d%H%M%S%f")
+    # Referința de control UNB (an..14), unică și pentru rulări în aceeași secundă
+    control_ref = started.strftime("%d%H%M%S%f")
+    directory = Path(output_dir)
+    paths = {
+        "edifact": directory / f"DESADV_{stamp}.edi",
+        "json": directory / f"DESADV_{stamp}.jsonl",
+    }
+    handles: Dict[str, Any] = {}
+    exported: List[int] = []
+    try:
+        for batch in iter_validated_batches(batch_size):
+            if not handles and not dry_run:
+                directory.mkdir(parents=True, exist_ok=True)
+                for fmt in formats:
+                    handles[fmt] = open(f"{paths[fmt]}.part", "w", encoding="utf-8", buffering=buffer_size)
+                if "edifact" in handles:
+                    sender = getattr(settings, "EDI_SENDER_ID", "BARRIER")
+                    recipient = getattr(settings, "EDI_RECIPIENT_ID", "SAP")
+                    now = timezone.localtime()
+                    unb = format_segment(
+                        "UNB",
+                        ("UNOW", "3"),
+                        sender,
+                        recipient,
+                        (now.strftime("%y%m%d"), now.strftime("%H%M")),
+                        control_ref,
+                    )
+                    handles["edifact"].write("UNA:+.? '\n" + unb + "\n")
+
+            for delivery in batch:
+                result.deliveries += 1
+                if "edifact" in handles:
+                    segments = desadv_segments(delivery, str(result.deliveries))
+                    handles["edifact"].write("\n".join(segments) + "\n")
+                if "json" in handles:
+                    handles["json"].write(json.dumps(desadv_json(delivery), cls=DjangoJSONEncoder) + "\n")
+            result.batches += 1
+            exported.extend(delivery.pk for delivery in batch)
+
+        if "edifact" in handles:
+            handles["edifact"].write(format_segment("UNZ", str(result.deliveries), control_ref) + "\n")
+        for fmt, fh in handles.items():
+            fh.flush()
+            os.fsync(fh.fileno())
+            fh.close()
+            os.replace(f"{paths[fmt]}.part", paths[fmt])
+            result.files.append(str(paths[fmt]))
+    finally:
+        for fh in handles.values():
+            if not fh.closed:
+                fh.close()
+
+    if not dry_run:
+        for start in range(0, len(exported), batch_size):
+            Delivery.objects.filter(pk__in=exported[start : start + batch_size]).update(desadv_exported_at=started)
+    return result
+
+
+def reset_exported() -> int:
+    """Șterge marcajele de export: rularea următoare re-emite toate avizele validate."""
+    return Delivery.objects.filter(desadv_exported_at__isnull=False).update(desadv_exported_at=None)
@@ -0,0 +1,208 @@
+"""Outbox pentru confirmările de livrare către SAP.
+
+`validate_delivery` scrie un `SapOutboxMessage` în aceeași tranzacție cu
+actualizarea cantităților, deci nu se pierde nicio confirmare și nu se trimite
+nimic pentru o validare anulată. Worker-ul (`drain_sap_outbox`):
+- revendică un lot de mesaje scadente (`skip_locked` unde baza de date permite)
+- le transmite în paralel, limitat la `concurrency` cereri simultane, printr-un
+  `requests.Session` comun (conexiuni keep-alive reutilizate din pool)
+- marchează mesajele trimise sau reprogramează reîncercarea cu backoff
+  exponențial (cu jitter și respectarea `Retry-After`)
+
+Rezultatul se scrie condiționat de `claimed_at`-ul revendicării: dacă lease-ul
+a expirat și mesajul a fost revendicat de alt worker, rezultatul întârziat este
+ignorat (contorizat ca `stale`), deci nu suprascrie starea mai nouă.
+"""
+
+from __future__ import annotations
+
+import random
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Any, Dict, List, Optional
+
+import requests
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+from requests.adapters import HTTPAdapter
+
+from .models import Delivery, DeliveryItem, SapOutboxMessage
+
+
+# Coduri HTTP după care are sens o reîncercare (restul 4xx sunt definitive)
+RETRYABLE_STATUS = {408, 425, 429, 500, 502, 503, 504}
+
+
+def build_confirmation_payload(delivery: Delivery, items: List[DeliveryItem]) -> Dict[str, Any]:
+    """Conținutul confirmării pentru SAP (cantități ca string, fără pierdere de precizie)."""
+    return {
+        "delivery_number": delivery.delivery_number,
+        "order_number": delivery.order.order_number,
+        "partner_code": delivery.partner.partner_code,
+        "validation_status": delivery.validation_status,
+        "validated_at": delivery.validated_at.isoformat() if delivery.validated_at else None,
+        "items": [
+            {
+                "position": item.order_item.position,
+                "material_code": item.order_item.material_code,
+                "unit_of_measure": item.order_item.unit_of_measure,
+                "quantity_accepted": str(item.quantity_accepted),
+                "quantity_delivered_total": str(item.order_item.quantity_delivered),
+            }
+            for item in items
+        ],
+    }
+
+
+def enqueue_sap_confirmation(delivery: Delivery, items: List[DeliveryItem]) -> SapOutboxMessage:
+    """Adaugă confirmarea în outbox (apelat în tranzacția validării)."""
+    return SapOutboxMessage.objects.create(
+        delivery=delivery, payload=build_confirmation_payload(delivery, items)
+    )
+
+
+def build_session(concurrency: int) -> requests.Session:
+    """Sesiune HTTP cu pool dimensionat pentru `concurrency` conexiuni keep-alive."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=concurrency, max_retries=0)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update(
+        {
+            "X-API-KEY": getattr(settings, "SAP_API_KEY", ""),
+            "Content-Type": "application/json",
+        }
+    )
+    return session
+
+
+def backoff_delay(attempts: int, retry_after: Optional[float] = None) -> float:
+    """Întârzierea până la următoarea încercare (secunde), exponențială cu jitter."""
+    base = getattr(settings, "SAP_OUTBOX_BACKOFF_BASE", 2.0)
+    cap = getattr(settings, "SAP_OUTBOX_BACKOFF_MAX", 600.0)
+    delay = min(cap, base * (2 ** max(attempts - 1, 0)))
+    delay = random.uniform(delay / 2, delay)
+    if retry_after is not None:
+        delay = max(delay, retry_after)
+    return delay
+
+
+def claim_batch(batch_size: int) -> List[SapOutboxMessage]:
+    """Revendică mesajele scadente, marcându-le `sending`.
+
+    Mesajele rămase `sending` mai mult decât `SAP_OUTBOX_LEASE_SECONDS` (worker
+    oprit brusc) sunt revendicate din nou; cheia de idempotență evită dublurile.
+    """
+    now = timezone.now()
+    lease = timedelta(seconds=getattr(settings, "SAP_OUTBOX_LEASE_SECONDS", 300))
+    due = Q(status="pending", next_attempt_at__lte=now) | Q(status="sending", claimed_at__lt=now - lease)
+    with transaction.atomic():
+        qs = SapOutboxMessage.objects.filter(due).order_by("next_attempt_at", "pk")
+        if connection.features.has_select_for_update_skip_locked:
+            qs = qs.select_for_update(skip_locked=True)
+        messages = list(qs[:batch_size])
+        if messages:
+            SapOutboxMessage.objects.filter(pk__in=[m.pk for m in messages]).update(
+                status="sending", claimed_at=now
+            )
+    for message in messages:
+        message.status, message.claimed_at = "sending", now
+    return messages
+
+
+@dataclass
+class SendOutcome:
+    message: SapOutboxMessage
+    ok: bool
+    retryable: bool
+    error: str = ""
+    retry_after: Optional[float] = None
+
+
+def _send_one(session: requests.Session, url: str, timeout: float, message: SapOutboxMessage) -> SendOutcome:
+    """Transmite un mesaj (rulează în thread-urile pool-ului, fără acces la DB)."""
+    try:
+        response = session.post(
+            url,
+            json=message.payload,
+            headers={"Idempotency-Key": message.idempotency_key},
+            timeout=timeout,
+        )
+    except requests.RequestException as exc:
+        return SendOutcome(message, ok=False, retryable=True, error=f"{type(exc).__name__}: {exc}")
+
+    # 409: SAP a procesat deja cheia de idempotență -> considerăm trimis
+    if response.status_code < 300 or response.status_code == 409:
+        return SendOutcome(message, ok=True, retryable=False)
+    retry_after = None
+    header = response.headers.get("Retry-After")
+    if header and header.isdigit():
+        retry_after = float(header)
+    return SendOutcome(
+        message,
+        ok=False,
+        retryable=response.status_code in RETRYABLE_STATUS,
+        error=f"HTTP {response.status_code}: {response.text[:500]}",
+        retry_after=retry_after,
+    )
+
+
+def _record(outcome: SendOutcome, max_attempts: int) -> str:
+    """Scrie rezultatul doar dacă mesajul este încă revendicat de acest worker."""
+    message = outcome.message
+    now = timezone.now()
+    changes: Dict[str, Any] = {"attempts": message.attempts + 1, "claimed_at": None, "updated_at": now}
+    if outcome.ok:
+        changes.update(status="sent", sent_at=now, last_error="")
+    elif outcome.retryable and changes["attempts"] < max_attempts:
+        changes.update(
+            status="pending",
+            next_attempt_at=now + timedelta(seconds=backoff_delay(changes["attempts"], outcome.retry_after)),
+            last_error=outcome.error,
+        )
+    else:
+        changes.update(status="failed", last_error=outcome.error)
+    updated = SapOutboxMessage.objects.filter(
+        pk=message.pk, status="sending", claimed_at=message.claimed_at
+    ).update(**changes)
+    if not updated:
+        # Lease expirat: mesajul a fost revendicat din nou; rezultatul acelui worker rămâne
+        return "stale"
+    for field, value in changes.items():
+        setattr(message, field, value)
+    return changes["status"]
+
+
+def drain_outbox(
+    batch_size: int | None = None,
+    concurrency: int | None = None,
+    max_batches: int | None = None,
+    session: requests.Session | None = None,
+) -> Dict[str, int]:
+    """Golește outbox-ul în loturi; se oprește când nu mai sunt mesaje scadente."""
+    batch_size = batch_size or getattr(settings, "SAP_OUTBOX_BATCH_SIZE", 100)
+    concurrency = concurrency or getattr(settings, "SAP_OUTBOX_CONCURRENCY", 4)
+    max_attempts = getattr(settings, "SAP_OUTBOX_MAX_ATTEMPTS", 8)
+    timeout = getattr(settings, "SAP_API_TIMEOUT", 30)
+    url = settings.SAP_API_URL.rstrip("/") + getattr(settings, "SAP_CONFIRMATION_PATH", "/deliveries/confirmations")
+
+    stats = {"sent": 0, "pending": 0, "failed": 0, "stale": 0, "batches": 0}
+    own_session = session is None
+    session = session or build_session(concurrency)
+    try:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            while max_batches is None or stats["batches"] < max_batches:
+                messages = claim_batch(batch_size)
+                if not messages:
+                    break
+                outcomes = pool.map(lambda m: _send_one(session, url, timeout, m), messages)
+                for outcome in outcomes:
+                    stats[_record(outcome, max_attempts)] += 1
+                stats["batches"] += 1
+    finally:
+        if own_session:
+            session.close()
+    return stats
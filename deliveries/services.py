@@ -5,11 +5,20 @@ from decimal import Decimal
 from typing import Dict
 
 from django.core.exceptions import ValidationError
-from django.db import transaction
+from django.db import connection, transaction
+
+from core import metrics
 
 from .models import Delivery, DeliveryItem
 
 
+DELIVERY_VALIDATIONS = metrics.counter(
+    "edi_delivery_validations_total", "Validări de avize, după rezultat (approved/partial/error)", ["result"]
+)
+DELIVERY_VALIDATION_SECONDS = metrics.histogram("edi_delivery_validation_seconds", "Durata validării unui aviz")
+
+
+@metrics.instrument(DELIVERY_VALIDATION_SECONDS, DELIVERY_VALIDATIONS, result=lambda d: d.validation_status)
 @transaction.atomic
 def validate_delivery(delivery_id: int, validated_by_user, validation_data: Dict[int, Decimal]) -> Delivery:
     """Procesează validarea unui aviz.
@@ -18,10 +27,17 @@ def validate_delivery(delivery_id: int, validated_by_user, validation_data: Dict
     - Marcează discrepanțele
     - Actualizează `OrderItem.quantity_delivered`
     - Setează statusurile și câmpurile de audit
+    - Recalculează statusul comenzilor afectate
+    - Adaugă confirmarea pentru SAP în outbox (aceeași tranzacție)
     """
 
     delivery = Delivery.objects.select_for_update().get(pk=delivery_id)
-    items = list(delivery.items.select_related("order_item"))
+    items_qs = delivery.items.select_related("order_item")
+    if connection.features.has_select_for_update_of:
+        # Blocăm și pozițiile de comandă: două validări concurente pe aceeași
+        # poziție nu mai pot pierde una din incrementările `quantity_delivered`
+        items_qs = items_qs.select_for_update(of=("self", "order_item"))
+    items = list(items_qs)
 
     if not items:
         raise ValidationError("Avizul nu conține poziții pentru validare.")
@@ -50,6 +66,14 @@ def validate_delivery(delivery_id: int, validated_by_user, validation_data: Dict
 
     delivery.validated_at = timezone.now()
     delivery.save(update_fields=["validation_status", "status", "validated_by", "validated_at", "updated_at"])
+
+    from orders.services import refresh_order_statuses
+
+    refresh_order_statuses({delivery.order_id} | {item.order_item.order_id for item in items})
+
+    from .sap_outbox import enqueue_sap_confirmation
+
+    enqueue_sap_confirmation(delivery, items)
     return delivery
 
 
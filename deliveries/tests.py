@@ -0,0 +1,262 @@
+from __future__ import annotations
+
+import json
+import shutil
+import tempfile
+import threading
+from datetime import date, timedelta
+from decimal import Decimal
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase, override_settings
+from django.utils import timezone
+
+from orders.models import Order, OrderItem
+from partners.models import Partner
+
+from .models import Delivery, SapOutboxMessage
+from .views import DELIVERY_SUBMISSIONS, _submission_conflict
+from .outbound import export_validated_deliveries
+from .sap_outbox import SendOutcome, _record, claim_batch, drain_outbox
+
+
+class DesadvExportTests(TestCase):
+    def setUp(self) -> None:
+        self.partner = Partner.objects.create(partner_code="P001", name="Partener test")
+        self.order = Order.objects.create(
+            order_number="4500000001",
+            partner=self.partner,
+            total_value=Decimal("100"),
+            status="sent_to_partner",
+            delivery_date=date(2024, 3, 10),
+        )
+        self.output_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.output_dir, ignore_errors=True)
+
+    def _delivery(self, number: str, status: str = "validated", validated_at=None) -> Delivery:
+        return Delivery.objects.create(
+            delivery_number=number,
+            order=self.order,
+            partner=self.partner,
+            delivery_date=date(2024, 3, 12),
+            status=status,
+            validation_status="approved",
+            validated_at=validated_at,
+        )
+
+    def _exported_numbers(self, result) -> list[str]:
+        [path] = [p for p in result.files if p.endswith(".jsonl")]
+        return [json.loads(line)["delivery_number"] for line in Path(path).read_text(encoding="utf-8").splitlines()]
+
+    def test_late_committed_validation_is_exported_next_run(self) -> None:
+        now = timezone.now()
+        self._delivery("AV-2", validated_at=now)
+        # Validarea a setat `validated_at` înainte de AV-2, dar face commit după prima rulare
+        late = self._delivery("AV-1", status="submitted")
+
+        first = export_validated_deliveries(self.output_dir)
+        self.assertEqual(self._exported_numbers(first), ["AV-2"])
+
+        Delivery.objects.filter(pk=late.pk).update(status="validated", validated_at=now - timedelta(minutes=5))
+        second = export_validated_deliveries(self.output_dir)
+        self.assertEqual(self._exported_numbers(second), ["AV-1"])
+
+        third = export_validated_deliveries(self.output_dir)
+        self.assertEqual(third.deliveries, 0)
+        self.assertEqual(third.files, [])
+
+    def test_dry_run_does_not_mark_deliveries(self) -> None:
+        self._delivery("AV-1", validated_at=timezone.now())
+        self.assertEqual(export_validated_deliveries(self.output_dir, dry_run=True).deliveries, 1)
+        self.assertFalse(Delivery.objects.filter(desadv_exported_at__isnull=False).exists())
+        self.assertEqual(export_validated_deliveries(self.output_dir).deliveries, 1)
+
+
+class _StubSapHandler(BaseHTTPRequestHandler):
+    """Endpoint SAP local: răspunsul este ales după `delivery_number` din corpul JSON."""
+
+    responses: dict[str, tuple[int, dict[str, str]]] = {}
+    received: list[str] = []
+
+    def do_POST(self) -> None:  # noqa: N802
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        type(self).received.append(self.headers["Idempotency-Key"])
+        status, headers = type(self).responses[body["delivery_number"]]
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format: str, *args) -> None:  # type: ignore[no-untyped-def]
+        pass
+
+
+@override_settings(SAP_OUTBOX_LEASE_SECONDS=300, SAP_OUTBOX_MAX_ATTEMPTS=8, SAP_API_TIMEOUT=5)
+class SapOutboxTests(TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), _StubSapHandler)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.addClassCleanup(cls.server.server_close)
+        cls.addClassCleanup(cls.server.shutdown)
+
+    def setUp(self) -> None:
+        _StubSapHandler.responses = {}
+        _StubSapHandler.received = []
+        self.partner = Partner.objects.create(partner_code="P001", name="Partener test")
+        self.order = Order.objects.create(
+            order_number="4500000001",
+            partner=self.partner,
+            total_value=Decimal("100"),
+            status="in_delivery",
+            delivery_date=date(2024, 3, 10),
+        )
+        host, port = self.server.server_address[:2]
+        self.enterContext(override_settings(SAP_API_URL=f"http://{host}:{port}/api"))
+
+    def _message(self, number: str, **fields) -> SapOutboxMessage:  # type: ignore[no-untyped-def]
+        delivery = Delivery.objects.create(
+            delivery_number=number,
+            order=self.order,
+            partner=self.partner,
+            delivery_date=date(2024, 3, 12),
+            status="validated",
+        )
+        return SapOutboxMessage.objects.create(delivery=delivery, payload={"delivery_number": number}, **fields)
+
+    def test_expired_lease_is_reclaimed(self) -> None:
+        now = timezone.now()
+        stale = self._message("AV-1", status="sending", claimed_at=now - timedelta(seconds=301))
+        self._message("AV-2", status="sending", claimed_at=now - timedelta(seconds=10))
+        self._message("AV-3", next_attempt_at=now + timedelta(minutes=5))
+
+        self.assertEqual([m.pk for m in claim_batch(10)], [stale.pk])
+        stale.refresh_from_db()
+        self.assertEqual(stale.status, "sending")
+        self.assertGreater(stale.claimed_at, now)
+        # Lease-ul reînnoit: nu mai este revendicat până la expirare
+        self.assertEqual(claim_batch(10), [])
+
+    def test_late_outcome_after_lease_expiry_is_discarded(self) -> None:
+        message = self._message("AV-1")
+        [first] = claim_batch(10)
+        # Worker-ul întârzie peste lease; alt worker revendică și transmite mesajul
+        SapOutboxMessage.objects.filter(pk=message.pk).update(claimed_at=timezone.now() - timedelta(seconds=301))
+        [second] = claim_batch(10)
+        self.assertEqual(_record(SendOutcome(second, ok=True, retryable=False), max_attempts=8), "sent")
+
+        late = SendOutcome(first, ok=False, retryable=True, error="HTTP 503")
+        self.assertEqual(_record(late, max_attempts=8), "stale")
+        message.refresh_from_db()
+        self.assertEqual((message.status, message.attempts, message.last_error), ("sent", 1, ""))
+
+    def test_send_outcomes(self) -> None:
+        already = self._message("AV-1")
+        throttled = self._message("AV-2")
+        rejected = self._message("AV-3")
+        _StubSapHandler.responses = {
+            "AV-1": (409, {}),
+            "AV-2": (503, {"Retry-After": "120"}),
+            "AV-3": (400, {}),
+        }
+
+        stats = drain_outbox(concurrency=2)
+        self.assertEqual((stats["sent"], stats["pending"], stats["failed"], stats["stale"]), (1, 1, 1, 0))
+        self.assertEqual(
+            sorted(_StubSapHandler.received), sorted(m.idempotency_key for m in (already, throttled, rejected))
+        )
+
+        already.refresh_from_db()
+        self.assertEqual(already.status, "sent")  # 409: SAP are deja cheia de idempotență
+        self.assertIsNotNone(already.sent_at)
+        throttled.refresh_from_db()
+        self.assertEqual((throttled.status, throttled.attempts), ("pending", 1))
+        self.assertGreaterEqual(throttled.next_attempt_at, timezone.now() + timedelta(seconds=110))
+        self.assertIsNone(throttled.claimed_at)
+        rejected.refresh_from_db()
+        self.assertEqual(rejected.status, "failed")
+        self.assertIn("HTTP 400", rejected.last_error)
+
+
+class DeliverySubmissionTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()  # răspunsurile idempotente salvate de alte teste
+        self.partner = Partner.objects.create(partner_code="P001", name="Partener test")
+        self.order = Order.objects.create(
+            order_number="4500000001",
+            partner=self.partner,
+            total_value=Decimal("100"),
+            status="sent_to_partner",
+            delivery_date=date(2024, 3, 10),
+        )
+        OrderItem.objects.create(
+            order=self.order,
+            position=10,
+            material_code="MAT-001",
+            material_description="Țeavă",
+            quantity_ordered=Decimal("10"),
+            unit_of_measure="BUC",
+            delivery_date=date(2024, 3, 10),
+            net_price=Decimal("10"),
+            price_unit="1",
+            line_total=Decimal("100"),
+        )
+        session = self.client.session
+        session["partner_code"] = "P001"
+        session.save()
+
+    def _submit(self, token: str = "tok-1", notes: str = ""):  # type: ignore[no-untyped-def]
+        return self.client.post(
+            "/deliveries/create/",
+            {
+                "order": self.order.pk,
+                "delivery_date": "2024-03-12",
+                "notes": notes,
+                "idempotency_key": token,
+                "items-TOTAL_FORMS": "0",
+                "items-INITIAL_FORMS": "0",
+            },
+        )
+
+    def _counts(self) -> dict[str, float]:
+        return {key[0]: value for key, value in DELIVERY_SUBMISSIONS._values.items()}
+
+    def assert_counted(self, before: dict[str, float], **expected: int) -> None:
+        after = self._counts()
+        delta = {label: after.get(label, 0) - before.get(label, 0) for label in set(after) | set(before)}
+        self.assertEqual({k: v for k, v in delta.items() if v}, expected)
+
+    def test_replay_is_not_counted_as_submitted(self) -> None:
+        before = self._counts()
+        self.assertEqual(self._submit().status_code, 302)
+        replay = self._submit()
+        self.assertEqual(replay["Idempotent-Replayed"], "true")
+        self.assertEqual(Delivery.objects.count(), 1)
+        self.assert_counted(before, submitted=1, replayed=1)
+
+    def test_reused_token_with_other_data_is_422_with_form(self) -> None:
+        self._submit()
+        before = self._counts()
+        response = self._submit(notes="altceva")
+        self.assertEqual(response.status_code, 422)
+        self.assertContains(response, "deja trimis cu alte date", status_code=422)
+        # Formularul reafișat are un token nou, deci retrimiterea lui creează avizul
+        self.assertNotEqual(response.context["idempotency_key"], "tok-1")
+        self.assertEqual(Delivery.objects.count(), 1)
+        self.assert_counted(before, mismatch=1)
+
+    def test_in_progress_submission_is_409_with_same_token(self) -> None:
+        request = RequestFactory().post("/deliveries/create/", {"order": self.order.pk, "idempotency_key": "tok-1"})
+        request.partner = self.partner
+        request.user = AnonymousUser()
+        response = _submission_conflict(request, 409)
+        response.render()
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response["Retry-After"], "1")
+        self.assertEqual(response.context_data["idempotency_key"], "tok-1")
+        self.assertIn("în curs de trimitere", response.content.decode())
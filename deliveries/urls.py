@@ -7,6 +7,7 @@ from .views import (
     DeliveryDetailView,
     DeliveryListView,
     DeliveryValidateView,
+    delivery_export,
 )
 
 
@@ -15,6 +16,7 @@ app_name = "deliveries"
 urlpatterns = [
     path("", DeliveryListView.as_view(), name="delivery_list"),
     path("create/", DeliveryCreateView.as_view(), name="delivery_create"),
+    path("export/", delivery_export, name="delivery_export"),
     path("<int:pk>/", DeliveryDetailView.as_view(), name="delivery_detail"),
     path("<int:pk>/validate/", DeliveryValidateView.as_view(), name="delivery_validate"),
 ]
@@ -1,23 +1,112 @@
 from __future__ import annotations
 
+import uuid
 from decimal import Decimal
 
+from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
+from django.db import transaction
+from django.http import Http404
 from django.shortcuts import get_object_or_404, redirect, render
 from django.utils.decorators import method_decorator
+from django.views.decorators.http import require_GET
 from django.views.generic import CreateView, ListView, DetailView, UpdateView
 
+from archive.models import ArchivedDelivery
+from core import metrics
+from core.db_router import on_replica, use_replica
+from core.idempotency import fingerprint, idempotent
+from core.exports import export_response, get_export_chunk_size
+
 from partners.decorators import require_partner_login
 from partners.models import Partner
 from orders.models import Order, OrderItem
 
+from .filters import filter_deliveries
 from .forms import DeliveryForm, DeliveryItemFormSet, DeliveryValidationForm
 from .models import Delivery, DeliveryItem
 from .services import validate_delivery
 
 
+DELIVERY_SUBMISSIONS = metrics.counter(
+    "edi_delivery_submissions_total",
+    "Trimiteri de avize din portal (submitted/invalid/replayed/in_progress/mismatch/error)",
+    ["result"],
+)
+DELIVERY_SUBMIT_SECONDS = metrics.histogram("edi_delivery_submit_seconds", "Durata trimiterii unui aviz din portal")
+
+# Câmpul ascuns din formularul de aviz: un token nou la fiecare afișare
+IDEMPOTENCY_FIELD = "idempotency_key"
+
+
+def _submission_key(request):  # type: ignore[no-untyped-def]
+    token = request.POST.get(IDEMPOTENCY_FIELD, "").strip()
+    return f"{request.partner.pk}:{token}" if token else None
+
+
+def _submission_fingerprint(request):  # type: ignore[no-untyped-def]
+    fields = sorted(
+        (name, value)
+        for name, values in request.POST.lists()
+        if name not in ("csrfmiddlewaretoken", IDEMPOTENCY_FIELD)
+        for value in values
+    )
+    return fingerprint(*(f"{name}={value}" for name, value in fields))
+
+
+def _submission_conflict(request, status: int):  # type: ignore[no-untyped-def]
+    """Formularul, cu eroarea și statusul real (409/422), nu redirect-ul unei trimiteri reușite."""
+    view = DeliveryCreateView(request=request, args=(), kwargs={})
+    view.object = None
+    form = view.get_form()
+    form.is_valid()
+    if status == 409:
+        form.add_error(
+            None, "Avizul este încă în curs de trimitere. Verifică lista de avize înainte de a retrimite."
+        )
+        # Același token: reîncercarea primește rezultatul primei trimiteri
+        context = view.get_context_data(form=form)
+    else:
+        form.add_error(None, "Formularul a fost deja trimis cu alte date. Verifică datele și trimite din nou.")
+        # Token nou: retrimiterea corectată este un aviz nou, nu o reluare
+        context = view.get_context_data(form=form, idempotency_key=uuid.uuid4().hex)
+    response = view.render_to_response(context, status=status)
+    if status == 409:
+        response["Retry-After"] = "1"
+    response.submission_result = "in_progress" if status == 409 else "mismatch"
+    return response
+
+
+def _submission_result(response) -> str:  # type: ignore[no-untyped-def]
+    """Eticheta metricii din rezultatul view-ului, nu din status (și reluările sunt redirect)."""
+    if response.has_header("Idempotent-Replayed"):
+        return "replayed"
+    return getattr(response, "submission_result", "invalid")
+
+
 @method_decorator(require_partner_login, name="dispatch")
+@method_decorator(
+    metrics.instrument(
+        DELIVERY_SUBMIT_SECONDS,
+        DELIVERY_SUBMISSIONS,
+        result=_submission_result,
+    ),
+    name="post",
+)
+@method_decorator(
+    # Dublu-click pe „Trimite aviz”: a doua trimitere așteaptă și primește redirect-ul primei
+    idempotent(
+        "delivery_create",
+        key=_submission_key,
+        request_fingerprint=_submission_fingerprint,
+        store=lambda response: response.status_code == 302,
+        wait=settings.IDEMPOTENCY_FORM_WAIT_SECONDS,
+        atomic=True,
+        conflict=_submission_conflict,
+    ),
+    name="post",
+)
 class DeliveryCreateView(CreateView):
     template_name = "deliveries/delivery_create.html"
     form_class = DeliveryForm
@@ -25,6 +114,8 @@ class DeliveryCreateView(CreateView):
 
     def get_context_data(self, **kwargs):  # type: ignore[no-untyped-def]
         ctx = super().get_context_data(**kwargs)
+        # După o trimitere invalidă cheia a fost eliberată, deci tokenul poate fi refolosit
+        ctx.setdefault("idempotency_key", self.request.POST.get(IDEMPOTENCY_FIELD) or uuid.uuid4().hex)
         if self.request.POST:
             ctx["formset"] = DeliveryItemFormSet(self.request.POST)
         else:
@@ -46,7 +137,10 @@ class DeliveryCreateView(CreateView):
             ctx["formset"] = DeliveryItemFormSet(initial=initial)
         return ctx
 
+    @transaction.atomic
     def form_valid(self, form):  # type: ignore[no-untyped-def]
+        # O singură tranzacție de scriere (aviz + poziții + status): cu profilul
+        # SQLite "tuned" lock-ul se ia o dată, la început (BEGIN IMMEDIATE)
         partner: Partner = self.request.partner  # type: ignore[attr-defined]
         form.instance.partner = partner
         response = super().form_valid(form)
@@ -84,10 +178,12 @@ class DeliveryCreateView(CreateView):
             messages.success(self.request, "Avizul a fost trimis. Pozițiile au fost preluate din comandă.")
         else:
             messages.warning(self.request, "Aviz creat fără poziții (nu există cantități rămase).")
+        response.submission_result = "submitted"
         return response
 
 
 @method_decorator(login_required(login_url="/admin/login/"), name="dispatch")
+@method_decorator(use_replica, name="dispatch")
 class DeliveryListView(ListView):
     template_name = "deliveries/delivery_list.html"
     context_object_name = "deliveries"
@@ -95,16 +191,36 @@ class DeliveryListView(ListView):
 
     def get_queryset(self):  # type: ignore[no-untyped-def]
         qs = Delivery.objects.select_related("order", "partner").prefetch_related("items")
-        status = self.request.GET.get("status")
-        vstatus = self.request.GET.get("validation_status")
-        partner = self.request.GET.get("partner")
-        if status:
-            qs = qs.filter(status=status)
-        if vstatus:
-            qs = qs.filter(validation_status=vstatus)
-        if partner:
-            qs = qs.filter(partner__name__icontains=partner)
-        return qs.order_by("-delivery_date")
+        return filter_deliveries(qs, self.request.GET).order_by("-delivery_date")
+
+
+DELIVERY_EXPORT_COLUMNS = [
+    ("delivery_number", "Nr. aviz"),
+    ("order__order_number", "Comandă"),
+    ("partner__partner_code", "Cod partener"),
+    ("partner__name", "Partener"),
+    ("delivery_date", "Data"),
+    ("status", "Status"),
+    ("validation_status", "Validare"),
+    ("submitted_at", "Trimis la"),
+    ("validated_at", "Validat la"),
+]
+
+
+@login_required(login_url="/admin/login/")
+@require_GET
+def delivery_export(request):  # type: ignore[no-untyped-def]
+    """Export avize (CSV/XLSX) cu aceleași filtre ca `DeliveryListView`."""
+    qs = filter_deliveries(on_replica(Delivery.objects.order_by("-delivery_date", "pk")), request.GET)
+    rows = qs.values_list(*[f for f, _ in DELIVERY_EXPORT_COLUMNS]).iterator(
+        chunk_size=get_export_chunk_size()
+    )
+    return export_response(
+        request.GET.get("format", "csv"),
+        "avize",
+        [label for _, label in DELIVERY_EXPORT_COLUMNS],
+        rows,
+    )
 
 
 @method_decorator(login_required, name="dispatch")
@@ -150,4 +266,10 @@ class DeliveryDetailView(DetailView):
     context_object_name = "delivery"
     model = Delivery
 
+    def get_object(self, queryset=None):  # type: ignore[no-untyped-def]
+        try:
+            return super().get_object(queryset)
+        except Http404:
+            return get_object_or_404(ArchivedDelivery, pk=self.kwargs["pk"])
+
 
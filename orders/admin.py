@@ -2,7 +2,13 @@ from __future__ import annotations
 
 from django.contrib import admin
 
-from .models import Order, OrderItem
+from .models import Material, Order, OrderItem
+
+
+@admin.register(Material)
+class MaterialAdmin(admin.ModelAdmin):
+    list_display = ["code", "description", "is_active"]
+    search_fields = ["code", "description"]
 
 
 class OrderItemInline(admin.TabularInline):
@@ -44,5 +50,6 @@ class OrderItemAdmin(admin.ModelAdmin):
         "quantity_ordered",
         "quantity_delivered",
     ]
+    raw_id_fields = ["material"]
 
 
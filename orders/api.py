@@ -2,13 +2,32 @@ from __future__ import annotations
 
 from typing import Any
 
+from asgiref.sync import sync_to_async
 from django.conf import settings
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_POST
-from django.http import JsonResponse, HttpRequest
-import json
+from django.http import HttpRequest
 
-from .services import import_sap_order
+from core import metrics
+from core.idempotency import fingerprint, idempotent
+from core.ratelimit import client_ip, limit_concurrency, ratelimit
+from core.jsonapi import (
+    BodyDecodingError,
+    FastJsonResponse,
+    UnsupportedContentEncoding,
+    body_stream,
+    compress_response,
+    loads,
+    read_body,
+    spool_body,
+)
+
+from .edifact import iter_edifact_orders
+from .services import import_sap_order, import_sap_orders_batch
+
+
+WEBHOOK_REQUESTS = metrics.counter("edi_sap_webhook_requests_total", "Cereri webhook SAP, după status HTTP", ["result"])
+WEBHOOK_SECONDS = metrics.histogram("edi_sap_webhook_seconds", "Durata procesării unei cereri webhook SAP")
 
 
 def _authorized(request: HttpRequest) -> bool:
@@ -17,34 +36,148 @@ def _authorized(request: HttpRequest) -> bool:
     return bool(expected) and (provided == expected or provided == f"Bearer {expected}")
 
 
+def _import_orders(payload: Any) -> dict:
+    """Importă o comandă sau o listă de comenzi; fiecare comandă separat (erorile nu le opresc pe celelalte)."""
+    orders = payload if isinstance(payload, list) else [payload]
+    result: dict = {"success": 0, "errors": []}
+    for entry in orders:
+        try:
+            import_sap_order(entry)
+            result["success"] += 1
+        except Exception as exc:
+            result["errors"].append(str(exc))
+    return result
+
+
+def _read_payload(request: HttpRequest) -> Any:
+    """Corpul JSON (eventual gzip) parsat; la eroare, `FastJsonResponse` cu 400/415."""
+    try:
+        return loads(read_body(request))
+    except UnsupportedContentEncoding:
+        return FastJsonResponse({"error": "unsupported_content_encoding"}, status=415)
+    except BodyDecodingError:
+        return FastJsonResponse({"error": "invalid_body"}, status=400)
+    except ValueError:
+        return FastJsonResponse({"error": "invalid_json"}, status=400)
+
+
+def _idempotency_key(request: HttpRequest) -> str | None:
+    # Doar cererile autorizate rezervă chei sau primesc răspunsuri salvate
+    if not _authorized(request):
+        return None
+    return (request.headers.get("Idempotency-Key") or "").strip() or None
+
+
+def _payload_fingerprint(request: HttpRequest) -> str:
+    encoding = request.headers.get("Content-Encoding", "")
+    if request.content_type.lower() == "application/edifact":
+        # Corpul EDIFACT nu este încărcat în memorie: copia pe disc (parsată apoi de
+        # `_import_edifact`) dă amprenta întregului conținut, nu doar a lungimii
+        request._edifact_spool, digest = spool_body(request)  # type: ignore[attr-defined]
+        return fingerprint(request.content_type, encoding, digest)
+    return fingerprint(request.content_type, encoding, request.body)
+
+
+def _idempotency_conflict(request: HttpRequest, status: int) -> FastJsonResponse:
+    if status == 409:
+        response = FastJsonResponse({"error": "idempotency_key_in_progress"}, status=409)
+        response["Retry-After"] = "1"
+        return response
+    return FastJsonResponse({"error": "idempotency_key_reused"}, status=status)
+
+
+def _client_ident(request: HttpRequest) -> str:
+    # Cererile autorizate se limitează per cheie API, celelalte per IP
+    if _authorized(request):
+        return f"key:{request.headers.get('X-API-KEY') or request.headers.get('Authorization')}"
+    return f"ip:{client_ip(request)}"
+
+
+webhook_ratelimit = ratelimit("sap_webhook", settings.RATELIMIT_WEBHOOK, key=_client_ident)
+import_slots = limit_concurrency("sap_import", settings.IMPORT_MAX_CONCURRENT, timeout=settings.IMPORT_SLOT_TIMEOUT)
+webhook_idempotent = idempotent(
+    "sap_webhook",
+    key=_idempotency_key,
+    request_fingerprint=_payload_fingerprint,
+    conflict=_idempotency_conflict,
+)
+
+
+def _import_edifact(request: HttpRequest) -> FastJsonResponse:
+    # Cu Idempotency-Key corpul a fost deja citit în copia făcută pentru amprentă
+    spooled = getattr(request, "_edifact_spool", None)
+    try:
+        result = import_sap_orders_batch(iter_edifact_orders(body_stream(request, spooled)))
+    except UnsupportedContentEncoding:
+        return FastJsonResponse({"error": "unsupported_content_encoding"}, status=415)
+    except BodyDecodingError:
+        return FastJsonResponse({"error": "invalid_body"}, status=400)
+    finally:
+        if spooled is not None:
+            spooled.close()
+    return FastJsonResponse(result, status=207 if result["errors"] else 200)
+
+
 @csrf_exempt
+@metrics.instrument(WEBHOOK_SECONDS, WEBHOOK_REQUESTS, result=lambda response: str(response.status_code))
 @require_POST
+@webhook_ratelimit
+@compress_response
+@webhook_idempotent
+@import_slots
 def sap_orders_webhook(request: HttpRequest):  # type: ignore[no-untyped-def]
     """Endpoint pentru SAP (webhook) care primește comenzi și le importă.
 
     - Autorizare prin header `X-API-KEY` (sau `Authorization: Bearer <key>`)
     - Acceptă fie un obiect cu o singură comandă, fie o listă de comenzi
+    - Cu `Content-Type: application/EDIFACT` acceptă un interschimb ORDERS,
+      citit incremental din corpul cererii
+    - Corpul poate fi trimis comprimat (`Content-Encoding: gzip`)
+    - Cu header `Idempotency-Key`, o reîncercare a aceluiași lot primește
+      răspunsul salvat, fără un nou import
+    - Limitat per cheie API (429) și la `IMPORT_MAX_CONCURRENT` importuri
+      simultane (503), ambele cu `Retry-After`
     - Returnează JSON cu număr de succes și erori
     """
     if not _authorized(request):
-        return JsonResponse({"error": "unauthorized"}, status=401)
+        return FastJsonResponse({"error": "unauthorized"}, status=401)
 
-    try:
-        payload = json.loads(request.body.decode("utf-8"))
-    except json.JSONDecodeError:
-        return JsonResponse({"error": "invalid_json"}, status=400)
+    if request.content_type.lower() == "application/edifact":
+        return _import_edifact(request)
 
-    orders = payload if isinstance(payload, list) else [payload]
-    result = {"success": 0, "errors": []}
-    for entry in orders:
-        try:
-            import_sap_order(entry)
-            result["success"] += 1
-        except Exception as exc:
-            result["errors"].append(str(exc))
+    payload = _read_payload(request)
+    if isinstance(payload, FastJsonResponse):
+        return payload
 
+    result = _import_orders(payload)
     status = 207 if result["errors"] else 200
-    return JsonResponse(result, status=status)
+    return FastJsonResponse(result, status=status)
+
+
+@csrf_exempt
+@metrics.instrument(WEBHOOK_SECONDS, WEBHOOK_REQUESTS, result=lambda response: str(response.status_code))
+@require_POST
+@webhook_ratelimit
+@compress_response
+@webhook_idempotent
+@import_slots
+async def sap_orders_webhook_async(request: HttpRequest):  # type: ignore[no-untyped-def]
+    """Varianta ASGI a `sap_orders_webhook` (același contract).
+
+    Sub ASGI corpul cererii este primit de bucla de evenimente (o încărcare
+    lentă din SAP nu ține ocupat un thread); citirea lui și importul rulează
+    apoi într-un thread (`sync_to_async`), fără a bloca bucla.
+    """
+    if not _authorized(request):
+        return FastJsonResponse({"error": "unauthorized"}, status=401)
 
+    if request.content_type.lower() == "application/edifact":
+        return await sync_to_async(_import_edifact)(request)
 
+    # `request.body` citește fișierul temporar în care ASGIHandler a pus corpul (I/O blocant)
+    payload = await sync_to_async(_read_payload)(request)
+    if isinstance(payload, FastJsonResponse):
+        return payload
 
+    result = await sync_to_async(_import_orders)(payload)
+    return FastJsonResponse(result, status=207 if result["errors"] else 200)
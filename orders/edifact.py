@@ -0,0 +1,398 @@
+"""Suport EDIFACT: tokenizare incrementală și maparea mesajelor ORDERS (D.96A).
+
+Fluxul (fișier sau corpul unei cereri HTTP) este citit în blocuri de
+`chunk_size` octeți; segmentele sunt emise pe măsură ce terminatorul lor este
+întâlnit, iar un mesaj ORDERS (UNH ... UNT) este transformat în dict-ul acceptat
+de `import_sap_order` imediat ce se închide. În memorie se află doar blocul
+curent și mesajul în curs, indiferent de câte mesaje conține interschimbul.
+
+Segmente ORDERS folosite:
+- BGM (nr. comandă), DTM+137 (data comenzii), DTM+2 (data livrării cerute)
+- NAD+SU (furnizorul = `partner_code`), CUX (moneda), FTX (note)
+- LIN / PIA (poziție și cod material), IMD (descriere), QTY+21 (cantitate, UM)
+- PRI+AAA (preț net și unitatea de preț)
+"""
+
+from __future__ import annotations
+
+import codecs
+import re
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal, InvalidOperation
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional
+
+
+Segment = List[List[str]]
+
+
+@dataclass(frozen=True)
+class Delimiters:
+    """Separatorii de serviciu (implicit cei standard, suprascriși de UNA)."""
+
+    component: str = ":"
+    element: str = "+"
+    decimal: str = "."
+    release: str = "?"
+    segment: str = "'"
+
+    @classmethod
+    def from_una(cls, una: str) -> "Delimiters":
+        # UNA:+.? ' -> componentă, element, zecimal, release, rezervat, terminator
+        return cls(component=una[3], element=una[4], decimal=una[5], release=una[6], segment=una[8])
+
+
+DEFAULT_DELIMITERS = Delimiters()
+
+# Identificator sintaxă (UNB) -> codificare Python
+SYNTAX_ENCODINGS = {
+    "UNOA": "ascii",
+    "UNOB": "ascii",
+    "UNOC": "iso-8859-1",
+    "UNOD": "iso-8859-2",
+    "UNOE": "iso-8859-5",
+    "UNOW": "utf-8",
+    "UNOY": "utf-8",
+}
+
+
+def detect_encoding(head: bytes) -> str:
+    """Deduce codificarea din identificatorul de sintaxă din UNB (primul bloc)."""
+    match = re.search(rb"UNB.(UNO[A-Z])", head)
+    if match:
+        return SYNTAX_ENCODINGS.get(match.group(1).decode("ascii"), "iso-8859-1")
+    return "utf-8"
+
+
+def _split_escaped(text: str, sep: str, release: str) -> List[str]:
+    """`str.split` care ignoră separatorii precedați de caracterul release."""
+    parts = text.split(sep)
+    if release not in text:
+        return parts
+    result: List[str] = []
+    buffer: Optional[str] = None
+    for part in parts:
+        piece = part if buffer is None else buffer + sep + part
+        trailing = len(piece) - len(piece.rstrip(release))
+        if trailing % 2:
+            buffer = piece
+        else:
+            result.append(piece)
+            buffer = None
+    if buffer is not None:
+        result.append(buffer)
+    return result
+
+
+def _unescape(value: str, release: str) -> str:
+    if release not in value:
+        return value
+    return re.sub(re.escape(release) + "(.)", r"\1", value, flags=re.S)
+
+
+def parse_segment(raw: str, delimiters: Delimiters = DEFAULT_DELIMITERS) -> Segment:
+    """Descompune un segment (fără terminator) în elemente și componente."""
+    release = delimiters.release
+    return [
+        [_unescape(c, release) for c in _split_escaped(element, delimiters.component, release)]
+        for element in _split_escaped(raw, delimiters.element, release)
+    ]
+
+
+class SegmentReader:
+    """Citește incremental segmentele unui interschimb EDIFACT.
+
+    `stream` poate fi text sau binar (fișier deschis în mod `rb`, `HttpRequest`);
+    pentru fluxuri binare codificarea se deduce din UNB dacă nu e furnizată.
+    Separatorii din UNA sunt disponibili în `delimiters` după primul segment.
+    """
+
+    def __init__(self, stream: IO[Any], chunk_size: int = 64 * 1024, encoding: str | None = None) -> None:
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.encoding = encoding
+        self.delimiters = DEFAULT_DELIMITERS
+        self.segment_count = 0
+
+    def __iter__(self) -> Iterator[Segment]:
+        first = self.stream.read(self.chunk_size)
+        # Ne asigurăm că avem cel puțin antetul UNA/UNB în primul bloc
+        while first and len(first) < 128:
+            more = self.stream.read(self.chunk_size)
+            if not more:
+                break
+            first += more
+        decoder = None
+        if isinstance(first, bytes):
+            encoding = self.encoding or detect_encoding(first)
+            decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+            text = decoder.decode(first)
+        else:
+            text = first
+
+        text = text.lstrip("\ufeff\r\n ")
+        if text.startswith("UNA"):
+            self.delimiters = Delimiters.from_una(text[:9])
+            text = text[9:]
+
+        delimiters = self.delimiters
+        terminator = delimiters.segment
+        release = delimiters.release
+        buffer = text
+        eof = not first
+        while True:
+            if not eof:
+                chunk = self.stream.read(self.chunk_size)
+                if not chunk:
+                    eof = True
+                    if decoder is not None:
+                        buffer += decoder.decode(b"", final=True)
+                else:
+                    buffer += decoder.decode(chunk) if decoder is not None else chunk
+
+            pieces = _split_escaped(buffer, terminator, release)
+            # Ultima bucată poate fi un segment incomplet: o păstrăm pentru blocul următor
+            buffer = "" if eof else pieces.pop()
+            for raw in pieces:
+                raw = raw.strip("\r\n")
+                if raw:
+                    self.segment_count += 1
+                    yield parse_segment(raw, delimiters)
+            if eof:
+                break
+
+
+def iter_segments(stream: IO[Any], chunk_size: int = 64 * 1024, encoding: str | None = None) -> Iterator[Segment]:
+    """Generează segmentele unui interschimb EDIFACT citit incremental."""
+    return iter(SegmentReader(stream, chunk_size=chunk_size, encoding=encoding))
+
+
+# ---------------------------------------------------------------------------
+# Scriere EDIFACT (folosită pentru mesaje de ieșire și date de test)
+# ---------------------------------------------------------------------------
+
+def _escape(value: Any, delimiters: Delimiters) -> str:
+    text = "" if value is None else str(value)
+    for char in (delimiters.release, delimiters.segment, delimiters.element, delimiters.component):
+        if char in text:
+            text = text.replace(char, delimiters.release + char)
+    return text
+
+
+def format_segment(tag: str, *elements: Any, delimiters: Delimiters = DEFAULT_DELIMITERS) -> str:
+    """Serializează un segment; un element poate fi valoare simplă sau secvență de componente.
+
+    Componentele și elementele goale de la final sunt omise, conform sintaxei.
+    """
+    parts = [tag]
+    for element in elements:
+        if isinstance(element, (list, tuple)):
+            components = [_escape(c, delimiters) for c in element]
+            while components and not components[-1]:
+                components.pop()
+            parts.append(delimiters.component.join(components))
+        else:
+            parts.append(_escape(element, delimiters))
+    while len(parts) > 1 and not parts[-1]:
+        parts.pop()
+    return delimiters.element.join(parts) + delimiters.segment
+
+
+# ---------------------------------------------------------------------------
+# Mapare ORDERS -> dict `import_sap_order`
+# ---------------------------------------------------------------------------
+
+def _component(segment: Segment, element: int, component: int = 0) -> str:
+    try:
+        return segment[element][component]
+    except IndexError:
+        return ""
+
+
+def _edifact_date(value: str, fmt: str) -> str:
+    """Convertește DTM (102 = CCYYMMDD, 203/204 = cu oră) în ISO `YYYY-MM-DD`."""
+    if fmt in ("102", "203", "204", "") and len(value) >= 8:
+        return f"{value[0:4]}-{value[4:6]}-{value[6:8]}"
+    raise ValueError(f"Format DTM neacceptat: {fmt} ({value})")
+
+
+def _edifact_decimal(value: str, delimiters: Delimiters) -> str:
+    normalized = value.replace(delimiters.decimal, ".") if delimiters.decimal != "." else value
+    try:
+        return str(Decimal(normalized))
+    except InvalidOperation as exc:
+        raise ValueError(f"Valoare numerică invalidă: {value}") from exc
+
+
+class _OrdersMessage:
+    """Acumulează segmentele unui mesaj ORDERS și produce dict-ul de import."""
+
+    def __init__(self, reference: str, delimiters: Delimiters) -> None:
+        self.reference = reference
+        self.delimiters = delimiters
+        self.order: Dict[str, Any] = {"currency": "RON", "items": []}
+        self.item: Optional[Dict[str, Any]] = None
+        self.notes: List[str] = []
+
+    def feed(self, tag: str, segment: Segment) -> None:
+        handler = getattr(self, f"_seg_{tag}", None)
+        if handler is not None:
+            handler(segment)
+
+    def _seg_BGM(self, segment: Segment) -> None:
+        self.order["order_number"] = _component(segment, 2)
+
+    def _seg_DTM(self, segment: Segment) -> None:
+        qualifier = _component(segment, 1, 0)
+        if qualifier not in ("137", "2", "69"):
+            return
+        value = _edifact_date(_component(segment, 1, 1), _component(segment, 1, 2))
+        if self.item is not None:
+            if qualifier != "137":
+                self.item["delivery_date"] = value
+        elif qualifier == "137":
+            self.order["order_date"] = value
+        else:
+            self.order["delivery_date"] = value
+
+    def _seg_NAD(self, segment: Segment) -> None:
+        if _component(segment, 1) == "SU":
+            self.order["partner_code"] = _component(segment, 2)
+
+    def _seg_CUX(self, segment: Segment) -> None:
+        if _component(segment, 1, 1):
+            self.order["currency"] = _component(segment, 1, 1)
+
+    def _seg_FTX(self, segment: Segment) -> None:
+        text = " ".join(c for c in (segment[4] if len(segment) > 4 else []) if c)
+        if text:
+            self.notes.append(text)
+
+    def _seg_LIN(self, segment: Segment) -> None:
+        self.item = {
+            "position": int(_component(segment, 1) or len(self.order["items"]) + 1),
+            "material_code": _component(segment, 3),
+            "material_description": "",
+            "unit_of_measure": "",
+            "net_price": "0",
+            "price_unit": "",
+        }
+        self.order["items"].append(self.item)
+
+    def _seg_PIA(self, segment: Segment) -> None:
+        if self.item is not None and not self.item["material_code"]:
+            self.item["material_code"] = _component(segment, 2)
+
+    def _seg_IMD(self, segment: Segment) -> None:
+        if self.item is not None:
+            self.item["material_description"] = _component(segment, 3, 3)
+
+    def _seg_QTY(self, segment: Segment) -> None:
+        if self.item is not None and _component(segment, 1, 0) == "21":
+            self.item["quantity_ordered"] = _edifact_decimal(_component(segment, 1, 1), self.delimiters)
+            self.item["unit_of_measure"] = _component(segment, 1, 2)
+
+    def _seg_PRI(self, segment: Segment) -> None:
+        if self.item is not None and _component(segment, 1, 0) in ("AAA", "AAB"):
+            self.item["net_price"] = _edifact_decimal(_component(segment, 1, 1), self.delimiters)
+            self.item["price_unit"] = _component(segment, 1, 5)
+
+    def _seg_UNS(self, segment: Segment) -> None:
+        self.item = None
+
+    def build(self) -> Dict[str, Any]:
+        order = self.order
+        order.setdefault("order_number", self.reference)
+        if self.notes:
+            order["notes"] = "\n".join(self.notes)
+        for item in order["items"]:
+            item.setdefault("delivery_date", order.get("delivery_date"))
+            if not item["price_unit"]:
+                item["price_unit"] = item["unit_of_measure"]
+        if "delivery_date" not in order:
+            dates = [i["delivery_date"] for i in order["items"] if i.get("delivery_date")]
+            if dates:
+                order["delivery_date"] = min(dates)
+        return order
+
+
+def iter_edifact_orders(
+    stream: IO[Any], chunk_size: int = 64 * 1024, encoding: str | None = None
+) -> Iterator[Dict[str, Any]]:
+    """Generează comenzile (format `import_sap_order`) dintr-un interschimb ORDERS.
+
+    Mesajele invalide sau de alt tip sunt emise ca `{"order_number", "error"}`,
+    la fel ca la cititorul tabelar, pentru a fi raportate de importul în loturi.
+    """
+    reader = SegmentReader(stream, chunk_size=chunk_size, encoding=encoding)
+    message: Optional[_OrdersMessage] = None
+    failed: Optional[str] = None
+    for segment in reader:
+        tag = segment[0][0]
+        if tag == "UNH":
+            reference = _component(segment, 1)
+            message_type = _component(segment, 2, 0)
+            failed = None
+            message = None
+            if message_type != "ORDERS":
+                failed = f"Tip de mesaj neacceptat: {message_type}"
+            else:
+                message = _OrdersMessage(reference, reader.delimiters)
+        elif tag == "UNT":
+            if message is not None:
+                yield message.build()
+            elif failed is not None:
+                yield {"order_number": _component(segment, 2), "error": failed}
+            message = None
+            failed = None
+        elif message is not None:
+            try:
+                message.feed(tag, segment)
+            except (ValueError, IndexError) as exc:
+                failed = f"Segment {tag} invalid: {exc}"
+                yield {"order_number": message.order.get("order_number", message.reference), "error": failed}
+                message = None
+                failed = None
+
+
+def iter_edifact_orders_from_file(file_path: str, chunk_size: int = 64 * 1024) -> Iterator[Dict[str, Any]]:
+    """Comenzile dintr-un fișier EDIFACT; fișierul rămâne deschis cât e consumat generatorul."""
+    with open(file_path, "rb") as fh:
+        yield from iter_edifact_orders(fh, chunk_size=chunk_size)
+
+
+def build_orders_interchange(
+    orders: Iterable[Dict[str, Any]], sender: str = "SAP", recipient: str = "BARRIER", reference: str = "1"
+) -> Iterator[str]:
+    """Serializează comenzi (format `import_sap_order`) ca interschimb ORDERS D.96A.
+
+    Generează segmentele pe rând; folosit la teste, benchmark și reexpediere.
+    """
+    seg = format_segment
+    now = datetime.now()
+    yield "UNA:+.? '"
+    yield seg("UNB", ("UNOC", "3"), sender, recipient, (now.strftime("%y%m%d"), now.strftime("%H%M")), reference)
+    count = 0
+    for count, order in enumerate(orders, start=1):
+        lines = [
+            seg("UNH", str(count), ("ORDERS", "D", "96A", "UN")),
+            seg("BGM", "220", order["order_number"], "9"),
+            seg("DTM", ("137", str(order["order_date"]).replace("-", ""), "102")),
+            seg("DTM", ("2", str(order["delivery_date"]).replace("-", ""), "102")),
+        ]
+        if order.get("notes"):
+            lines.append(seg("FTX", "AAI", "", "", [order["notes"]]))
+        lines.append(seg("NAD", "SU", (order["partner_code"], "", "92")))
+        lines.append(seg("CUX", ("2", order.get("currency", "RON"), "9")))
+        for item in order["items"]:
+            lines += [
+                seg("LIN", item["position"], "", (item["material_code"], "SA")),
+                seg("IMD", "F", "", ("", "", "", item.get("material_description", ""))),
+                seg("QTY", ("21", item["quantity_ordered"], item.get("unit_of_measure", ""))),
+                seg("DTM", ("2", str(item["delivery_date"]).replace("-", ""), "102")),
+                seg("PRI", ("AAA", item["net_price"], "", "", "1", item.get("price_unit", ""))),
+            ]
+        lines.append(seg("UNS", "S"))
+        lines.append(seg("UNT", str(len(lines) + 1), str(count)))
+        yield from lines
+    yield seg("UNZ", str(count), reference)
@@ -0,0 +1,40 @@
+"""Filtre comune pentru listele de comenzi (UI și export)."""
+
+from __future__ import annotations
+
+from typing import Mapping
+
+from django.db.models import Exists, OuterRef, QuerySet
+
+from .models import OrderItem
+
+
+def filter_orders(qs: QuerySet, params: Mapping[str, str]) -> QuerySet:
+    """Aplică filtrele din query string (`status`, `partner`, `material`) pe un queryset de `Order`."""
+    status = params.get("status")
+    partner = params.get("partner")
+    material = params.get("material")
+    if status:
+        qs = qs.filter(status=status)
+    if partner:
+        qs = qs.filter(partner__name__icontains=partner)
+    if material:
+        # Codul este căutat în nomenclator, pozițiile sunt legate prin `material_id`
+        qs = qs.filter(
+            Exists(OrderItem.objects.filter(order=OuterRef("pk"), material__code__istartswith=material))
+        )
+    return qs
+
+
+def filter_order_items(qs: QuerySet, params: Mapping[str, str]) -> QuerySet:
+    """Aceleași filtre ca `filter_orders`, aplicate pe pozițiile de comandă."""
+    status = params.get("status")
+    partner = params.get("partner")
+    material = params.get("material")
+    if status:
+        qs = qs.filter(order__status=status)
+    if partner:
+        qs = qs.filter(order__partner__name__icontains=partner)
+    if material:
+        qs = qs.filter(material__code__istartswith=material)
+    return qs
@@ -0,0 +1,325 @@
+"""Capacitatea de conexiuni simultane: WSGI (gunicorn gthread) vs ASGI (uvicorn), view-uri sync vs async.
+
+Pentru fiecare mod pornește un server cu un singur proces pe o bază SQLite
+temporară, apoi, timp de `--duration` secunde:
+- `--slow-uploads` clienți trimit webhook-ului SAP corpuri JSON încet (pe
+  bucăți, în `--upload-seconds`), ca o legătură lentă cu SAP
+- `--pollers` clienți cer în buclă `order_items_api` (polling-ul JS din portal)
+
+Raportul arată câte cereri de polling au fost servite și latențele lor cât
+timp încărcările lente țin conexiuni deschise. Sub WSGI fiecare încărcare
+ocupă un thread până la ultimul octet; sub ASGI corpul este primit de bucla de
+evenimente, iar cu `ASYNC_API_VIEWS` nici view-urile nu mai țin un thread pe
+durata cererii.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import io
+import json
+import multiprocessing
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from itertools import count
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from core.benchdata import OrderGenerator, to_sap_payload
+from core.loadtest import percentile
+
+
+MODES: Dict[str, Tuple[str, bool]] = {
+    # mod -> (server, ASYNC_API_VIEWS)
+    "wsgi": ("gunicorn", False),
+    "asgi": ("uvicorn", False),
+    "asgi-async": ("uvicorn", True),
+}
+
+PREFIX = "BENCH"
+PARTNERS = 5
+
+
+def _prepare(env: Dict[str, str], lines: int) -> Tuple[str, int]:
+    """Schema, date seed și o sesiune de partener; întoarce (cheia sesiunii, id-ul comenzii interogate)."""
+    os.environ.update(env)
+    import django
+
+    django.setup()
+    from django.contrib.sessions.backends.db import SessionStore
+    from django.core.management import call_command
+
+    from orders.models import Order
+
+    call_command("migrate", verbosity=0)
+    call_command(
+        "seed_benchmark_data",
+        prefix=PREFIX,
+        partners=PARTNERS,
+        materials=max(lines, 500),
+        orders=200,
+        lines_distribution="fixed",
+        lines_mean=lines,
+        delivery_ratio=0.0,
+        stdout=io.StringIO(),
+    )
+    order = Order.objects.filter(order_number__startswith=f"{PREFIX}-").select_related("partner").first()
+    session = SessionStore()
+    session["partner_code"] = order.partner.partner_code
+    session.save()
+    return session.session_key, order.pk
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _server_command(server: str, port: int, threads: int) -> List[str]:
+    if server == "gunicorn":
+        return [
+            sys.executable, "-m", "gunicorn", "barrier_edi.wsgi:application",
+            "-k", "gthread", "--workers", "1", "--threads", str(threads),
+            "-b", f"127.0.0.1:{port}", "--log-level", "warning",
+        ]
+    return [
+        sys.executable, "-m", "uvicorn", "barrier_edi.asgi:application",
+        "--host", "127.0.0.1", "--port", str(port), "--workers", "1",
+        "--log-level", "warning", "--no-access-log",
+    ]
+
+
+async def _request(
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+    head: bytes,
+    body: bytes = b"",
+    chunks: int = 1,
+    send_seconds: float = 0.0,
+) -> int:
+    """Trimite o cerere HTTP/1.1 (corpul în `chunks` bucăți, pe `send_seconds`) și citește răspunsul."""
+    writer.write(head)
+    step = max(1, -(-len(body) // chunks)) if body else 0
+    for offset in range(0, len(body), step or 1):
+        writer.write(body[offset : offset + step])
+        await writer.drain()
+        if send_seconds:
+            await asyncio.sleep(send_seconds / chunks)
+    await writer.drain()
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError("conexiune închisă de server")
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _sep, value = line.decode("latin-1").partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value.strip())
+    await reader.readexactly(length)
+    return int(status_line.split()[1])
+
+
+class _Load:
+    def __init__(self, port: int, options: Dict[str, Any], session_key: str, order_id: int) -> None:
+        self.port = port
+        self.options = options
+        self.poll_head = (
+            f"GET /orders/{order_id}/items-api/ HTTP/1.1\r\nHost: 127.0.0.1\r\n"
+            f"Cookie: {settings.SESSION_COOKIE_NAME}={session_key}\r\nConnection: keep-alive\r\n\r\n"
+        ).encode()
+        self.generator = OrderGenerator(seed=7, partners=PARTNERS, materials=500)
+        self.order_numbers = count(10_000_000)
+        self.latencies: List[float] = []
+        self.poll_errors = 0
+        self.uploads = 0
+        self.upload_errors = 0
+        self.upload_latencies: List[float] = []
+
+    def _upload(self) -> Tuple[bytes, bytes]:
+        orders = [
+            to_sap_payload(self.generator.order(next(self.order_numbers)), PREFIX)
+            for _ in range(self.options["upload_orders"])
+        ]
+        body = json.dumps(orders).encode()
+        head = (
+            "POST /orders/api/sap/webhook/ HTTP/1.1\r\nHost: 127.0.0.1\r\nContent-Type: application/json\r\n"
+            f"X-API-KEY: {settings.SAP_API_KEY}\r\nContent-Length: {len(body)}\r\nConnection: close\r\n\r\n"
+        ).encode()
+        return head, body
+
+    async def poller(self, deadline: float) -> None:
+        timeout = self.options["timeout"]
+        while time.monotonic() < deadline:
+            try:
+                reader, writer = await asyncio.wait_for(asyncio.open_connection("127.0.0.1", self.port), timeout)
+            except (OSError, asyncio.TimeoutError):
+                self.poll_errors += 1
+                await asyncio.sleep(0.1)
+                continue
+            try:
+                while time.monotonic() < deadline:
+                    started = time.perf_counter()
+                    status = await asyncio.wait_for(_request(reader, writer, self.poll_head), timeout)
+                    self.latencies.append(time.perf_counter() - started)
+                    if status != 200:
+                        self.poll_errors += 1
+            except (OSError, ConnectionError, asyncio.TimeoutError, asyncio.IncompleteReadError):
+                self.poll_errors += 1
+            finally:
+                writer.close()
+
+    async def uploader(self, deadline: float) -> None:
+        seconds = self.options["upload_seconds"]
+        while time.monotonic() < deadline:
+            head, body = self._upload()
+            started = time.perf_counter()
+            try:
+                reader, writer = await asyncio.open_connection("127.0.0.1", self.port)
+                try:
+                    status = await asyncio.wait_for(
+                        _request(reader, writer, head, body, chunks=10, send_seconds=seconds),
+                        seconds + self.options["timeout"],
+                    )
+                finally:
+                    writer.close()
+            except (OSError, ConnectionError, asyncio.TimeoutError, asyncio.IncompleteReadError):
+                self.upload_errors += 1
+                continue
+            self.upload_latencies.append(time.perf_counter() - started)
+            if status == 200:
+                self.uploads += 1
+            else:
+                self.upload_errors += 1
+
+    async def run(self) -> float:
+        started = time.monotonic()
+        deadline = started + self.options["duration"]
+        tasks = [self.uploader(deadline) for _ in range(self.options["slow_uploads"])]
+        tasks += [self.poller(deadline) for _ in range(self.options["pollers"])]
+        await asyncio.gather(*tasks)
+        return time.monotonic() - started
+
+
+class Command(BaseCommand):
+    help = "Conexiuni simultane (polling + încărcări SAP lente): gunicorn gthread vs uvicorn, view-uri sync vs async."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--modes", default=",".join(MODES), help=f"Moduri separate prin virgulă ({', '.join(MODES)})")
+        parser.add_argument("--pollers", type=int, default=100, help="Clienți care interoghează order_items_api")
+        parser.add_argument("--slow-uploads", type=int, default=20, help="Încărcări webhook lente simultane")
+        parser.add_argument("--upload-seconds", type=float, default=5.0, help="Durata trimiterii unui corp webhook")
+        parser.add_argument("--upload-orders", type=int, default=5, help="Comenzi per corp webhook")
+        parser.add_argument("--duration", type=float, default=15.0, help="Durata fiecărui mod (secunde)")
+        parser.add_argument("--lines", type=int, default=50, help="Poziții ale comenzii interogate")
+        parser.add_argument("--wsgi-threads", type=int, default=8, help="Thread-uri gunicorn (gthread)")
+        parser.add_argument("--timeout", type=float, default=30.0, help="Timeout per cerere (secunde)")
+
+    def handle(self, *args, **options):  # type: ignore[no-untyped-def]
+        modes = [m.strip() for m in options["modes"].split(",") if m.strip()]
+        unknown = [m for m in modes if m not in MODES]
+        if unknown:
+            raise CommandError(f"Moduri necunoscute: {', '.join(unknown)}")
+
+        rows = []
+        with tempfile.TemporaryDirectory() as tmp:
+            env = {
+                "SQLITE_PATH": str(Path(tmp) / "bench.sqlite3"),
+                "DEBUG": "False",
+                "PERF_SERVER_TIMING": "False",
+                # Sub încărcare aproape toate cererile depășesc bugetul; fără loguri de avertizare
+                "PERF_BUDGET_MS": "3600000",
+                "DJANGO_SETTINGS_MODULE": os.environ.get("DJANGO_SETTINGS_MODULE", "barrier_edi.settings"),
+            }
+            with multiprocessing.get_context("spawn").Pool(1) as pool:
+                session_key, order_id = pool.apply(_prepare, (env, options["lines"]))
+
+            for mode in modes:
+                server, async_views = MODES[mode]
+                if importlib.util.find_spec(server) is None:
+                    self.stderr.write(f"{mode}: {server} nu este instalat, sărit")
+                    continue
+                result = self._run_mode(mode, server, async_views, env, session_key, order_id, options)
+                if result is not None:
+                    rows.append(result)
+        self._report(rows, options)
+
+    def _run_mode(
+        self,
+        mode: str,
+        server: str,
+        async_views: bool,
+        env: Dict[str, str],
+        session_key: str,
+        order_id: int,
+        options: Dict[str, Any],
+    ) -> Optional[Dict[str, Any]]:
+        port = _free_port()
+        process = subprocess.Popen(
+            _server_command(server, port, options["wsgi_threads"]),
+            cwd=settings.BASE_DIR,
+            env={**os.environ, **env, "ASYNC_API_VIEWS": str(async_views)},
+        )
+        try:
+            if not self._wait_ready(port, process):
+                self.stderr.write(f"{mode}: serverul nu a pornit")
+                return None
+            load = _Load(port, options, session_key, order_id)
+            elapsed = asyncio.run(load.run())
+        finally:
+            process.terminate()
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        return {
+            "mode": mode,
+            "polls": len(load.latencies),
+            "rps": len(load.latencies) / elapsed,
+            "p50": percentile(load.latencies, 50) * 1000,
+            "p95": percentile(load.latencies, 95) * 1000,
+            "p99": percentile(load.latencies, 99) * 1000,
+            "poll_errors": load.poll_errors,
+            "uploads": load.uploads,
+            "upload_errors": load.upload_errors,
+            "upload_p50": percentile(load.upload_latencies, 50),
+        }
+
+    @staticmethod
+    def _wait_ready(port: int, process: subprocess.Popen, timeout: float = 30.0) -> bool:
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                return False
+            try:
+                with socket.create_connection(("127.0.0.1", port), timeout=1):
+                    return True
+            except OSError:
+                time.sleep(0.2)
+        return False
+
+    def _report(self, rows: List[Dict[str, Any]], options: Dict[str, Any]) -> None:
+        self.stdout.write(
+            f"{options['pollers']} clienți polling + {options['slow_uploads']} încărcări lente "
+            f"({options['upload_seconds']:.0f}s/corp), {options['duration']:.0f}s per mod, 1 proces server"
+        )
+        self.stdout.write(
+            f"{'mod':<12} {'polling':>8} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'erori':>6} "
+            f"{'încărcări':>10} {'erori':>6} {'încărcare p50 s':>16}"
+        )
+        for row in rows:
+            self.stdout.write(
+                f"{row['mode']:<12} {row['polls']:>8} {row['rps']:>8.1f} {row['p50']:>8.1f} {row['p95']:>8.1f} "
+                f"{row['p99']:>8.1f} {row['poll_errors']:>6} {row['uploads']:>10} {row['upload_errors']:>6} "
+                f"{row['upload_p50']:>16.2f}"
+            )
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import tempfile
+import time
+import tracemalloc
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from orders.edifact import SegmentReader, build_orders_interchange, iter_edifact_orders
+
+
+def _synthetic_orders(messages: int, lines: int):  # type: ignore[no-untyped-def]
+    today = date.today().isoformat()
+    for n in range(messages):
+        yield {
+            "order_number": f"45{n:08d}",
+            "partner_code": "PART-001",
+            "order_date": today,
+            "delivery_date": today,
+            "currency": "RON",
+            "items": [
+                {
+                    "position": (i + 1) * 10,
+                    "material_code": f"MAT-{i:05d}",
+                    "material_description": "Material benchmark ?+:'",
+                    "quantity_ordered": "12.500",
+                    "unit_of_measure": "BUC",
+                    "delivery_date": today,
+                    "net_price": "99.90",
+                    "price_unit": "BUC",
+                }
+                for i in range(lines)
+            ],
+        }
+
+
+class Command(BaseCommand):
+    help = "Micro-benchmark pentru parserul EDIFACT ORDERS (segmente/s, mesaje/s, memorie)."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--messages", type=int, default=5000, help="Număr de mesaje ORDERS generate")
+        parser.add_argument("--lines", type=int, default=10, help="Poziții per mesaj")
+        parser.add_argument("--chunk-size", type=int, default=64 * 1024, help="Dimensiunea blocului citit")
+        parser.add_argument("--file", dest="file_path", default=None, help="Folosește un fișier EDIFACT existent")
+        parser.add_argument(
+            "--memory",
+            action="store_true",
+            default=False,
+            help="Rulează o trecere suplimentară cu tracemalloc pentru vârful de memorie",
+        )
+
+    def handle(self, *args, **options):  # type: ignore[no-untyped-def]
+        chunk_size = options["chunk_size"]
+        with tempfile.NamedTemporaryFile("w+b", suffix=".edi") as tmp:
+            path = options.get("file_path")
+            if not path:
+                for segment in build_orders_interchange(_synthetic_orders(options["messages"], options["lines"])):
+                    tmp.write(segment.encode("iso-8859-1") + b"\n")
+                tmp.flush()
+                path = tmp.name
+
+            with open(path, "rb") as fh:
+                reader = SegmentReader(fh, chunk_size=chunk_size)
+                started = time.perf_counter()
+                for _segment in reader:
+                    pass
+                tokenize_time = time.perf_counter() - started
+                size_mb = fh.tell() / (1024 * 1024)
+            segments = reader.segment_count
+
+            with open(path, "rb") as fh:
+                started = time.perf_counter()
+                messages = sum(1 for _order in iter_edifact_orders(fh, chunk_size=chunk_size))
+                map_time = time.perf_counter() - started
+
+            peak = None
+            if options["memory"]:
+                with open(path, "rb") as fh:
+                    tracemalloc.start()
+                    for _order in iter_edifact_orders(fh, chunk_size=chunk_size):
+                        pass
+                    _current, peak = tracemalloc.get_traced_memory()
+                    tracemalloc.stop()
+
+        self.stdout.write(f"Fișier: {size_mb:.1f} MB, {segments} segmente, {messages} mesaje")
+        self.stdout.write(
+            f"Tokenizare: {tokenize_time:.2f}s ({segments / tokenize_time:,.0f} segmente/s, "
+            f"{size_mb / tokenize_time:.1f} MB/s)"
+        )
+        self.stdout.write(
+            f"Tokenizare + mapare ORDERS: {map_time:.2f}s ({segments / map_time:,.0f} segmente/s, "
+            f"{messages / map_time:,.0f} mesaje/s)"
+        )
+        if peak is not None:
+            self.stdout.write(f"Vârf memorie alocată (tracemalloc): {peak / 1024:.0f} KiB")
@@ -0,0 +1,70 @@
+"""Generează un fișier JSON de comenzi SAP sintetice, de orice dimensiune.
+
+Fișierul are formatul citit de `import_sap_orders --file` / `sync_sap_orders`
+și acceptat de webhook; codurile de partener corespund celor create de
+`seed_benchmark_data` cu același `--prefix`. Scrierea este incrementală,
+deci memoria nu depinde de dimensiunea fișierului.
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.utils.dateparse import parse_date
+
+from core.benchdata import LINE_DISTRIBUTIONS, OrderGenerator, to_sap_payload, write_json_array
+
+
+class Command(BaseCommand):
+    help = "Generează un fișier JSON cu comenzi SAP sintetice (determinist după --seed)."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("output", help="Fișierul JSON generat ('-' pentru stdout)")
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--prefix", default="BENCH", help="Prefixul codurilor (ca la seed_benchmark_data)")
+        parser.add_argument("--orders", type=int, default=None, help="Numărul de comenzi (implicit 1000, nelimitat cu --size-mb)")
+        parser.add_argument("--size-mb", type=float, default=None, help="Oprește la dimensiunea dată (MB)")
+        parser.add_argument("--first-order", type=int, default=0, help="Numărul primei comenzi generate")
+        parser.add_argument("--partners", type=int, default=50)
+        parser.add_argument("--materials", type=int, default=5000)
+        parser.add_argument("--lines-distribution", choices=LINE_DISTRIBUTIONS, default="lognormal")
+        parser.add_argument("--lines-mean", type=int, default=10)
+        parser.add_argument("--lines-max", type=int, default=200)
+        parser.add_argument("--start-date", default="2024-01-01")
+        parser.add_argument("--days", type=int, default=365)
+
+    def handle(self, *args, **options):  # type: ignore[no-untyped-def]
+        start_date = parse_date(options["start_date"])
+        if start_date is None:
+            raise CommandError("--start-date invalid")
+        max_bytes = int(options["size_mb"] * 1024 * 1024) if options["size_mb"] else None
+        orders = options["orders"]
+        if orders is None:
+            orders = sys.maxsize if max_bytes else 1000
+        generator = OrderGenerator(
+            seed=options["seed"],
+            partners=options["partners"],
+            materials=options["materials"],
+            distribution=options["lines_distribution"],
+            lines_mean=options["lines_mean"],
+            lines_max=options["lines_max"],
+            start_date=start_date,
+            days=options["days"],
+        )
+        entries = (to_sap_payload(order, options["prefix"]) for order in generator.orders(orders, options["first_order"]))
+
+        started = time.perf_counter()
+        if options["output"] == "-":
+            # Direct pe sys.stdout: `self.stdout` adaugă un sfârșit de linie după fiecare scriere
+            write_json_array(sys.stdout, entries, max_bytes)
+            return
+        with open(options["output"], "w", encoding="utf-8") as fh:
+            written, size = write_json_array(fh, entries, max_bytes)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{written} comenzi, {size / 1024 / 1024:.1f} MB în {options['output']} "
+                f"({time.perf_counter() - started:.1f}s)"
+            )
+        )
@@ -1,15 +1,31 @@
 from __future__ import annotations
 
+import time
+
 from django.core.management.base import BaseCommand, CommandParser
 
 from orders.services import sync_sap_orders
 
 
 class Command(BaseCommand):
-    help = "Importă comenzi din SAP (mock sau fișier JSON)."
+    help = "Importă comenzi din SAP (mock, fișier JSON, export ALV XLSX/CSV sau EDIFACT ORDERS)."
 
     def add_arguments(self, parser: CommandParser) -> None:
-        parser.add_argument("--file", dest="file_path", help="Cale către fișier JSON local", default=None)
+        parser.add_argument("--file", dest="file_path", help="Cale către fișier JSON/XLSX/CSV/EDI local", default=None)
+        parser.add_argument(
+            "--format",
+            dest="file_format",
+            choices=["json", "xlsx", "csv", "edifact"],
+            default=None,
+            help="Formatul fișierului (implicit dedus din extensie)",
+        )
+        parser.add_argument("--sheet", default=None, help="Foaia din XLSX (implicit prima)")
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=None,
+            help="Comenzi per tranzacție (implicit SAP_IMPORT_BATCH_SIZE)",
+        )
         parser.add_argument(
             "--dry-run",
             action="store_true",
@@ -21,11 +37,19 @@ class Command(BaseCommand):
         file_path = options.get("file_path")
         dry_run = options.get("dry_run", False)
         self.stdout.write(self.style.NOTICE("Pornesc importul de comenzi SAP..."))
-        result = sync_sap_orders(file_path=file_path, dry_run=dry_run)
+        started = time.perf_counter()
+        result = sync_sap_orders(
+            file_path=file_path,
+            dry_run=dry_run,
+            file_format=options.get("file_format"),
+            sheet=options.get("sheet"),
+            batch_size=options.get("batch_size"),
+        )
+        elapsed = time.perf_counter() - started
         self.stdout.write(self.style.SUCCESS(f"Comenzi procesate cu succes: {result['success']}"))
+        rate = result["success"] / elapsed if elapsed else 0
+        self.stdout.write(f"Durată: {elapsed:.2f}s ({rate:.0f} comenzi/s)")
         if result["errors"]:
             self.stdout.write(self.style.ERROR("Erori întâlnite:"))
             for err in result["errors"]:
                 self.stdout.write(f" - {err}")
-
-
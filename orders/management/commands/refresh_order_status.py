@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import time
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from orders.services import refresh_order_statuses
+
+
+class Command(BaseCommand):
+    help = "Recalculează statusul comenzilor (pending -> in_delivery -> delivered) din cantitățile livrate."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--order",
+            dest="orders",
+            action="append",
+            type=int,
+            help="ID comandă (se poate repeta); implicit toate comenzile",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            default=False,
+            help="Afișează tranzițiile fără a le salva",
+        )
+
+    def handle(self, *args, **options):  # type: ignore[no-untyped-def]
+        started = time.perf_counter()
+        transitions = refresh_order_statuses(order_ids=options["orders"], dry_run=options["dry_run"])
+        elapsed = time.perf_counter() - started
+        for transition, count in sorted(transitions.items()):
+            self.stdout.write(f"{transition}: {count}")
+        prefix = "[DRY-RUN] " if options["dry_run"] else ""
+        self.stdout.write(
+            self.style.SUCCESS(f"{prefix}Comenzi actualizate: {sum(transitions.values())} | {elapsed:.2f}s")
+        )
@@ -0,0 +1,65 @@
+"""Populează `Material` și `OrderItem.material` din codurile existente.
+
+Rulează în bucăți keyset după `pk` (fiecare bucată în tranzacția ei), deci
+tabelele mari nu sunt blocate o perioadă lungă, iar o rulare întreruptă
+reia de unde a rămas (sunt tratate doar pozițiile fără material).
+"""
+
+from django.db import migrations, transaction
+from django.db.models import OuterRef, Subquery
+from django.utils import timezone
+
+
+CHUNK_SIZE = 5000
+
+
+def backfill_materials(apps, schema_editor):
+    Material = apps.get_model("orders", "Material")
+    OrderItem = apps.get_model("orders", "OrderItem")
+    db = schema_editor.connection.alias
+
+    last_pk = 0
+    while True:
+        rows = list(
+            OrderItem.objects.using(db)
+            .filter(pk__gt=last_pk, material__isnull=True)
+            .order_by("pk")
+            .values_list("pk", "material_code", "material_description")[:CHUNK_SIZE]
+        )
+        if not rows:
+            break
+        last_pk = rows[-1][0]
+
+        descriptions = {}
+        for _pk, code, description in rows:
+            descriptions.setdefault(code, description)
+        now = timezone.now()
+        with transaction.atomic(using=db):
+            Material.objects.using(db).bulk_create(
+                [
+                    Material(code=code, description=description[:255], created_at=now, updated_at=now)
+                    for code, description in descriptions.items()
+                ],
+                ignore_conflicts=True,
+            )
+            # Un singur UPDATE per bucată, cu lookup pe indexul unic `Material.code`
+            OrderItem.objects.using(db).filter(
+                pk__gte=rows[0][0], pk__lte=last_pk, material__isnull=True
+            ).update(
+                material_id=Subquery(
+                    Material.objects.using(db).filter(code=OuterRef("material_code")).values("id")[:1]
+                )
+            )
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ("orders", "0002_material"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_materials, migrations.RunPython.noop),
+    ]
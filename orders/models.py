@@ -50,6 +50,25 @@ class Order(BaseModel):
         return not self.items.exclude(quantity_delivered__gte=models.F("quantity_ordered")).exists()
 
 
+class Material(BaseModel):
+    """Nomenclator materiale (cod SAP unic), populat la importul comenzilor.
+
+    Pozițiile de comandă îl referă prin FK, deci căutările și agregările pe
+    material folosesc join-uri pe chei întregi în loc de comparații de text.
+    """
+
+    code = models.CharField(max_length=100, unique=True)
+    description = models.CharField(max_length=255, blank=True)
+
+    class Meta:
+        ordering = ["code"]
+        verbose_name = "Material"
+        verbose_name_plural = "Materiale"
+
+    def __str__(self) -> str:  # pragma: no cover
+        return self.code
+
+
 class OrderItem(BaseModel):
     """Poziție de comandă (material, cantitate, preț)."""
 
@@ -57,6 +76,10 @@ class OrderItem(BaseModel):
         Order, on_delete=models.CASCADE, related_name="items"
     )
     position = models.IntegerField()
+    material = models.ForeignKey(
+        Material, on_delete=models.PROTECT, related_name="order_items", null=True, blank=True
+    )
+    # Codul și textul din comanda SAP rămân pe poziție (textul poate diferi per comandă)
     material_code = models.CharField(max_length=100)
     material_description = models.CharField(max_length=255)
     quantity_ordered = models.DecimalField(max_digits=10, decimal_places=3)
@@ -80,10 +103,24 @@ class OrderItem(BaseModel):
         return f"{self.order.order_number} - Poz {self.position}"
 
     def save(self, *args: Any, **kwargs: Any) -> None:
-        """Calculează automat totalul liniei înainte de salvare.
+        """Calculează automat totalul liniei și leagă materialul înainte de salvare."""
+        self.line_total = self.calculate_line_total()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or "material_code" in update_fields:
+            if self.material_code and (self.material_id is None or self.material.code != self.material_code):
+                self.material, _ = Material.objects.get_or_create(
+                    code=self.material_code, defaults={"description": self.material_description}
+                )
+                if update_fields is not None:
+                    kwargs["update_fields"] = {*update_fields, "material"}
+        super().save(*args, **kwargs)
+
+    def calculate_line_total(self) -> Decimal:
+        """Totalul liniei (cantitate × preț net), rotunjit la 2 zecimale.
 
         Folosește conversie explicită la Decimal pentru a gestiona cazurile în
         care valorile sunt furnizate ca string (de ex. importuri din SAP/mock).
+        Apelat și direct la importul în bloc (`bulk_create` nu trece prin `save`).
         """
         try:
             quantity = Decimal(str(self.quantity_ordered)) if self.quantity_ordered is not None else Decimal("0")
@@ -93,8 +130,7 @@ class OrderItem(BaseModel):
             price = Decimal(str(self.net_price)) if self.net_price is not None else Decimal("0")
         except Exception:
             price = Decimal("0")
-        self.line_total = (quantity * price).quantize(Decimal("0.01"))
-        super().save(*args, **kwargs)
+        return (quantity * price).quantize(Decimal("0.01"))
 
     def get_remaining_quantity(self) -> Decimal:
         """Cantitatea rămasă de livrat pentru această poziție."""
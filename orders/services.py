@@ -2,15 +2,82 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from decimal import Decimal
-from typing import Any, Dict, List
+from typing import Any, Dict, Iterable, List
 
 from django.conf import settings
 from django.core.exceptions import ValidationError
-from django.db import transaction
+from django.db import connection, transaction
+from django.db.models import Case, CharField, Count, Exists, F, OuterRef, Value, When
+from django.utils import timezone
 
-from .models import Order, OrderItem
+from archive.models import ArchivedOrder
+from core import metrics
 
+from .models import Material, Order, OrderItem
 
+
+SAP_ORDER_IMPORTS = metrics.counter("edi_sap_order_imports_total", "Comenzi SAP importate, după rezultat", ["result"])
+SAP_ORDER_IMPORT_SECONDS = metrics.histogram("edi_sap_order_import_seconds", "Durata importului unei comenzi SAP")
+SAP_ORDER_LINES_IMPORTED = metrics.counter("edi_sap_order_lines_imported_total", "Poziții de comandă importate din SAP")
+SAP_SYNC_RUNS = metrics.counter("edi_sap_sync_runs_total", "Rulări sync_sap_orders, după rezultat", ["result"])
+SAP_SYNC_SECONDS = metrics.histogram(
+    "edi_sap_sync_seconds",
+    "Durata unei rulări sync_sap_orders",
+    buckets=(1, 5, 15, 30, 60, 120, 300, 600, 1800, 3600),
+)
+SAP_SYNC_LAST_SUCCESS = metrics.gauge(
+    "edi_sap_sync_last_success_timestamp_seconds",
+    "Momentul (epoch) ultimei sincronizări SAP fără erori",
+    multiprocess_mode="max",
+)
+
+
+# Cache în proces cod material -> id. Conține doar id-uri deja commit-ate
+# (completat prin `on_commit`), deci un savepoint anulat la import nu lasă
+# în cache materiale inexistente.
+_material_ids: Dict[str, int] = {}
+
+
+def _supports_upsert() -> bool:
+    """Upsert cu id-urile returnate (PostgreSQL); SQLite păstrează calea clasică."""
+    features = connection.features
+    return connection.vendor == "postgresql" and features.supports_update_conflicts_with_target
+
+
+def clear_material_cache() -> None:
+    _material_ids.clear()
+
+
+def resolve_materials(materials: Dict[str, str]) -> Dict[str, int]:
+    """Get-or-create în lot pentru `{cod: descriere}`; întoarce `{cod: id}`.
+
+    Codurile din cache nu ating baza de date; restul costă un SELECT, plus un
+    INSERT multi-rând (`ignore_conflicts`) și un SELECT pentru codurile noi.
+    """
+    resolved = {code: _material_ids[code] for code in materials if code in _material_ids}
+    missing = [code for code in materials if code not in resolved]
+    if not missing:
+        return resolved
+
+    found = dict(Material.objects.filter(code__in=missing).values_list("code", "id"))
+    new = [Material(code=code, description=(materials[code] or "")[:255]) for code in missing if code not in found]
+    if new and _supports_upsert():
+        # ON CONFLICT DO UPDATE întoarce id-ul și pentru codurile create între timp de alt proces
+        Material.objects.bulk_create(new, update_conflicts=True, unique_fields=["code"], update_fields=["code"])
+        found.update((m.code, m.pk) for m in new)
+    elif new:
+        Material.objects.bulk_create(new, ignore_conflicts=True)
+        found.update(Material.objects.filter(code__in=[m.code for m in new]).values_list("code", "id"))
+
+    max_size = getattr(settings, "MATERIAL_CACHE_SIZE", 100_000)
+    transaction.on_commit(
+        lambda: _material_ids.update(found) if len(_material_ids) < max_size else None
+    )
+    resolved.update(found)
+    return resolved
+
+
+@metrics.instrument(SAP_ORDER_IMPORT_SECONDS, SAP_ORDER_IMPORTS)
 @transaction.atomic
 def import_sap_order(sap_order_data: Dict[str, Any]) -> Order:
     """Importă o comandă dintr-un dict în format SAP simplificat.
@@ -31,6 +98,11 @@ def import_sap_order(sap_order_data: Dict[str, Any]) -> Order:
         if key not in sap_order_data:
             raise ValidationError(f"Câmp lipsă în comandă: {key}")
 
+    # O comandă deja arhivată nu este recreată: ar apărea de două ori în liste și rapoarte
+    order_number = sap_order_data["order_number"]
+    if ArchivedOrder.objects.filter(order_number=order_number).exists():
+        raise ValidationError(f"Comanda {order_number} este arhivată și nu mai poate fi reimportată")
+
     partner_code = sap_order_data["partner_code"]
     from partners.models import Partner
 
@@ -38,22 +110,36 @@ def import_sap_order(sap_order_data: Dict[str, Any]) -> Order:
     if not partner:
         raise ValidationError(f"Partener inexistent: {partner_code}")
 
-    order, _created = Order.objects.update_or_create(
-        order_number=sap_order_data["order_number"],
-        defaults={
-            "partner": partner,
-            "order_date": sap_order_data["order_date"],
-            "delivery_date": sap_order_data["delivery_date"],
-            "currency": sap_order_data.get("currency", "RON"),
-            "status": "pending",
-            "notes": sap_order_data.get("notes", ""),
-            "total_value": Decimal("0"),
-        },
-    )
+    defaults = {
+        "partner": partner,
+        "order_date": sap_order_data["order_date"],
+        "delivery_date": sap_order_data["delivery_date"],
+        "currency": sap_order_data.get("currency", "RON"),
+        "status": "pending",
+        "notes": sap_order_data.get("notes", ""),
+        "total_value": Decimal("0"),
+    }
+    if _supports_upsert():
+        # Un singur INSERT ... ON CONFLICT DO UPDATE ... RETURNING id (PostgreSQL),
+        # în loc de SELECT ... FOR UPDATE urmat de UPDATE / INSERT
+        order = Order(order_number=sap_order_data["order_number"], **defaults)
+        # `order_date` (auto_now_add) nu intră în UPDATE: `bulk_create` îl înlocuiește cu data curentă
+        Order.objects.bulk_create(
+            [order],
+            update_conflicts=True,
+            unique_fields=["order_number"],
+            update_fields=[*(f for f in defaults if f != "order_date"), "updated_at"],
+        )
+    else:
+        order, _created = Order.objects.update_or_create(
+            order_number=sap_order_data["order_number"], defaults=defaults
+        )
 
     # Curățăm pozițiile existente și le recreăm din datele SAP
     order.items.all().delete()
     total_value = Decimal("0")
+    to_create: List[OrderItem] = []
+    materials: Dict[str, str] = {}
     for item in sap_order_data["items"]:
         required_item = [
             "position",
@@ -69,7 +155,7 @@ def import_sap_order(sap_order_data: Dict[str, Any]) -> Order:
             if key not in item:
                 raise ValidationError(f"Câmp lipsă în poziție: {key}")
 
-        oi = OrderItem.objects.create(
+        oi = OrderItem(
             order=order,
             position=item["position"],
             material_code=item["material_code"],
@@ -80,26 +166,102 @@ def import_sap_order(sap_order_data: Dict[str, Any]) -> Order:
             net_price=Decimal(str(item["net_price"])),
             price_unit=item["price_unit"],
             price_unit_order=item.get("price_unit_order", ""),
-            line_total=Decimal("0"),
         )
+        oi.line_total = oi.calculate_line_total()
         total_value += oi.line_total
+        to_create.append(oi)
+        oi.material_code = str(oi.material_code)
+        materials.setdefault(oi.material_code, oi.material_description)
+
+    material_ids = resolve_materials(materials)
+    for oi in to_create:
+        oi.material_id = material_ids[oi.material_code]
+
+    # Un singur INSERT multi-rând în loc de câte un `save()` per poziție
+    OrderItem.objects.bulk_create(to_create, batch_size=500)
+    SAP_ORDER_LINES_IMPORTED.inc(len(to_create))
 
     order.total_value = total_value
-    order.save(update_fields=["total_value", "updated_at"])
+    # La inserare `auto_now_add` a pus data curentă; data comenzii este cea din SAP
+    order.order_date = sap_order_data["order_date"]
+    order.save(update_fields=["order_date", "total_value", "updated_at"])
     return order
 
 
-def sync_sap_orders(file_path: str | None = None, dry_run: bool = False) -> dict:
+def import_sap_orders_batch(
+    entries: Iterable[Dict[str, Any]], dry_run: bool = False, batch_size: int | None = None
+) -> dict:
+    """Importă un flux de comenzi în tranzacții de câte `batch_size` comenzi.
+
+    Fiecare comandă rămâne atomică (savepoint prin `import_sap_order`), dar
+    commit-ul se face o dată per lot, nu per comandă. `entries` poate fi un
+    generator, deci fluxul nu este încărcat integral în memorie. Intrările cu
+    cheia `error` (produse de cititoarele de fișiere) sunt raportate ca erori.
+    """
+    if batch_size is None:
+        batch_size = getattr(settings, "SAP_IMPORT_BATCH_SIZE", 200)
+
+    results: dict = {"success": 0, "errors": []}
+
+    def _run(batch: List[Dict[str, Any]]) -> None:
+        with transaction.atomic():
+            for entry in batch:
+                try:
+                    if "error" in entry:
+                        raise ValidationError(entry["error"])
+                    if not dry_run:
+                        import_sap_order(entry)
+                    results["success"] += 1
+                except Exception as exc:
+                    number = entry.get("order_number", "?") if isinstance(entry, dict) else "?"
+                    results["errors"].append(f"{number}: {exc}")
+
+    batch: List[Dict[str, Any]] = []
+    for entry in entries:
+        batch.append(entry)
+        if len(batch) >= batch_size:
+            _run(batch)
+            batch = []
+    if batch:
+        _run(batch)
+    return results
+
+
+TABULAR_FORMATS = {"xlsx", "xlsm", "csv"}
+EDIFACT_FORMATS = {"edi", "edifact"}
+
+
+@metrics.instrument(SAP_SYNC_SECONDS, SAP_SYNC_RUNS, result=lambda r: "partial" if r["errors"] else "ok")
+def sync_sap_orders(
+    file_path: str | None = None,
+    dry_run: bool = False,
+    file_format: str | None = None,
+    sheet: str | None = None,
+    batch_size: int | None = None,
+) -> dict:
     """Simulează sincronizarea comenzilor din SAP.
 
-    - Dacă `file_path` este furnizat, citește JSON local
+    - Dacă `file_path` este furnizat, citește JSON local, un export ALV
+      XLSX/CSV sau un interschimb EDIFACT ORDERS (formatul se deduce din
+      extensie dacă `file_format` lipsește)
     - Altfel, construiește date mock
-    - Pentru fiecare comandă: apelează `import_sap_order`
+    - Comenzile sunt importate în loturi prin `import_sap_orders_batch`
     """
     import json
     from datetime import date
 
-    if file_path:
+    if file_path and not file_format:
+        file_format = file_path.rsplit(".", 1)[-1].lower() if "." in file_path else "json"
+
+    if file_path and file_format in TABULAR_FORMATS:
+        from .tabular import iter_sap_orders_from_table
+
+        data: Iterable[Dict[str, Any]] = iter_sap_orders_from_table(file_path, sheet=sheet, file_format=file_format)
+    elif file_path and file_format in EDIFACT_FORMATS:
+        from .edifact import iter_edifact_orders_from_file
+
+        data = iter_edifact_orders_from_file(file_path)
+    elif file_path:
         with open(file_path, "r", encoding="utf-8") as f:
             data = json.load(f)
     else:
@@ -126,14 +288,51 @@ def sync_sap_orders(file_path: str | None = None, dry_run: bool = False) -> dict
             }
         ]
 
-    results = {"success": 0, "errors": []}
-    for entry in data:
-        try:
-            if not dry_run:
-                import_sap_order(entry)
-            results["success"] += 1
-        except Exception as exc:  # pragma: no cover - doar logging simplu
-            results["errors"].append(str(exc))
-    return results
+    result = import_sap_orders_batch(data, dry_run=dry_run, batch_size=batch_size)
+    if not result["errors"] and not dry_run:
+        SAP_SYNC_LAST_SUCCESS.set(timezone.now().timestamp())
+    return result
+
 
+def order_status_expression() -> Case:
+    """Statusul comenzii calculat în SQL din starea agregată a pozițiilor.
+
+    - `delivered`: are poziții și niciuna nu mai are cantitate de livrat
+    - `in_delivery`: cel puțin o poziție are cantitate livrată
+    - `pending`: nimic livrat (o comandă `in_delivery`/`delivered` revine aici
+      doar dacă livrările au fost corectate)
+
+    `sent_to_partner` rămâne neschimbat până la prima cantitate livrată.
+    """
+    items = OrderItem.objects.filter(order=OuterRef("pk"))
+    has_items = Exists(items)
+    has_open = Exists(items.filter(quantity_delivered__lt=F("quantity_ordered")))
+    has_delivered = Exists(items.filter(quantity_delivered__gt=0))
+    return Case(
+        When(has_items & ~has_open, then=Value("delivered")),
+        When(has_delivered, then=Value("in_delivery")),
+        When(status__in=("in_delivery", "delivered"), then=Value("pending")),
+        default=F("status"),
+        output_field=CharField(),
+    )
+
+
+def refresh_order_statuses(order_ids: Iterable[int] | None = None, dry_run: bool = False) -> Dict[str, int]:
+    """Recalculează statusul comenzilor printr-un singur UPDATE set-based.
+
+    Fără `order_ids` sunt tratate toate comenzile neanulate. Sunt scrise doar
+    rândurile al căror status se schimbă. Întoarce numărul de comenzi pe
+    tranziție (`"pending->in_delivery"` etc.).
+    """
+    new_status = order_status_expression()
+    qs = Order.objects.exclude(status="cancelled")
+    if order_ids is not None:
+        qs = qs.filter(pk__in=list(order_ids))
+    changed = qs.exclude(status=new_status)
 
+    transitions: Dict[str, int] = {}
+    for row in changed.values("status").annotate(new_status=new_status, count=Count("pk")).order_by():
+        transitions[f"{row['status']}->{row['new_status']}"] = row["count"]
+    if transitions and not dry_run:
+        changed.update(status=new_status, updated_at=timezone.now())
+    return transitions
@@ -0,0 +1,212 @@
+"""Citire comenzi SAP din exporturi tabelare (ALV -> XLSX / CSV).
+
+Fișierul este parcurs rând cu rând (`openpyxl` în mod `read_only`, respectiv
+`csv.reader`), iar rândurile consecutive cu același număr de comandă sunt
+grupate pe loc în dict-ul acceptat de `import_sap_order`. În memorie se află
+la un moment dat doar comanda curentă.
+"""
+
+from __future__ import annotations
+
+import csv
+from datetime import date, datetime
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from django.core.exceptions import ValidationError
+
+
+# Antet coloană (normalizat: lowercase, fără spații la capete) -> cheie internă.
+# Acoperă numele tehnice SAP (EKKO/EKPO), etichetele ALV în engleză și cheile proprii.
+COLUMN_ALIASES: Dict[str, str] = {
+    "order_number": "order_number",
+    "ebeln": "order_number",
+    "purchasing document": "order_number",
+    "partner_code": "partner_code",
+    "lifnr": "partner_code",
+    "vendor": "partner_code",
+    "supplier": "partner_code",
+    "order_date": "order_date",
+    "bedat": "order_date",
+    "document date": "order_date",
+    "delivery_date": "delivery_date",
+    "eindt": "delivery_date",
+    "delivery date": "delivery_date",
+    "currency": "currency",
+    "waers": "currency",
+    "position": "position",
+    "ebelp": "position",
+    "item": "position",
+    "material_code": "material_code",
+    "matnr": "material_code",
+    "material": "material_code",
+    "material_description": "material_description",
+    "txz01": "material_description",
+    "short text": "material_description",
+    "quantity_ordered": "quantity_ordered",
+    "menge": "quantity_ordered",
+    "order quantity": "quantity_ordered",
+    "unit_of_measure": "unit_of_measure",
+    "meins": "unit_of_measure",
+    "order unit": "unit_of_measure",
+    "net_price": "net_price",
+    "netpr": "net_price",
+    "net price": "net_price",
+    "price_unit": "price_unit",
+    "bprme": "price_unit",
+    "order price unit": "price_unit",
+    "price_unit_order": "price_unit_order",
+    "notes": "notes",
+}
+
+ORDER_FIELDS = ("order_number", "partner_code", "order_date", "currency", "notes")
+ITEM_FIELDS = (
+    "position",
+    "material_code",
+    "material_description",
+    "quantity_ordered",
+    "unit_of_measure",
+    "delivery_date",
+    "net_price",
+    "price_unit",
+    "price_unit_order",
+)
+
+
+def _map_header(header: Iterable[Any]) -> List[Optional[str]]:
+    mapped = [COLUMN_ALIASES.get(str(h or "").strip().lower()) for h in header]
+    missing = {"order_number", "partner_code", "position", "material_code", "quantity_ordered"} - set(mapped)
+    if missing:
+        raise ValidationError(f"Coloane lipsă în fișier: {', '.join(sorted(missing))}")
+    return mapped
+
+
+def _cell(value: Any) -> Any:
+    """Normalizează valorile citite din XLSX/CSV la tipurile așteptate de import."""
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, float):
+        return str(Decimal(repr(value)))
+    if isinstance(value, str):
+        return value.strip()
+    return value
+
+
+def _iter_xlsx_rows(path: Path, sheet: str | None) -> Iterator[tuple]:
+    from openpyxl import load_workbook
+
+    # Handle deschis explicit: cu o cale, openpyxl refuză fișierele fără extensie .xlsx/.xlsm
+    with open(path, "rb") as fh:
+        workbook = load_workbook(fh, read_only=True, data_only=True)
+        try:
+            worksheet = workbook[sheet] if sheet else workbook.worksheets[0]
+            yield from worksheet.iter_rows(values_only=True)
+        finally:
+            workbook.close()
+
+
+def _iter_csv_rows(path: Path) -> Iterator[list]:
+    with open(path, "r", encoding="utf-8-sig", newline="") as fh:
+        sample = fh.read(4096)
+        fh.seek(0)
+        try:
+            dialect = csv.Sniffer().sniff(sample, delimiters=";,\t")
+        except csv.Error:
+            dialect = csv.excel
+        yield from csv.reader(fh, dialect)
+
+
+XLSX_FORMATS = {"xlsx", "xlsm"}
+
+
+def iter_sap_rows(
+    file_path: str, sheet: str | None = None, file_format: str | None = None
+) -> Iterator[Dict[str, Any]]:
+    """Generează rândurile fișierului ca dict-uri cu chei interne.
+
+    Parserul este ales după `file_format` (ex. `--format xlsx` pentru un fișier
+    fără extensie); extensia este folosită doar dacă formatul lipsește.
+    """
+    path = Path(file_path)
+    file_format = (file_format or path.suffix.lstrip(".")).lower()
+    if file_format in XLSX_FORMATS:
+        raw_rows: Iterator[Any] = _iter_xlsx_rows(path, sheet)
+    else:
+        raw_rows = _iter_csv_rows(path)
+
+    header = _map_header(next(raw_rows, []))
+    for raw in raw_rows:
+        if not raw or all(v in (None, "") for v in raw):
+            continue
+        yield {key: _cell(value) for key, value in zip(header, raw) if key}
+
+
+def _order_sort_key(number: str) -> tuple:
+    # EBELN numeric (cu sau fără zerourile din față) comparat ca număr, ca sortarea din ALV / Excel
+    return (0, int(number), "") if number.isdigit() else (1, 0, number)
+
+
+def group_sap_rows(rows: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """Grupează rânduri consecutive cu același `order_number` în comenzi.
+
+    Fișierul trebuie sortat crescător după comandă (ca exporturile ALV sortate
+    după document): se reține doar ultimul număr de comandă, deci memoria nu
+    crește cu numărul de comenzi. O comandă care apare după una mai mare (fișier
+    nesortat, sau o comandă reapărută după ce a fost închisă) primește o comandă
+    cu cheia `error` și rândurile ei sunt ignorate; altfel a doua apariție ar
+    suprascrie pozițiile primei la import.
+    """
+    last: Optional[str] = None
+    skipped: Optional[str] = None
+    current: Optional[Dict[str, Any]] = None
+
+    def _finish(order: Dict[str, Any]) -> Dict[str, Any]:
+        dates = [i["delivery_date"] for i in order["items"] if i.get("delivery_date")]
+        order["delivery_date"] = min(dates) if dates else order.get("order_date")
+        for item in order["items"]:
+            if not item.get("delivery_date"):
+                item["delivery_date"] = order["delivery_date"]
+        return order
+
+    for row in rows:
+        number = str(row.get("order_number") or "")
+        if number == skipped:
+            continue
+        if current is None or number != current["order_number"]:
+            if current is not None:
+                yield _finish(current)
+                current = None
+            if number and last is not None and _order_sort_key(number) <= _order_sort_key(last):
+                skipped = number
+                yield {
+                    "order_number": number,
+                    "error": (
+                        f"Comanda {number} apare după comanda {last}; sortați fișierul crescător după comandă."
+                    ),
+                }
+                continue
+            if number:
+                last = number
+            current = {key: row.get(key) for key in ORDER_FIELDS if row.get(key) is not None}
+            current["order_number"] = number
+            current.setdefault("currency", "RON")
+            current["items"] = []
+        item = {key: row[key] for key in ITEM_FIELDS if row.get(key) is not None}
+        item.setdefault("material_description", "")
+        item.setdefault("unit_of_measure", "")
+        item.setdefault("net_price", "0")
+        item.setdefault("price_unit", item.get("unit_of_measure", ""))
+        current["items"].append(item)
+
+    if current is not None:
+        yield _finish(current)
+
+
+def iter_sap_orders_from_table(
+    file_path: str, sheet: str | None = None, file_format: str | None = None
+) -> Iterator[Dict[str, Any]]:
+    """Comenzile dintr-un fișier XLSX/CSV, în format `import_sap_order`."""
+    return group_sap_rows(iter_sap_rows(file_path, sheet=sheet, file_format=file_format))
@@ -0,0 +1,567 @@
+from __future__ import annotations
+
+import csv
+import gzip
+import io
+import os
+import tempfile
+import time
+from datetime import date
+from decimal import Decimal
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import path, reverse
+from django.utils import timezone
+
+from archive.models import ArchivedOrder
+from archive.services import archive_batch
+from core.constants import ORDER_STATUS_CHOICES
+from core.idempotency import fingerprint
+from deliveries.models import Delivery, DeliveryItem
+
+from partners.models import Partner
+
+from .api import sap_orders_webhook_async
+from .edifact import build_orders_interchange, iter_edifact_orders
+from .models import Material, Order, OrderItem
+from .services import (
+    clear_material_cache,
+    import_sap_order,
+    import_sap_orders_batch,
+    refresh_order_statuses,
+    resolve_materials,
+    sync_sap_orders,
+)
+from .tabular import group_sap_rows
+from .views import order_items_api, order_items_api_async
+
+
+# URL-uri pentru `AsyncViewTests`: variantele ASGI sunt rutate doar cu `ASYNC_API_VIEWS=True`
+urlpatterns = [
+    path("items/<int:order_id>/", order_items_api, name="items_sync"),
+    path("items-async/<int:order_id>/", order_items_api_async, name="items_async"),
+    path("webhook-async/", sap_orders_webhook_async, name="webhook_async"),
+]
+
+
+def sap_payload(order_number: str = "4500000001", order_date: str = "2024-03-05", quantity: str = "10") -> dict:
+    return {
+        "order_number": order_number,
+        "partner_code": "P001",
+        "order_date": order_date,
+        "delivery_date": "2024-04-01",
+        "currency": "RON",
+        "items": [
+            {
+                "position": 10,
+                "material_code": "MAT-001",
+                "material_description": "Țeavă",
+                "quantity_ordered": quantity,
+                "unit_of_measure": "BUC",
+                "delivery_date": "2024-04-01",
+                "net_price": "12.50",
+                "price_unit": "1",
+            }
+        ],
+    }
+
+
+class ImportSapOrderTests(TestCase):
+    def setUp(self) -> None:
+        clear_material_cache()
+        Partner.objects.create(partner_code="P001", name="Partener test")
+
+    def assert_keeps_sap_order_date(self) -> None:
+        created = import_sap_order(sap_payload())
+        created.refresh_from_db()
+        self.assertEqual(created.order_date, date(2024, 3, 5))
+        order = import_sap_order(sap_payload(quantity="20"))
+        order.refresh_from_db()
+        self.assertEqual(order.order_date, date(2024, 3, 5))
+        self.assertEqual(Order.objects.count(), 1)
+        self.assertEqual(order.items.get().quantity_ordered, 20)
+
+    def test_reimport_keeps_sap_order_date(self) -> None:
+        self.assert_keeps_sap_order_date()
+
+    def test_reimport_keeps_sap_order_date_with_upsert(self) -> None:
+        # Calea PostgreSQL (INSERT ... ON CONFLICT DO UPDATE); SQLite suportă aceeași sintaxă
+        with mock.patch("orders.services._supports_upsert", return_value=True):
+            self.assert_keeps_sap_order_date()
+
+    def test_archived_order_is_not_reimported(self) -> None:
+        order = import_sap_order(sap_payload())
+        Order.objects.filter(pk=order.pk).update(status="delivered")
+        archive_batch([order.pk], older_than_days=0)
+        self.assertTrue(ArchivedOrder.objects.filter(order_number="4500000001").exists())
+
+        with self.assertRaises(ValidationError):
+            import_sap_order(sap_payload())
+        result = import_sap_orders_batch([sap_payload()])
+        self.assertEqual(result["success"], 0)
+        self.assertEqual(len(result["errors"]), 1)
+        self.assertFalse(Order.objects.filter(order_number="4500000001").exists())
+
+
+class MaterialResolutionTests(TestCase):
+    def setUp(self) -> None:
+        clear_material_cache()
+        self.addCleanup(clear_material_cache)
+        Partner.objects.create(partner_code="P001", name="Partener test")
+
+    def test_codes_are_created_once_and_cached_after_commit(self) -> None:
+        existing = Material.objects.create(code="MAT-001", description="Țeavă")
+        with self.captureOnCommitCallbacks(execute=True):
+            ids = resolve_materials({"MAT-001": "alt text", "MAT-002": "Cot"})
+        self.assertEqual(ids["MAT-001"], existing.pk)
+        self.assertEqual(Material.objects.get(pk=ids["MAT-002"]).description, "Cot")
+
+        with self.assertNumQueries(0):
+            self.assertEqual(resolve_materials({"MAT-001": "", "MAT-002": ""}), ids)
+
+    def test_rolled_back_material_is_not_cached(self) -> None:
+        with self.captureOnCommitCallbacks(execute=True):
+            with self.assertRaises(RuntimeError), transaction.atomic():
+                resolve_materials({"MAT-009": "Flanșă"})
+                raise RuntimeError("import anulat")
+        self.assertFalse(Material.objects.exists())
+        with self.captureOnCommitCallbacks(execute=True):
+            [material_id] = resolve_materials({"MAT-009": "Flanșă"}).values()
+        self.assertTrue(Material.objects.filter(pk=material_id).exists())
+
+    def test_import_and_edits_link_order_items(self) -> None:
+        with self.captureOnCommitCallbacks(execute=True):
+            first = import_sap_order(sap_payload())
+            second = import_sap_order(sap_payload(order_number="4500000002"))
+        self.assertEqual(first.items.get().material_id, second.items.get().material_id)
+        self.assertEqual(Material.objects.get().code, "MAT-001")
+
+        item = second.items.get()
+        item.material_code = "MAT-002"
+        item.save(update_fields=["material_code"])
+        item.refresh_from_db()
+        self.assertEqual(item.material.code, "MAT-002")
+
+
+class SyncSapOrdersFormatTests(TestCase):
+    def setUp(self) -> None:
+        clear_material_cache()
+        Partner.objects.create(partner_code="P001", name="Partener test")
+
+    def test_explicit_format_overrides_missing_extension(self) -> None:
+        from openpyxl import Workbook
+
+        workbook = Workbook()
+        sheet = workbook.active
+        sheet.append(["EBELN", "LIFNR", "BEDAT", "EBELP", "MATNR", "TXZ01", "MENGE", "MEINS", "EINDT", "NETPR"])
+        sheet.append(["4500000001", "P001", "2024-03-05", 10, "MAT-001", "Țeavă", 10, "BUC", "2024-04-01", 12.5])
+        fd, path = tempfile.mkstemp()  # fără extensie, ca un fișier descărcat din SAP GUI
+        os.close(fd)
+        self.addCleanup(os.remove, path)
+        workbook.save(path)
+
+        result = sync_sap_orders(file_path=path, file_format="xlsx")
+        self.assertEqual(result["success"], 1, result["errors"])
+        order = Order.objects.get(order_number="4500000001")
+        self.assertEqual(order.order_date, date(2024, 3, 5))
+        self.assertEqual(order.items.get().material_code, "MAT-001")
+
+
+class RefreshOrderStatusesTests(TestCase):
+    """`refresh_order_statuses` (un UPDATE) dă același rezultat ca regulile aplicate comandă cu comandă."""
+
+    # Cantitățile livrate ale pozițiilor (comandate: 10 fiecare)
+    DELIVERIES = {
+        "fără poziții": [],
+        "nimic livrat": ["0", "0"],
+        "parțial": ["4", "0"],
+        "integral": ["10", "10"],
+        "peste comandă": ["12", "10"],
+    }
+
+    def setUp(self) -> None:
+        self.partner = Partner.objects.create(partner_code="P001", name="Partener test")
+
+    @staticmethod
+    def _expected(order: Order) -> str:
+        # Logica per comandă: `is_fully_delivered` + o poziție cu cantitate livrată
+        items = list(order.items.all())
+        if order.status == "cancelled":
+            return order.status
+        if items and order.is_fully_delivered():
+            return "delivered"
+        if any(item.quantity_delivered > 0 for item in items):
+            return "in_delivery"
+        if order.status in ("in_delivery", "delivered"):
+            return "pending"
+        return order.status
+
+    def test_matches_per_order_rules(self) -> None:
+        number = 4500000000
+        for status, _label in ORDER_STATUS_CHOICES:
+            for delivered in self.DELIVERIES.values():
+                number += 1
+                order = Order.objects.create(
+                    order_number=str(number),
+                    partner=self.partner,
+                    total_value=Decimal("100"),
+                    status=status,
+                    delivery_date=date(2024, 4, 1),
+                )
+                for position, quantity in enumerate(delivered, start=1):
+                    OrderItem.objects.create(
+                        order=order,
+                        position=position * 10,
+                        material_code="MAT-001",
+                        material_description="Țeavă",
+                        quantity_ordered=Decimal("10"),
+                        quantity_delivered=Decimal(quantity),
+                        unit_of_measure="BUC",
+                        delivery_date=date(2024, 4, 1),
+                        net_price=Decimal("10"),
+                        price_unit="1",
+                        line_total=Decimal("100"),
+                    )
+        expected = {order.pk: self._expected(order) for order in Order.objects.all()}
+        changed = sum(1 for order in Order.objects.all() if expected[order.pk] != order.status)
+        before = dict(Order.objects.values_list("pk", "updated_at"))
+
+        dry_run = refresh_order_statuses(dry_run=True)
+        self.assertEqual(sum(dry_run.values()), changed)
+        self.assertEqual(dict(Order.objects.values_list("pk", "updated_at")), before)
+
+        self.assertEqual(refresh_order_statuses(), dry_run)
+        self.assertEqual(dict(Order.objects.values_list("pk", "status")), expected)
+        # Doar rândurile schimbate sunt scrise
+        after = dict(Order.objects.values_list("pk", "updated_at"))
+        rewritten = {pk for pk in before if after[pk] != before[pk]}
+        self.assertEqual(len(rewritten), changed)
+        self.assertEqual(refresh_order_statuses(), {})
+
+
+@override_settings(EXPORT_CHUNK_SIZE=2)
+class OrderExportTests(TestCase):
+    def setUp(self) -> None:
+        self.partner = Partner.objects.create(partner_code="P001", name="Partener test")
+        for i, status in enumerate(("pending", "delivered", "pending", "pending", "cancelled"), start=1):
+            order = Order.objects.create(
+                order_number=f"450000000{i}",
+                partner=self.partner,
+                total_value=Decimal("100"),
+                status=status,
+                delivery_date=date(2024, 4, 1),
+            )
+            # `order_date` este `auto_now_add`: data SAP se setează după creare, ca la import
+            Order.objects.filter(pk=order.pk).update(order_date=date(2024, 3, i))
+        self.client.force_login(get_user_model().objects.create_user("intern", password="x"))
+
+    def test_csv_is_streamed_with_filters(self) -> None:
+        response = self.client.get(reverse("orders:order_export"), {"status": "pending"})
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Disposition"], 'attachment; filename="comenzi.csv"')
+        text = b"".join(response.streaming_content).decode("utf-8")
+        header, *rows = csv.reader(io.StringIO(text.lstrip("\ufeff")))
+        self.assertEqual(header[0], "Nr. comandă")
+        # Mai multe bucăți de `EXPORT_CHUNK_SIZE`, cele mai noi comenzi întâi
+        self.assertEqual([row[0] for row in rows], ["4500000004", "4500000003", "4500000001"])
+
+    def test_xlsx_export(self) -> None:
+        from openpyxl import load_workbook
+
+        response = self.client.get(reverse("orders:order_export"), {"format": "xlsx"})
+        self.assertTrue(response.streaming)
+        workbook = load_workbook(io.BytesIO(b"".join(response.streaming_content)), read_only=True)
+        rows = list(workbook.active.iter_rows(values_only=True))
+        self.assertEqual(len(rows), 6)
+        self.assertEqual(rows[1][:2], ("4500000005", "P001"))
+
+    def test_anonymous_user_is_redirected_to_login(self) -> None:
+        self.client.logout()
+        self.assertEqual(self.client.get(reverse("orders:order_export")).status_code, 302)
+
+
+class EdifactOrdersParserTests(SimpleTestCase):
+    def _interchange(self, *orders: dict) -> str:
+        return "\n".join(build_orders_interchange(orders))
+
+    def test_round_trip_with_escapes_across_tiny_chunks(self) -> None:
+        payload = sap_payload()
+        payload["notes"] = "Livrare: rampa 2+3, poarta 'B'?"
+        payload["items"][0]["material_description"] = "Café"
+        second = sap_payload(order_number="4500000002", quantity="7.5")
+        second["items"][0]["material_description"] = "Teava"
+        body = self._interchange(payload, second).encode("iso-8859-1")  # UNOC
+
+        # Blocuri de 7 octeți: segmentele și caracterele release sunt tăiate între blocuri
+        first, parsed = list(iter_edifact_orders(io.BytesIO(body), chunk_size=7))
+        self.assertEqual(first["order_number"], "4500000001")
+        self.assertEqual(
+            (first["partner_code"], first["order_date"], first["delivery_date"]), ("P001", "2024-03-05", "2024-04-01")
+        )
+        self.assertEqual(first["notes"], payload["notes"])
+        [item] = first["items"]
+        self.assertEqual(
+            (item["position"], item["material_code"], item["material_description"], item["quantity_ordered"]),
+            (10, "MAT-001", "Café", "10"),
+        )
+        self.assertEqual((item["net_price"], item["unit_of_measure"]), ("12.50", "BUC"))
+        self.assertEqual(parsed["items"][0]["quantity_ordered"], "7.5")
+
+    def test_invalid_message_is_reported_and_parsing_continues(self) -> None:
+        body = self._interchange(sap_payload(), sap_payload(order_number="4500000002"))
+        body = body.replace("QTY+21:10:BUC'", "QTY+21:zece:BUC'", 1)
+        broken, valid = list(iter_edifact_orders(io.StringIO(body)))
+        self.assertEqual(broken["order_number"], "4500000001")
+        self.assertIn("QTY", broken["error"])
+        self.assertEqual(valid["order_number"], "4500000002")
+        self.assertNotIn("error", valid)
+
+
+class GroupSapRowsTests(SimpleTestCase):
+    def _rows(self, *numbers: str) -> list[dict]:
+        return [
+            {"order_number": number, "partner_code": "P001", "position": 10 * i, "material_code": "MAT-001"}
+            for i, number in enumerate(numbers, start=1)
+        ]
+
+    def _grouped(self, *numbers: str) -> list[tuple[str, int | str]]:
+        return [
+            (order["order_number"], order.get("error") or len(order["items"]))
+            for order in group_sap_rows(self._rows(*numbers))
+        ]
+
+    def test_sorted_rows_are_grouped_numerically(self) -> None:
+        self.assertEqual(self._grouped("99", "99", "100", "4500000001"), [("99", 2), ("100", 1), ("4500000001", 1)])
+
+    def test_out_of_order_and_repeated_orders_are_errors(self) -> None:
+        grouped = self._grouped("4500000002", "4500000002", "4500000001", "4500000001", "4500000003", "4500000002")
+        self.assertEqual([number for number, _ in grouped], ["4500000002", "4500000001", "4500000003", "4500000002"])
+        self.assertEqual(grouped[0][1], 2)
+        self.assertIn("după comanda 4500000002", grouped[1][1])
+        self.assertEqual(grouped[2][1], 1)
+        self.assertIn("după comanda 4500000003", grouped[3][1])
+
+
+@override_settings(SAP_API_KEY="test-key", RATELIMIT_ENABLED=False)
+class EdifactWebhookIdempotencyTests(TestCase):
+    def setUp(self) -> None:
+        clear_material_cache()
+        Partner.objects.create(partner_code="P001", name="Partener test")
+
+    def _post(self, quantity: str, compressed: bool = False):  # type: ignore[no-untyped-def]
+        body = "\n".join(build_orders_interchange([sap_payload(quantity=quantity)])).encode("utf-8")
+        headers = {"X-API-KEY": "test-key", "Idempotency-Key": "lot-1"}
+        if compressed:
+            body = gzip.compress(body)
+            headers["Content-Encoding"] = "gzip"
+        return self.client.post(
+            reverse("orders:sap_webhook"), data=body, content_type="application/EDIFACT", headers=headers
+        )
+
+    def test_same_key_with_different_edifact_body_is_rejected(self) -> None:
+        self.assertEqual(self._post("10").status_code, 200)
+        replay = self._post("10")
+        self.assertEqual(replay["Idempotent-Replayed"], "true")
+        # Aceeași lungime a corpului, alt conținut: nu trebuie să primească răspunsul salvat
+        self.assertEqual(self._post("20").status_code, 422)
+        self.assertEqual(Order.objects.get().items.get().quantity_ordered, 10)
+
+    def test_gzip_body_is_imported_from_spooled_copy(self) -> None:
+        response = self._post("10", compressed=True)
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(Order.objects.get().items.get().quantity_ordered, 10)
+
+
+class OrderDetailApiTests(TestCase):
+    """API-urile paginate ale detaliului de comandă (`lines-api`, `deliveries-api`)."""
+
+    def setUp(self) -> None:
+        cache.clear()  # contoarele de rată ale altor teste
+        self.partner = Partner.objects.create(partner_code="P001", name="Partener test")
+        self.other = Partner.objects.create(partner_code="P002", name="Alt partener")
+        self.order = Order.objects.create(
+            order_number="4500000001",
+            partner=self.partner,
+            total_value=Decimal("500"),
+            status="in_delivery",
+            delivery_date=date(2024, 3, 10),
+        )
+        # Pozițiile 20 și 40 sunt livrate integral
+        self.items = {
+            position: self._item(self.order, position, delivered="10" if position in (20, 40) else "0")
+            for position in (10, 20, 30, 40, 50)
+        }
+        self.first = self._delivery("AV-1", date(2024, 3, 11))
+        self.second = self._delivery("AV-2", date(2024, 3, 12))
+        self.third = self._delivery("AV-3", date(2024, 3, 12))
+        # `bulk_create` păstrează `has_discrepancy` dat (`save()` l-ar recalcula din cantitatea rămasă)
+        DeliveryItem.objects.bulk_create([
+            DeliveryItem(
+                delivery=self.second,
+                order_item=self.items[30],
+                quantity_delivered=Decimal("4"),
+                quantity_accepted=Decimal("3"),
+                has_discrepancy=True,
+            ),
+            DeliveryItem(delivery=self.third, order_item=self.items[20], quantity_delivered=Decimal("10")),
+        ])
+        session = self.client.session
+        session["partner_code"] = "P001"
+        session.save()
+
+    def _item(self, order: Order, position: int, delivered: str) -> OrderItem:
+        return OrderItem.objects.create(
+            order=order,
+            position=position,
+            material_code=f"MAT-{position}",
+            material_description="Țeavă",
+            quantity_ordered=Decimal("10"),
+            unit_of_measure="BUC",
+            delivery_date=date(2024, 3, 10),
+            net_price=Decimal("10"),
+            price_unit="1",
+            line_total=Decimal("100"),
+            quantity_delivered=Decimal(delivered),
+        )
+
+    def _delivery(self, number: str, day: date) -> Delivery:
+        return Delivery.objects.create(
+            delivery_number=number,
+            order=self.order,
+            partner=self.partner,
+            delivery_date=day,
+            status="validated",
+            validation_status="approved",
+            validated_at=timezone.now(),
+            desadv_exported_at=timezone.now(),
+        )
+
+    def _lines(self, order_id: int | None = None, **params):  # type: ignore[no-untyped-def]
+        return self.client.get(reverse("orders:order_lines_api", args=[order_id or self.order.pk]), params)
+
+    def _deliveries(self, order_id: int | None = None, **params):  # type: ignore[no-untyped-def]
+        return self.client.get(reverse("orders:order_deliveries_api", args=[order_id or self.order.pk]), params)
+
+    def _positions(self, **params) -> tuple[list[int], int | None]:  # type: ignore[no-untyped-def]
+        data = self._lines(**params).json()
+        return [row["position"] for row in data["lines"]], data["next"]
+
+    def test_lines_are_paged_by_position_cursor(self) -> None:
+        self.assertEqual(self._positions(limit=2), ([10, 20], 20))
+        self.assertEqual(self._positions(limit=2, after=20), ([30, 40], 40))
+        self.assertEqual(self._positions(limit=2, after=40), ([50], None))
+        self.assertEqual(self._lines(after="x").status_code, 400)
+
+    def test_line_filters(self) -> None:
+        self.assertEqual(self._positions(filter="open"), ([10, 30, 50], None))
+        self.assertEqual(self._positions(filter="open", limit=1, after=10), ([30], 30))
+        self.assertEqual(self._positions(filter="discrepancies"), ([30], None))
+        self.assertEqual(self._lines(filter="altceva").status_code, 400)
+
+    def test_deliveries_are_paged_newest_first_by_date_and_id_cursor(self) -> None:
+        page = self._deliveries(limit=2).json()
+        # Aceeași dată: ordinea descrescătoare după id departajează
+        self.assertEqual([row["delivery_number"] for row in page["deliveries"]], ["AV-3", "AV-2"])
+        self.assertEqual(page["next"], f"2024-03-12_{self.second.pk}")
+        self.assertEqual(page["deliveries"][1]["discrepancy_count"], 1)
+
+        last = self._deliveries(limit=2, after=page["next"]).json()
+        self.assertEqual([row["delivery_number"] for row in last["deliveries"]], ["AV-1"])
+        self.assertIsNone(last["next"])
+        self.assertEqual(self._deliveries(after="2024-03-12").status_code, 400)
+
+    def test_delivery_discrepancy_filter(self) -> None:
+        data = self._deliveries(filter="discrepancies").json()
+        self.assertEqual([row["delivery_number"] for row in data["deliveries"]], ["AV-2"])
+        self.assertEqual(self._deliveries(filter="open").status_code, 400)
+
+    def test_archived_order_is_served_from_archive(self) -> None:
+        Order.objects.filter(pk=self.order.pk).update(status="delivered")
+        archive_batch([self.order.pk], older_than_days=0)
+        self.assertFalse(Order.objects.filter(pk=self.order.pk).exists())
+
+        self.assertEqual(self._positions(limit=2, after=20), ([30, 40], 40))
+        self.assertEqual(self._positions(filter="discrepancies"), ([30], None))
+        data = self._deliveries(filter="discrepancies").json()
+        self.assertEqual([row["delivery_number"] for row in data["deliveries"]], ["AV-2"])
+
+    def test_other_partners_order_is_404(self) -> None:
+        foreign = Order.objects.create(
+            order_number="4500000002",
+            partner=self.other,
+            total_value=Decimal("100"),
+            status="in_delivery",
+            delivery_date=date(2024, 3, 10),
+        )
+        self._item(foreign, 10, delivered="0")
+        self.assertEqual(self._lines(foreign.pk).status_code, 404)
+        self.assertEqual(self._deliveries(foreign.pk).status_code, 404)
+        self.assertEqual(self._lines(foreign.pk + 1000).status_code, 404)
+
+        self.client.session.flush()
+        self.client.cookies.clear()
+        self.assertEqual(self._lines().status_code, 401)
+
+    @override_settings(RATELIMIT_ENABLED=True)
+    def test_detail_apis_have_their_own_rate_bucket(self) -> None:
+        # Bugetul `order_items_api` al partenerului epuizat (fereastra curentă și vecinele ei)
+        window = int(time.time() // 60)
+        prefix = f"rl:order_items_api:{fingerprint('partner:P001')[:32]}"
+        for offset in (-1, 0, 1):
+            cache.set(f"{prefix}:{window + offset}", 10_000, 300)
+
+        self.assertEqual(
+            self.client.get(reverse("orders:order_items_api", args=[self.order.pk])).status_code, 429
+        )
+        self.assertEqual(self._lines().status_code, 200)
+        self.assertEqual(self._deliveries().status_code, 200)
+
+
+@override_settings(ROOT_URLCONF="orders.tests", SAP_API_KEY="test-key", RATELIMIT_ENABLED=False)
+class AsyncViewTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()  # răspunsurile idempotente salvate de alte teste
+        clear_material_cache()
+        Partner.objects.create(partner_code="P001", name="Partener test")
+        self.order = import_sap_order(sap_payload())
+        OrderItem.objects.filter(order=self.order).update(quantity_delivered=Decimal("2.5"))
+
+    def _partner_session(self) -> None:
+        session = self.client.session
+        session["partner_code"] = "P001"
+        session.save()
+        self.async_client.cookies = self.client.cookies
+
+    async def test_items_api_matches_sync_view(self) -> None:
+        url = f"/items-async/{self.order.pk}/"
+        self.assertEqual((await self.async_client.get(url)).status_code, 401)
+
+        await sync_to_async(self._partner_session)()
+        response = await self.async_client.get(url)
+        self.assertEqual(response.status_code, 200)
+        expected = await sync_to_async(self.client.get)(f"/items/{self.order.pk}/")
+        self.assertEqual(response.content, expected.content)
+        [item] = response.json()["items"]
+        self.assertEqual(item["remaining"], "7.500")
+
+    async def test_webhook_imports_and_replays(self) -> None:
+        url = "/webhook-async/"
+        body = sap_payload(order_number="4500000002", quantity="4")
+        self.assertEqual(
+            (await self.async_client.post(url, body, content_type="application/json")).status_code, 401
+        )
+
+        headers = {"X-API-KEY": "test-key", "Idempotency-Key": "lot-async"}
+        response = await self.async_client.post(url, body, content_type="application/json", headers=headers)
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(response.json()["success"], 1)
+        replay = await self.async_client.post(url, body, content_type="application/json", headers=headers)
+        self.assertEqual(replay["Idempotent-Replayed"], "true")
+        order = await Order.objects.aget(order_number="4500000002")
+        self.assertEqual(await order.items.acount(), 1)
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
+from django.conf import settings
 from django.urls import path
 from .views import OrderListView, OrderDetailView, OrderCreateView
-from .views import order_items_api
-from .api import sap_orders_webhook
+from .views import order_items_api, order_items_api_async, order_export, order_items_export
+from .views import order_deliveries_api, order_lines_api
+from .api import sap_orders_webhook, sap_orders_webhook_async
 
 
 app_name = "orders"
@@ -11,9 +13,21 @@ app_name = "orders"
 urlpatterns = [
     path("", OrderListView.as_view(), name="order_list"),
     path("create/", OrderCreateView.as_view(), name="order_create"),
+    path("export/", order_export, name="order_export"),
+    path("items/export/", order_items_export, name="order_items_export"),
     path("<int:pk>/", OrderDetailView.as_view(), name="order_detail"),
-    path("<int:order_id>/items-api/", order_items_api, name="order_items_api"),
-    path("api/sap/webhook/", sap_orders_webhook, name="sap_webhook"),
+    path(
+        "<int:order_id>/items-api/",
+        order_items_api_async if settings.ASYNC_API_VIEWS else order_items_api,
+        name="order_items_api",
+    ),
+    path("<int:order_id>/lines-api/", order_lines_api, name="order_lines_api"),
+    path("<int:order_id>/deliveries-api/", order_deliveries_api, name="order_deliveries_api"),
+    path(
+        "api/sap/webhook/",
+        sap_orders_webhook_async if settings.ASYNC_API_VIEWS else sap_orders_webhook,
+        name="sap_webhook",
+    ),
 ]
 
 
@@ -1,20 +1,34 @@
 from __future__ import annotations
 
+from django.conf import settings
 from django.contrib.auth.decorators import login_required
 from django.utils.decorators import method_decorator
-from django.db.models import Sum, F
+from django.db.models import Count, DecimalField, Exists, ExpressionWrapper, F, OuterRef, Q, Sum, Value
+from django.db.models.functions import Coalesce
 from django.views.generic import ListView, DetailView, TemplateView, CreateView
+from datetime import date
 from decimal import Decimal
 
 from .models import Order, OrderItem
+from .filters import filter_order_items, filter_orders
 from .forms import OrderForm, OrderItemForm
 from django.forms import inlineformset_factory
-from django.http import JsonResponse
+from django.http import Http404
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
 from django.views.decorators.http import require_GET
 from partners.models import Partner
+from archive.models import ArchivedDeliveryItem, ArchivedOrder
+from deliveries.models import DeliveryItem
+from core.constants import DELIVERY_STATUS_CHOICES, VALIDATION_STATUS_CHOICES
+from core.db_router import on_replica, use_replica
+from core.jsonapi import FastJsonResponse, compress_response
+from core.ratelimit import client_ip, ratelimit
+from core.exports import export_response, get_export_chunk_size
 
 
 @method_decorator(login_required(login_url="/admin/login/?next=/orders/"), name="dispatch")
+@method_decorator(use_replica, name="dispatch")
 class OrderListView(ListView):
     """Listă de comenzi pentru utilizatori interni.
 
@@ -26,26 +40,20 @@ class OrderListView(ListView):
     context_object_name = "orders"
 
     def get_queryset(self):  # type: ignore[no-untyped-def]
-        qs = (
-            Order.objects.select_related("partner")
-            .prefetch_related("items")
-            .order_by("-order_date")
-        )
-        status = self.request.GET.get("status")
-        partner = self.request.GET.get("partner")
-        if status:
-            qs = qs.filter(status=status)
-        if partner:
-            qs = qs.filter(partner__name__icontains=partner)
-        return qs
+        qs = Order.objects.select_related("partner").order_by("-order_date")
+        return filter_orders(qs, self.request.GET)
 
     def get_context_data(self, **kwargs):  # type: ignore[no-untyped-def]
-        # Folosim queryset-ul complet (nepaginat) pentru statistici, apoi apelăm super()
-        full_qs = self.get_queryset()
         ctx = super().get_context_data(**kwargs)
-        total_orders = full_qs.count()
-        active_orders = full_qs.exclude(status__in=["delivered", "cancelled"]).count()
-        total_value = full_qs.aggregate(total=Sum("total_value"))['total'] or 0
+        # Statisticile pe tot queryset-ul filtrat (nepaginat), într-un singur SELECT agregat
+        stats = self.object_list.order_by().aggregate(
+            total_orders=Count("pk"),
+            active_orders=Count("pk", filter=~Q(status__in=["delivered", "cancelled"])),
+            total_value=Sum("total_value"),
+        )
+        total_orders = stats["total_orders"]
+        active_orders = stats["active_orders"]
+        total_value = stats["total_value"] or 0
         ctx.update({
             "stats": {
                 "total_orders": total_orders,
@@ -62,18 +70,29 @@ class OrderDetailView(DetailView):
     context_object_name = "order"
     model = Order
 
+    def get_object(self, queryset=None):  # type: ignore[no-untyped-def]
+        try:
+            return super().get_object(queryset)
+        except Http404:
+            # Comenzile închise mutate în arhivă rămân accesibile la același URL
+            return get_object_or_404(ArchivedOrder, pk=self.kwargs["pk"])
+
     def get_context_data(self, **kwargs):  # type: ignore[no-untyped-def]
         ctx = super().get_context_data(**kwargs)
         order: Order = ctx["order"]
-        deliveries = order.deliveries.all().prefetch_related("items")
-        total_ordered = order.items.aggregate(s=Sum("quantity_ordered"))['s'] or 0
-        total_delivered = order.items.aggregate(s=Sum("quantity_delivered"))['s'] or 0
+        # Pozițiile și avizele se încarcă paginat (`order_lines_api`, `order_deliveries_api`);
+        # pagina are doar totalurile, într-un singur SELECT agregat
+        totals = order.items.aggregate(
+            lines=Count("pk"), total_ordered=Sum("quantity_ordered"), total_delivered=Sum("quantity_delivered")
+        )
+        total_ordered = totals["total_ordered"] or 0
+        total_delivered = totals["total_delivered"] or 0
         percentage = 0
         if total_ordered:
             percentage = round(float(total_delivered) / float(total_ordered) * 100, 2)
         ctx.update({
-            "deliveries": deliveries,
             "delivery_stats": {
+                "lines": totals["lines"],
                 "total_ordered": total_ordered,
                 "total_delivered": total_delivered,
                 "percentage": percentage,
@@ -121,7 +140,57 @@ class OrderCreateView(CreateView):
             return self.render_to_response(self.get_context_data(form=form, formset=formset))
 
 
+_QUANTITY_STEP = Decimal("0.001")
+
+
+def _remaining():  # type: ignore[no-untyped-def]
+    """Cantitatea rămasă a unei poziții, ca expresie SQL."""
+    return ExpressionWrapper(
+        F("quantity_ordered") - Coalesce("quantity_delivered", Value(Decimal("0"))),
+        output_field=DecimalField(max_digits=10, decimal_places=3),
+    )
+
+
+def _remaining_items(order_id: int):  # type: ignore[no-untyped-def]
+    """Pozițiile comenzii cu cantitate rămasă, calculată și filtrată în SQL.
+
+    O comandă inexistentă și una fără poziții dau același răspuns, deci
+    pozițiile se citesc direct, fără interogarea separată a comenzii.
+    """
+    return (
+        OrderItem.objects.filter(order_id=order_id)
+        .annotate(remaining=_remaining())
+        # Jumătate de pas: SQLite face diferența în virgulă mobilă
+        .filter(remaining__gt=_QUANTITY_STEP / 2)
+        .order_by("position")
+        .values("id", "material_code", "material_description", "remaining")
+    )
+
+
+def _remaining_row(row: dict) -> dict:
+    # `remaining` rămâne Decimal cu 3 zecimale (ca `get_remaining_quantity`), serializat exact
+    row["remaining"] = row["remaining"].quantize(_QUANTITY_STEP)
+    return row
+
+
+def _portal_ident(request) -> str:  # type: ignore[no-untyped-def]
+    # Per partener (sesiune), per utilizator staff, altfel per IP
+    code = request.session.get("partner_code")
+    if code:
+        return f"partner:{code}"
+    if request.user.is_authenticated:
+        return f"user:{request.user.pk}"
+    return f"ip:{client_ip(request)}"
+
+
+items_api_ratelimit = ratelimit("order_items_api", settings.RATELIMIT_ITEMS_API, key=_portal_ident)
+# Pagina de detaliu încarcă pozițiile și avizele în pagini: buget separat de `order_items_api`
+detail_api_ratelimit = ratelimit("order_detail_api", settings.RATELIMIT_ORDER_DETAIL_API, key=_portal_ident)
+
+
 @require_GET
+@items_api_ratelimit
+@compress_response
 def order_items_api(request, order_id: int):  # type: ignore[no-untyped-def]
     """API simplu: pozițiile unei comenzi cu cantitățile rămase (pentru populare JS)."""
     # Autorizare: staff autentificat SAU partener cu sesiune validă
@@ -131,21 +200,229 @@ def order_items_api(request, order_id: int):  # type: ignore[no-untyped-def]
     if code:
         partner_ok = Partner.objects.filter(partner_code=code, is_active=True).exists()
     if not (is_staff or partner_ok):
-        return JsonResponse({"error": "unauthorized"}, status=401)
+        return FastJsonResponse({"error": "unauthorized"}, status=401)
+    return FastJsonResponse({"items": [_remaining_row(row) for row in _remaining_items(order_id)]})
+
+
+@require_GET
+@items_api_ratelimit
+@compress_response
+async def order_items_api_async(request, order_id: int):  # type: ignore[no-untyped-def]
+    """Varianta ASGI a `order_items_api` (același răspuns), cu ORM-ul async."""
+    user = await request.auser()
+    is_staff = user.is_authenticated and user.is_staff
+    partner_ok = False
+    code = await request.session.aget("partner_code")
+    if code:
+        partner_ok = await Partner.objects.filter(partner_code=code, is_active=True).aexists()
+    if not (is_staff or partner_ok):
+        return FastJsonResponse({"error": "unauthorized"}, status=401)
+    return FastJsonResponse({"items": [_remaining_row(row) async for row in _remaining_items(order_id)]})
+
+
+# --- detaliul comenzii: poziții și avize încărcate în pagini ---
+
+_MAX_PAGE_SIZE = 500
+
+_LINE_FIELDS = (
+    "id",
+    "position",
+    "material_code",
+    "material_description",
+    "quantity_ordered",
+    "unit_of_measure",
+    "net_price",
+    "line_total",
+    "quantity_delivered",
+    "remaining",
+)
+_DELIVERY_STATUS_LABELS = dict(DELIVERY_STATUS_CHOICES)
+_VALIDATION_STATUS_LABELS = dict(VALIDATION_STATUS_CHOICES)
+
+
+def _detail_order(request, order_id: int):  # type: ignore[no-untyped-def]
+    """Comanda (activă sau arhivată) vizibilă cererii: staff orice comandă, partenerul doar pe ale lui.
+
+    Întoarce (comandă, None) sau (None, răspuns de eroare); comanda altui
+    partener dă 404, ca una inexistentă.
+    """
+    is_staff = request.user.is_authenticated and request.user.is_staff
+    code = request.session.get("partner_code")
+    if not (is_staff or code):
+        return None, FastJsonResponse({"error": "unauthorized"}, status=401)
+    for model in (Order, ArchivedOrder):
+        qs = model.objects.filter(pk=order_id)
+        if not is_staff:
+            qs = qs.filter(partner__partner_code=code, partner__is_active=True)
+        order = qs.only("pk").first()
+        if order is not None:
+            return order, None
+    return None, FastJsonResponse({"error": "not_found"}, status=404)
+
+
+def _page_size(request) -> int:  # type: ignore[no-untyped-def]
     try:
-        order = Order.objects.get(pk=order_id)
-    except Order.DoesNotExist:
-        return JsonResponse({"items": []})
-    data = []
-    for oi in order.items.all():
-        remaining = oi.get_remaining_quantity()
-        if remaining > 0:
-            data.append({
-                "id": oi.id,
-                "material_code": oi.material_code,
-                "material_description": oi.material_description,
-                "remaining": float(remaining),
-            })
-    return JsonResponse({"items": data})
+        size = int(request.GET.get("limit", settings.ORDER_DETAIL_PAGE_SIZE))
+    except ValueError:
+        size = settings.ORDER_DETAIL_PAGE_SIZE
+    return max(1, min(size, _MAX_PAGE_SIZE))
+
+
+def _bad_request(error: str) -> FastJsonResponse:
+    return FastJsonResponse({"error": error}, status=400)
+
+
+@require_GET
+@detail_api_ratelimit
+@use_replica
+@compress_response
+def order_lines_api(request, order_id: int):  # type: ignore[no-untyped-def]
+    """Pozițiile comenzii, paginate după `position` (`?after=<poziție>&limit=N`).
+
+    `?filter=open` = doar pozițiile cu cantitate rămasă, `?filter=discrepancies`
+    = doar pozițiile cu discrepanțe pe vreun aviz; filtrarea și paginarea sunt
+    în SQL (index pe comandă + poziție), deci costul unei pagini nu depinde de
+    mărimea comenzii. `next` este cursorul paginii următoare (null la final).
+    """
+    order, error = _detail_order(request, order_id)
+    if error is not None:
+        return error
+    try:
+        after = int(request.GET.get("after", 0))
+    except ValueError:
+        return _bad_request("invalid_cursor")
+    size = _page_size(request)
+
+    qs = order.items.filter(position__gt=after).annotate(remaining=_remaining())
+    line_filter = request.GET.get("filter", "")
+    if line_filter == "open":
+        qs = qs.filter(remaining__gt=_QUANTITY_STEP / 2)
+    elif line_filter == "discrepancies":
+        delivery_item = ArchivedDeliveryItem if getattr(order, "is_archived", False) else DeliveryItem
+        qs = qs.filter(Exists(delivery_item.objects.filter(order_item=OuterRef("pk"), has_discrepancy=True)))
+    elif line_filter:
+        return _bad_request("invalid_filter")
+
+    # Un rând în plus arată dacă mai există o pagină, fără COUNT pe toată comanda
+    rows = [_remaining_row(row) for row in qs.order_by("position").values(*_LINE_FIELDS)[: size + 1]]
+    more = len(rows) > size
+    rows = rows[:size]
+    return FastJsonResponse({"lines": rows, "next": rows[-1]["position"] if more else None})
+
+
+def _delivery_row(row: dict) -> dict:
+    row["status_display"] = _DELIVERY_STATUS_LABELS.get(row["status"], row["status"])
+    row["validation_status_display"] = _VALIDATION_STATUS_LABELS.get(
+        row["validation_status"], row["validation_status"]
+    )
+    row["url"] = reverse("deliveries:delivery_detail", args=[row["id"]])
+    return row
 
 
+@require_GET
+@detail_api_ratelimit
+@use_replica
+@compress_response
+def order_deliveries_api(request, order_id: int):  # type: ignore[no-untyped-def]
+    """Avizele comenzii, cele mai noi întâi, paginate (`?after=<cursor>&limit=N`).
+
+    Fiecare aviz vine cu numărul de poziții și de discrepanțe;
+    `?filter=discrepancies` = doar avizele cu discrepanțe. Cursorul este
+    `data_id` al ultimului aviz din pagină (`next`, null la final).
+    """
+    order, error = _detail_order(request, order_id)
+    if error is not None:
+        return error
+    size = _page_size(request)
+
+    qs = order.deliveries.all()
+    cursor = request.GET.get("after", "")
+    if cursor:
+        try:
+            day, _sep, pk = cursor.partition("_")
+            after_date, after_id = date.fromisoformat(day), int(pk)
+        except ValueError:
+            return _bad_request("invalid_cursor")
+        qs = qs.filter(Q(delivery_date__lt=after_date) | Q(delivery_date=after_date, pk__lt=after_id))
+    delivery_filter = request.GET.get("filter", "")
+    if delivery_filter == "discrepancies":
+        delivery_item = ArchivedDeliveryItem if getattr(order, "is_archived", False) else DeliveryItem
+        qs = qs.filter(Exists(delivery_item.objects.filter(delivery=OuterRef("pk"), has_discrepancy=True)))
+    elif delivery_filter:
+        return _bad_request("invalid_filter")
+
+    qs = (
+        qs.annotate(
+            line_count=Count("items"),
+            discrepancy_count=Count("items", filter=Q(items__has_discrepancy=True)),
+        )
+        .order_by("-delivery_date", "-pk")
+        .values(
+            "id", "delivery_number", "delivery_date", "status", "validation_status", "line_count", "discrepancy_count"
+        )
+    )
+    rows = [_delivery_row(row) for row in qs[: size + 1]]
+    more = len(rows) > size
+    rows = rows[:size]
+    last = rows[-1] if rows else None
+    return FastJsonResponse(
+        {"deliveries": rows, "next": f"{last['delivery_date'].isoformat()}_{last['id']}" if more and last else None}
+    )
+
+
+ORDER_EXPORT_COLUMNS = [
+    ("order_number", "Nr. comandă"),
+    ("partner__partner_code", "Cod partener"),
+    ("partner__name", "Partener"),
+    ("order_date", "Data"),
+    ("delivery_date", "Data livrare"),
+    ("total_value", "Valoare"),
+    ("currency", "Monedă"),
+    ("status", "Status"),
+]
+
+ORDER_ITEM_EXPORT_COLUMNS = [
+    ("order__order_number", "Nr. comandă"),
+    ("order__partner__name", "Partener"),
+    ("position", "Poziție"),
+    ("material_code", "Cod material"),
+    ("material_description", "Descriere"),
+    ("quantity_ordered", "Cant. comandată"),
+    ("quantity_delivered", "Cant. livrată"),
+    ("unit_of_measure", "UM"),
+    ("delivery_date", "Data livrare"),
+    ("net_price", "Preț net"),
+    ("line_total", "Total linie"),
+]
+
+
+@login_required(login_url="/admin/login/")
+@require_GET
+def order_export(request):  # type: ignore[no-untyped-def]
+    """Export comenzi (CSV/XLSX) cu aceleași filtre ca `OrderListView`."""
+    qs = filter_orders(on_replica(Order.objects.order_by("-order_date", "pk")), request.GET)
+    rows = qs.values_list(*[f for f, _ in ORDER_EXPORT_COLUMNS]).iterator(
+        chunk_size=get_export_chunk_size()
+    )
+    return export_response(
+        request.GET.get("format", "csv"),
+        "comenzi",
+        [label for _, label in ORDER_EXPORT_COLUMNS],
+        rows,
+    )
+
+
+@login_required(login_url="/admin/login/")
+@require_GET
+def order_items_export(request):  # type: ignore[no-untyped-def]
+    """Export poziții de comandă (CSV/XLSX), filtrate după comanda părinte."""
+    qs = filter_order_items(on_replica(OrderItem.objects.order_by("order_id", "position")), request.GET)
+    rows = qs.values_list(*[f for f, _ in ORDER_ITEM_EXPORT_COLUMNS]).iterator(
+        chunk_size=get_export_chunk_size()
+    )
+    return export_response(
+        request.GET.get("format", "csv"),
+        "pozitii_comenzi",
+        [label for _, label in ORDER_ITEM_EXPORT_COLUMNS],
+        rows,
+    )
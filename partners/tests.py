@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from django.conf import settings
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from .models import Partner
+
+
+class PartnerLoginSessionTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()  # contoarele de rată ale altor teste
+        self.partner = Partner.objects.create(partner_code="P001", name="Partener test", login_attempts=2)
+
+    def test_login_cycles_session_key_and_resets_attempts(self) -> None:
+        session = self.client.session
+        session["theme"] = "dark"
+        session.save()
+        anonymous_key = session.session_key
+
+        response = self.client.post(reverse("partners:login"), {"partner_code": "P001"})
+        self.assertRedirects(response, reverse("partners:dashboard"), fetch_redirect_response=False)
+        self.assertNotEqual(self.client.cookies[settings.SESSION_COOKIE_NAME].value, anonymous_key)
+        self.assertEqual(self.client.session["partner_code"], "P001")
+        self.assertEqual(self.client.session["theme"], "dark")
+        self.partner.refresh_from_db()
+        self.assertEqual(self.partner.login_attempts, 0)
+
+    def test_failed_login_counts_attempt(self) -> None:
+        Partner.objects.filter(pk=self.partner.pk).update(is_active=False)
+        self.client.post(reverse("partners:login"), {"partner_code": "P001"})
+        self.partner.refresh_from_db()
+        self.assertEqual(self.partner.login_attempts, 3)
@@ -1,20 +1,50 @@
 from __future__ import annotations
 
+from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth.decorators import user_passes_test
 from django.utils.decorators import method_decorator
 from django.db import models
-from django.shortcuts import redirect, render
+from django.http import Http404
+from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse
 from django.views import View
 from django.views.generic import TemplateView, ListView, DetailView
 
+from core.db_router import use_replica
+from core.ratelimit import client_ip, ratelimit
+
 from .decorators import require_partner_login
 from .forms import PartnerLoginForm
 from .models import Partner
+from archive.models import ArchivedOrder
 from orders.models import Order
 
 
+def _login_rate_limited(request, retry_after: int):  # type: ignore[no-untyped-def]
+    messages.error(request, f"Prea multe încercări de autentificare. Reîncearcă peste {retry_after} secunde.")
+    return render(request, PartnerLoginView.template_name, {"form": PartnerLoginForm()}, status=429)
+
+
+def _submitted_code(request):  # type: ignore[no-untyped-def]
+    code = request.POST.get("partner_code", "").strip()
+    return f"code:{code}" if code else None
+
+
+# Ghicirea codurilor: limită per IP și per cod încercat, înainte de orice query
+@method_decorator(
+    ratelimit(
+        "partner_login_ip",
+        settings.RATELIMIT_LOGIN_IP,
+        key=lambda request: f"ip:{client_ip(request)}",
+        reject=_login_rate_limited,
+    ),
+    name="post",
+)
+@method_decorator(
+    ratelimit("partner_login_code", settings.RATELIMIT_LOGIN_CODE, key=_submitted_code, reject=_login_rate_limited),
+    name="post",
+)
 class PartnerLoginView(View):
     """Autentificare partener pe baza `partner_code` prin sesiune."""
 
@@ -28,9 +58,12 @@ class PartnerLoginView(View):
         if form.is_valid():
             partner_code = form.cleaned_data["partner_code"]
             partner = Partner.objects.get(partner_code=partner_code)
+            # Cheie nouă la autentificare (fără fixarea sesiunii); datele existente rămân
+            request.session.cycle_key()
             request.session["partner_code"] = partner.partner_code
-            partner.login_attempts = 0
-            partner.save(update_fields=["login_attempts"])
+            if partner.login_attempts:
+                partner.login_attempts = 0
+                partner.save(update_fields=["login_attempts"])
             messages.success(request, "Autentificare reușită.")
             return redirect("partners:dashboard")
 
@@ -57,6 +90,7 @@ class PartnerLogoutView(View):
 
 
 @method_decorator(require_partner_login, name="dispatch")
+@method_decorator(use_replica, name="dispatch")
 class PartnerDashboardView(TemplateView):
     template_name = "partners/dashboard.html"
 
@@ -87,6 +121,7 @@ class PartnerDashboardView(TemplateView):
 
 
 @method_decorator(require_partner_login, name="dispatch")
+@method_decorator(use_replica, name="dispatch")
 class PartnerOrderListView(ListView):
     template_name = "partners/order_list.html"
     context_object_name = "orders"
@@ -104,6 +139,7 @@ class PartnerOrderListView(ListView):
 
 
 @method_decorator(require_partner_login, name="dispatch")
+@method_decorator(use_replica, name="dispatch")
 class PartnerOrderDetailView(DetailView):
     template_name = "partners/order_detail.html"
     context_object_name = "order"
@@ -112,7 +148,10 @@ class PartnerOrderDetailView(DetailView):
     # dispatch protejat prin method_decorator mai sus
 
     def get_object(self, queryset=None):  # type: ignore[no-untyped-def]
-        obj: Order = super().get_object(queryset)
+        try:
+            obj: Order | ArchivedOrder = super().get_object(queryset)
+        except Http404:
+            obj = get_object_or_404(ArchivedOrder, pk=self.kwargs["pk"])
         partner: Partner = self.request.partner  # type: ignore[attr-defined]
         if obj.partner_id != partner.id:
             messages.error(self.request, "Nu ai acces la această comandă.")
@@ -121,6 +160,7 @@ class PartnerOrderDetailView(DetailView):
 
 
 @method_decorator(require_partner_login, name="dispatch")
+@method_decorator(use_replica, name="dispatch")
 class PartnerProfileView(TemplateView):
     template_name = "partners/profile.html"
 
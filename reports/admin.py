@@ -0,0 +1,20 @@
+from __future__ import annotations
+
+from django.contrib import admin
+
+from .models import DailyPartnerRollup
+
+
+@admin.register(DailyPartnerRollup)
+class DailyPartnerRollupAdmin(admin.ModelAdmin):
+    list_display = [
+        "day",
+        "partner",
+        "currency",
+        "orders_count",
+        "ordered_value",
+        "delivered_quantity",
+        "discrepancy_lines",
+    ]
+    list_filter = ["currency", "day"]
+    search_fields = ["partner__name", "partner__partner_code"]
@@ -0,0 +1,231 @@
+"""KPI furnizori calculați vectorizat cu NumPy.
+
+Pentru fiecare poziție din avizele validate se compară:
+- `Delivery.delivery_date` cu `OrderItem.delivery_date` (livrare la timp)
+- `quantity_accepted` cu `quantity_delivered` (grad de acceptare / discrepanțe)
+
+Pozițiile sunt citite cu `values_list` în bucăți keyset după `pk`; fiecare bucată
+este redusă imediat la agregate pe grup (partener / `material_id` / săptămână) cu
+`np.unique` + `np.bincount`, apoi combinată cu agregatele anterioare. Memoria
+depinde de numărul de grupuri, nu de numărul de poziții. Cheia de grup este un
+int64 cu biți ficși per dimensiune; dacă un id nu încape în biții lui, acumulatorul
+trece (inclusiv pentru agregatele deja calculate) la chei structurate cu câte un
+câmp per dimensiune, mai lente dar fără limită. Sunt citite atât
+tabelele operaționale, cât și arhiva (`reports.services.SOURCES`), în același
+acumulator.
+"""
+
+from __future__ import annotations
+
+from datetime import date
+from typing import Any, Dict, List, Sequence
+
+import numpy as np
+from django.conf import settings
+
+from orders.models import Material
+
+from .services import SOURCES
+
+
+GROUP_DIMENSIONS = ("partner", "material", "week")
+
+# Biți alocați fiecărei dimensiuni în cheia de grup int64 (partenerul primește restul)
+_WEEK_BITS = 18
+_MATERIAL_BITS = 24
+_PARTNER_BITS = 63 - _MATERIAL_BITS - _WEEK_BITS
+_KEY_DTYPE = np.dtype([("partner", np.int64), ("material", np.int64), ("week", np.int64)])
+_METRICS = ("lines", "on_time", "delivered", "accepted", "discrepancies", "late_days")
+
+
+def _pack(partner: np.ndarray, material: np.ndarray, week: np.ndarray) -> np.ndarray:
+    return (partner << (_MATERIAL_BITS + _WEEK_BITS)) | (material << _WEEK_BITS) | week
+
+
+def _unpack(keys: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    if keys.dtype == _KEY_DTYPE:
+        return keys["partner"], keys["material"], keys["week"]
+    week = keys & ((1 << _WEEK_BITS) - 1)
+    material = (keys >> _WEEK_BITS) & ((1 << _MATERIAL_BITS) - 1)
+    partner = keys >> (_MATERIAL_BITS + _WEEK_BITS)
+    return partner, material, week
+
+
+def _fits(partner: np.ndarray, material: np.ndarray, week: np.ndarray) -> bool:
+    """Toate valorile încap în biții lor (altfel `_pack` ar amesteca dimensiunile)."""
+    return all(
+        not len(column) or (column.min() >= 0 and column.max() < 1 << bits)
+        for column, bits in ((partner, _PARTNER_BITS), (material, _MATERIAL_BITS), (week, _WEEK_BITS))
+    )
+
+
+def _structured(partner: np.ndarray, material: np.ndarray, week: np.ndarray) -> np.ndarray:
+    """Chei cu câte un câmp per dimensiune; `np.unique` le sortează în aceeași ordine ca `_pack`."""
+    keys = np.empty(len(partner), dtype=_KEY_DTYPE)
+    keys["partner"], keys["material"], keys["week"] = partner, material, week
+    return keys
+
+
+def _reduce(keys: np.ndarray, values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Însumează rândurile `values` (n × metrici) pe chei identice."""
+    unique, inverse = np.unique(keys, return_inverse=True)
+    out = np.empty((len(unique), values.shape[1]), dtype=np.float64)
+    for col in range(values.shape[1]):
+        out[:, col] = np.bincount(inverse, weights=values[:, col], minlength=len(unique))
+    return unique, out
+
+
+class SupplierKpiAccumulator:
+    """Agregă bucăți de poziții și produce KPI-urile finale."""
+
+    def __init__(self, group_by: Sequence[str] = GROUP_DIMENSIONS) -> None:
+        unknown = set(group_by) - set(GROUP_DIMENSIONS)
+        if unknown:
+            raise ValueError(f"Dimensiuni necunoscute: {', '.join(sorted(unknown))}")
+        self.group_by = tuple(group_by)
+        self.keys = np.empty(0, dtype=np.int64)
+        self.values = np.empty((0, len(_METRICS)), dtype=np.float64)
+        # Bucăți deja reduse, combinate cu agregatul abia când depășesc mărimea lui
+        # (altfel grupările aproape unice ar re-sorta tot agregatul la fiecare bucată)
+        self._pending: List[tuple[np.ndarray, np.ndarray]] = []
+        self._pending_size = 0
+        self.rows = 0
+
+    def add_chunk(self, rows: List[tuple]) -> None:
+        """Adaugă o bucată de tuple `(pk, partner_id, material_id, livrat_la, termen, livrat, acceptat)`."""
+        if not rows:
+            return
+        n = len(rows)
+        _pk, partner_col, material_col, delivered_on, due_on, qty_delivered, qty_accepted = zip(*rows)
+        partner = np.fromiter(partner_col, dtype=np.int64, count=n)
+        material = np.fromiter((m or 0 for m in material_col), dtype=np.int64, count=n)
+        delivered_day = np.fromiter(map(date.toordinal, delivered_on), dtype=np.int64, count=n)
+        due_day = np.fromiter(map(date.toordinal, due_on), dtype=np.int64, count=n)
+        delivered = np.fromiter(map(float, qty_delivered), dtype=np.float64, count=n)
+        accepted = np.fromiter((float(q or 0) for q in qty_accepted), dtype=np.float64, count=n)
+
+        # Săptămâna = ordinalul zilei de luni (ordinal 1 = luni 0001-01-01) / 7
+        week = (delivered_day - 1) // 7
+        late = np.maximum(delivered_day - due_day, 0)
+        dimensions = (
+            partner if "partner" in self.group_by else np.zeros(n, dtype=np.int64),
+            material if "material" in self.group_by else np.zeros(n, dtype=np.int64),
+            week if "week" in self.group_by else np.zeros(n, dtype=np.int64),
+        )
+        if self.keys.dtype != _KEY_DTYPE and not _fits(*dimensions):
+            self._use_structured_keys()
+        keys = _structured(*dimensions) if self.keys.dtype == _KEY_DTYPE else _pack(*dimensions)
+        values = np.column_stack(
+            (
+                np.ones(n),
+                (late == 0).astype(np.float64),
+                delivered,
+                accepted,
+                (accepted != delivered).astype(np.float64),
+                late.astype(np.float64),
+            )
+        )
+        chunk_keys, chunk_values = _reduce(keys, values)
+        self._pending.append((chunk_keys, chunk_values))
+        self._pending_size += len(chunk_keys)
+        if self._pending_size >= len(self.keys):
+            self._merge()
+        self.rows += n
+
+    def _use_structured_keys(self) -> None:
+        self.keys = _structured(*_unpack(self.keys))
+        self._pending = [(_structured(*_unpack(keys)), values) for keys, values in self._pending]
+
+    def _merge(self) -> None:
+        if not self._pending:
+            return
+        self.keys, self.values = _reduce(
+            np.concatenate([self.keys] + [k for k, _ in self._pending]),
+            np.vstack([self.values] + [v for _, v in self._pending]),
+        )
+        self._pending = []
+        self._pending_size = 0
+
+    def results(self) -> List[Dict[str, Any]]:
+        """KPI-urile per grup, ca listă de dict-uri (sortate după cheie)."""
+        self._merge()
+        if not len(self.keys):
+            return []
+        partner, material, week = _unpack(self.keys)
+        metrics = dict(zip(_METRICS, self.values.T))
+        lines = metrics["lines"]
+        late_lines = lines - metrics["on_time"]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            fill_rate = np.where(metrics["delivered"] > 0, metrics["accepted"] / metrics["delivered"], np.nan)
+            on_time_rate = metrics["on_time"] / lines
+            discrepancy_rate = metrics["discrepancies"] / lines
+            avg_delay = np.where(late_lines > 0, metrics["late_days"] / late_lines, 0.0)
+
+        out: List[Dict[str, Any]] = []
+        for i in range(len(self.keys)):
+            row: Dict[str, Any] = {
+                "lines": int(lines[i]),
+                "delivered": float(metrics["delivered"][i]),
+                "accepted": float(metrics["accepted"][i]),
+                "fill_rate": None if np.isnan(fill_rate[i]) else float(fill_rate[i]),
+                "on_time_rate": float(on_time_rate[i]),
+                "discrepancy_rate": float(discrepancy_rate[i]),
+                "avg_delay_days": float(avg_delay[i]),
+            }
+            if "partner" in self.group_by:
+                row["partner_id"] = int(partner[i])
+            if "material" in self.group_by:
+                row["material_id"] = int(material[i]) or None
+            if "week" in self.group_by:
+                row["week_start"] = date.fromordinal(int(week[i]) * 7 + 1)
+            out.append(row)
+        return out
+
+
+def compute_supplier_kpis(
+    group_by: Sequence[str] = GROUP_DIMENSIONS,
+    date_from: date | None = None,
+    date_to: date | None = None,
+    partner_id: int | None = None,
+    chunk_size: int | None = None,
+) -> List[Dict[str, Any]]:
+    """Calculează KPI-urile pentru pozițiile din avizele validate (inclusiv cele arhivate)."""
+    chunk_size = chunk_size or getattr(settings, "ANALYTICS_CHUNK_SIZE", 100_000)
+    accumulator = SupplierKpiAccumulator(group_by)
+    for _order_model, _delivery_model, item_model in SOURCES:
+        qs = item_model.objects.filter(delivery__status="validated")
+        if date_from:
+            qs = qs.filter(delivery__delivery_date__gte=date_from)
+        if date_to:
+            qs = qs.filter(delivery__delivery_date__lte=date_to)
+        if partner_id:
+            qs = qs.filter(delivery__partner_id=partner_id)
+
+        last_pk = 0
+        while True:
+            chunk = list(
+                qs.filter(pk__gt=last_pk)
+                .order_by("pk")
+                .values_list(
+                    "pk",
+                    "delivery__partner_id",
+                    "order_item__material_id",
+                    "delivery__delivery_date",
+                    "order_item__delivery_date",
+                    "quantity_delivered",
+                    "quantity_accepted",
+                )[:chunk_size]
+            )
+            if not chunk:
+                break
+            last_pk = chunk[-1][0]
+            accumulator.add_chunk(chunk)
+
+    results = accumulator.results()
+    if "material" in accumulator.group_by:
+        codes = dict(
+            Material.objects.filter(pk__in={r["material_id"] for r in results}).values_list("pk", "code")
+        )
+        for row in results:
+            row["material_code"] = codes.get(row["material_id"], "")
+    return results
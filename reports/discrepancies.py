@@ -0,0 +1,131 @@
+"""Raport de discrepanțe calculat integral în baza de date.
+
+Pentru pozițiile avizelor validate se calculează, per partener / material /
+perioadă:
+- livrat vs. acceptat (`quantity_delivered - quantity_accepted`)
+- livrat vs. comandat: diferența față de cantitatea rămasă de livrat pe poziția
+  de comandă la momentul validării (comandat minus acceptat pe avizele validate
+  anterior), aceeași regulă ca `DeliveryItem.calculate_discrepancy`, dar ca
+  subquery corelat în loc de buclă Python per poziție.
+
+Raportul acoperă și arhiva (`archive_closed_orders`): sursa este view-ul
+`DiscrepancyLine` (`UNION ALL` între pozițiile operaționale și cele arhivate),
+deci gruparea, filtrarea, sortarea și paginarea rămân un singur query SQL, iar
+exportul citește cu cursor. O comandă este mutată în arhivă cu tot cu avizele
+ei, deci subquery-ul corelat vede toate avizele anterioare ale poziției.
+"""
+
+from __future__ import annotations
+
+from typing import Any, List, Mapping, Tuple
+
+from django.db.models import (
+    Count,
+    DecimalField,
+    ExpressionWrapper,
+    F,
+    OuterRef,
+    Q,
+    QuerySet,
+    Subquery,
+    Sum,
+    Value,
+)
+from django.db.models.functions import Coalesce, TruncMonth, TruncWeek
+from django.utils.dateparse import parse_date
+
+from .models import DiscrepancyLine
+
+
+PERIODS = ("month", "week", "day")
+
+QUANTITY = DecimalField(max_digits=15, decimal_places=3)
+
+# Coloanele exportului, în ordinea din raport
+DISCREPANCY_COLUMNS: List[Tuple[str, str]] = [
+    ("period", "Perioadă"),
+    ("partner__partner_code", "Cod partener"),
+    ("partner__name", "Partener"),
+    ("material_code", "Cod material"),
+    ("unit_of_measure", "UM"),
+    ("lines", "Poziții"),
+    ("delivered", "Cant. livrată"),
+    ("accepted", "Cant. acceptată"),
+    ("not_accepted", "Livrat - acceptat"),
+    ("vs_ordered", "Livrat - rămas de livrat"),
+    ("rejected_lines", "Poziții cu diferențe la acceptare"),
+    ("over_lines", "Poziții livrate peste comandă"),
+    ("short_lines", "Poziții livrate sub comandă"),
+]
+
+
+def _previously_accepted() -> Subquery:
+    """Cantitatea acceptată pe aceeași poziție de comandă în avizele validate anterior."""
+    earlier = (
+        DiscrepancyLine.objects.filter(
+            order_item_id=OuterRef("order_item_id"),
+            delivery_status="validated",
+        )
+        .filter(
+            Q(validated_at__lt=OuterRef("validated_at"))
+            | Q(validated_at=OuterRef("validated_at"), delivery_id__lt=OuterRef("delivery_id"))
+        )
+        .order_by()
+        .values("order_item_id")
+        .annotate(total=Sum("quantity_accepted"))
+        .values("total")
+    )
+    return Subquery(earlier, output_field=QUANTITY)
+
+
+def discrepancy_report(params: Mapping[str, Any]) -> QuerySet:
+    """Rândurile raportului (dict-uri), grupate, filtrate și sortate în SQL.
+
+    Parametri acceptați: `period` (month/week/day), `date_from`, `date_to`,
+    `partner` (cod sau nume), `material` (prefix cod), `only_discrepancies`.
+    Include pozițiile din arhivă; rezultatul se paginează/exportă direct din bază.
+    """
+    period = params.get("period") if params.get("period") in PERIODS else "month"
+    qs = DiscrepancyLine.objects.filter(delivery_status="validated")
+    date_from = parse_date(params.get("date_from") or "")
+    date_to = parse_date(params.get("date_to") or "")
+    if date_from:
+        qs = qs.filter(delivery_date__gte=date_from)
+    if date_to:
+        qs = qs.filter(delivery_date__lte=date_to)
+    partner = (params.get("partner") or "").strip()
+    if partner:
+        qs = qs.filter(Q(partner__partner_code__iexact=partner) | Q(partner__name__icontains=partner))
+    material = (params.get("material") or "").strip()
+    if material:
+        qs = qs.filter(material__code__istartswith=material)
+
+    if period == "day":
+        period_expr: Any = F("delivery_date")
+    elif period == "week":
+        period_expr = TruncWeek("delivery_date")
+    else:
+        period_expr = TruncMonth("delivery_date")
+
+    accepted = Coalesce("quantity_accepted", Value(0), output_field=QUANTITY)
+    remaining = ExpressionWrapper(
+        F("quantity_ordered") - Coalesce(_previously_accepted(), Value(0), output_field=QUANTITY),
+        output_field=QUANTITY,
+    )
+    qs = (
+        qs.annotate(period=period_expr, line_accepted=accepted, line_remaining=remaining)
+        .values("period", "partner__partner_code", "partner__name", "material_code", "unit_of_measure")
+        .annotate(
+            lines=Count("pk"),
+            delivered=Sum("quantity_delivered"),
+            accepted=Sum("line_accepted"),
+            not_accepted=Sum(F("quantity_delivered") - F("line_accepted"), output_field=QUANTITY),
+            vs_ordered=Sum(F("quantity_delivered") - F("line_remaining"), output_field=QUANTITY),
+            rejected_lines=Count("pk", filter=~Q(quantity_delivered=F("line_accepted"))),
+            over_lines=Count("pk", filter=Q(quantity_delivered__gt=F("line_remaining"))),
+            short_lines=Count("pk", filter=Q(quantity_delivered__lt=F("line_remaining"))),
+        )
+    )
+    if params.get("only_discrepancies"):
+        qs = qs.filter(Q(rejected_lines__gt=0) | Q(over_lines__gt=0) | Q(short_lines__gt=0))
+    return qs.order_by("-period", "partner__name", "material_code")
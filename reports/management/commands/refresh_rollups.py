@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+import time
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from reports.services import refresh_rollups
+
+
+class Command(BaseCommand):
+    help = "Actualizează agregatele zilnice per partener (incremental, după watermark)."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            default=False,
+            help="Reconstruiește toate zilele (ignoră watermark-ul)",
+        )
+
+    def handle(self, *args, **options):  # type: ignore[no-untyped-def]
+        started = time.perf_counter()
+        result = refresh_rollups(full=options["full"])
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Zile recalculate: {result['days']} | Rânduri agregate: {result['rows']} | {elapsed:.2f}s"
+            )
+        )
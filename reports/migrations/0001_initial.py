@@ -0,0 +1,66 @@
+# Generated by Django 5.1.1 on 2026-10-19 16:03
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ("partners", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DailyPartnerRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("day", models.DateField()),
+                ("currency", models.CharField(max_length=3)),
+                ("orders_count", models.PositiveIntegerField(default=0)),
+                (
+                    "ordered_value",
+                    models.DecimalField(
+                        decimal_places=2, default=Decimal("0"), max_digits=18
+                    ),
+                ),
+                (
+                    "delivered_quantity",
+                    models.DecimalField(
+                        decimal_places=3, default=Decimal("0"), max_digits=18
+                    ),
+                ),
+                ("delivery_lines", models.PositiveIntegerField(default=0)),
+                ("discrepancy_lines", models.PositiveIntegerField(default=0)),
+                ("refreshed_at", models.DateTimeField(auto_now=True)),
+                (
+                    "partner",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="daily_rollups",
+                        to="partners.partner",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Agregat zilnic partener",
+                "verbose_name_plural": "Agregate zilnice parteneri",
+                "ordering": ["-day"],
+                "indexes": [
+                    models.Index(fields=["day"], name="reports_dai_day_56a672_idx")
+                ],
+                "unique_together": {("partner", "day", "currency")},
+            },
+        ),
+    ]
@@ -0,0 +1,71 @@
+# Generated by Django 5.1.1 on 2026-10-19 17:35
+"""View-ul `reports_discrepancy_line`: pozițiile de aviz operaționale și arhivate."""
+
+from django.db import migrations, models
+
+
+_TIER = """
+    SELECT di.id, di.delivery_id, di.order_item_id, d.partner_id, oi.material_id,
+           d.status AS delivery_status, d.delivery_date, d.validated_at,
+           oi.material_code, oi.unit_of_measure, oi.quantity_ordered,
+           di.quantity_delivered, di.quantity_accepted
+    FROM {item} di
+    JOIN {delivery} d ON d.id = di.delivery_id
+    JOIN {order_item} oi ON oi.id = di.order_item_id
+"""
+
+CREATE_VIEW = (
+    "CREATE VIEW reports_discrepancy_line AS"
+    + _TIER.format(item="deliveries_deliveryitem", delivery="deliveries_delivery", order_item="orders_orderitem")
+    + "UNION ALL"
+    + _TIER.format(
+        item="archive_archiveddeliveryitem",
+        delivery="archive_archiveddelivery",
+        order_item="archive_archivedorderitem",
+    )
+)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("archive", "0001_initial"),
+        ("deliveries", "0002_sap_outbox"),
+        ("orders", "0003_backfill_material"),
+        ("reports", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREATE_VIEW, "DROP VIEW IF EXISTS reports_discrepancy_line"),
+        migrations.CreateModel(
+            name="DiscrepancyLine",
+            fields=[
+                ("id", models.BigIntegerField(primary_key=True, serialize=False)),
+                ("delivery_id", models.BigIntegerField()),
+                ("order_item_id", models.BigIntegerField()),
+                ("delivery_status", models.CharField(max_length=20)),
+                ("delivery_date", models.DateField()),
+                ("validated_at", models.DateTimeField(null=True)),
+                ("material_code", models.CharField(max_length=100)),
+                ("unit_of_measure", models.CharField(max_length=10)),
+                (
+                    "quantity_ordered",
+                    models.DecimalField(decimal_places=3, max_digits=10),
+                ),
+                (
+                    "quantity_delivered",
+                    models.DecimalField(decimal_places=3, max_digits=10),
+                ),
+                (
+                    "quantity_accepted",
+                    models.DecimalField(decimal_places=3, max_digits=10, null=True),
+                ),
+            ],
+            options={
+                "verbose_name": "Poziție raport discrepanțe",
+                "verbose_name_plural": "Poziții raport discrepanțe",
+                "db_table": "reports_discrepancy_line",
+                "managed": False,
+            },
+        ),
+    ]
@@ -0,0 +1,74 @@
+"""Tabele agregate (rollup) pentru rapoarte."""
+
+from __future__ import annotations
+
+from decimal import Decimal
+
+from django.db import models
+
+
+class DailyPartnerRollup(models.Model):
+    """Agregat zilnic per partener și monedă.
+
+    - comenzi: după `Order.order_date`
+    - livrări: poziții din avize validate, după `Delivery.delivery_date`
+
+    Populat exclusiv de `refresh_rollups`; paginile de rapoarte citesc doar acest tabel.
+    """
+
+    partner = models.ForeignKey(
+        "partners.Partner", on_delete=models.CASCADE, related_name="daily_rollups"
+    )
+    day = models.DateField()
+    currency = models.CharField(max_length=3)
+    orders_count = models.PositiveIntegerField(default=0)
+    ordered_value = models.DecimalField(max_digits=18, decimal_places=2, default=Decimal("0"))
+    delivered_quantity = models.DecimalField(max_digits=18, decimal_places=3, default=Decimal("0"))
+    delivery_lines = models.PositiveIntegerField(default=0)
+    discrepancy_lines = models.PositiveIntegerField(default=0)
+    refreshed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["-day"]
+        unique_together = [["partner", "day", "currency"]]
+        indexes = [models.Index(fields=["day"])]
+        verbose_name = "Agregat zilnic partener"
+        verbose_name_plural = "Agregate zilnice parteneri"
+
+    def __str__(self) -> str:  # pragma: no cover
+        return f"{self.partner_id} {self.day} {self.currency}"
+
+
+class DiscrepancyLine(models.Model):
+    """Poziție de aviz din tabelele operaționale sau din arhivă (view SQL, doar citire).
+
+    View-ul `reports_discrepancy_line` este `UNION ALL` între pozițiile de aviz
+    curente și cele arhivate (cu avizul și poziția de comandă aplatizate), deci
+    raportul de discrepanțe grupează, filtrează, sortează și paginează ambele
+    niveluri într-un singur query. Id-urile sunt unice între niveluri: arhivarea
+    păstrează `id`-ul și șterge rândul operațional.
+    """
+
+    id = models.BigIntegerField(primary_key=True)
+    delivery_id = models.BigIntegerField()
+    order_item_id = models.BigIntegerField()
+    partner = models.ForeignKey(
+        "partners.Partner", on_delete=models.DO_NOTHING, db_constraint=False, related_name="+"
+    )
+    material = models.ForeignKey(
+        "orders.Material", on_delete=models.DO_NOTHING, db_constraint=False, null=True, related_name="+"
+    )
+    delivery_status = models.CharField(max_length=20)
+    delivery_date = models.DateField()
+    validated_at = models.DateTimeField(null=True)
+    material_code = models.CharField(max_length=100)
+    unit_of_measure = models.CharField(max_length=10)
+    quantity_ordered = models.DecimalField(max_digits=10, decimal_places=3)
+    quantity_delivered = models.DecimalField(max_digits=10, decimal_places=3)
+    quantity_accepted = models.DecimalField(max_digits=10, decimal_places=3, null=True)
+
+    class Meta:
+        managed = False
+        db_table = "reports_discrepancy_line"
+        verbose_name = "Poziție raport discrepanțe"
+        verbose_name_plural = "Poziții raport discrepanțe"
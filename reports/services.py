@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+from datetime import date, timedelta
+from decimal import Decimal
+from typing import Dict, Iterable, List, Set, Tuple
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.utils import timezone
+
+from archive.models import ArchivedDelivery, ArchivedDeliveryItem, ArchivedOrder
+from core.models import Watermark
+from deliveries.models import Delivery, DeliveryItem
+from orders.models import Order
+
+from .models import DailyPartnerRollup
+
+
+WATERMARK_NAME = "daily_partner_rollup"
+
+RollupKey = Tuple[int, date, str]
+
+# Tabelele operaționale și arhiva (comenzile închise mutate de `archive_closed_orders`)
+SOURCES = (
+    (Order, Delivery, DeliveryItem),
+    (ArchivedOrder, ArchivedDelivery, ArchivedDeliveryItem),
+)
+
+
+def touched_days(since) -> Set[date]:  # type: ignore[no-untyped-def]
+    """Zilele afectate de modificări ulterioare lui `since` (comenzi, avize, poziții de aviz)."""
+    days: Set[date] = set()
+    days.update(
+        Order.objects.filter(updated_at__gt=since).values_list("order_date", flat=True).distinct()
+    )
+    days.update(
+        Delivery.objects.filter(updated_at__gt=since).values_list("delivery_date", flat=True).distinct()
+    )
+    days.update(
+        DeliveryItem.objects.filter(updated_at__gt=since)
+        .values_list("delivery__delivery_date", flat=True)
+        .distinct()
+    )
+    return days
+
+
+def all_days() -> Set[date]:
+    days: Set[date] = set()
+    for order_model, delivery_model, _item_model in SOURCES:
+        days.update(order_model.objects.values_list("order_date", flat=True).distinct())
+        days.update(delivery_model.objects.values_list("delivery_date", flat=True).distinct())
+    return days
+
+
+def _aggregate(days: List[date]) -> Dict[RollupKey, DailyPartnerRollup]:
+    """Recalculează în SQL (GROUP BY) agregatele pentru zilele date."""
+    rows: Dict[RollupKey, DailyPartnerRollup] = {}
+
+    def _row(key: RollupKey) -> DailyPartnerRollup:
+        if key not in rows:
+            rows[key] = DailyPartnerRollup(partner_id=key[0], day=key[1], currency=key[2])
+        return rows[key]
+
+    for order_model, _delivery_model, item_model in SOURCES:
+        orders = (
+            order_model.objects.filter(order_date__in=days)
+            .values("partner_id", "order_date", "currency")
+            .annotate(n=Count("id"), value=Sum("total_value"))
+            .order_by()
+        )
+        for rec in orders:
+            row = _row((rec["partner_id"], rec["order_date"], rec["currency"]))
+            row.orders_count += rec["n"]
+            row.ordered_value += rec["value"] or Decimal("0")
+
+        lines = (
+            item_model.objects.filter(delivery__status="validated", delivery__delivery_date__in=days)
+            .values("delivery__partner_id", "delivery__delivery_date", "delivery__order__currency")
+            .annotate(
+                qty=Sum("quantity_accepted"),
+                n=Count("id"),
+                disc=Count("id", filter=Q(has_discrepancy=True)),
+            )
+            .order_by()
+        )
+        for rec in lines:
+            key = (rec["delivery__partner_id"], rec["delivery__delivery_date"], rec["delivery__order__currency"])
+            row = _row(key)
+            row.delivered_quantity += rec["qty"] or Decimal("0")
+            row.delivery_lines += rec["n"]
+            row.discrepancy_lines += rec["disc"]
+    return rows
+
+
+def rebuild_days(days: Iterable[date], chunk_size: int | None = None) -> int:
+    """Înlocuiește agregatele pentru zilele date (câte `chunk_size` zile per tranzacție)."""
+    chunk_size = chunk_size or getattr(settings, "ROLLUP_DAYS_PER_CHUNK", 31)
+    ordered = sorted(days)
+    written = 0
+    for start in range(0, len(ordered), chunk_size):
+        chunk = ordered[start:start + chunk_size]
+        rows = _aggregate(chunk)
+        with transaction.atomic():
+            DailyPartnerRollup.objects.filter(day__in=chunk).delete()
+            DailyPartnerRollup.objects.bulk_create(rows.values(), batch_size=1000)
+        written += len(rows)
+    return written
+
+
+def refresh_rollups(full: bool = False) -> dict:
+    """Actualizare incrementală: doar zilele atinse de la ultimul watermark.
+
+    Watermark-ul este momentul de start al rulării anterioare, deci modificările
+    făcute în timpul unei rulări sunt prinse de rularea următoare. `updated_at`
+    este setat înainte de commit: o tranzacție care face commit după ce rularea
+    a trecut de ea ar rămâne în urmă, de aceea fereastra începe cu `ROLLUP_LAG`
+    secunde înaintea watermark-ului (zilele din suprapunere sunt doar recalculate).
+    Notă: ștergerile fizice și mutarea unei înregistrări pe altă dată (ziua veche)
+    nu sunt detectate incremental; pentru acestea folosiți `full=True`.
+    """
+    watermark = Watermark.get(WATERMARK_NAME)
+    started = timezone.now()
+    if full or watermark.last_timestamp is None:
+        days = all_days()
+        if full:
+            DailyPartnerRollup.objects.exclude(day__in=days).delete()
+    else:
+        lag = timedelta(seconds=getattr(settings, "ROLLUP_LAG", 300))
+        days = touched_days(watermark.last_timestamp - lag)
+    written = rebuild_days(days)
+    watermark.advance(started, 0)
+    return {"days": len(days), "rows": written}
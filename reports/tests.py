@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from archive.models import ArchivedDeliveryItem
+from archive.services import archive_batch
+from core.models import Watermark
+from deliveries.models import Delivery, DeliveryItem
+from orders.models import Order, OrderItem
+from partners.models import Partner
+
+from .analytics import _MATERIAL_BITS, SupplierKpiAccumulator, compute_supplier_kpis
+from .discrepancies import discrepancy_report
+from .models import DailyPartnerRollup
+from .services import WATERMARK_NAME, refresh_rollups
+
+
+class ArchivedHistoryReportTests(TestCase):
+    """Rapoartele nu pierd istoricul după `archive_closed_orders`."""
+
+    def setUp(self) -> None:
+        self.partner = Partner.objects.create(partner_code="P001", name="Partener test")
+        # Aceeași perioadă, partener și material: grupul combină comanda arhivată și cea curentă
+        self.closed = self._validated_order("4500000001", delivered="10", accepted="8")
+        self._validated_order("4500000002", delivered="5", accepted="5")
+
+    def _validated_order(self, number: str, delivered: str, accepted: str) -> Order:
+        order = Order.objects.create(
+            order_number=number,
+            partner=self.partner,
+            total_value=Decimal("100"),
+            status="delivered",
+            delivery_date=date(2024, 3, 10),
+        )
+        order_item = OrderItem.objects.create(
+            order=order,
+            position=10,
+            material_code="MAT-001",
+            material_description="Țeavă",
+            quantity_ordered=Decimal(delivered),
+            unit_of_measure="BUC",
+            delivery_date=date(2024, 3, 10),
+            net_price=Decimal("10"),
+            price_unit="1",
+            line_total=Decimal("100"),
+            quantity_delivered=Decimal(accepted),
+        )
+        delivery = Delivery.objects.create(
+            delivery_number=f"AV-{number}",
+            order=order,
+            partner=self.partner,
+            delivery_date=date(2024, 3, 12),
+            status="validated",
+            validation_status="approved",
+            validated_at=timezone.now(),
+            desadv_exported_at=timezone.now(),
+        )
+        DeliveryItem.objects.create(
+            delivery=delivery,
+            order_item=order_item,
+            quantity_delivered=Decimal(delivered),
+            quantity_accepted=Decimal(accepted),
+            has_discrepancy=delivered != accepted,
+        )
+        return order
+
+    def test_discrepancy_report_and_kpis_include_archive(self) -> None:
+        params = {"period": "month"}
+        report_before = list(discrepancy_report(params))
+        kpis_before = compute_supplier_kpis(("partner",))
+
+        archive_batch([self.closed.pk], older_than_days=0)
+        self.assertEqual(ArchivedDeliveryItem.objects.count(), 1)
+
+        report_after = list(discrepancy_report(params))
+        self.assertEqual(report_after, report_before)
+        self.assertEqual(len(report_after), 1)
+        row = report_after[0]
+        self.assertEqual(row["lines"], 2)
+        self.assertEqual(row["delivered"], Decimal("15"))
+        self.assertEqual(row["accepted"], Decimal("13"))
+        self.assertEqual(row["rejected_lines"], 1)
+        self.assertEqual(compute_supplier_kpis(("partner",)), kpis_before)
+        self.assertEqual(kpis_before[0]["lines"], 2)
+
+    def test_only_discrepancies_filters_merged_groups(self) -> None:
+        archive_batch([self.closed.pk], older_than_days=0)
+        self.assertEqual(discrepancy_report({"only_discrepancies": "1"}).count(), 1)
+        self.assertFalse(discrepancy_report({"only_discrepancies": "1", "material": "OTHER"}).exists())
+
+    def test_report_page_and_export(self) -> None:
+        archive_batch([self.closed.pk], older_than_days=0)
+        staff = get_user_model().objects.create_user("staff", password="x", is_staff=True)
+        self.client.force_login(staff)
+        self.assertContains(self.client.get("/reports/discrepancies/"), "MAT-001")
+        export = self.client.get("/reports/discrepancies/export/", {"format": "csv"})
+        content = b"".join(export.streaming_content).decode("utf-8-sig")
+        self.assertEqual(len(content.strip().splitlines()), 2)
+        self.assertIn("MAT-001", content)
+
+
+class SupplierKpiAccumulatorTests(SimpleTestCase):
+    def _row(self, pk: int, partner: int, material: int, accepted: str = "10") -> tuple:
+        return (pk, partner, material, date(2024, 3, 12), date(2024, 3, 10), Decimal("10"), Decimal(accepted))
+
+    def _groups(self, accumulator: SupplierKpiAccumulator) -> dict[tuple[int, int | None], int]:
+        return {(row["partner_id"], row["material_id"]): row["lines"] for row in accumulator.results()}
+
+    def test_ids_beyond_packed_key_bits_stay_separate(self) -> None:
+        big_material = (1 << _MATERIAL_BITS) + 5
+        accumulator = SupplierKpiAccumulator(("partner", "material"))
+        # Prima bucată încape în cheia int64; a doua o depășește și convertește agregatele existente
+        accumulator.add_chunk([self._row(1, 1, 5), self._row(2, 2, 5)])
+        accumulator.add_chunk([self._row(3, 1, big_material), self._row(4, 1, 5, accepted="8")])
+        accumulator.add_chunk([self._row(5, 1 << 40, 7)])
+
+        self.assertEqual(
+            self._groups(accumulator), {(1, 5): 2, (2, 5): 1, (1, big_material): 1, (1 << 40, 7): 1}
+        )
+        [row] = [r for r in accumulator.results() if (r["partner_id"], r["material_id"]) == (1, 5)]
+        self.assertEqual(row["discrepancy_rate"], 0.5)
+
+    def test_results_are_sorted_the_same_with_either_key(self) -> None:
+        rows = [self._row(1, 2, 3), self._row(2, 1, 9), self._row(3, 1, 4)]
+        packed = SupplierKpiAccumulator(("partner", "material"))
+        packed.add_chunk(rows)
+        structured = SupplierKpiAccumulator(("partner", "material"))
+        structured.add_chunk(rows + [self._row(4, 3, 1 << _MATERIAL_BITS)])
+        self.assertEqual(list(self._groups(packed)), [(1, 4), (1, 9), (2, 3)])
+        self.assertEqual(list(self._groups(structured)), [(1, 4), (1, 9), (2, 3), (3, 1 << _MATERIAL_BITS)])
+
+
+class RefreshRollupsTests(TestCase):
+    def test_late_commit_inside_lag_window_is_picked_up(self) -> None:
+        partner = Partner.objects.create(partner_code="P001", name="Partener test")
+        refresh_rollups()
+        watermark = Watermark.get(WATERMARK_NAME)
+
+        # Tranzacție cu `updated_at` anterior watermark-ului, vizibilă abia după rularea precedentă
+        order = Order.objects.create(
+            order_number="4500000001",
+            partner=partner,
+            total_value=Decimal("100"),
+            delivery_date=date(2024, 3, 10),
+        )
+        Order.objects.filter(pk=order.pk).update(
+            order_date=date(2024, 3, 5), updated_at=watermark.last_timestamp - timedelta(seconds=60)
+        )
+
+        with self.settings(ROLLUP_LAG=0):
+            refresh_rollups()
+        self.assertFalse(DailyPartnerRollup.objects.exists())
+
+        Watermark.objects.filter(pk=watermark.pk).update(last_timestamp=watermark.last_timestamp)
+        refresh_rollups()
+        rollup = DailyPartnerRollup.objects.get()
+        self.assertEqual((rollup.day, rollup.orders_count), (date(2024, 3, 5), 1))
+
+
+class DiscrepancyReportPagingTests(TestCase):
+    """Pagina raportului face un număr fix de query-uri, cu LIMIT, indiferent de volum."""
+
+    def setUp(self) -> None:
+        self.partner = Partner.objects.create(partner_code="P001", name="Partener test")
+        self.client.force_login(get_user_model().objects.create_user("staff", password="x", is_staff=True))
+
+    def _lines(self, start: int, count: int) -> None:
+        order = Order.objects.create(
+            order_number=f"45{start:08d}",
+            partner=self.partner,
+            total_value=Decimal("100"),
+            delivery_date=date(2024, 3, 10),
+        )
+        delivery = Delivery.objects.create(
+            delivery_number=f"AV-{start}",
+            order=order,
+            partner=self.partner,
+            delivery_date=date(2024, 3, 12),
+            status="validated",
+            validated_at=timezone.now(),
+        )
+        for n in range(start, start + count):
+            order_item = OrderItem.objects.create(
+                order=order,
+                position=n,
+                material_code=f"MAT-{n:03d}",
+                material_description="Material",
+                quantity_ordered=Decimal("5"),
+                unit_of_measure="BUC",
+                delivery_date=date(2024, 3, 10),
+                net_price=Decimal("1"),
+                price_unit="1",
+                line_total=Decimal("5"),
+            )
+            DeliveryItem.objects.create(
+                delivery=delivery,
+                order_item=order_item,
+                quantity_delivered=Decimal("5"),
+                quantity_accepted=Decimal("4"),
+            )
+
+    def _report_queries(self) -> list[str]:
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get("/reports/discrepancies/", {"period": "day"})
+        self.assertEqual(response.status_code, 200)
+        return [q["sql"] for q in ctx.captured_queries if "reports_discrepancy_line" in q["sql"]]
+
+    def test_page_is_count_plus_limited_select(self) -> None:
+        self._lines(1, 3)
+        small = self._report_queries()
+        self._lines(100, 60)
+        large = self._report_queries()
+
+        self.assertEqual(len(small), len(large))
+        self.assertEqual(len(large), 2)  # COUNT pentru paginator + pagina curentă
+        self.assertIn("COUNT(", large[0].upper())
+        self.assertIn("LIMIT 50", large[1].upper())
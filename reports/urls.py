@@ -0,0 +1,15 @@
+from __future__ import annotations
+
+from django.urls import path
+
+from .views import DiscrepancyReportView, PartnerReportView, SupplierKpiView, discrepancy_export
+
+
+app_name = "reports"
+
+urlpatterns = [
+    path("", PartnerReportView.as_view(), name="partner_report"),
+    path("suppliers/", SupplierKpiView.as_view(), name="supplier_kpis"),
+    path("discrepancies/", DiscrepancyReportView.as_view(), name="discrepancy_report"),
+    path("discrepancies/export/", discrepancy_export, name="discrepancy_export"),
+]
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.contrib.auth.decorators import user_passes_test
+from django.core.cache import cache
+from django.db.models import F, Sum
+from django.db.models.functions import TruncMonth
+from django.utils.dateparse import parse_date
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import require_GET
+from django.views.generic import ListView, TemplateView
+
+from core.db_router import on_replica, use_replica
+from core.exports import export_response, get_export_chunk_size
+from core.models import Watermark
+from partners.models import Partner
+
+from .analytics import compute_supplier_kpis
+from .discrepancies import DISCREPANCY_COLUMNS, discrepancy_report
+from .models import DailyPartnerRollup
+from .services import WATERMARK_NAME
+
+
+def _is_staff(user):  # type: ignore[no-untyped-def]
+    return user.is_authenticated and user.is_staff
+
+
+@method_decorator(user_passes_test(_is_staff, login_url="/admin/login/"), name="dispatch")
+@method_decorator(use_replica, name="dispatch")
+class PartnerReportView(ListView):
+    """Valoare comandată / livrată per partener și perioadă (zi sau lună).
+
+    Citește exclusiv din `DailyPartnerRollup`, deci costul nu depinde de
+    volumul comenzilor și avizelor brute.
+    """
+
+    template_name = "reports/partner_report.html"
+    context_object_name = "rows"
+    paginate_by = 50
+
+    def get_period(self) -> tuple[date, date]:
+        today = date.today()
+        date_from = parse_date(self.request.GET.get("date_from") or "") or (today - timedelta(days=365)).replace(day=1)
+        date_to = parse_date(self.request.GET.get("date_to") or "") or today
+        return date_from, date_to
+
+    def get_queryset(self):  # type: ignore[no-untyped-def]
+        date_from, date_to = self.get_period()
+        qs = DailyPartnerRollup.objects.filter(day__gte=date_from, day__lte=date_to)
+        partner = self.request.GET.get("partner")
+        if partner:
+            qs = qs.filter(partner__name__icontains=partner)
+        period = F("day") if self.request.GET.get("granularity") == "day" else TruncMonth("day")
+        return (
+            qs.annotate(period=period)
+            .values("period", "partner__partner_code", "partner__name", "currency")
+            .annotate(
+                orders=Sum("orders_count"),
+                value=Sum("ordered_value"),
+                delivered=Sum("delivered_quantity"),
+                lines=Sum("delivery_lines"),
+                discrepancies=Sum("discrepancy_lines"),
+            )
+            .order_by("-period", "partner__name", "currency")
+        )
+
+    def get_context_data(self, **kwargs):  # type: ignore[no-untyped-def]
+        ctx = super().get_context_data(**kwargs)
+        date_from, date_to = self.get_period()
+        watermark = Watermark.objects.filter(name=WATERMARK_NAME).first()
+        ctx.update({
+            "date_from": date_from,
+            "date_to": date_to,
+            "granularity": self.request.GET.get("granularity", "month"),
+            "refreshed_at": watermark.last_timestamp if watermark else None,
+        })
+        return ctx
+
+
+KPI_GROUPINGS = {
+    "partner": ("partner",),
+    "partner_week": ("partner", "week"),
+    "partner_material": ("partner", "material"),
+}
+
+
+@method_decorator(user_passes_test(_is_staff, login_url="/admin/login/"), name="dispatch")
+@method_decorator(use_replica, name="dispatch")
+class SupplierKpiView(TemplateView):
+    """Dashboard KPI furnizori (fill rate, livrare la timp, discrepanțe).
+
+    Rezultatul calculului vectorizat este păstrat în cache
+    `ANALYTICS_CACHE_TIMEOUT` secunde per combinație de filtre.
+    """
+
+    template_name = "reports/supplier_kpis.html"
+
+    def get_context_data(self, **kwargs):  # type: ignore[no-untyped-def]
+        ctx = super().get_context_data(**kwargs)
+        grouping = self.request.GET.get("group_by", "partner")
+        if grouping not in KPI_GROUPINGS:
+            grouping = "partner"
+        today = date.today()
+        date_from = parse_date(self.request.GET.get("date_from") or "") or today - timedelta(days=90)
+        date_to = parse_date(self.request.GET.get("date_to") or "") or today
+
+        cache_key = f"reports:supplier_kpis:{grouping}:{date_from}:{date_to}"
+        rows = cache.get_or_set(
+            cache_key,
+            lambda: compute_supplier_kpis(KPI_GROUPINGS[grouping], date_from=date_from, date_to=date_to),
+            getattr(settings, "ANALYTICS_CACHE_TIMEOUT", 900),
+        )
+        partners = dict(Partner.objects.values_list("pk", "name"))
+        for row in rows:
+            row["partner_name"] = partners.get(row.get("partner_id"), "")
+        ctx.update({
+            "rows": rows,
+            "grouping": grouping,
+            "date_from": date_from,
+            "date_to": date_to,
+        })
+        return ctx
+
+
+@method_decorator(user_passes_test(_is_staff, login_url="/admin/login/"), name="dispatch")
+@method_decorator(use_replica, name="dispatch")
+class DiscrepancyReportView(ListView):
+    """Discrepanțe livrat / acceptat / comandat per partener, material și perioadă."""
+
+    template_name = "reports/discrepancy_report.html"
+    context_object_name = "rows"
+    paginate_by = 50
+
+    def get_queryset(self):  # type: ignore[no-untyped-def]
+        return discrepancy_report(self.request.GET)
+
+    def get_context_data(self, **kwargs):  # type: ignore[no-untyped-def]
+        ctx = super().get_context_data(**kwargs)
+        ctx["period"] = self.request.GET.get("period", "month")
+        return ctx
+
+
+@user_passes_test(_is_staff, login_url="/admin/login/")
+@require_GET
+def discrepancy_export(request):  # type: ignore[no-untyped-def]
+    """Export raport discrepanțe (CSV/XLSX) cu aceleași filtre ca pagina."""
+    rows = (
+        on_replica(discrepancy_report(request.GET))
+        .values_list(*[f for f, _ in DISCREPANCY_COLUMNS])
+        .iterator(chunk_size=get_export_chunk_size())
+    )
+    return export_response(
+        request.GET.get("format", "csv"),
+        "discrepante",
+        [label for _, label in DISCREPANCY_COLUMNS],
+        rows,
+    )
@@ -0,0 +1,78 @@
+// Detaliul comenzii: pozițiile și avizele se încarcă în pagini din API-urile JSON
+// (`order_lines_api`, `order_deliveries_api`). Containerul `[data-lazy-list]` dă URL-ul,
+// cheia listei din răspuns și coloanele tabelului; butoanele `[data-filter]` schimbă filtrul.
+(function(){
+  function cell(row, column){
+    const td = document.createElement('td');
+    if (column === 'url') {
+      const link = document.createElement('a');
+      link.className = 'btn btn-sm btn-outline-primary';
+      link.href = row.url;
+      link.textContent = 'Detalii';
+      td.appendChild(link);
+    } else {
+      const value = row[column];
+      td.textContent = value === null || value === undefined ? '' : value;
+    }
+    return td;
+  }
+
+  function setup(container){
+    const tbody = container.querySelector('tbody');
+    const more = container.querySelector('[data-more]');
+    const empty = container.querySelector('[data-empty]');
+    const columns = container.dataset.columns.split(',');
+    const key = container.dataset.key;
+    let filter = '';
+    let cursor = null;
+    let loading = false;
+    let generation = 0;
+
+    async function load(reset){
+      if (loading && !reset) return;
+      if (reset) { generation += 1; cursor = null; tbody.replaceChildren(); }
+      const current = generation;
+      loading = true;
+      more.classList.add('d-none');
+      const params = new URLSearchParams();
+      if (filter) params.set('filter', filter);
+      if (cursor !== null) params.set('after', cursor);
+      try {
+        const res = await fetch(`${container.dataset.url}?${params}`, {headers: {'X-Requested-With': 'XMLHttpRequest'}});
+        const data = await res.json();
+        if (current !== generation) return;  // filtrul s-a schimbat între timp
+        if (!res.ok) { console.error(data); return; }
+        (data[key] || []).forEach((row) => {
+          const tr = document.createElement('tr');
+          columns.forEach((column) => tr.appendChild(cell(row, column)));
+          tbody.appendChild(tr);
+        });
+        cursor = data.next;
+        more.classList.toggle('d-none', cursor === null);
+        empty.classList.toggle('d-none', tbody.children.length > 0);
+      } catch (e) {
+        console.error(e);
+      } finally {
+        if (current === generation) loading = false;
+      }
+    }
+
+    container.querySelectorAll('[data-filter]').forEach((button) => {
+      button.addEventListener('click', () => {
+        container.querySelectorAll('[data-filter]').forEach((b) => b.classList.toggle('active', b === button));
+        filter = button.dataset.filter;
+        load(true);
+      });
+    });
+    more.addEventListener('click', () => load(false));
+    // Pagina următoare se cere singură când butonul ajunge în viewport
+    if ('IntersectionObserver' in window) {
+      new IntersectionObserver((entries) => {
+        if (entries.some((e) => e.isIntersecting) && cursor !== null) load(false);
+      }).observe(more);
+    }
+    load(true);
+  }
+
+  document.querySelectorAll('[data-lazy-list]').forEach(setup);
+})();